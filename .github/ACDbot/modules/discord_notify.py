@@ -1,4 +1,4 @@
-import requests
+from modules import http_client
 import os
 
 # Map call series to Discord webhook URLs via environment variables
@@ -15,5 +15,5 @@ def send_discord_notification(call_series, message):
         print(f"No webhook configured for call series: {call_series}")
         return False
     data = {"content": message}
-    response = requests.post(webhook_url, json=data)
+    response = http_client.post(webhook_url, json=data)
     return response.status_code == 204 
\ No newline at end of file
@@ -2,6 +2,20 @@ import os
 import json
 import requests
 import urllib.parse
+from modules import discourse_cache, http_client
+
+# Posts per /t/<id>/posts.json request, as Discourse pages them
+POSTS_PAGE_SIZE = 20
+# Discourse limits each API user (max_admin_api_reqs_per_minute, 60 by default);
+# every call queues on this budget instead of running into 429s
+REQUESTS_PER_MINUTE = float(os.environ.get("ACDBOT_DISCOURSE_REQS_PER_MINUTE", "60"))
+
+
+def _base_url():
+    """The Discourse base URL, with the per-API-user rate governor set up for its host."""
+    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    http_client.set_host_rate(urllib.parse.urlsplit(base_url).hostname or base_url, REQUESTS_PER_MINUTE)
+    return base_url
 
 class DiscourseDuplicateTitleError(Exception):
     """Custom exception for duplicate Discourse topic titles."""
@@ -24,7 +38,7 @@ def create_topic(title: str, body: str, category_id=63):
     """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
-    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    base_url = _base_url()
 
     payload = {
         "title": title,
@@ -34,7 +48,7 @@ def create_topic(title: str, body: str, category_id=63):
     }
 
     try:
-        resp = requests.post(
+        resp = http_client.post(
             f"{base_url}/posts.json",
             headers={
                 "Api-Key": api_key,
@@ -58,6 +72,11 @@ def create_topic(title: str, body: str, category_id=63):
 
         response_data = resp.json()
         topic_id = response_data.get("topic_id")
+        if topic_id:
+            # The created post is the topic's first post
+            discourse_cache.remember_topic(
+                topic_id, first_post_id=response_data.get("id"), title=title, category_id=category_id, body=body
+            )
         return {"topic_id": topic_id, "title": title, "action": "created"}
 
     except DiscourseDuplicateTitleError:
@@ -70,44 +89,38 @@ def create_topic(title: str, body: str, category_id=63):
 
 
 def update_topic(topic_id: int, title: str = None, body: str = None, category_id: int = None):
+    """
+    Updates a topic's title/category and the body of its first post.
+    Only the parts that differ from the last write recorded in discourse_cache
+    are sent, and the topic is only fetched when its first post ID is unknown.
+    """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
-    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    base_url = _base_url()
 
-    # 1. Fetch the topic details so we can retrieve the first post's ID.
-    try:
-        resp_topic = requests.get(
-            f"{base_url}/t/{topic_id}.json",
-            headers={
-                "Api-Key": api_key,
-                "Api-Username": api_user
-            }
-        )
-        resp_topic.raise_for_status()
-        topic_json = resp_topic.json()
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Failed to fetch topic details for ID {topic_id}: {e}")
-        raise # Re-raise the exception
+    cached = discourse_cache.get_topic(topic_id)
+    changed = discourse_cache.changed_parts(cached, title=title, category_id=category_id, body=body)
+    title_changed = "title" in changed
+    category_changed = "category_id" in changed
+    body_changed = "body" in changed
 
-    # The first post ID is usually the first object in the `post_stream["posts"]`.
-    try:
-        first_post_id = topic_json["post_stream"]["posts"][0]["id"]
-    except (KeyError, IndexError, TypeError) as e:
-        print(f"[ERROR] Could not extract first_post_id for topic {topic_id}. JSON structure might be unexpected. Error: {e}")
-        # For now, let's raise to indicate the problem clearly
-        raise ValueError(f"Could not find first post ID for topic {topic_id}") from e
+    # 1. Look up the first post's ID if the body changed and it isn't cached.
+    first_post_id = cached.get("first_post_id")
+    if body_changed and first_post_id is None:
+        first_post_id = _fetch_first_post_id(topic_id, base_url, api_key, api_user)
+        discourse_cache.remember_topic(topic_id, first_post_id=first_post_id)
 
-    # 2. If we have a new title or category, update the topic (PUT /t/<topic_id>.json).
+    # 2. If the title or category changed, update the topic (PUT /t/<topic_id>.json).
     topic_updated = False
-    if title is not None or category_id is not None:
+    if title_changed or category_changed:
         update_payload = {}
-        if title:
+        if title_changed:
             update_payload["title"] = title
-        if category_id:
+        if category_changed:
             update_payload["category_id"] = category_id
 
         try:
-            resp_update_topic = requests.put(
+            resp_update_topic = http_client.put(
                 f"{base_url}/t/{topic_id}.json",
                 headers={
                     "Api-Key": api_key,
@@ -120,26 +133,32 @@ def update_topic(topic_id: int, title: str = None, body: str = None, category_id
                 error_text = resp_update_topic.text
                 print(f"[ERROR] Failed to update topic title/category for {topic_id}. Response: {error_text}")
                 # Check if this specific error is a duplicate title error during update
-                if "Title has already been used" in error_text and title is not None:
+                if "Title has already been used" in error_text and title_changed:
                      raise DiscourseDuplicateTitleError(title, message=f"Failed to update topic {topic_id} because title already exists")
+                discourse_cache.forget_topic(topic_id)
                 resp_update_topic.raise_for_status() # Raise for other errors
             topic_updated = True
+            discourse_cache.remember_topic(
+                topic_id,
+                title=title if title_changed else None,
+                category_id=category_id if category_changed else None,
+            )
         except DiscourseDuplicateTitleError:
             raise # Re-raise duplicate title error
         except requests.exceptions.RequestException as e:
             print(f"[ERROR] Network/API error during topic update for {topic_id}: {e}")
             raise
 
-    # 3. If we have new body content, update the text of the first post (PUT /posts/<post_id>.json).
+    # 3. If the body changed, update the text of the first post (PUT /posts/<post_id>.json).
     post_updated = False
-    if body is not None:
+    if body_changed:
         post_update_payload = {
             "post": {
                 "raw": body
             }
         }
         try:
-            resp_update_post = requests.put(
+            resp_update_post = http_client.put(
                 f"{base_url}/posts/{first_post_id}.json",
                 headers={
                     "Api-Key": api_key,
@@ -150,23 +169,53 @@ def update_topic(topic_id: int, title: str = None, body: str = None, category_id
             )
             if not resp_update_post.ok:
                 print(f"[ERROR] Failed to update post body for post {first_post_id} (topic {topic_id}). Response: {resp_update_post.text}")
+                # The cached post ID may be stale; look it up again next time
+                discourse_cache.forget_topic(topic_id)
                 resp_update_post.raise_for_status()
             post_updated = True
+            discourse_cache.remember_topic(topic_id, body=body)
         except requests.exceptions.RequestException as e:
             print(f"[ERROR] Network/API error during post update for post {first_post_id} (topic {topic_id}): {e}")
             raise
 
+    if not (topic_updated or post_updated):
+        print(f"[DEBUG] Discourse topic {topic_id} unchanged, nothing sent.")
+
     # Return status based on what was attempted/succeeded
     return {"topic_id": topic_id, "topic_updated": topic_updated, "post_updated": post_updated}
 
 
+def _fetch_first_post_id(topic_id, base_url, api_key, api_user):
+    """Fetches the topic (GET /t/<topic_id>.json) and returns its first post's ID."""
+    try:
+        resp_topic = http_client.get(
+            f"{base_url}/t/{topic_id}.json",
+            headers={
+                "Api-Key": api_key,
+                "Api-Username": api_user
+            }
+        )
+        resp_topic.raise_for_status()
+        topic_json = resp_topic.json()
+    except requests.exceptions.RequestException as e:
+        print(f"[ERROR] Failed to fetch topic details for ID {topic_id}: {e}")
+        raise # Re-raise the exception
+
+    # The first post ID is usually the first object in the `post_stream["posts"]`.
+    try:
+        return topic_json["post_stream"]["posts"][0]["id"]
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"[ERROR] Could not extract first_post_id for topic {topic_id}. JSON structure might be unexpected. Error: {e}")
+        raise ValueError(f"Could not find first post ID for topic {topic_id}") from e
+
+
 def create_post(topic_id: int, body: str):
     """
     Creates a new post (reply) in the specified Discourse topic.
     """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
-    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    base_url = _base_url()
 
     payload = {
         "topic_id": topic_id,
@@ -174,7 +223,7 @@ def create_post(topic_id: int, body: str):
     }
 
     try:
-        resp = requests.post(
+        resp = http_client.post(
             f"{base_url}/posts.json",
             headers={
                 "Api-Key": api_key,
@@ -193,16 +242,70 @@ def create_post(topic_id: int, body: str):
         raise # Re-raise
 
 
+def get_post(post_id: int):
+    """
+    Retrieves a single post, including its raw content.
+    """
+    api_key = os.environ["DISCOURSE_API_KEY"]
+    api_user = os.environ["DISCOURSE_API_USERNAME"]
+    base_url = _base_url()
+
+    try:
+        resp = http_client.get(
+            f"{base_url}/posts/{post_id}.json",
+            headers={
+                "Api-Key": api_key,
+                "Api-Username": api_user,
+            },
+        )
+        if not resp.ok:
+            print(resp.text)
+            resp.raise_for_status()
+
+        return resp.json()
+    except requests.exceptions.RequestException as e:
+        print(f"[ERROR] Failed to get post {post_id}: {e}")
+        raise
+
+
+def update_post(post_id: int, body: str):
+    """
+    Replaces the content of a post.
+    """
+    api_key = os.environ["DISCOURSE_API_KEY"]
+    api_user = os.environ["DISCOURSE_API_USERNAME"]
+    base_url = _base_url()
+
+    try:
+        resp = http_client.put(
+            f"{base_url}/posts/{post_id}.json",
+            headers={
+                "Api-Key": api_key,
+                "Api-Username": api_user,
+                "Content-Type": "application/json",
+            },
+            data=json.dumps({"post": {"raw": body}}),
+        )
+        if not resp.ok:
+            print(resp.text)
+            resp.raise_for_status()
+
+        return resp.json()
+    except requests.exceptions.RequestException as e:
+        print(f"[ERROR] Failed to update post {post_id}: {e}")
+        raise
+
+
 def get_posts_in_topic(topic_id: int):
     """
     Retrieves all posts in a Discourse topic.
     """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
-    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    base_url = _base_url()
 
     try:
-        resp = requests.get(
+        resp = http_client.get(
             f"{base_url}/t/{topic_id}/posts.json",
             headers={
                 "Api-Key": api_key,
@@ -220,22 +323,94 @@ def get_posts_in_topic(topic_id: int):
         raise
 
 
-def check_if_transcript_posted(topic_id: int, meeting_id: str):
+def artifact_marker(kind: str, key: str):
+    """Invisible tag appended to the bot's posts so they can be recognised later."""
+    return f"<!-- acdbot:{kind}:{key} -->"
+
+
+def posted_artifact(record: dict, kind: str, topic_id: int):
+    """The post of this kind recorded on an occurrence (or mapping entry) for topic_id, or None."""
+    artifact = (record or {}).get("discourse_posts", {}).get(kind)
+    if artifact and str(artifact.get("topic_id")) == str(topic_id):
+        return artifact
+    return None
+
+
+def record_artifact(record: dict, kind: str, topic_id: int, post_id, body: str = None):
+    """Stores the post of this kind on an occurrence (or mapping entry). The caller persists it."""
+    posts = dict(record.get("discourse_posts") or {})
+    posts[kind] = {
+        "topic_id": topic_id,
+        "post_id": post_id,
+        "content_sha256": discourse_cache.body_hash(body) if body is not None else None,
+    }
+    record["discourse_posts"] = posts
+
+
+def find_artifact_post(topic_id: int, markers):
+    """
+    Scans the bot's own posts in a topic, page by page, for any of markers.
+    Returns the matching post or None.
+    """
+    api_key = os.environ["DISCOURSE_API_KEY"]
+    api_user = os.environ["DISCOURSE_API_USERNAME"]
+    base_url = _base_url()
+    headers = {"Api-Key": api_key, "Api-Username": api_user}
+
+    # The post stream lists the IDs of every post (filtered to the bot's),
+    # while the posts themselves come back a page at a time
+    resp = http_client.get(
+        f"{base_url}/t/{topic_id}.json",
+        headers=headers,
+        params={"username_filters": api_user},
+    )
+    resp.raise_for_status()
+    post_stream = resp.json().get("post_stream", {})
+    post_ids = post_stream.get("stream") or [post["id"] for post in post_stream.get("posts", [])]
+
+    for start in range(0, len(post_ids), POSTS_PAGE_SIZE):
+        resp = http_client.get(
+            f"{base_url}/t/{topic_id}/posts.json",
+            headers=headers,
+            params={"post_ids[]": post_ids[start:start + POSTS_PAGE_SIZE], "include_raw": "true"},
+        )
+        resp.raise_for_status()
+        for post in resp.json().get("post_stream", {}).get("posts", []):
+            content = (post.get("raw") or "") + (post.get("cooked") or "")
+            if any(marker in content for marker in markers):
+                return post
+    return None
+
+
+def transcript_key(meeting_id: str, record: dict = None):
+    """Marker key of an occurrence's transcript post: the meeting ID, plus the issue number if known."""
+    issue_number = (record or {}).get("issue_number")
+    return f"{meeting_id}-{issue_number}" if issue_number else str(meeting_id)
+
+
+def check_if_transcript_posted(topic_id: int, meeting_id: str, record: dict = None):
     """
     Checks if the transcript for the given meeting_id has already been posted.
-    Returns True if found, False otherwise. Returns None on error fetching posts.
+    record is the occurrence (or mapping entry) the transcript belongs to: a
+    post recorded on it answers without any request, and a post found by
+    scanning the topic is recorded on it. Returns True if found, False
+    otherwise. Returns None on error fetching posts.
     """
+    if posted_artifact(record, "transcript", topic_id):
+        return True
     try:
-        posts = get_posts_in_topic(topic_id)
-        marker = f"transcript-{meeting_id}.txt"
-        for post in posts:
-            # Check both raw and cooked content for robustness
-            if marker in post.get("cooked", "") or marker in post.get("raw", ""):
-                return True
-        return False
+        # Posts from before markers were added carry the transcript file name
+        post = find_artifact_post(
+            topic_id, [artifact_marker("transcript", transcript_key(meeting_id, record)), f"transcript-{meeting_id}.txt"]
+        )
     except Exception as e:
         print(f"[WARN] Could not check for transcript in topic {topic_id} due to error: {e}")
         return None # Indicate uncertainty due to error
+    if post is None:
+        return False
+    if record is not None:
+        record_artifact(record, "transcript", topic_id, post.get("id"), post.get("raw"))
+    return True
 
 
 def upload_file(file_content: str, file_name: str):
@@ -244,12 +419,12 @@ def upload_file(file_content: str, file_name: str):
     """
     api_key = os.environ["DISCOURSE_API_KEY"]
     api_user = os.environ["DISCOURSE_API_USERNAME"]
-    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    base_url = _base_url()
 
     files = {'file': (file_name, file_content, 'text/plain')}
 
     try:
-        resp = requests.post(
+        resp = http_client.post(
             f"{base_url}/uploads.json",
             headers={
                 "Api-Key": api_key,
@@ -282,7 +457,7 @@ def search_topic_by_title(title: str):
     # Keep the old logic for reference or potential future restricted use, but warn heavily.
     api_key = os.environ.get("DISCOURSE_API_KEY") # Use .get() to avoid KeyError if not set
     api_user = os.environ.get("DISCOURSE_API_USERNAME")
-    base_url = os.environ.get("DISCOURSE_BASE_URL", "https://ethereum-magicians.org")
+    base_url = _base_url()
 
     if not api_key or not api_user:
         print("[ERROR] Discourse API Key or Username not configured for search.")
@@ -293,7 +468,7 @@ def search_topic_by_title(title: str):
 
     try:
         # Search for the exact title
-        resp = requests.get(
+        resp = http_client.get(
             f"{base_url}/search.json?q={encoded_title}",
             headers={
                 "Api-Key": api_key,
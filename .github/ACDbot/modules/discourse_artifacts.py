@@ -0,0 +1,195 @@
+"""
+One "Meeting artifacts" reply per occurrence, edited in place.
+
+The recording summary, the YouTube video link and the stream links used to be
+separate replies, each a write request and a notification to everyone
+watching the topic. publish() instead puts each artifact in its own section of
+a single bot-owned reply per occurrence: the occurrence's first artifact
+creates it (one notification), later ones edit it (edits notify nobody).
+Occurrences sharing a topic (e.g. from handle_issue's duplicate-title fallback)
+each get their own reply, so one never overwrites another's sections and each
+new meeting's recording still notifies the topic's watchers.
+
+Inside a batch() every artifact published for an occurrence is written
+together when the batch ends, so its summary and stream links cost a single
+request. A batch still writes an occurrence's post once its oldest pending
+artifact has waited ACDBOT_DISCOURSE_ARTIFACT_DEBOUNCE seconds. Outside a
+batch, publish() writes immediately.
+
+Sections are delimited by artifact_marker() comments, so the transcript
+duplicate check (discourse.check_if_transcript_posted) still finds them.
+
+Configuration (environment variables):
+  - ACDBOT_DISCOURSE_ARTIFACT_DEBOUNCE  longest a batch holds an artifact back, in seconds (default 120)
+"""
+import collections
+import contextlib
+import os
+import re
+import threading
+import time
+
+import requests
+
+from modules import discourse, discourse_cache
+
+DEBOUNCE = float(os.environ.get("ACDBOT_DISCOURSE_ARTIFACT_DEBOUNCE", "120"))
+
+HEADING = "### Meeting artifacts"
+# Sections appear in this order; other kinds follow alphabetically
+SECTION_ORDER = ["transcript", "youtube_video", "youtube_streams"]
+SECTION_PATTERN = re.compile(r"<!-- acdbot:(\w+):(\S*) -->\n(.*?)\n<!-- /acdbot:\1 -->", re.DOTALL)
+
+_local = threading.local()
+_lock = threading.Lock()
+# Serialises the read-modify-write of each topic's post across threads
+_topic_locks = collections.defaultdict(threading.Lock)
+
+
+class _Pending:
+    """Artifacts waiting to be written to one occurrence's post."""
+
+    def __init__(self):
+        self.sections = {}  # kind -> (key, body)
+        self.records = []   # (record, kind, body)
+        self.callbacks = []
+        self.since = time.monotonic()
+
+
+def post_marker(occurrence_key):
+    """Invisible tag identifying an occurrence's artifacts post."""
+    return f"<!-- acdbot:artifacts:{occurrence_key} -->"
+
+
+def publish(topic_id, occurrence_key, kind, key, body, record=None, on_published=None):
+    """
+    Adds (or replaces) the kind section of the artifacts post of the occurrence
+    occurrence_key (discourse.transcript_key()) in the topic.
+    Once written, the post is recorded under discourse_posts[kind] on record
+    (an occurrence or mapping entry) and on_published() is called.
+    """
+    occurrence_key = str(occurrence_key)
+    pending = _pending_topics().setdefault((topic_id, occurrence_key), _Pending())
+    pending.sections[kind] = (key, body)
+    if record is not None:
+        pending.records.append((record, kind, body))
+    if on_published is not None:
+        pending.callbacks.append(on_published)
+
+    if not _batch_depth() or time.monotonic() - pending.since >= DEBOUNCE:
+        flush(topic_id, occurrence_key)
+
+
+@contextlib.contextmanager
+def batch():
+    """Defers publish() writes to the end of the block (per thread; batches nest)."""
+    _local.depth = _batch_depth() + 1
+    try:
+        yield
+    except BaseException:
+        # The block failed: drop what it queued rather than publish half of it
+        _local.depth -= 1
+        if not _local.depth:
+            _pending_topics().clear()
+        raise
+    _local.depth -= 1
+    if not _local.depth:
+        flush()
+
+
+def flush(topic_id=None, occurrence_key=None):
+    """
+    Writes the pending artifacts of one occurrence's post, of every post in topic_id, or
+    (by default) of every post. Returns the post IDs written by (topic_id, occurrence_key).
+    If a write fails, everything still pending on this thread is dropped (as when a batch fails)
+    and the error is raised, so nothing is published later with an unrelated occurrence.
+    """
+    pending_topics = _pending_topics()
+    posts = [post for post in pending_topics
+             if (topic_id is None or post[0] == topic_id)
+             and (occurrence_key is None or post[1] == str(occurrence_key))]
+    written = {}
+    try:
+        for post in posts:
+            pending = pending_topics.get(post)
+            if pending is None:
+                continue
+            tid, okey = post
+            post_id = _write(tid, okey, pending.sections)
+            for record, kind, body in pending.records:
+                discourse.record_artifact(record, kind, tid, post_id, body)
+            for callback in pending.callbacks:
+                callback()
+            # Only now is the post done
+            del pending_topics[post]
+            written[post] = post_id
+    except BaseException:
+        pending_topics.clear()
+        raise
+    return written
+
+
+def compose(occurrence_key, sections):
+    """Raw content of an occurrence's artifacts post holding sections ({kind: (key, body)})."""
+    order = {kind: i for i, kind in enumerate(SECTION_ORDER)}
+    parts = [f"{HEADING}\n{post_marker(occurrence_key)}"]
+    for kind in sorted(sections, key=lambda kind: (order.get(kind, len(order)), kind)):
+        key, body = sections[kind]
+        parts.append(f"{discourse.artifact_marker(kind, key)}\n{body.strip()}\n<!-- /acdbot:{kind} -->")
+    return "\n\n".join(parts)
+
+
+def parse(raw):
+    """Sections ({kind: (key, body)}) of an artifacts post's raw content."""
+    return {kind: (key, body) for kind, key, body in SECTION_PATTERN.findall(raw or "")}
+
+
+def find_post_id(topic_id, occurrence_key):
+    """ID of an occurrence's artifacts post: from the topic cache, else by scanning the bot's posts."""
+    post_id = discourse_cache.get_topic(topic_id).get("artifacts_posts", {}).get(str(occurrence_key))
+    if post_id is None:
+        post = discourse.find_artifact_post(topic_id, [post_marker(occurrence_key)])
+        if post is not None:
+            post_id = post["id"]
+            discourse_cache.remember_artifacts_post(topic_id, occurrence_key, post_id)
+    return post_id
+
+
+def _write(topic_id, occurrence_key, new_sections):
+    with _lock:
+        topic_lock = _topic_locks[str(topic_id)]
+    with topic_lock:
+        post_id = find_post_id(topic_id, occurrence_key)
+        raw = None
+        if post_id is not None:
+            try:
+                raw = discourse.get_post(post_id).get("raw", "")
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                print(f"[WARN] Artifacts post {post_id} in topic {topic_id} is gone, starting a new one.")
+                post_id = None
+        if post_id is None:
+            response = discourse.create_post(topic_id, compose(occurrence_key, new_sections))
+            post_id = response["id"]
+            discourse_cache.remember_artifacts_post(topic_id, occurrence_key, post_id)
+            print(f"[DEBUG] Created artifacts post {post_id} for {occurrence_key} in topic {topic_id} ({', '.join(new_sections)})")
+            return post_id
+
+        sections = parse(raw)
+        sections.update(new_sections)
+        body = compose(occurrence_key, sections)
+        if body != raw:
+            discourse.update_post(post_id, body)
+            print(f"[DEBUG] Updated artifacts post {post_id} for {occurrence_key} in topic {topic_id} ({', '.join(new_sections)})")
+        return post_id
+
+
+def _pending_topics():
+    if not hasattr(_local, "pending"):
+        _local.pending = {}
+    return _local.pending
+
+
+def _batch_depth():
+    return getattr(_local, "depth", 0)
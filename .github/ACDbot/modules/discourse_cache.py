@@ -0,0 +1,129 @@
+"""
+Cache of what the bot last wrote to each Discourse topic.
+
+update_topic() used to fetch /t/{id}.json on every call just to learn the
+first post's ID, then PUT the title, category and body whether or not they had
+changed. The cache remembers, per topic, the first post ID and the title,
+category and body hash of the last successful write, so an edit only sends the
+requests whose content actually changed (and none for an unchanged edit).
+
+The cache is kept in discourse_topic_cache.json and committed alongside the
+mapping. It only knows what the bot wrote: edits made directly on Discourse
+are not noticed until the issue content changes again. It also remembers the
+ID of each occurrence's "Meeting artifacts" reply (see discourse_artifacts).
+"""
+import hashlib
+import json
+import threading
+
+from modules import mapping_commit
+from modules.meeting_store import write_json_atomic
+
+CACHE_FILE = ".github/ACDbot/discourse_topic_cache.json"
+
+_lock = threading.Lock()
+
+
+def body_hash(body):
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def load_cache():
+    """Returns the cache ({"topics": {topic_id: entry}}), empty if there is none."""
+    try:
+        with open(CACHE_FILE, "r") as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        cache = None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARN] Could not read {CACHE_FILE}, starting an empty Discourse topic cache: {e}")
+        cache = None
+    if not isinstance(cache, dict):
+        cache = {}
+    cache.setdefault("topics", {})
+    return cache
+
+
+def get_topic(topic_id):
+    """
+    The cached entry of a topic, or {}: first_post_id, title, category_id,
+    body_sha256, and artifacts_posts (occurrence key -> ID of the bot's
+    "Meeting artifacts" reply for that occurrence).
+    """
+    with _lock:
+        return dict(load_cache()["topics"].get(str(topic_id), {}))
+
+
+def changed_parts(cached, title=None, category_id=None, body=None):
+    """
+    Which of title, category_id and body differ from a topic's cached entry
+    (see get_topic); arguments left as None are not compared. An empty list
+    means an update would send nothing.
+    """
+    changed = []
+    if title and title != cached.get("title"):
+        changed.append("title")
+    if category_id and category_id != cached.get("category_id"):
+        changed.append("category_id")
+    if body is not None and body_hash(body) != cached.get("body_sha256"):
+        changed.append("body")
+    return changed
+
+
+def remember_topic(topic_id, first_post_id=None, title=None, category_id=None, body=None):
+    """Records what was just written to a topic. Arguments left as None keep their cached value."""
+    changes = {
+        "first_post_id": first_post_id,
+        "title": title,
+        "category_id": category_id,
+        "body_sha256": body_hash(body) if body is not None else None,
+    }
+    with _lock:
+        cache = load_cache()
+        entry = cache["topics"].setdefault(str(topic_id), {})
+        updated = False
+        for key, value in changes.items():
+            if value is not None and entry.get(key) != value:
+                entry[key] = value
+                updated = True
+        if updated:
+            _save_cache(cache, f"Cache Discourse topic {topic_id}")
+
+
+def forget_topic(topic_id):
+    """Drops a topic whose cached state can no longer be trusted."""
+    with _lock:
+        cache = load_cache()
+        if cache["topics"].pop(str(topic_id), None) is not None:
+            _save_cache(cache, f"Forget cached Discourse topic {topic_id}")
+
+
+def remember_artifacts_post(topic_id, occurrence_key, post_id):
+    """Records the ID of an occurrence's "Meeting artifacts" reply in a topic."""
+    with _lock:
+        cache = load_cache()
+        posts = cache["topics"].setdefault(str(topic_id), {}).setdefault("artifacts_posts", {})
+        if posts.get(str(occurrence_key)) != post_id:
+            posts[str(occurrence_key)] = post_id
+            _save_cache(cache, f"Cache Discourse artifacts post of {occurrence_key} in topic {topic_id}")
+
+
+def merge_caches(remote, local):
+    """
+    Keeps the topics another run cached; ours win for topics both runs wrote,
+    except that both runs' artifacts posts are kept.
+    """
+    remote_topics = remote.get("topics", {})
+    topics = dict(remote_topics)
+    for topic_id, entry in local.get("topics", {}).items():
+        posts = dict(remote_topics.get(topic_id, {}).get("artifacts_posts", {}))
+        posts.update(entry.get("artifacts_posts", {}))
+        topics[topic_id] = dict(entry, artifacts_posts=posts) if posts else entry
+    return {"topics": topics}
+
+
+def _save_cache(cache, reason):
+    # Also called from poll_zoom_recordings pool workers; mapping_commit only
+    # flushes from the main thread, so workers just mark the file pending.
+    write_json_atomic(CACHE_FILE, cache)
+    mapping_commit.request_file_commit(CACHE_FILE, reason, merge=merge_caches)
@@ -1,5 +1,5 @@
 import os
-import requests
+from modules import http_client
 
 def get_farcaster_client():
     """Initialize Farcaster client with credentials"""
@@ -22,7 +22,7 @@ def create_cast(text: str, parent_url: str = None):
     }
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f"{client['api_url']}/casts",
             json=payload,
             headers=headers
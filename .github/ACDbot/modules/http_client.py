@@ -0,0 +1,338 @@
+"""
+Shared HTTP client for the ACDbot service modules.
+
+Every Zoom, Discourse, Telegram, Farcaster and Discord call goes through here so
+that calls to the same host reuse one keep-alive connection pool instead of
+opening a new TCP+TLS connection each time. All requests get a timeout, and
+429/5xx responses are retried with jittered exponential backoff, honouring the
+Retry-After header when the server sends one.
+
+Configuration (environment variables):
+  - ACDBOT_HTTP_CONNECT_TIMEOUT  seconds to establish a connection (default 10)
+  - ACDBOT_HTTP_READ_TIMEOUT     seconds to wait for response data (default 60)
+  - ACDBOT_HTTP_MAX_RETRIES      retries after the first attempt (default 4)
+  - ACDBOT_HTTP_BACKOFF_BASE     first backoff delay in seconds (default 1)
+  - ACDBOT_HTTP_MAX_RETRY_AFTER  longest Retry-After we are willing to sleep (default 120)
+  - ACDBOT_HTTP_POOL_SIZE        keep-alive connections kept per host (default 10)
+  - ACDBOT_HTTP_HOST_CONCURRENCY requests in flight at once per host, across
+                                 threads (default 4)
+  - ACDBOT_HTTP_HOST_LIMITS      per-host overrides, e.g.
+                                 "api.telegram.org=1,ethereum-magicians.org=2"
+  - ACDBOT_HTTP_MAX_RATE_WAIT    longest a rate-governed request queues in total
+                                 (default 900)
+
+Hosts with a published request rate (e.g. Discourse's per-API-user limit) can
+be given a token-bucket governor with set_host_rate(). Requests to such a host
+then wait for a token instead of running into 429s, and a 429 or an exhausted
+rate-limit header pauses every request to the host until the server's reset
+time, queueing them for up to ACDBOT_HTTP_MAX_RATE_WAIT seconds rather than
+failing. The waiting added is printed when the process exits.
+"""
+import atexit
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = float(os.environ.get("ACDBOT_HTTP_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.environ.get("ACDBOT_HTTP_READ_TIMEOUT", "60"))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+MAX_RETRIES = int(os.environ.get("ACDBOT_HTTP_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.environ.get("ACDBOT_HTTP_BACKOFF_BASE", "1"))
+BACKOFF_MAX = 60.0
+MAX_RETRY_AFTER = float(os.environ.get("ACDBOT_HTTP_MAX_RETRY_AFTER", "120"))
+POOL_SIZE = int(os.environ.get("ACDBOT_HTTP_POOL_SIZE", "10"))
+HOST_CONCURRENCY = int(os.environ.get("ACDBOT_HTTP_HOST_CONCURRENCY", "4"))
+MAX_RATE_WAIT = float(os.environ.get("ACDBOT_HTTP_MAX_RATE_WAIT", "900"))
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Only these are safe to replay after a 5xx or a dropped connection. A POST that
+# hit a 5xx may already have created the topic/post/meeting, so it is only
+# retried on 429, where the server guarantees nothing was done.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_host_slots = {}
+_host_buckets = {}
+
+
+def _parse_host_limits(value):
+    limits = {}
+    for item in (value or "").split(","):
+        host, _, limit = item.partition("=")
+        if host.strip() and limit.strip().isdigit():
+            limits[host.strip().lower()] = max(1, int(limit))
+    return limits
+
+
+HOST_LIMITS = _parse_host_limits(os.environ.get("ACDBOT_HTTP_HOST_LIMITS"))
+
+
+def get_session(url):
+    """Returns the shared requests.Session for the scheme and host of url."""
+    key = _session_key(url)
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            # Retries are handled in request() so they can honour Retry-After
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount(key.split("://", 1)[0] + "://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def host_slot(url):
+    """
+    Returns the semaphore bounding concurrent requests to url's host, so worker
+    threads cannot flood one service. Held while a request is in flight (up to
+    the response headers for stream=True), never during backoff sleeps.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    slot = _host_slots.get(host)
+    if slot is not None:
+        return slot
+    with _sessions_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = threading.BoundedSemaphore(HOST_LIMITS.get(host, HOST_CONCURRENCY))
+            _host_slots[host] = slot
+        return slot
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every thread calling one host: rate tokens per
+    second, up to capacity banked. pause() empties it until a given time.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.waited = 0.0  # seconds callers spent queued
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, sleeping until one is available. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.waited += waited
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                else:
+                    delay = self._paused_until - now
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """No requests for the next seconds (e.g. the server's Retry-After)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                self._updated = until
+                # One request may go at the reset, the rest follow at the rate
+                self._tokens = 1
+
+
+def set_host_rate(host, per_minute, burst=None):
+    """Governs requests to host with a token bucket of per_minute requests (burst banked, default per_minute / 6)."""
+    host = host.lower()
+    with _sessions_lock:
+        if host not in _host_buckets:
+            capacity = burst if burst is not None else max(1.0, per_minute / 6)
+            _host_buckets[host] = TokenBucket(per_minute / 60.0, capacity)
+        return _host_buckets[host]
+
+
+def host_bucket(url):
+    """The rate governor of url's host, or None if it has none."""
+    return _host_buckets.get((urlsplit(url).hostname or "").lower())
+
+
+def rate_limit_waits():
+    """Seconds requests spent queued by each host's governor."""
+    return {host: bucket.waited for host, bucket in _host_buckets.items() if bucket.waited}
+
+
+def parse_rate_limit_reset(response):
+    """
+    Seconds until the server's rate limit resets if a RateLimit-Remaining /
+    X-RateLimit-Remaining header says none are left, else None.
+    """
+    headers = response.headers if response is not None else {}
+    for prefix in ("RateLimit-", "X-RateLimit-"):
+        remaining = headers.get(prefix + "Remaining")
+        if remaining is None:
+            continue
+        try:
+            if float(remaining) > 0:
+                return None
+            reset = float(headers.get(prefix + "Reset", "0"))
+        except ValueError:
+            return None
+        # Either seconds from now or a Unix timestamp
+        if reset > 1e9:
+            reset -= time.time()
+        return max(1.0, reset)
+    return None
+
+
+def close_sessions():
+    """Closes every pooled connection. Mostly useful in tests and long-lived servers."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def parse_retry_after(response):
+    """
+    Returns the delay in seconds requested by a Retry-After header, or None.
+    Handles both the delta-seconds and the HTTP-date forms.
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, base * 2**attempt], capped."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(method, url, timeout=None, max_retries=None, **kwargs):
+    """
+    Sends an HTTP request through the pooled session for url's host.
+    Accepts the same keyword arguments as requests.request and returns the final
+    requests.Response (which may still be an error response once retries run out).
+    """
+    method = method.upper()
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    idempotent = method in IDEMPOTENT_METHODS
+    session = get_session(url)
+    slot = host_slot(url)
+    bucket = host_bucket(url)
+    rate_waited = 0.0
+
+    attempt = 0
+    while True:
+        if bucket is not None:
+            rate_waited += bucket.acquire()
+        try:
+            with slot:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if not idempotent or attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"[DEBUG] {method} {_loggable(url)} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        status = response.status_code
+        if bucket is not None:
+            reset = parse_retry_after(response) if status == 429 else parse_rate_limit_reset(response)
+            if status == 429:
+                reset = max(1.0, reset if reset is not None else backoff_delay(attempt))
+            if reset is not None:
+                # Everyone calling this host waits for the reset, not just us
+                bucket.pause(reset)
+            if status == 429:
+                if rate_waited + reset > MAX_RATE_WAIT:
+                    print(f"[WARN] {method} {_loggable(url)} rate limited for {reset:.0f}s more, giving up after queueing {rate_waited:.0f}s")
+                    return response
+                print(f"[DEBUG] {method} {_loggable(url)} rate limited, queueing for {reset:.1f}s")
+                response.close()
+                continue
+
+        retryable = status in RETRY_STATUS_CODES and (idempotent or status == 429)
+        if not retryable or attempt >= max_retries:
+            return response
+
+        delay = parse_retry_after(response)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        elif delay > MAX_RETRY_AFTER:
+            print(f"[WARN] {method} {_loggable(url)} asked to retry after {delay:.0f}s, giving up instead")
+            return response
+
+        print(f"[DEBUG] {method} {_loggable(url)} returned {status}, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+@atexit.register
+def _report_rate_limit_waits():
+    for host, waited in rate_limit_waits().items():
+        print(f"[INFO] Rate limit governor for {host} added {waited:.1f}s of waiting")
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def _session_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _loggable(url):
+    """Strips the query string and Telegram bot tokens so logs never leak secrets."""
+    parts = urlsplit(url)
+    path = parts.path
+    if parts.netloc == "api.telegram.org" and path.startswith("/bot"):
+        path = "/bot<token>/" + path.split("/", 2)[-1]
+    return f"{parts.scheme}://{parts.netloc}{path}"
@@ -0,0 +1,218 @@
+"""
+Parser for the protocol-call issue templates (.github/ISSUE_TEMPLATE).
+
+handle_issue used to run a separate regex over the whole body for every
+config field, compiling some of them on each call and reading two fields
+twice. parse_issue() reads the body once: a single scan picks up every
+"Label : value" line the templates define and hands each value to the parser
+registered for its label in FIELDS. The date/time and duration, which can
+appear anywhere in free text, are matched with patterns compiled once at
+import. Everything comes back in one IssueConfig, together with
+diagnostics for values that were ignored.
+
+The extract_* functions and parse_issue_for_time() in handle_issue are thin
+wrappers around this module.
+"""
+import re
+from collections import namedtuple
+from datetime import datetime as dt
+
+IssueConfig = namedtuple("IssueConfig", [
+    "is_recurring",          # "Recurring meeting" (default False)
+    "occurrence_rate",       # "Occurrence rate": none, weekly, bi-weekly or monthly (default "none")
+    "call_series",           # "Call series", lower-cased (default None)
+    "need_youtube_streams",  # "Need YouTube stream links" (default False)
+    "already_zoom_meeting",  # "Already a Zoom meeting ID" (default False)
+    "already_on_calendar",   # "Already on Ethereum Calendar" (default False)
+    "display_zoom_link",     # "display zoom link in invite" (default False)
+    "facilitator_emails",    # "Facilitator emails" / "Facilitator email" (default [])
+    "start_time",            # ISO 8601 UTC start, e.g. "2025-01-16T14:00:00Z" (None if missing)
+    "duration",              # minutes (None if missing)
+    "time_error",            # why start_time/duration could not be parsed, or None
+    "diagnostics",           # messages about ignored or conflicting values
+])
+
+# Every labelled config line; the label is matched case-insensitively anywhere on a line
+FIELD_PATTERN = re.compile(
+    r"(?P<label>recurring meeting|occurrence rate|already on ethereum calendar|call series"
+    r"|need youtube stream links|already a zoom meeting id|display zoom link in invite"
+    r"|facilitator emails?)[ \t]*:[ \t]*(?P<value>[^\n]*)",
+    re.IGNORECASE,
+)
+BOOLEAN_VALUE = re.compile(r"(true|false)", re.IGNORECASE)
+OCCURRENCE_RATE_VALUE = re.compile(r"(none|weekly|bi-weekly|monthly)", re.IGNORECASE)
+# Facilitator lines only count at the start of a line, optionally as a list item
+FACILITATOR_PREFIX = re.compile(r"(?:-\s*)?")
+MARKDOWN_EMAIL = re.compile(r"\[([^]]+)\]\(mailto:[^)]+\)")
+PLAIN_EMAIL = re.compile(r"[^@\s]+@[^@\s]+")
+
+# Optional parts are written so that a run of spaces or letters can only be split
+# one way between quantifiers (e.g. "\s*,?\s*" is written "\s*(?:,\s*)?"): a failed
+# match then cannot backtrack quadratically. tests/test_issue_parser_fuzz.py checks this.
+DATE_PATTERN = re.compile(
+    r"""
+    \[?                                        # Optional opening bracket
+    (?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s+)?    # Optional day of the week
+    (?P<month>[A-Za-z]{3,9})\s+               # Full or abbreviated month name
+    (?P<day>\d{1,2}),?\s+                      # Day of the month, comma optional
+    (?P<year>\d{4}),?\s+                       # Year, comma optional
+    (?P<hour>\d{1,2}):(?P<minute>\d{2})        # Start time HH:MM
+    (?:-(?P<end_hour>\d{1,2}):(?P<end_minute>\d{2}))?  # Optional end time HH:MM
+    \s*UTC                                     # UTC timezone
+    \]?                                        # Optional closing bracket
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+# PeerDAS format: "Apr 22 (Tues), 2025, 14:00 UTC"
+ALT_DATE_PATTERN = re.compile(
+    r"""
+    (?P<month>[A-Za-z]{3,9})\s+                # Month name (abbreviated or full)
+    (?P<day>\d{1,2})                           # Day number
+    \s*(?:\([A-Za-z]{3,4}\),?\s*|,\s*)?       # Optional day of week in parentheses, optional comma
+    (?P<year>\d{4}),?\s*                      # Year, optional comma
+    (?P<hour>\d{1,2}):(?P<minute>\d{2})\s*     # Start time HH:MM
+    (?:-\s*(?P<end_hour>\d{1,2}):(?P<end_minute>\d{2})\s*)?  # Optional end time HH:MM
+    UTC                                        # UTC timezone
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+DURATION_PATTERN = re.compile(r"(?i)duration(?:\s*(?:in\s*)?minutes)?[:\s-]*(\d+)\s*(?:minutes|min|m)?\b")
+# Fallback: a list item that is just a number of minutes (e.g. '- 15 minutes')
+DURATION_ITEM_PATTERN = re.compile(r"(?m)^[^\S\n]*-\s*(\d+)\s*(?:minutes|min|m)?\b")
+# Used only to explain a missing date
+DATE_FRAGMENT_PATTERN = re.compile(r"(?<![A-Za-z])[A-Za-z]+\s+\d{1,2}(?:,?\s*\d{4})(?:,?\s*\d{1,2}:\d{2})?")
+TIME_FRAGMENT_PATTERN = re.compile(r"\d{1,2}:\d{2}\s*(?:UTC|GMT|EST|PST|[+-]\d{2}:\d{2})?")
+
+
+def parse_boolean(value):
+    match = BOOLEAN_VALUE.match(value)
+    return match.group(1).lower() == "true" if match else None
+
+
+def parse_occurrence_rate(value):
+    match = OCCURRENCE_RATE_VALUE.match(value)
+    return match.group(1).lower() if match else None
+
+
+def parse_call_series(value):
+    return value.strip().lower() or None
+
+
+def parse_facilitator_list(value):
+    return [email.strip() for email in value.split(",") if email.strip()] or None
+
+
+def parse_facilitator_email(value):
+    match = MARKDOWN_EMAIL.match(value) or PLAIN_EMAIL.match(value)
+    return [match.group(1 if match.re is MARKDOWN_EMAIL else 0).strip()] if match else None
+
+
+# label (lower case) -> (IssueConfig field, value parser). A parser returns None for a value it rejects.
+FIELDS = {
+    "recurring meeting": ("is_recurring", parse_boolean),
+    "occurrence rate": ("occurrence_rate", parse_occurrence_rate),
+    "call series": ("call_series", parse_call_series),
+    "need youtube stream links": ("need_youtube_streams", parse_boolean),
+    "already a zoom meeting id": ("already_zoom_meeting", parse_boolean),
+    "already on ethereum calendar": ("already_on_calendar", parse_boolean),
+    "display zoom link in invite": ("display_zoom_link", parse_boolean),
+    "facilitator emails": ("facilitator_list", parse_facilitator_list),
+    "facilitator email": ("facilitator_emails", parse_facilitator_email),
+}
+
+DEFAULTS = {
+    "is_recurring": False,
+    "occurrence_rate": "none",
+    "call_series": None,
+    "need_youtube_streams": False,
+    "already_zoom_meeting": False,
+    "already_on_calendar": False,
+    "display_zoom_link": False,
+}
+
+
+def parse_issue(issue_body):
+    """Parses every config field of an issue body. Never raises: problems end up in diagnostics."""
+    issue_body = issue_body or ""
+    values = {}
+    diagnostics = []
+    for match in FIELD_PATTERN.finditer(issue_body):
+        label = match.group("label").lower()
+        value = match.group("value").strip()
+        if label.startswith("facilitator"):
+            line_start = issue_body.rfind("\n", 0, match.start()) + 1
+            if not FACILITATOR_PREFIX.fullmatch(issue_body, line_start, match.start()):
+                continue
+        field, parse_value = FIELDS[label]
+        parsed = parse_value(value)
+        if parsed is None:
+            diagnostics.append(f"Ignored {match.group('label')!r} value {value!r}")
+        elif field not in values:
+            # The first valid occurrence of a field wins
+            values[field] = parsed
+        elif values[field] != parsed:
+            diagnostics.append(f"Ignored repeated {match.group('label')!r} value {value!r}, "
+                               f"keeping {values[field]!r}")
+
+    # A "Facilitator emails:" list takes precedence over single "Facilitator email:" lines
+    if "facilitator_list" in values:
+        values["facilitator_emails"] = values.pop("facilitator_list")
+
+    try:
+        start_time, duration = parse_issue_time(issue_body)
+        time_error = None
+    except ValueError as e:
+        start_time = duration = None
+        time_error = str(e)
+        diagnostics.append(time_error)
+
+    # A fresh list per parse, so callers can't share (or mutate) the default
+    values.setdefault("facilitator_emails", [])
+    config = dict(DEFAULTS, **values)
+    return IssueConfig(start_time=start_time, duration=duration, time_error=time_error,
+                       diagnostics=diagnostics, **config)
+
+
+def parse_issue_time(issue_body):
+    """
+    Returns (start_time, duration) from an issue body: an ISO 8601 UTC start and
+    a duration in minutes, taken from a duration line or else from the end time
+    of the date line. Raises ValueError if either is missing.
+    """
+    date_match = DATE_PATTERN.search(issue_body) or ALT_DATE_PATTERN.search(issue_body)
+    if not date_match:
+        date_samples = DATE_FRAGMENT_PATTERN.findall(issue_body)
+        time_samples = TIME_FRAGMENT_PATTERN.findall(issue_body)
+        error_msg = "Missing or invalid date/time format."
+        if date_samples or time_samples:
+            error_msg += f" Found potential date/time fragments: {', '.join(date_samples[:2])} {', '.join(time_samples[:2])}"
+        raise ValueError(error_msg)
+
+    month, day, year = date_match.group('month'), date_match.group('day'), date_match.group('year')
+    start_dt = parse_datetime(month, day, year, date_match.group('hour'), date_match.group('minute'))
+    start_time_utc = start_dt.isoformat() + "Z"
+
+    duration_match = DURATION_PATTERN.search(issue_body) or DURATION_ITEM_PATTERN.search(issue_body)
+    if duration_match:
+        return start_time_utc, int(duration_match.group(1))
+
+    end_hour, end_minute = date_match.group('end_hour'), date_match.group('end_minute')
+    if end_hour and end_minute:
+        end_dt = parse_datetime(month, day, year, end_hour, end_minute, "end time")
+        if end_dt <= start_dt:
+            raise ValueError("End time must be after start time.")
+        return start_time_utc, int((end_dt - start_dt).total_seconds() // 60)
+
+    raise ValueError("Missing or invalid duration format. Provide duration in minutes after the date/time.")
+
+
+def parse_datetime(month, day, year, hour, minute, what="start time"):
+    """datetime from a full or abbreviated month name and the other date parts."""
+    datetime_str = f"{month} {day} {year} {hour}:{minute}"
+    try:
+        return dt.strptime(datetime_str, "%B %d %Y %H:%M")
+    except ValueError:
+        try:
+            return dt.strptime(datetime_str, "%b %d %Y %H:%M")
+        except ValueError as e:
+            raise ValueError(f"Unable to parse the {what}: {e}")
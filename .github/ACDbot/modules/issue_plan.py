@@ -0,0 +1,352 @@
+"""
+What handle_issue will do for an issue, worked out without calling any service.
+
+plan_issue() takes the issue (number, title, body, URL) and the mapping, and
+makes every decision handle_github_issue makes before it touches a service:
+whether the Discourse topic is created, updated or unchanged (from
+discourse_cache), whether the series' Zoom meeting and calendar event are
+reused, what is created or updated on Zoom, YouTube and Google Calendar, who
+is emailed, whether the Telegram message is sent or edited, and how the
+mapping changes. The result is an IssuePlan: a list of PlanSteps (one per
+side effect) plus the decisions themselves, which handle_github_issue then
+carries out.
+
+Planning reads only the mapping and the local caches, so it takes
+milliseconds. It is used for
+
+    python scripts/handle_issue.py --plan --issue_number N --repo R [--body-file F --title T]
+
+which prints the plan and exits (1 if the issue body has errors), and by
+handle_github_issue, which stops early when the plan is empty.
+
+Values that only exist once a step has run (a new topic, meeting or event ID)
+appear in the plan as "<new ...>".
+
+Most issue edits only touch the agenda. Each occurrence stores the
+scheduling_fingerprint of the issue it was last processed from (see
+scheduling_fingerprint()). When an edit leaves the fingerprint unchanged, the
+plan only syncs the Discourse topic body (or does nothing): no Zoom, YouTube,
+calendar, Telegram, mapping or GitHub comment step.
+"""
+import os
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from modules import discourse_cache, issue_parser
+from modules.meeting_store import content_hash, is_valid_topic_id
+
+DISCOURSE_CATEGORY_ID = 63
+NEW_TOPIC = "<new topic>"
+NEW_MEETING = "<new meeting>"
+NEW_EVENT = "<new event>"
+# The IssueConfig fields that decide what happens on Zoom, YouTube, the calendar and the mapping
+SCHEDULING_FIELDS = ("start_time", "duration", "is_recurring", "occurrence_rate", "call_series",
+                     "already_zoom_meeting", "already_on_calendar", "need_youtube_streams",
+                     "display_zoom_link", "facilitator_emails")
+
+# service: discourse, zoom, youtube, gcal, email, telegram or github; action: what is called; detail: for the reader
+PlanStep = namedtuple("PlanStep", ["service", "action", "detail"])
+
+
+class IssuePlan:
+    """The decisions and side effects of processing one issue (see plan_issue)."""
+
+    def __init__(self, issue_number, issue_title, config):
+        self.issue_number = issue_number
+        self.issue_title = issue_title
+        self.config = config
+        self.steps = []
+        self.notes = []              # Why a decision was taken, for the log
+        self.meeting_id = None       # Mapping key the issue is already filed under, if any
+        self.occurrence = None       # Its occurrence, if any
+        self.is_first_run = True
+        self.series_entry = None     # Series entry whose Zoom meeting (or calendar event) can be reused
+        self.reuse_series_meeting = False
+        self.skip_zoom = config.already_zoom_meeting
+        self.skip_gcal = config.already_on_calendar
+        self.topic_id = None         # Valid Discourse topic already recorded for the issue
+        self.fingerprint = None      # scheduling_fingerprint of the issue, None if its time is invalid
+        self.schedule_unchanged = False
+        self.event_base_title = issue_title
+        self.discourse_action = None
+        self.discourse_body = None   # First post of the topic: issue body, link and series stream links
+        self.series_streams = None   # The call series' existing YouTube streams, listed in the topic
+        self.zoom_action = None
+        self.streams_action = None
+        self.gcal_action = None
+        self.telegram_action = None
+        self.email_recipients = []
+        self.mapping_changes = []    # (field, old value, new value)
+
+    @property
+    def errors(self):
+        return [self.config.time_error] if self.config.time_error else []
+
+    @property
+    def is_empty(self):
+        return not self.steps and not self.mapping_changes
+
+    def add_step(self, service, action, detail=""):
+        self.steps.append(PlanStep(service, action, detail))
+
+
+def plan_issue(issue_number, issue_title, issue_body, issue_url, store):
+    """Builds the IssuePlan for an issue against store (a MeetingStore). Makes no network calls."""
+    config = issue_parser.parse_issue(issue_body)
+    plan = IssuePlan(issue_number, issue_title, config)
+    plan.notes.extend(config.diagnostics)
+
+    _plan_series_reuse(plan, store)
+    _plan_existing_occurrence(plan, store)
+    if not config.time_error:
+        plan.fingerprint = scheduling_fingerprint(config, issue_title)
+    if plan.occurrence and plan.fingerprint and plan.occurrence.get("scheduling_fingerprint") == plan.fingerprint:
+        plan.schedule_unchanged = True
+        plan.notes.append("Scheduling fields are unchanged since the last run; only the Discourse topic is synced.")
+        _plan_discourse(plan, store, issue_body, issue_url)
+        plan.zoom_action = plan.streams_action = plan.gcal_action = plan.telegram_action = "unchanged"
+        return plan
+    _plan_discourse(plan, store, issue_body, issue_url)
+    if config.is_recurring and config.call_series:
+        plan.event_base_title = " ".join(word.capitalize() for word in config.call_series.strip().split())
+    meeting_id = _plan_zoom(plan)
+    _plan_streams(plan)
+    event_id = _plan_gcal(plan, store, meeting_id)
+    _plan_notifications(plan, meeting_id)
+    _plan_mapping(plan, store, meeting_id, event_id)
+    if not plan.is_empty:
+        plan.add_step("github", "update_or_create_comment", f"bot comment on issue #{issue_number}")
+    return plan
+
+
+def scheduling_fingerprint(config, issue_title):
+    """
+    Hash of everything in an issue that affects more than its Discourse body:
+    the SCHEDULING_FIELDS of its IssueConfig and the title (the Zoom, calendar
+    and Telegram title of a one-off meeting).
+    """
+    fields = {field: getattr(config, field) for field in SCHEDULING_FIELDS}
+    fields["issue_title"] = issue_title
+    return content_hash(json.dumps(fields, sort_keys=True))
+
+
+def _plan_series_reuse(plan, store):
+    config = plan.config
+    if not (config.is_recurring and config.call_series):
+        return
+    entry = next((entry for _, entry in store.series_entries(config.call_series) if "meeting_id" in entry), None)
+    if not entry:
+        return
+    series_meeting_id = entry.get("meeting_id")
+    is_placeholder = str(series_meeting_id) == "null" or str(series_meeting_id).startswith("placeholder-")
+    if series_meeting_id and not is_placeholder:
+        plan.series_entry = entry
+        if not plan.skip_zoom:
+            plan.notes.append(f"Reusing the Zoom meeting {series_meeting_id} of series '{config.call_series}' "
+                              "although the issue does not say it already has one.")
+        plan.skip_zoom = True
+    elif is_placeholder:
+        plan.notes.append(f"Series '{config.call_series}' only has a placeholder meeting ID "
+                          f"('{series_meeting_id}'), so it is not reused.")
+        plan.series_entry = entry
+
+
+def _plan_existing_occurrence(plan, store):
+    meeting_id, occurrence = store.find_occurrence(plan.issue_number)
+    if not (meeting_id and occurrence):
+        return
+    plan.meeting_id = meeting_id
+    plan.occurrence = occurrence
+    plan.is_first_run = False
+    topic_id = occurrence.get("discourse_topic_id")
+    if topic_id and not str(topic_id).startswith("placeholder"):
+        plan.topic_id = topic_id
+
+
+def stream_links(youtube_streams):
+    """One "- Stream N (date): URL" line per stream, as listed in the topic and the GitHub comment."""
+    lines = []
+    for i, stream in enumerate(youtube_streams or [], 1):
+        stream_date = ""
+        scheduled_time = stream.get("scheduled_time")
+        if scheduled_time:
+            try:
+                date_obj = datetime.fromisoformat(scheduled_time.replace("Z", "+00:00"))
+                stream_date = f" ({date_obj.strftime('%b %d, %Y')})"
+            except ValueError as e:
+                print(f"[DEBUG] Error formatting stream date: {e}")
+        lines.append(f"- Stream {i}{stream_date}: {stream.get('stream_url')}")
+    return lines
+
+
+def discourse_body(issue_body, issue_url, series_streams=None, occurrence_streams=None):
+    """
+    The topic's first post: the issue body, a link back to the issue, the
+    series' existing stream links and the occurrence's own. Built whole so one
+    update sends it and the body hash discourse_cache keeps matches what the
+    next edit produces.
+    """
+    body = f"{issue_body}\n\n[GitHub Issue]({issue_url})"
+    if series_streams:
+        body += "\n\n**Existing YouTube Stream Links:**\n" + "\n".join(stream_links(series_streams))
+    if occurrence_streams:
+        body += "\n\n**YouTube Stream Links:**\n" + "\n".join(stream_links(occurrence_streams))
+    return body
+
+
+def _plan_discourse(plan, store, issue_body, issue_url):
+    if plan.config.call_series:
+        plan.series_streams = next((entry["youtube_streams"] for _, entry in store.series_entries(plan.config.call_series)
+                                    if "youtube_streams" in entry), None)
+    occurrence_streams = plan.occurrence.get("youtube_streams") if plan.occurrence else None
+    body = plan.discourse_body = discourse_body(issue_body, issue_url, plan.series_streams, occurrence_streams)
+    if plan.topic_id:
+        cached = discourse_cache.get_topic(plan.topic_id)
+        changed = discourse_cache.changed_parts(cached, title=plan.issue_title, body=body,
+                                                category_id=DISCOURSE_CATEGORY_ID)
+        if changed:
+            plan.discourse_action = "update"
+            plan.add_step("discourse", "update_topic", f"topic {plan.topic_id}: {', '.join(changed)}")
+        else:
+            plan.discourse_action = "unchanged"
+    else:
+        plan.discourse_action = "create"
+        plan.add_step("discourse", "create_topic", repr(plan.issue_title))
+
+
+def _plan_zoom(plan):
+    """Decides the Zoom action and returns the mapping key the occurrence will be filed under."""
+    config = plan.config
+    if config.time_error:
+        plan.zoom_action = "time_error"
+        plan.notes.append(config.time_error)
+        return f"placeholder-time-error-{plan.issue_number}"
+    if plan.skip_zoom:
+        if plan.series_entry:
+            plan.reuse_series_meeting = True
+            plan.zoom_action = "reuse_series"
+            return str(plan.series_entry["meeting_id"])
+        plan.zoom_action = "skipped_issue"
+        return f"placeholder-skipped-{plan.issue_number}"
+    if plan.meeting_id:
+        if str(plan.meeting_id).startswith("placeholder-"):
+            plan.zoom_action = "skipped_placeholder"
+        else:
+            plan.zoom_action = "update"
+            plan.add_step("zoom", "update_meeting",
+                          f"{plan.meeting_id}: {config.start_time}, {config.duration} min, {plan.event_base_title!r}")
+        return str(plan.meeting_id)
+    recurring = config.is_recurring and config.occurrence_rate != "none"
+    plan.zoom_action = "create_recurring" if recurring else "create"
+    plan.add_step("zoom", "create_recurring_meeting" if recurring else "create_meeting",
+                  f"{plan.event_base_title!r}: {config.start_time}, {config.duration} min"
+                  + (f", {config.occurrence_rate}" if recurring else ""))
+    return NEW_MEETING
+
+
+def _plan_streams(plan):
+    config = plan.config
+    if plan.reuse_series_meeting and "youtube_streams" in plan.series_entry:
+        plan.streams_action = "reuse_series"
+    elif config.is_recurring and config.occurrence_rate != "none" and config.need_youtube_streams:
+        if not plan.is_first_run and plan.occurrence and plan.occurrence.get("youtube_streams"):
+            plan.streams_action = "reuse_occurrence"
+        else:
+            plan.streams_action = "create"
+            plan.add_step("youtube", "create_recurring_streams", f"1 stream at {config.start_time}")
+            plan.add_step("discourse", "update_topic", "add the stream links to the topic")
+    else:
+        plan.streams_action = "none"
+
+
+def _plan_gcal(plan, store, meeting_id):
+    """Decides the calendar action and returns the event ID the series will record."""
+    config = plan.config
+    recurring = config.is_recurring and config.occurrence_rate != "none"
+    if plan.skip_gcal:
+        if plan.reuse_series_meeting and plan.series_entry.get("calendar_event_id"):
+            plan.gcal_action = "reuse_series"
+            return plan.series_entry["calendar_event_id"]
+        plan.gcal_action = "skipped"
+        return None
+    series = store.get_series(meeting_id) or {}
+    event_id = series.get("calendar_event_id")
+    if event_id:
+        plan.gcal_action = "update_recurring" if recurring else "update"
+        plan.add_step("gcal", "update_recurring_event" if recurring else "update_event",
+                      f"{event_id}: {config.start_time}, {config.duration} min")
+        return event_id
+    if config.start_time and config.duration:
+        plan.gcal_action = "create_recurring" if recurring else "create"
+        plan.add_step("gcal", "create_recurring_event" if recurring else "create_event",
+                      f"{plan.event_base_title!r}: {config.start_time}, {config.duration} min")
+        return NEW_EVENT
+    plan.gcal_action = "skipped_no_time"
+    return None
+
+
+def _plan_notifications(plan, meeting_id):
+    zoom_id_valid = not str(meeting_id).startswith("placeholder-")
+    facilitators = plan.config.facilitator_emails
+    if facilitators and plan.is_first_run and zoom_id_valid:
+        plan.email_recipients = list(facilitators)
+        plan.add_step("email", "send_email", ", ".join(facilitators))
+
+    if os.environ.get("TELEGRAM_CHAT_ID"):
+        message_id = (plan.occurrence or {}).get("telegram_message_id")
+        if message_id:
+            plan.telegram_action = "update"
+            plan.add_step("telegram", "update_message", str(message_id))
+        else:
+            plan.telegram_action = "send"
+            plan.add_step("telegram", "send_message", f"issue #{plan.issue_number}")
+    else:
+        plan.telegram_action = "not_configured"
+
+
+def _plan_mapping(plan, store, meeting_id, event_id):
+    config = plan.config
+    occurrence = plan.occurrence or {}
+    new_values = {
+        "issue_title": plan.issue_title,
+        "discourse_topic_id": plan.topic_id or (occurrence.get("discourse_topic_id")
+                                                if is_valid_topic_id(occurrence.get("discourse_topic_id"))
+                                                else NEW_TOPIC),
+        "start_time": config.start_time,
+        "duration": config.duration,
+    }
+    if plan.occurrence is None:
+        plan.mapping_changes.append((f"{meeting_id}.occurrences", None, f"add issue #{plan.issue_number}"))
+    for field, value in new_values.items():
+        if occurrence.get(field) != value:
+            plan.mapping_changes.append((f"{meeting_id}.occurrences[#{plan.issue_number}].{field}",
+                                         occurrence.get(field), value))
+    series = store.get_series(meeting_id) or {}
+    if config.call_series and "call_series" not in series:
+        plan.mapping_changes.append((f"{meeting_id}.call_series", None, config.call_series))
+    if event_id and series.get("calendar_event_id") != event_id:
+        plan.mapping_changes.append((f"{meeting_id}.calendar_event_id", series.get("calendar_event_id"), event_id))
+
+
+def format_plan(plan):
+    """The plan as text for the log or the --plan output."""
+    config = plan.config
+    lines = [f"Plan for issue #{plan.issue_number}: {plan.issue_title}"]
+    lines.append(f"  Parsed: start={config.start_time} duration={config.duration} recurring={config.is_recurring} "
+                 f"rate={config.occurrence_rate} series={config.call_series} streams={config.need_youtube_streams}")
+    lines.append(f"  Decisions: discourse={plan.discourse_action} zoom={plan.zoom_action} "
+                 f"streams={plan.streams_action} gcal={plan.gcal_action} telegram={plan.telegram_action} "
+                 f"first_run={plan.is_first_run}")
+    for error in plan.errors:
+        lines.append(f"  Error: {error}")
+    for note in plan.notes:
+        if note not in plan.errors:
+            lines.append(f"  Note: {note}")
+    if plan.is_empty:
+        lines.append("  Nothing to do.")
+    for step in plan.steps:
+        lines.append(f"  - {step.service}.{step.action}" + (f": {step.detail}" if step.detail else ""))
+    for field, old, new in plan.mapping_changes:
+        lines.append(f"  mapping {field}: {old!r} -> {new!r}")
+    return "\n".join(lines)
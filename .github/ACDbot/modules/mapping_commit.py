@@ -0,0 +1,279 @@
+"""
+Coalesced commits of meeting_topic_mapping.json back to the repository.
+
+Scripts call request_commit() whenever they change the mapping instead of
+committing straight away (and request_file_commit() for the small JSON state
+files some scripts keep next to it). All requests made during a run, mapping
+and state files alike, end up in a single commit, pushed by flush_commits() at
+the end of main() (and at interpreter exit as a backstop). Long runs also commit once the oldest pending change is older
+than ACDBOT_COMMIT_MAX_DELAY seconds (default 600), checked on each request
+made from the main thread. Requests from worker threads (the upload queue, the
+recording poll pool) only mark their files pending, so a commit never runs
+inside a worker; the main thread's next request or final flush picks them up.
+
+The mapping and every pending state file go into one commit through the Git
+Data API (one tree, one commit, then a fast-forward of the branch ref), rather
+than a Contents API commit per file. Before committing, the remote blob SHA is
+compared with the SHA of the content this run started from (the base). If
+another run committed in between, our changes are three-way merged onto the
+remote version (modules/mapping_merge.py) instead of overwriting it. A 409/422
+from a ref update racing ours re-fetches the head and merges again.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+
+from github import Github, GithubException, InputGitAuthor, InputGitTreeElement
+
+from modules import mapping_merge
+from modules.meeting_store import (
+    MAPPING_FILE, get_store, save_meeting_topic_mapping, serialize_mapping, write_json_atomic
+)
+
+COMMIT_MAX_DELAY = float(os.environ.get("ACDBOT_COMMIT_MAX_DELAY", "600"))
+COMMIT_MAX_ATTEMPTS = int(os.environ.get("ACDBOT_COMMIT_MAX_ATTEMPTS", "3"))
+DEFAULT_COMMIT_MESSAGE = "Update meeting-topic mapping"
+CONFLICT_STATUS_CODES = {409, 422}
+
+_lock = threading.RLock()
+_pending_since = None
+_pending_reasons = []
+_mapping_pending = False
+# Small JSON state files committed alongside the mapping: path -> merge(remote, local)
+_pending_files = {}
+_atexit_registered = False
+
+
+def git_blob_sha(content: bytes) -> str:
+    """The SHA git (and the Contents API) assigns to a file with this content."""
+    header = f"blob {len(content)}\0".encode("utf-8")
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def request_commit(reason=None):
+    """
+    Marks the mapping as changed and schedules it for the run's commit.
+    Commits immediately only when the oldest pending change exceeds COMMIT_MAX_DELAY.
+    """
+    global _mapping_pending
+    with _lock:
+        get_store().mark_dirty()
+        _mapping_pending = True
+        _schedule(reason)
+    _flush_if_overdue()
+
+
+def request_file_commit(path, reason=None, merge=None):
+    """
+    Schedules a JSON state file (already written locally) for the run's commit.
+    merge(remote, local) returns the content to commit when the remote file
+    differs from ours; without it our version wins.
+    """
+    with _lock:
+        _pending_files[path] = merge
+        _schedule(reason)
+    _flush_if_overdue()
+
+
+def has_pending_commit():
+    return _pending_since is not None
+
+
+def flush_commits():
+    """
+    Commits all pending mapping changes and pending state files together in one
+    commit. Returns True if anything was committed, False if there was nothing
+    to commit. Raises on failure, leaving the changes pending.
+    """
+    global _pending_since, _mapping_pending
+    with _lock:
+        if _pending_since is None:
+            return False
+        message = DEFAULT_COMMIT_MESSAGE
+        if _pending_reasons:
+            message += "\n\n" + "\n".join(f"- {reason}" for reason in _pending_reasons)
+        committed = commit_files(message, include_mapping=_mapping_pending, state_files=dict(_pending_files))
+        _mapping_pending = False
+        _pending_files.clear()
+        _pending_since = None
+        _pending_reasons.clear()
+        return committed
+
+
+def _schedule(reason):
+    global _pending_since, _atexit_registered
+    if _pending_since is None:
+        _pending_since = time.monotonic()
+    if reason and reason not in _pending_reasons:
+        _pending_reasons.append(reason)
+    if not _atexit_registered:
+        atexit.register(_flush_at_exit)
+        _atexit_registered = True
+
+
+def _flush_if_overdue():
+    if threading.current_thread() is not threading.main_thread():
+        return
+    with _lock:
+        overdue = _pending_since is not None and time.monotonic() - _pending_since >= COMMIT_MAX_DELAY
+    if overdue:
+        print(f"[DEBUG] Pending mapping changes are older than {COMMIT_MAX_DELAY:.0f}s, committing now.")
+        flush_commits()
+
+
+def commit_files(message=DEFAULT_COMMIT_MESSAGE, include_mapping=True, state_files=None):
+    """
+    Commits the shared mapping (written to disk first) and the given state files
+    (path -> merge function) in a single commit through the Git Data API: one
+    tree holding every changed file, one commit on top of the branch head, then
+    a fast-forward of the branch ref. The mapping is three-way merged with
+    concurrent remote changes, and state files with their merge function.
+    Files whose remote copy already has our content are left out; returns False
+    without committing when none changed.
+    """
+    state_files = state_files or {}
+    store = get_store() if include_mapping else None
+    if include_mapping:
+        save_meeting_topic_mapping()
+    repo = _get_repo()
+    branch = os.environ.get("GITHUB_REF_NAME", "main")
+    author = InputGitAuthor(
+        name="GitHub Actions Bot",
+        email="actions@github.com"
+    )
+
+    for attempt in range(1, COMMIT_MAX_ATTEMPTS + 1):
+        ref = repo.get_git_ref(f"heads/{branch}")
+        head = repo.get_git_commit(ref.object.sha)
+        changes = {}
+        if include_mapping:
+            mapping_content = _mapping_change(repo, store, head.sha)
+            if mapping_content is not None:
+                changes[MAPPING_FILE] = mapping_content
+        for path, merge in state_files.items():
+            content = _state_file_change(repo, path, merge, head.sha)
+            if content is not None:
+                changes[path] = content
+
+        if not changes:
+            print("[DEBUG] Remote files already match local content, nothing to commit.")
+            if include_mapping:
+                store.base_text = _read_local()
+            return False
+
+        tree = repo.create_git_tree(
+            [InputGitTreeElement(path, "100644", "blob", content=content) for path, content in changes.items()],
+            head.tree,
+        )
+        commit = repo.create_git_commit(message, tree, [head], author=author)
+        try:
+            ref.edit(commit.sha)
+        except GithubException as e:
+            if e.status not in CONFLICT_STATUS_CODES or attempt == COMMIT_MAX_ATTEMPTS:
+                raise
+            print(f"[WARN] {branch} moved while committing (HTTP {e.status}), merging and retrying (attempt {attempt}/{COMMIT_MAX_ATTEMPTS}).")
+            continue
+
+        if include_mapping:
+            store.base_text = _read_local()
+        print(f"Committed {', '.join(changes)} to the repository. Commit SHA: {commit.sha}")
+        return True
+
+    return False
+
+
+def _mapping_change(repo, store, ref):
+    """The mapping content to commit at ref, merged with remote changes; None if the remote already has it."""
+    contents = _get_remote_contents(repo, MAPPING_FILE, ref)
+    if contents is None:
+        print(f"Creating new file {MAPPING_FILE} as it doesn't exist in repo")
+        return _read_local()
+
+    base_sha = git_blob_sha(store.base_text.encode("utf-8")) if store.base_text is not None else None
+    if contents.sha != base_sha:
+        print(f"[DEBUG] Remote {MAPPING_FILE} changed since this run loaded it ({base_sha} -> {contents.sha}), merging.")
+        _merge_remote(repo, contents, store)
+
+    local_content = _read_local()
+    if contents.sha == git_blob_sha(local_content.encode("utf-8")):
+        return None
+    return local_content
+
+
+def _state_file_change(repo, path, merge, ref):
+    """A state file's content to commit at ref, merged with the remote copy; None if the remote already has it."""
+    with open(path, "r") as f:
+        local_content = f.read()
+    contents = _get_remote_contents(repo, path, ref)
+    if contents is None:
+        return local_content
+    if contents.sha == git_blob_sha(local_content.encode("utf-8")):
+        return None
+    if merge is not None:
+        remote = json.loads(contents.decoded_content.decode("utf-8"))
+        local_content = serialize_mapping(merge(remote, json.loads(local_content)))
+        write_json_atomic(path, None, text=local_content)
+        if contents.sha == git_blob_sha(local_content.encode("utf-8")):
+            return None
+    return local_content
+
+
+def _get_remote_contents(repo, path, ref):
+    try:
+        return repo.get_contents(path, ref=ref)
+    except GithubException as e:
+        if e.status != 404:
+            raise
+        return None
+
+
+def _merge_remote(repo, contents, store):
+    """Three-way merges our changes onto the remote mapping; the remote becomes the new base."""
+    remote_text = contents.decoded_content.decode("utf-8")
+    remote = json.loads(remote_text)
+    base = _load_base(repo, store)
+
+    merged, conflicts = mapping_merge.merge(base, store.mapping, remote)
+    for conflict in conflicts:
+        print(f"[WARN] Mapping merge conflict: {conflict}")
+
+    store.replace(merged)
+    save_meeting_topic_mapping()
+    store.base_text = remote_text
+
+
+def _load_base(repo, store):
+    """The mapping this run started from, fetched by commit SHA if it was not loaded from disk."""
+    if store.base_text is not None:
+        return json.loads(store.base_text)
+    base_ref = os.environ.get("GITHUB_SHA")
+    if base_ref:
+        try:
+            base_contents = repo.get_contents(MAPPING_FILE, ref=base_ref)
+            return json.loads(base_contents.decoded_content.decode("utf-8"))
+        except GithubException as e:
+            print(f"[WARN] Could not fetch base mapping at {base_ref}: {e}")
+    # Without a common ancestor every difference counts as changed on both sides
+    return {}
+
+
+def _read_local():
+    with open(MAPPING_FILE, "r") as f:
+        return f.read()
+
+
+def _get_repo():
+    g = Github(os.environ["GITHUB_TOKEN"])
+    return g.get_repo(os.environ["GITHUB_REPOSITORY"])
+
+
+def _flush_at_exit():
+    if not has_pending_commit():
+        return
+    try:
+        flush_commits()
+    except Exception as e:
+        print(f"::error::Failed to commit pending mapping changes at exit: {e}")
@@ -0,0 +1,160 @@
+"""
+Three-way merge of meeting_topic_mapping.json versions.
+
+handle_issue, poll_zoom_recordings and upload_zoom_recording can run at the same
+time, each starting from the mapping in its checkout (the base). When our commit
+finds that the remote file moved on, merge() replays our changes (base -> local)
+on top of the remote version:
+
+  - series are matched by meeting_id, occurrences by issue_number
+  - a field changed on only one side takes that side's value
+  - a field changed on both sides to different values is resolved per type:
+      bool  -> True if either side set it (processed / posted flags)
+      int   -> the larger value (attempt counters)
+      list  -> remote items followed by our new items (notifications, streams)
+      dict  -> merged recursively
+      other -> our value, reported as a conflict
+  - deleting something the other side modified keeps the modified version
+"""
+from typing import Dict, List, Tuple
+
+_MISSING = object()
+
+
+def merge(base: Dict, local: Dict, remote: Dict) -> Tuple[Dict, List[str]]:
+    """Returns (merged mapping, list of human-readable conflict descriptions)."""
+    conflicts = []
+    merged = {}
+    for meeting_id in _ordered_keys(remote, local):
+        value = _merge_series(
+            base.get(meeting_id, _MISSING),
+            local.get(meeting_id, _MISSING),
+            remote.get(meeting_id, _MISSING),
+            f"{meeting_id}",
+            conflicts,
+        )
+        if value is not _MISSING:
+            merged[meeting_id] = value
+    return merged, conflicts
+
+
+def _merge_series(base, local, remote, path, conflicts):
+    if local == base:
+        return remote
+    if remote == base:
+        return local
+    if local is _MISSING or remote is _MISSING:
+        # Deleted on one side, modified on the other: keep the modification
+        return remote if local is _MISSING else local
+    if not (isinstance(local, dict) and isinstance(remote, dict)):
+        conflicts.append(f"{path}: both sides replaced the entry, keeping ours")
+        return local
+
+    base = base if isinstance(base, dict) else {}
+    merged = _merge_dict(
+        {k: v for k, v in base.items() if k != "occurrences"},
+        {k: v for k, v in local.items() if k != "occurrences"},
+        {k: v for k, v in remote.items() if k != "occurrences"},
+        path,
+        conflicts,
+    )
+    if "occurrences" in local or "occurrences" in remote:
+        merged["occurrences"] = _merge_occurrences(
+            base.get("occurrences") or [],
+            local.get("occurrences") or [],
+            remote.get("occurrences") or [],
+            path,
+            conflicts,
+        )
+    return merged
+
+
+def _merge_occurrences(base, local, remote, path, conflicts):
+    base_by_issue = _by_issue(base)
+    local_by_issue = _by_issue(local)
+    remote_by_issue = _by_issue(remote)
+
+    merged = []
+    for issue in _ordered_keys(remote_by_issue, local_by_issue):
+        value = _merge_value(
+            base_by_issue.get(issue, _MISSING),
+            local_by_issue.get(issue, _MISSING),
+            remote_by_issue.get(issue, _MISSING),
+            f"{path}/#{issue}",
+            conflicts,
+        )
+        if value is not _MISSING:
+            merged.append(value)
+
+    # Occurrences without an issue number cannot be matched; keep both sides' copies
+    for occurrence in remote + local:
+        if _issue_of(occurrence) is None and occurrence not in merged:
+            merged.append(occurrence)
+    return merged
+
+
+def _merge_dict(base, local, remote, path, conflicts):
+    merged = {}
+    for key in _ordered_keys(remote, local):
+        value = _merge_value(
+            base.get(key, _MISSING),
+            local.get(key, _MISSING),
+            remote.get(key, _MISSING),
+            f"{path}.{key}",
+            conflicts,
+        )
+        if value is not _MISSING:
+            merged[key] = value
+    return merged
+
+
+def _merge_value(base, local, remote, path, conflicts):
+    if local == remote:
+        return local
+    if local == base:
+        return remote
+    if remote == base:
+        return local
+    if local is _MISSING or remote is _MISSING:
+        return remote if local is _MISSING else local
+
+    if isinstance(local, bool) and isinstance(remote, bool):
+        return local or remote
+    if _is_int(local) and _is_int(remote):
+        return max(local, remote)
+    if isinstance(local, list) and isinstance(remote, list):
+        return remote + [item for item in local if item not in remote]
+    if isinstance(local, dict) and isinstance(remote, dict):
+        return _merge_dict(base if isinstance(base, dict) else {}, local, remote, path, conflicts)
+
+    conflicts.append(f"{path}: ours={local!r} theirs={remote!r}, keeping ours")
+    return local
+
+
+def _ordered_keys(first, second):
+    """Keys of first in order, then keys only in second."""
+    keys = list(first.keys())
+    keys.extend(k for k in second.keys() if k not in first)
+    return keys
+
+
+def _by_issue(occurrences):
+    result = {}
+    for occurrence in occurrences:
+        issue = _issue_of(occurrence)
+        if issue is not None and issue not in result:
+            result[issue] = occurrence
+    return result
+
+
+def _issue_of(occurrence):
+    if not isinstance(occurrence, dict):
+        return None
+    try:
+        return int(occurrence.get("issue_number"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,183 @@
+"""
+Streaming media source for YouTube resumable uploads.
+
+StreamingMediaUpload feeds videos().insert() straight from an iterator of byte
+chunks (e.g. a Zoom download's iter_content()) instead of a file on disk. A
+background thread pulls the download into a bounded buffer while the upload
+sends the chunks already received, so both transfers overlap and at most
+ACDBOT_YOUTUBE_STREAM_BUFFER_MB of the recording is held in memory.
+
+The resumable protocol only ever re-sends from the start of the chunk being
+uploaded (after a retry or a partial acknowledgement), so everything before it
+is dropped as soon as the next chunk is requested.
+
+Configuration (environment variables):
+  - ACDBOT_YOUTUBE_CHUNK_MB          size of each upload request (default 8, rounded
+                                     to a multiple of 256 KiB as YouTube requires)
+  - ACDBOT_YOUTUBE_STREAM_BUFFER_MB  download read-ahead kept in memory (default 32)
+"""
+import collections
+import os
+import threading
+
+from googleapiclient.http import MediaUpload
+
+MIB = 1024 * 1024
+# Resumable upload chunks must be a multiple of 256 KiB (except the last one)
+CHUNK_GRANULARITY = 256 * 1024
+CHUNK_SIZE = max(CHUNK_GRANULARITY,
+                 int(float(os.environ.get("ACDBOT_YOUTUBE_CHUNK_MB", "8")) * MIB)
+                 // CHUNK_GRANULARITY * CHUNK_GRANULARITY)
+BUFFER_SIZE = int(float(os.environ.get("ACDBOT_YOUTUBE_STREAM_BUFFER_MB", "32")) * MIB)
+
+
+class StreamClosedError(Exception):
+    """Raised when bytes are requested from a stream that was closed or already discarded."""
+
+
+class ChunkBuffer:
+    """
+    Thread-safe byte window between one producer and one consumer.
+
+    put() blocks while more than max_size bytes are buffered; read() blocks
+    until the requested range has arrived (or the producer finished) and drops
+    everything before the range it was asked for.
+    """
+
+    def __init__(self, max_size=BUFFER_SIZE, start=0):
+        self.max_size = max_size
+        self._pieces = collections.deque()
+        self._start = start  # stream offset of the first buffered byte
+        self._end = start    # stream offset just past the last buffered byte
+        self._finished = False
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+
+    def put(self, data):
+        """Appends data, waiting for room. Returns False once the consumer has closed the buffer."""
+        with self._cond:
+            while not self._closed and self._end - self._start >= self.max_size:
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._pieces.append(bytes(data))
+            self._end += len(data)
+            self._cond.notify_all()
+            return True
+
+    def finish(self, error=None):
+        """Marks the end of the stream, optionally with the error that ended it."""
+        with self._cond:
+            self._finished = True
+            self._error = error
+            self._cond.notify_all()
+
+    def close(self):
+        """Releases the buffered data and unblocks the producer."""
+        with self._cond:
+            self._closed = True
+            self._pieces.clear()
+            self._start = self._end
+            self._cond.notify_all()
+
+    def read(self, begin, length):
+        """
+        Returns up to length bytes starting at stream offset begin. A short
+        result means the stream ended. Offsets before begin are discarded.
+        """
+        with self._cond:
+            if self._closed:
+                raise StreamClosedError("Stream was closed")
+            if begin < self._start:
+                raise StreamClosedError(f"Offset {begin} was already discarded (window starts at {self._start})")
+            self._discard_before(begin)
+            while self._end < begin + length and not self._finished and not self._closed:
+                self._cond.wait()
+                # begin may be further ahead than the window holds (resuming
+                # past the start of the stream), so keep making room
+                self._discard_before(begin)
+            if self._error is not None and self._end < begin + length:
+                raise self._error
+            if self._closed:
+                raise StreamClosedError("Stream was closed")
+            return self._slice(begin, length)
+
+    def _discard_before(self, offset):
+        while self._pieces and self._start + len(self._pieces[0]) <= offset:
+            self._start += len(self._pieces.popleft())
+        if self._pieces and self._start < offset:
+            self._pieces[0] = self._pieces[0][offset - self._start:]
+            self._start = offset
+        self._cond.notify_all()
+
+    def _slice(self, begin, length):
+        out = bytearray()
+        position = self._start
+        for piece in self._pieces:
+            if len(out) >= length:
+                break
+            piece_end = position + len(piece)
+            if piece_end > begin:
+                out += piece[max(0, begin - position):]
+            position = piece_end
+        return bytes(out[:length])
+
+
+class StreamingMediaUpload(MediaUpload):
+    """
+    Resumable MediaUpload reading from an iterator of byte chunks.
+
+    size is the total length if known (e.g. the download's Content-Length);
+    when None the upload is sent with an unknown length and finalised on the
+    first short chunk. start is the stream offset of the first chunk, for
+    resuming an upload with a download that skips what was already sent.
+    Call close() when done so the reader thread stops.
+    """
+
+    def __init__(self, chunks, size=None, mimetype="video/mp4", chunksize=CHUNK_SIZE,
+                 buffer_size=BUFFER_SIZE, start=0):
+        super().__init__()
+        self._size = size
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        # The whole chunk being uploaded must fit in the window
+        self._buffer = ChunkBuffer(max(buffer_size, chunksize), start=start)
+        self._reader = threading.Thread(target=self._fill, args=(chunks,), daemon=True)
+        self._reader.start()
+
+    def _fill(self, chunks):
+        try:
+            for chunk in chunks:
+                if chunk and not self._buffer.put(chunk):
+                    return
+        except Exception as e:
+            self._buffer.finish(e)
+        else:
+            self._buffer.finish()
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._size
+
+    def resumable(self):
+        return True
+
+    def getbytes(self, begin, length):
+        return self._buffer.read(begin, length)
+
+    def has_stream(self):
+        # Served through getbytes(): the stream() path needs a seekable file
+        return False
+
+    def close(self):
+        self._buffer.close()
+        self._reader.join(timeout=5)
+
+    def to_json(self):
+        raise NotImplementedError("Streaming uploads cannot be serialized")
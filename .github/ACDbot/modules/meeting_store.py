@@ -0,0 +1,453 @@
+"""
+Indexed in-memory model of meeting_topic_mapping.json.
+
+The mapping is keyed by Zoom meeting ID. Each entry describes a meeting series and
+holds an "occurrences" list with one dict per GitHub issue. Older entries keep the
+occurrence fields (issue_number, start_time, ...) directly on the series entry;
+the store treats such a legacy entry as its own single occurrence.
+
+MeetingStore wraps the mapping dict itself (store.mapping), so code that updates
+non-indexed occurrence fields in place keeps working. Changes to indexed fields
+(issue_number, call_series, discourse_topic_id, start_time) must go through
+upsert_series/upsert_occurrence, or be followed by reindex(meeting_id).
+
+This module is also the single persistence layer for the mapping file. Each
+process shares one store (get_store / load_meeting_topic_mapping). Mutations
+only mark it dirty; the file is written when a caller needs it on disk
+(save_meeting_topic_mapping, e.g. right before committing) and once more at
+exit. Writes go to a temp file that is renamed over the mapping, so a
+cancelled run never leaves a torn file, and are skipped entirely when the
+serialized content hash is unchanged.
+"""
+import atexit
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+MAPPING_FILE = ".github/ACDbot/meeting_topic_mapping.json"
+
+Occurrence = Dict
+SeriesEntry = Dict
+OccurrenceMatch = Tuple[Optional[str], Optional[Occurrence]]
+
+
+def iter_occurrences(entry: SeriesEntry) -> Iterator[Occurrence]:
+    """Yields the occurrence dicts of a series entry (the entry itself for legacy entries)."""
+    if not isinstance(entry, dict):
+        return
+    occurrences = entry.get("occurrences")
+    if isinstance(occurrences, list):
+        for occurrence in occurrences:
+            if isinstance(occurrence, dict):
+                yield occurrence
+    elif entry.get("issue_number") is not None:
+        yield entry
+
+
+def is_valid_topic_id(topic_id) -> bool:
+    """Discourse topic IDs are ints; failed creations leave 'placeholder-...' strings behind."""
+    return bool(topic_id) and not str(topic_id).startswith("placeholder")
+
+
+def parse_start_time(value) -> Optional[datetime]:
+    """Parses an ISO 8601 start_time ('2025-04-24T14:00:00Z') into an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def serialize_mapping(data) -> str:
+    """The on-disk JSON format of the mapping and the bot's other state files."""
+    return json.dumps(data, indent=2)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_json_atomic(path: str, data, text: Optional[str] = None):
+    """Writes data as JSON to path via a temp file in the same directory and os.replace."""
+    if text is None:
+        text = serialize_mapping(data)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _issue_key(issue_number) -> Optional[int]:
+    try:
+        return int(issue_number)
+    except (TypeError, ValueError):
+        return None
+
+
+class MeetingStore:
+    """
+    Lookup indexes over the meeting mapping:
+      - issue number -> (meeting_id, occurrence)                      O(1)
+      - call_series -> occurrences sorted by issue number             O(log n) insert
+      - Discourse topic id -> occurrences                             O(1)
+      - occurrence start time -> occurrences, sorted                  O(log n) range lookup
+    """
+
+    def __init__(self, mapping: Optional[Dict[str, SeriesEntry]] = None, path: Optional[str] = None):
+        self.mapping = mapping if mapping is not None else {}
+        self.path = path
+        self.dirty = False
+        # File content the mapping was loaded from (or last committed as): the
+        # common ancestor for merging with concurrent writers
+        self.base_text = None
+        # Hash of the content last read from or written to path; None means "unknown"
+        self._saved_hash = content_hash(serialize_mapping(self.mapping)) if path else None
+        self.reindex()
+
+    @classmethod
+    def load(cls, path: str = MAPPING_FILE) -> "MeetingStore":
+        mapping = {}
+        text = None
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                text = f.read()
+            try:
+                mapping = json.loads(text)
+            except json.JSONDecodeError:
+                print(f"::error::Failed to decode JSON from {path}. Returning empty mapping.")
+                text = None
+        store = cls(mapping, path=path)
+        store.base_text = text
+        return store
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def mark_dirty(self):
+        """Records that the mapping changed; the change is written on the next flush."""
+        self.dirty = True
+
+    def replace(self, mapping: Dict[str, SeriesEntry]):
+        """Swaps in a new mapping dict (e.g. a filtered copy) and rebuilds the indexes."""
+        if mapping is not self.mapping:
+            self.mapping = mapping
+            self.reindex()
+        self.dirty = True
+
+    def flush(self, path: Optional[str] = None) -> bool:
+        """
+        Writes the mapping if it is dirty and its content differs from what is on disk.
+        Returns True when the file was written.
+        """
+        path = path or self.path or MAPPING_FILE
+        if not self.dirty and path == self.path:
+            return False
+        text = serialize_mapping(self.mapping)
+        new_hash = content_hash(text)
+        if path == self.path and new_hash == self._saved_hash:
+            print(f"[DEBUG] Mapping content unchanged, skipping write to {path}")
+            self.dirty = False
+            return False
+        write_json_atomic(path, self.mapping, text=text)
+        if path == self.path:
+            self._saved_hash = new_hash
+            self.dirty = False
+        return True
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def reindex(self, meeting_id=None):
+        """Rebuilds the indexes for one series, or for the whole mapping when meeting_id is None."""
+        if meeting_id is None:
+            self._by_issue = {}
+            self._by_series = {}
+            self._by_topic = {}
+            self._by_start = []
+            self._series_members = {}
+            self._series_of = {}
+            self._indexed = {}
+            # Tie-breaker so sorted index keys never compare the occurrence dicts they carry
+            self._key_seq = itertools.count()
+            for m_id in list(self.mapping.keys()):
+                self._index_series(str(m_id))
+            return
+        meeting_id = str(meeting_id)
+        self._unindex_series(meeting_id)
+        if meeting_id in self.mapping:
+            self._index_series(meeting_id)
+
+    def _index_series(self, meeting_id: str):
+        entry = self.mapping.get(meeting_id)
+        records = []
+        if not isinstance(entry, dict):
+            self._indexed[meeting_id] = records
+            return
+        call_series = entry.get("call_series")
+        latest = None
+        for occurrence in iter_occurrences(entry):
+            issue_number = _issue_key(occurrence.get("issue_number"))
+            topic_id = occurrence.get("discourse_topic_id")
+            start = parse_start_time(occurrence.get("start_time"))
+            ref = (meeting_id, occurrence)
+            record = {"occurrence": occurrence, "issue": issue_number, "series": None, "topic": None, "start": None}
+
+            # First entry wins, matching the old "first match in mapping order" scans
+            if issue_number is not None and issue_number not in self._by_issue:
+                self._by_issue[issue_number] = ref
+            if call_series:
+                sort_key = (issue_number if issue_number is not None else -1, meeting_id,
+                            next(self._key_seq), occurrence)
+                bisect.insort(self._by_series.setdefault(call_series, []), sort_key)
+                record["series"] = (call_series, sort_key)
+                latest = sort_key if latest is None else max(latest, sort_key)
+            if is_valid_topic_id(topic_id):
+                self._by_topic.setdefault(str(topic_id), []).append(ref)
+                record["topic"] = str(topic_id)
+            if start is not None:
+                start_key = (start, meeting_id, next(self._key_seq), occurrence)
+                bisect.insort(self._by_start, start_key)
+                record["start"] = start_key
+            records.append(record)
+        self._indexed[meeting_id] = records
+        if call_series:
+            # Series entries without any occurrence yet still belong to the call series
+            self._series_members.setdefault(call_series, {})[meeting_id] = latest
+            self._series_of[meeting_id] = call_series
+
+    def _unindex_series(self, meeting_id: str):
+        call_series = self._series_of.pop(meeting_id, None)
+        if call_series is not None:
+            self._series_members.get(call_series, {}).pop(meeting_id, None)
+        for record in self._indexed.pop(meeting_id, []):
+            occurrence = record["occurrence"]
+            issue_number = record["issue"]
+            if issue_number is not None:
+                current = self._by_issue.get(issue_number)
+                if current and current[1] is occurrence:
+                    del self._by_issue[issue_number]
+                    self._restore_issue(issue_number)
+            if record["series"]:
+                call_series, sort_key = record["series"]
+                _remove_sorted(self._by_series.get(call_series, []), sort_key)
+            if record["topic"]:
+                refs = self._by_topic.get(record["topic"], [])
+                refs[:] = [ref for ref in refs if ref[1] is not occurrence]
+            if record["start"]:
+                _remove_sorted(self._by_start, record["start"])
+
+    def _restore_issue(self, issue_number: int):
+        # Another series may also reference this issue (duplicates); fall back to it
+        for m_id, records in self._indexed.items():
+            for record in records:
+                if record["issue"] == issue_number:
+                    self._by_issue[issue_number] = (m_id, record["occurrence"])
+                    return
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_series(self, meeting_id) -> Optional[SeriesEntry]:
+        entry = self.mapping.get(str(meeting_id))
+        return entry if isinstance(entry, dict) else None
+
+    def find_occurrence(self, issue_number) -> OccurrenceMatch:
+        """Returns (meeting_id, occurrence) for a GitHub issue number, or (None, None)."""
+        key = _issue_key(issue_number)
+        if key is None:
+            return None, None
+        return self._by_issue.get(key, (None, None))
+
+    def find_occurrence_in_series(self, meeting_id, issue_number) -> Optional[Occurrence]:
+        """Returns the occurrence for issue_number if it belongs to meeting_id."""
+        found_meeting_id, occurrence = self.find_occurrence(issue_number)
+        if found_meeting_id == str(meeting_id):
+            return occurrence
+        # Duplicated issue numbers: the index only holds the first one, scan this series
+        key = _issue_key(issue_number)
+        for occurrence in iter_occurrences(self.get_series(meeting_id)):
+            if _issue_key(occurrence.get("issue_number")) == key:
+                return occurrence
+        return None
+
+    def iter_series_occurrences(self, call_series: str) -> Iterator[Tuple[str, Occurrence]]:
+        """Yields (meeting_id, occurrence) for a call series, newest issue number first."""
+        for _, meeting_id, _, occurrence in reversed(self._by_series.get(call_series, [])):
+            yield meeting_id, occurrence
+
+    def latest_in_series(self, call_series: str,
+                         predicate: Optional[Callable[[str, SeriesEntry, Occurrence], bool]] = None) -> OccurrenceMatch:
+        """
+        Returns (meeting_id, occurrence) for the highest issue number in call_series,
+        optionally restricted to occurrences for which predicate(meeting_id, entry, occurrence) holds.
+        """
+        if not call_series:
+            return None, None
+        for meeting_id, occurrence in self.iter_series_occurrences(call_series):
+            if predicate is None or predicate(meeting_id, self.mapping[meeting_id], occurrence):
+                return meeting_id, occurrence
+        return None, None
+
+    def series_entries(self, call_series: str) -> List[Tuple[str, SeriesEntry]]:
+        """Returns the distinct (meeting_id, entry) pairs of a call series, most recent issue first."""
+        members = self._series_members.get(call_series, {})
+        # Entries with occurrences by their latest issue; those without any come last, in index order
+        with_occurrences = sorted((m_id for m_id, latest in members.items() if latest is not None),
+                                  key=lambda m_id: members[m_id], reverse=True)
+        without = [m_id for m_id, latest in members.items() if latest is None]
+        return [(meeting_id, self.mapping[meeting_id]) for meeting_id in with_occurrences + without]
+
+    def find_by_topic(self, topic_id) -> List[Tuple[str, Occurrence]]:
+        """Returns every (meeting_id, occurrence) that points at a Discourse topic."""
+        if not is_valid_topic_id(topic_id):
+            return []
+        return list(self._by_topic.get(str(topic_id), []))
+
+    def find_by_start_time(self, start_time, tolerance_minutes: int = 30, meeting_id=None) -> OccurrenceMatch:
+        """
+        Returns the (meeting_id, occurrence) whose start_time is closest to start_time
+        and within tolerance_minutes, optionally restricted to one meeting ID.
+        """
+        target = start_time if isinstance(start_time, datetime) else parse_start_time(start_time)
+        if target is None:
+            return None, None
+        if target.tzinfo is None:
+            target = target.replace(tzinfo=timezone.utc)
+        tolerance = timedelta(minutes=tolerance_minutes)
+        low = bisect.bisect_left(self._by_start, (target - tolerance,))
+        high = bisect.bisect_right(self._by_start, (target + tolerance, chr(0x10FFFF)))
+
+        best = (None, None)
+        best_delta = None
+        for start, m_id, _, occurrence in self._by_start[low:high]:
+            if meeting_id is not None and m_id != str(meeting_id):
+                continue
+            delta = abs(start - target)
+            if best_delta is None or delta < best_delta:
+                best, best_delta = (m_id, occurrence), delta
+        return best
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def upsert_series(self, meeting_id, entry: SeriesEntry) -> SeriesEntry:
+        """Stores a series entry under meeting_id and refreshes its indexes."""
+        meeting_id = str(meeting_id)
+        self.mapping[meeting_id] = entry
+        self.reindex(meeting_id)
+        self.dirty = True
+        return entry
+
+    def upsert_occurrence(self, meeting_id, occurrence: Occurrence) -> Occurrence:
+        """
+        Inserts or replaces the occurrence with the same issue_number in the series
+        meeting_id (creating the series entry if needed) and refreshes the indexes.
+        New occurrences get the next occurrence_number.
+        """
+        meeting_id = str(meeting_id)
+        entry = self.mapping.setdefault(meeting_id, {"meeting_id": meeting_id})
+        occurrences = entry.get("occurrences")
+        if not isinstance(occurrences, list):
+            occurrences = entry["occurrences"] = []
+
+        key = _issue_key(occurrence.get("issue_number"))
+        index = next((i for i, occ in enumerate(occurrences)
+                      if isinstance(occ, dict) and _issue_key(occ.get("issue_number")) == key), -1)
+        if index == -1:
+            occurrence.setdefault("occurrence_number", len(occurrences) + 1)
+            occurrences.append(occurrence)
+        else:
+            occurrences[index] = occurrence
+        self.reindex(meeting_id)
+        self.dirty = True
+        return occurrence
+
+    def remove_series(self, meeting_id) -> Optional[SeriesEntry]:
+        meeting_id = str(meeting_id)
+        entry = self.mapping.pop(meeting_id, None)
+        self.reindex(meeting_id)
+        self.dirty = True
+        return entry
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_store(reload: bool = False) -> MeetingStore:
+    """
+    Returns the process-wide MeetingStore for MAPPING_FILE, loading it on first use.
+    reload=True re-reads the file (for long-running readers such as serve_rss),
+    unless there are unsaved changes.
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = MeetingStore.load(MAPPING_FILE)
+            atexit.register(_flush_at_exit)
+        elif reload:
+            if _shared_store.dirty:
+                print("[WARN] Not reloading mapping: there are unsaved changes.")
+            else:
+                fresh = MeetingStore.load(MAPPING_FILE)
+                _shared_store.mapping = fresh.mapping
+                _shared_store._saved_hash = fresh._saved_hash
+                _shared_store.base_text = fresh.base_text
+                _shared_store.reindex()
+        return _shared_store
+
+
+def load_meeting_topic_mapping(reload: bool = False) -> Dict[str, SeriesEntry]:
+    """Returns the shared mapping dict. Every caller in a process sees the same object."""
+    return get_store(reload=reload).mapping
+
+
+def save_meeting_topic_mapping(mapping: Optional[Dict[str, SeriesEntry]] = None) -> bool:
+    """
+    Writes the shared mapping to disk now (atomically, skipped when unchanged).
+    Use this before anything that reads the file, such as a commit; otherwise
+    prefer get_store().mark_dirty() and let the exit flush write it once.
+    """
+    store = get_store()
+    if mapping is not None:
+        store.replace(mapping)
+    store.mark_dirty()
+    return store.flush()
+
+
+def _flush_at_exit():
+    if _shared_store is not None and _shared_store.dirty:
+        try:
+            if _shared_store.flush():
+                print(f"[DEBUG] Flushed pending mapping changes to {_shared_store.path} at exit.")
+        except Exception as e:
+            print(f"::error::Failed to flush mapping at exit: {e}")
+
+
+def _remove_sorted(items: list, key):
+    index = bisect.bisect_left(items, key)
+    if index < len(items) and items[index] == key:
+        del items[index]
@@ -1,11 +1,63 @@
+"""
+RSS feeds of the meetings in the mapping, written under rss/ (published to
+GitHub Pages and served by serve_rss.py).
+
+  - meetings.xml          the latest items of every series
+  - series/<series>.xml   the latest items of one call_series (e.g. series/acde.xml)
+  - archive/<year>.xml    every item of a year, newest year first
+
+The first two only carry a window of items (the latest ACDBOT_RSS_MAX_ITEMS,
+optionally only those from the last ACDBOT_RSS_MAX_AGE_DAYS days), so readers
+polling them download a bounded document. The archive pages hold the full
+history as an RFC 5005 paged feed: meetings.xml is the first page and links
+"next" to the newest year, each year links to its neighbours, and every page
+links "first" and "last".
+
+Items are rendered straight to XML text, one per occurrence (or per legacy
+non-recurring entry), and cached with a hash of everything they are built
+from, so a rebuild only renders the items whose occurrence changed since the
+last build in this process. Each feed is written in a single pass, and only
+when its content changed.
+
+Configuration (environment variables):
+  - ACDBOT_RSS_MAX_ITEMS     items in meetings.xml and each series feed (default 50, 0 for no limit)
+  - ACDBOT_RSS_MAX_AGE_DAYS  leave out items that started longer ago (default 0, no limit)
+  - ACDBOT_RSS_BASE_URL      URL the rss/ directory is published at, for links
+                             between feeds (default "/rss")
+"""
 import os
 import datetime
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-import pytz
 import json
+import re
+import tempfile
+import threading
+from collections import namedtuple
+from xml.sax.saxutils import escape
+import pytz
+from modules.meeting_store import content_hash, get_store, load_meeting_topic_mapping, parse_start_time
 
 RSS_FILE_PATH = ".github/ACDbot/rss/meetings.xml"
+SERIES_DIR = "series"
+ARCHIVE_DIR = "archive"
+RFC822_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+MAX_ITEMS = int(os.environ.get("ACDBOT_RSS_MAX_ITEMS", "50"))
+MAX_AGE_DAYS = float(os.environ.get("ACDBOT_RSS_MAX_AGE_DAYS", "0"))
+FEED_BASE_URL = os.environ.get("ACDBOT_RSS_BASE_URL", "/rss").rstrip("/")
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+CHANNEL_TITLE = "Ethereum Protocol Meetings"
+CHANNEL_DESCRIPTION = "RSS feed for Ethereum Protocol Meetings"
+
+# A rendered item: published is the start time (None if unknown), series the call_series slug
+FeedItem = namedtuple("FeedItem", ["guid", "series", "published", "xml"])
+
+_lock = threading.Lock()
+# guid -> (input hash, FeedItem)
+_item_cache = {}
+# path -> hash of the content last written there (or found there unchanged)
+_written = {}
+# lastBuildDate changes on every build, so it is ignored when comparing a feed with the file on disk
+BUILD_DATE_PATTERN = re.compile(r"<lastBuildDate>[^<]*</lastBuildDate>")
 
 def ensure_rss_directory():
     """Ensure the RSS directory exists"""
@@ -13,280 +65,363 @@ def ensure_rss_directory():
 
 def create_or_update_rss_feed(mapping):
     """
-    Creates or updates the RSS feed with meeting information
+    Creates or updates the RSS feeds with meeting information
     Args:
         mapping: The meeting-topic mapping dictionary
+    Returns the path of the main feed.
     """
     ensure_rss_directory()
-    
-    # Create RSS feed structure if it doesn't exist
-    if not os.path.exists(RSS_FILE_PATH):
-        create_new_rss_feed()
-    
-    # Load existing RSS feed
-    tree = ET.parse(RSS_FILE_PATH)
-    root = tree.getroot()
-    channel = root.find('channel')
-    
-    # Update lastBuildDate
-    last_build_date = channel.find('lastBuildDate')
     now = datetime.datetime.now(pytz.UTC)
-    last_build_date.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
-    
-    # Remove existing items first to rebuild based on current mapping state
-    existing_items = channel.findall('item')
-    for item in existing_items:
-        channel.remove(item)
-    
-    # Add items based on occurrences
+    rss_dir = os.path.dirname(RSS_FILE_PATH)
+
+    with _lock:
+        items = sorted(render_items(mapping, now), key=_newest_first)
+        feeds = {}  # path -> (title, items, links)
+
+        # Archive pages, newest year first; undated items go with the oldest year
+        years = sorted({item.published.year for item in items if item.published}, reverse=True)
+        if not years and items:
+            years = [now.year]
+        pages = [f"{FEED_BASE_URL}/{ARCHIVE_DIR}/{year}.xml" for year in years]
+        main_url = f"{FEED_BASE_URL}/{os.path.basename(RSS_FILE_PATH)}"
+        for i, year in enumerate(years):
+            page_items = [item for item in items
+                          if (item.published.year if item.published else years[-1]) == year]
+            links = [("self", pages[i]), ("first", main_url), ("previous", pages[i - 1] if i else main_url),
+                     ("last", pages[-1])]
+            if i + 1 < len(pages):
+                links.append(("next", pages[i + 1]))
+            feeds[os.path.join(rss_dir, ARCHIVE_DIR, f"{year}.xml")] = (
+                f"{CHANNEL_TITLE} ({year} archive)", page_items, links)
+
+        # The main feed is the first page of the archive
+        links = [("self", main_url), ("first", main_url)]
+        if pages:
+            links += [("next", pages[0]), ("last", pages[-1])]
+        feeds[RSS_FILE_PATH] = (CHANNEL_TITLE, window(items, now), links)
+
+        series_names = {}
+        for item in items:
+            if item.series:
+                series_names.setdefault(item.series, []).append(item)
+        for series, series_items in series_names.items():
+            url = f"{FEED_BASE_URL}/{SERIES_DIR}/{series}.xml"
+            feeds[os.path.join(rss_dir, SERIES_DIR, f"{series}.xml")] = (
+                f"{CHANNEL_TITLE}: {series}", window(series_items, now), [("self", url)])
+
+        for path, (title, feed_items, links) in feeds.items():
+            write_feed_if_changed(path, title, feed_items, links, now)
+        for subdir in (SERIES_DIR, ARCHIVE_DIR):
+            remove_stale_feeds(os.path.join(rss_dir, subdir), feeds)
+
+    return RSS_FILE_PATH
+
+def feed_file_for(url_path):
+    """
+    Maps a request path to a feed file: /rss (or /rss/meetings.xml) to the main
+    feed, /rss/<series> to series/<series>.xml, /rss/archive/<year> to an
+    archive page. Returns None for other paths.
+    """
+    parts = [part for part in url_path.split("?", 1)[0].split("/") if part]
+    if not parts or parts[0] != "rss":
+        return None
+    parts = [part[:-len(".xml")] if part.endswith(".xml") else part for part in parts[1:]]
+    rss_dir = os.path.dirname(RSS_FILE_PATH)
+    if not parts or parts == [os.path.basename(RSS_FILE_PATH)[:-len(".xml")]]:
+        return RSS_FILE_PATH
+    if len(parts) == 2 and parts[0] == ARCHIVE_DIR and parts[1].isdigit():
+        return os.path.join(rss_dir, ARCHIVE_DIR, f"{parts[1]}.xml")
+    if len(parts) == 2 and parts[0] == SERIES_DIR:
+        parts = parts[1:]
+    if len(parts) == 1 and series_slug(parts[0]) == parts[0]:
+        return os.path.join(rss_dir, SERIES_DIR, f"{parts[0]}.xml")
+    return None
+
+def window(items, now, max_items=None, max_age_days=None):
+    """The newest-first items a bounded feed carries: at most max_items, none older than max_age_days."""
+    max_items = MAX_ITEMS if max_items is None else max_items
+    max_age_days = MAX_AGE_DAYS if max_age_days is None else max_age_days
+    if max_age_days:
+        cutoff = now - datetime.timedelta(days=max_age_days)
+        items = [item for item in items if item.published and item.published >= cutoff]
+    return items[:max_items] if max_items else items
+
+def write_feed_if_changed(path, title, items, links, now):
+    content_key = content_hash(title + repr(links) + "".join(item.xml for item in items))
+    if _written.get(path) == content_key and os.path.exists(path):
+        return False
+    pub_date = read_channel_pub_date(path) or now.strftime(RFC822_FORMAT)
+    content = render_feed([item.xml for item in items], pub_date, now.strftime(RFC822_FORMAT),
+                          title=title, links=links)
+    # A new process has no _written: keep the file (and its ETag) if only lastBuildDate would change
+    if BUILD_DATE_PATTERN.sub("", content) == BUILD_DATE_PATTERN.sub("", read_feed_file(path)):
+        _written[path] = content_key
+        return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_rss_feed(content, path)
+    _written[path] = content_key
+    return True
+
+def read_feed_file(path):
+    """A feed file's content, or "" if it cannot be read."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def remove_stale_feeds(directory, feeds):
+    """Deletes feed files of series or years that no longer have items."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(directory, name)
+        if name.endswith(".xml") and path not in feeds:
+            os.remove(path)
+            _written.pop(path, None)
+
+def series_slug(call_series):
+    """File name for a call_series: lowercase, runs of other characters as '-' ("FOCIL Breakout" -> "focil-breakout")."""
+    return re.sub(r"[^a-z0-9]+", "-", str(call_series).lower()).strip("-")
+
+def _newest_first(item):
+    # Undated items sort last
+    return -item.published.timestamp() if item.published else float("inf")
+
+def iter_feed_sources(mapping):
+    """Yields (meeting_id, series entry, occurrence or None for a legacy entry) for every feed item."""
     for meeting_id, entry in mapping.items():
         if not isinstance(entry, dict):
             continue
-            
         if "occurrences" in entry and isinstance(entry["occurrences"], list):
-            # Recurring meeting: Create an item for each occurrence
+            # Recurring meeting: an item for each occurrence
             for occurrence in entry["occurrences"]:
-                if not isinstance(occurrence, dict):
-                    continue
-
-                item = ET.SubElement(channel, 'item')
-                issue_number = occurrence.get('issue_number')
-                
-                # Title (from occurrence)
-                title_elem = ET.SubElement(item, 'title')
-                title_elem.text = occurrence.get('issue_title', f"Meeting {meeting_id} - Occurrence {issue_number}")
-                
-                # Link (to occurrence's Discourse topic)
-                link_elem = ET.SubElement(item, 'link')
-                discourse_topic_id = occurrence.get('discourse_topic_id')
-                if discourse_topic_id:
-                    discourse_url = f"{os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')}/t/{discourse_topic_id}"
-                    link_elem.text = discourse_url
-                else:
-                    link_elem.text = os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org') # Fallback link
-
-                # Description
-                desc_elem = ET.SubElement(item, 'description')
-                desc_content = f"<p><strong>Series Meeting ID:</strong> {meeting_id}</p>"
-                desc_content += f"<p><strong>Occurrence Issue:</strong> <a href='https://github.com/{os.environ.get('GITHUB_REPOSITORY', '')}/issues/{issue_number}'>#{issue_number}</a></p>"
-
-                # Add start time and duration from occurrence
-                start_time = occurrence.get('start_time')
-                duration = occurrence.get('duration')
-                if start_time:
-                    try:
-                        dt_occ = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                        formatted_time = dt_occ.strftime("%Y-%m-%d %H:%M UTC")
-                        desc_content += f"<p><strong>Start Time:</strong> {formatted_time}</p>"
-                    except Exception as e:
-                        print(f"[WARN] Error formatting occurrence start time {start_time}: {e}")
-                        desc_content += f"<p><strong>Start Time:</strong> {start_time}</p>"
-                
-                if duration:
-                    desc_content += f"<p><strong>Duration:</strong> {duration} minutes</p>"
-
-                # Add series recurring info
-                if entry.get('is_recurring'):
-                    occurrence_rate = entry.get('occurrence_rate', 'none')
-                    desc_content += f"<p><strong>Recurring Series:</strong> {occurrence_rate}</p>"
-
-                # Add YouTube stream links (from occurrence)
-                occurrence_youtube_streams = occurrence.get('youtube_streams', [])
-                if occurrence_youtube_streams:
-                    desc_content += "<p><strong>YouTube Streams (Occurrence):</strong></p><ul>"
-                    for i, stream in enumerate(occurrence_youtube_streams, 1):
-                        stream_url = stream.get('stream_url')
-                        if stream_url:
-                            desc_content += f"<li><a href='{stream_url}'>Stream #{i}</a></li>"
-                    desc_content += "</ul>"
-
-                # Add occurrence-specific YouTube video if available
-                youtube_video_id = occurrence.get('youtube_video_id')
-                if youtube_video_id:
-                    youtube_url = f"https://youtu.be/{youtube_video_id}"
-                    desc_content += f"<p><strong>Recording (This Occurrence):</strong> <a href='{youtube_url}'>{youtube_url}</a></p>"
-                
-                # Add occurrence-specific notifications
-                notifications = occurrence.get('notifications', [])
-                if notifications:
-                    desc_content += "<h3>Occurrence Updates:</h3><ul>"
-                    # Sort notifications by timestamp if possible
-                    try:
-                        notifications.sort(key=lambda x: datetime.datetime.fromisoformat(x.get('timestamp')), reverse=True)
-                    except:
-                        pass # Ignore sorting errors
-                    
-                    for notification in notifications:
-                        timestamp = notification.get('timestamp')
-                        n_type = notification.get('type')
-                        n_content = notification.get('content')
-                        n_url = notification.get('url', '')
-                        
-                        formatted_time_notif = timestamp
-                        try:
-                            dt_notif = datetime.datetime.fromisoformat(timestamp)
-                            formatted_time_notif = dt_notif.strftime("%Y-%m-%d %H:%M UTC")
-                        except:
-                            pass
-                        
-                        if n_url:
-                            desc_content += f"<li><strong>{formatted_time_notif} - {n_type}:</strong> <a href='{n_url}'>{n_content}</a></li>"
-                        else:
-                            desc_content += f"<li><strong>{formatted_time_notif} - {n_type}:</strong> {n_content}</li>"
-                    desc_content += "</ul>"
-
-                desc_elem.text = desc_content
-
-                # Publication date (use occurrence start time)
-                pub_date_elem = ET.SubElement(item, 'pubDate')
-                if start_time:
-                    try:
-                        dt_pub = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                        pub_date_elem.text = dt_pub.strftime("%a, %d %b %Y %H:%M:%S %z")
-                    except:
-                        pub_date_elem.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
-                else:
-                    pub_date_elem.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
-
-                # GUID (unique per occurrence)
-                guid_elem = ET.SubElement(item, 'guid')
-                guid_elem.set('isPermaLink', 'false')
-                guid_elem.text = f"meeting-{meeting_id}-occurrence-{issue_number}"
-                
+                if isinstance(occurrence, dict):
+                    yield meeting_id, entry, occurrence
         else:
-            # Non-recurring meeting or legacy format: Create a single item
-            item = ET.SubElement(channel, 'item')
-            
-            # Title
-            title_elem = ET.SubElement(item, 'title')
-            title_elem.text = entry.get('issue_title', f"Meeting {meeting_id}")
-            
-            # Link (to Discourse topic)
-            link_elem = ET.SubElement(item, 'link')
-            discourse_topic_id = entry.get('discourse_topic_id')
-            if discourse_topic_id:
-                 discourse_url = f"{os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')}/t/{discourse_topic_id}"
-                 link_elem.text = discourse_url
-            else:
-                 link_elem.text = os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')
-            
-            # Description
-            desc_elem = ET.SubElement(item, 'description')
-            desc_content = f"<p><strong>Meeting ID:</strong> {meeting_id}</p>"
-            
-            start_time = entry.get('start_time')
-            duration = entry.get('duration')
-            if start_time:
-                 try:
-                     dt_legacy = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                     formatted_time = dt_legacy.strftime("%Y-%m-%d %H:%M UTC")
-                     desc_content += f"<p><strong>Start Time:</strong> {formatted_time}</p>"
-                 except:
-                     desc_content += f"<p><strong>Start Time:</strong> {start_time}</p>"
-            if duration:
-                 desc_content += f"<p><strong>Duration:</strong> {duration} minutes</p>"
-            
-            youtube_video_id = entry.get('youtube_video_id')
-            if youtube_video_id:
-                 youtube_url = f"https://youtu.be/{youtube_video_id}"
-                 desc_content += f"<p><strong>Recording:</strong> <a href='{youtube_url}'>{youtube_url}</a></p>"
-            
-            # Add legacy notifications if they exist
-            notifications = entry.get('notifications', [])
-            if notifications:
-                 desc_content += "<h3>Meeting Updates:</h3><ul>"
-                 # Sort notifications by timestamp if possible
-                 try:
-                     notifications.sort(key=lambda x: datetime.datetime.fromisoformat(x.get('timestamp')), reverse=True)
-                 except:
-                     pass 
-                 for notification in notifications:
-                     timestamp = notification.get('timestamp')
-                     n_type = notification.get('type')
-                     n_content = notification.get('content')
-                     n_url = notification.get('url', '')
-                     formatted_time_notif = timestamp
-                     try:
-                         dt_notif = datetime.datetime.fromisoformat(timestamp)
-                         formatted_time_notif = dt_notif.strftime("%Y-%m-%d %H:%M UTC")
-                     except:
-                         pass
-                     if n_url:
-                         desc_content += f"<li><strong>{formatted_time_notif} - {n_type}:</strong> <a href='{n_url}'>{n_content}</a></li>"
-                     else:
-                         desc_content += f"<li><strong>{formatted_time_notif} - {n_type}:</strong> {n_content}</li>"
-                 desc_content += "</ul>"
-            
-            desc_elem.text = desc_content
-            
-            # Publication date
-            pub_date_elem = ET.SubElement(item, 'pubDate')
-            if start_time:
-                 try:
-                     dt_pub = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                     pub_date_elem.text = dt_pub.strftime("%a, %d %b %Y %H:%M:%S %z")
-                 except:
-                     pub_date_elem.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
+            # Non-recurring meeting or legacy format: a single item
+            yield meeting_id, entry, None
+
+def render_items(mapping, now):
+    """
+    Returns a FeedItem for every item, in mapping order. Items whose inputs
+    are unchanged since the last call come from the cache.
+    """
+    base_url = os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')
+    repository = os.environ.get('GITHUB_REPOSITORY', '')
+    items = []
+    seen = set()
+    for meeting_id, entry, occurrence in iter_feed_sources(mapping):
+        if occurrence is not None:
+            guid = f"meeting-{meeting_id}-occurrence-{occurrence.get('issue_number')}"
+            inputs = [occurrence, entry.get('is_recurring'), entry.get('occurrence_rate'), entry.get('call_series')]
+        else:
+            guid = f"meeting-{meeting_id}"
+            inputs = [entry]
+        inputs_hash = content_hash(json.dumps([meeting_id, base_url, repository] + inputs, sort_keys=True, default=str))
+
+        cached = _item_cache.get(guid)
+        if cached is None or cached[0] != inputs_hash:
+            source = occurrence if occurrence is not None else entry
+            if occurrence is not None:
+                xml = render_occurrence_item(meeting_id, entry, occurrence, guid, base_url, repository, now)
             else:
-                 pub_date_elem.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
-            
-            # GUID
-            guid_elem = ET.SubElement(item, 'guid')
-            guid_elem.set('isPermaLink', 'false')
-            guid_elem.text = f"meeting-{meeting_id}"
-    
-    # Write updated RSS feed
-    write_rss_feed(tree)
-    
-    return RSS_FILE_PATH
+                xml = render_legacy_item(meeting_id, entry, guid, base_url, now)
+            series = series_slug(entry['call_series']) if entry.get('call_series') else None
+            cached = (inputs_hash, FeedItem(guid, series or None, parse_start_time(source.get('start_time')), xml))
+            _item_cache[guid] = cached
+        items.append(cached[1])
+        seen.add(guid)
+
+    # Forget items that left the mapping
+    for guid in set(_item_cache) - seen:
+        del _item_cache[guid]
+    return items
+
+def render_occurrence_item(meeting_id, entry, occurrence, guid, base_url, repository, now):
+    issue_number = occurrence.get('issue_number')
+    title = occurrence.get('issue_title', f"Meeting {meeting_id} - Occurrence {issue_number}")
+
+    # Link (to occurrence's Discourse topic)
+    discourse_topic_id = occurrence.get('discourse_topic_id')
+    link = f"{base_url}/t/{discourse_topic_id}" if discourse_topic_id else base_url # Fallback link
+
+    # Description
+    desc_content = f"<p><strong>Series Meeting ID:</strong> {meeting_id}</p>"
+    desc_content += f"<p><strong>Occurrence Issue:</strong> <a href='https://github.com/{repository}/issues/{issue_number}'>#{issue_number}</a></p>"
+
+    # Add start time and duration from occurrence
+    start_time = occurrence.get('start_time')
+    duration = occurrence.get('duration')
+    if start_time:
+        desc_content += f"<p><strong>Start Time:</strong> {format_start_time(start_time)}</p>"
+    if duration:
+        desc_content += f"<p><strong>Duration:</strong> {duration} minutes</p>"
+
+    # Add series recurring info
+    if entry.get('is_recurring'):
+        occurrence_rate = entry.get('occurrence_rate', 'none')
+        desc_content += f"<p><strong>Recurring Series:</strong> {occurrence_rate}</p>"
+
+    # Add YouTube stream links (from occurrence)
+    occurrence_youtube_streams = occurrence.get('youtube_streams') or []
+    if occurrence_youtube_streams:
+        desc_content += "<p><strong>YouTube Streams (Occurrence):</strong></p><ul>"
+        for i, stream in enumerate(occurrence_youtube_streams, 1):
+            stream_url = stream.get('stream_url')
+            if stream_url:
+                desc_content += f"<li><a href='{stream_url}'>Stream #{i}</a></li>"
+        desc_content += "</ul>"
+
+    # Add occurrence-specific YouTube video if available
+    youtube_video_id = occurrence.get('youtube_video_id')
+    if youtube_video_id:
+        youtube_url = f"https://youtu.be/{youtube_video_id}"
+        desc_content += f"<p><strong>Recording (This Occurrence):</strong> <a href='{youtube_url}'>{youtube_url}</a></p>"
+
+    # Add occurrence-specific notifications
+    desc_content += render_notifications(occurrence.get('notifications', []), "Occurrence Updates")
+
+    return render_item(title, link, desc_content, format_pub_date(start_time, now), guid)
+
+def render_legacy_item(meeting_id, entry, guid, base_url, now):
+    title = entry.get('issue_title', f"Meeting {meeting_id}")
+
+    # Link (to Discourse topic)
+    discourse_topic_id = entry.get('discourse_topic_id')
+    link = f"{base_url}/t/{discourse_topic_id}" if discourse_topic_id else base_url
+
+    # Description
+    desc_content = f"<p><strong>Meeting ID:</strong> {meeting_id}</p>"
+    start_time = entry.get('start_time')
+    duration = entry.get('duration')
+    if start_time:
+        desc_content += f"<p><strong>Start Time:</strong> {format_start_time(start_time)}</p>"
+    if duration:
+        desc_content += f"<p><strong>Duration:</strong> {duration} minutes</p>"
+
+    youtube_video_id = entry.get('youtube_video_id')
+    if youtube_video_id:
+        youtube_url = f"https://youtu.be/{youtube_video_id}"
+        desc_content += f"<p><strong>Recording:</strong> <a href='{youtube_url}'>{youtube_url}</a></p>"
+
+    # Add legacy notifications if they exist
+    desc_content += render_notifications(entry.get('notifications', []), "Meeting Updates")
+
+    return render_item(title, link, desc_content, format_pub_date(start_time, now), guid)
+
+def render_notifications(notifications, heading):
+    """HTML list of notifications, newest first (the mapping's list is left untouched)."""
+    if not notifications:
+        return ""
+    # Sort notifications by timestamp if possible
+    try:
+        notifications = sorted(notifications, key=lambda x: datetime.datetime.fromisoformat(x.get('timestamp')), reverse=True)
+    except (TypeError, ValueError):
+        pass # Ignore sorting errors
+
+    html = f"<h3>{heading}:</h3><ul>"
+    for notification in notifications:
+        timestamp = notification.get('timestamp')
+        n_type = notification.get('type')
+        n_content = notification.get('content')
+        n_url = notification.get('url', '')
+
+        formatted_time_notif = timestamp
+        try:
+            formatted_time_notif = datetime.datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M UTC")
+        except (TypeError, ValueError):
+            pass
+
+        if n_url:
+            html += f"<li><strong>{formatted_time_notif} - {n_type}:</strong> <a href='{n_url}'>{n_content}</a></li>"
+        else:
+            html += f"<li><strong>{formatted_time_notif} - {n_type}:</strong> {n_content}</li>"
+    return html + "</ul>"
+
+def format_start_time(start_time):
+    try:
+        dt = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        return dt.strftime("%Y-%m-%d %H:%M UTC")
+    except (AttributeError, ValueError) as e:
+        print(f"[WARN] Error formatting start time {start_time}: {e}")
+        return start_time
+
+def format_pub_date(start_time, now):
+    """Publication date: the meeting's start time, else now."""
+    if start_time:
+        try:
+            return datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00')).strftime(RFC822_FORMAT)
+        except (AttributeError, ValueError):
+            pass
+    return now.strftime(RFC822_FORMAT)
+
+def render_item(title, link, description, pub_date, guid):
+    return (
+        "    <item>\n"
+        f"      <title>{escape('' if title is None else str(title))}</title>\n"
+        f"      <link>{escape(link)}</link>\n"
+        f"      <description>{escape(description)}</description>\n"
+        f"      <pubDate>{pub_date}</pubDate>\n"
+        f"      <guid isPermaLink=\"false\">{escape(guid)}</guid>\n"
+        "    </item>\n"
+    )
+
+def render_feed(items, pub_date, last_build_date, title=CHANNEL_TITLE, description=CHANNEL_DESCRIPTION, links=()):
+    """The complete RSS document for pre-rendered items. links are (rel, href) atom:link pairs."""
+    link = os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')
+    atom_links = "".join(
+        f'    <atom:link rel="{rel}" href="{escape(href)}" type="application/rss+xml"/>\n' for rel, href in links
+    )
+    header = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<rss version="2.0" xmlns:atom="{ATOM_NS}">\n'
+        "  <channel>\n"
+        f"    <title>{escape(title)}</title>\n"
+        f"    <link>{escape(link)}</link>\n"
+        f"    <description>{escape(description)}</description>\n"
+        f"{atom_links}"
+        "    <language>en-us</language>\n"
+        f"    <pubDate>{pub_date}</pubDate>\n"
+        f"    <lastBuildDate>{last_build_date}</lastBuildDate>\n"
+        "    <generator>ACDbot RSS Generator</generator>\n"
+        "    <docs>https://www.rssboard.org/rss-specification</docs>\n"
+    )
+    return header + "".join(items) + "  </channel>\n</rss>\n"
+
+def read_channel_pub_date(path):
+    """The channel's pubDate (when the feed was first created) from an existing feed file, or None."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            head = f.read(4096)
+    except OSError:
+        return None
+    match = re.search(r"<pubDate>([^<]+)</pubDate>", head.split("<item>", 1)[0])
+    return match.group(1) if match else None
 
 def create_new_rss_feed():
     """Creates a new RSS feed file with basic structure"""
-    rss = ET.Element('rss')
-    rss.set('version', '2.0')
-    
-    channel = ET.SubElement(rss, 'channel')
-    
-    # Required channel elements
-    title = ET.SubElement(channel, 'title')
-    title.text = "Ethereum Protocol Meetings"
-    
-    link = ET.SubElement(channel, 'link')
-    link.text = os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')
-    
-    description = ET.SubElement(channel, 'description')
-    description.text = "RSS feed for Ethereum Protocol Meetings"
-    
-    # Optional channel elements
-    language = ET.SubElement(channel, 'language')
-    language.text = "en-us"
-    
-    now = datetime.datetime.now(pytz.UTC)
-    
-    pub_date = ET.SubElement(channel, 'pubDate')
-    pub_date.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
-    
-    last_build_date = ET.SubElement(channel, 'lastBuildDate')
-    last_build_date.text = now.strftime("%a, %d %b %Y %H:%M:%S %z")
-    
-    generator = ET.SubElement(channel, 'generator')
-    generator.text = "ACDbot RSS Generator"
-    
-    docs = ET.SubElement(channel, 'docs')
-    docs.text = "https://www.rssboard.org/rss-specification"
-    
-    # Write to file
-    tree = ET.ElementTree(rss)
-    write_rss_feed(tree)
-
-def write_rss_feed(tree):
-    """Writes the RSS feed to file with pretty formatting"""
-    rough_string = ET.tostring(tree.getroot(), 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="  ")
-    
-    with open(RSS_FILE_PATH, 'w', encoding='utf-8') as f:
-        f.write(pretty_xml)
+    ensure_rss_directory()
+    now = datetime.datetime.now(pytz.UTC).strftime(RFC822_FORMAT)
+    write_rss_feed(render_feed([], now, now))
+
+def write_rss_feed(content, path=None):
+    """Writes the RSS feed via a temp file and os.replace, so readers never see a partial feed"""
+    path = path or RSS_FILE_PATH
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".xml", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def add_meeting_to_rss(meeting_id, entry):
     """
@@ -295,9 +430,8 @@ def add_meeting_to_rss(meeting_id, entry):
         meeting_id: The meeting ID
         entry: The meeting entry dictionary
     """
-    # Load existing mapping
-    from .transcript import load_meeting_topic_mapping
-    mapping = load_meeting_topic_mapping()
+    # Copy of the shared mapping, so the feed preview does not change what gets saved
+    mapping = dict(load_meeting_topic_mapping())
     
     # Update mapping with new entry
     mapping[meeting_id] = entry
@@ -305,17 +439,6 @@ def add_meeting_to_rss(meeting_id, entry):
     # Update RSS feed
     create_or_update_rss_feed(mapping)
 
-# Helper to find occurrence by issue number (copied from upload_zoom_recording.py)
-def find_occurrence_by_issue_number(series_entry, issue_number):
-    """Helper function to find an occurrence by issue number."""
-    if not series_entry or "occurrences" not in series_entry:
-        return None, -1
-    for index, occ in enumerate(series_entry["occurrences"]):
-        # Ensure comparison is between same types if issue_number can be string/int
-        if str(occ.get("issue_number")) == str(issue_number):
-            return occ, index
-    return None, -1
-
 # New function to add notifications to existing meeting entries
 def add_notification_to_meeting(meeting_id, occurrence_issue_number, notification_type, content, url=None):
     """
@@ -328,34 +451,18 @@ def add_notification_to_meeting(meeting_id, occurrence_issue_number, notificatio
         content: Notification content/description
         url: Optional URL associated with the notification
     """
-    # Load existing mapping
-    # Use absolute import if running as script, relative if part of package
-    try:
-        from .transcript import load_meeting_topic_mapping, save_meeting_topic_mapping # Relative import
-    except ImportError:
-        # Assume running as script, need a way to load/save mapping
-        # This might require moving load/save functions out or duplicating them
-        print("[WARN] Could not perform relative import for mapping functions in rss_utils.")
-        # Fallback: Define simple load/save here if needed, or rely on caller to save
-        def load_meeting_topic_mapping(): # Simple fallback
-             if os.path.exists(".github/ACDbot/meeting_topic_mapping.json"): # Adjust path if needed
-                 with open(".github/ACDbot/meeting_topic_mapping.json", "r") as f:
-                     return json.load(f)
-             return {}
-        def save_meeting_topic_mapping(m): # Simple fallback
-             with open(".github/ACDbot/meeting_topic_mapping.json", "w") as f:
-                 json.dump(m, f, indent=2)
-
-    mapping = load_meeting_topic_mapping()
-
-    series_entry = mapping.get(str(meeting_id))
+    # Shared store: the caller's mapping object sees this notification too
+    store = get_store()
+    mapping = store.mapping
+
+    series_entry = store.get_series(meeting_id)
 
     if not series_entry:
         print(f"[ERROR] Meeting series {meeting_id} not found in mapping for RSS notification.")
         return
 
     # Find the specific occurrence
-    matched_occurrence, occurrence_index = find_occurrence_by_issue_number(series_entry, occurrence_issue_number)
+    matched_occurrence = store.find_occurrence_in_series(meeting_id, occurrence_issue_number)
 
     if matched_occurrence is None:
         print(f"[ERROR] Occurrence {occurrence_issue_number} not found in meeting {meeting_id} for RSS notification.")
@@ -375,14 +482,11 @@ def add_notification_to_meeting(meeting_id, occurrence_issue_number, notificatio
     if url:
         notification["url"] = url
 
-    # Add to notifications list within the occurrence
+    # Add to notifications list within the occurrence (updates the mapping in place)
     matched_occurrence["notifications"].append(notification)
 
-    # Update the occurrence in the main mapping structure
-    mapping[str(meeting_id)]["occurrences"][occurrence_index] = matched_occurrence
-
-    # Save mapping
-    save_meeting_topic_mapping(mapping)
+    # Written with the caller's next save, or at exit
+    store.mark_dirty()
 
     # Update RSS feed
     create_or_update_rss_feed(mapping) 
\ No newline at end of file
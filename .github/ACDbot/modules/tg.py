@@ -1,5 +1,6 @@
 import os
 import requests
+from modules import http_client
 from telegram.constants import ParseMode
 
 ZOOM_CLIENT_ID = os.environ.get("ZOOM_CLIENT_ID")
@@ -26,7 +27,7 @@ def send_message(text: str):
         "parse_mode": "HTML"
     }
 
-    resp = requests.post(url, data=data)
+    resp = http_client.post(url, data=data)
     resp.raise_for_status()
     return resp.json()["result"]["message_id"]
 
@@ -47,7 +48,7 @@ def update_message(message_id: int, text: str):
     }
 
     try:
-        resp = requests.post(url, data=data)
+        resp = http_client.post(url, data=data)
         resp.raise_for_status()
         return True
     except requests.exceptions.HTTPError as e:
@@ -98,7 +99,7 @@ def send_private_message(username: str, text: str, parse_mode=None):
             data = {"chat_id": f"@{clean_username}"}
             print(f"[DEBUG] Attempting to get chat info for @{clean_username}")
             
-            resp = requests.post(url, data=data)
+            resp = http_client.post(url, data=data)
             if resp.status_code == 200 and resp.json().get("ok"):
                 chat_data = resp.json()
                 chat_id = chat_data["result"]["id"]
@@ -120,7 +121,7 @@ def send_private_message(username: str, text: str, parse_mode=None):
                 }
                 
                 print(f"[DEBUG] Attempting direct message to @{clean_username}")
-                resp = requests.post(url, data=data)
+                resp = http_client.post(url, data=data)
                 
                 if resp.status_code == 200 and resp.json().get("ok"):
                     # If this works, get the chat_id from the response
@@ -152,7 +153,7 @@ def send_private_message(username: str, text: str, parse_mode=None):
             print(f"[DEBUG] Using parse_mode: {parse_mode}")
             
         print(f"[DEBUG] Sending actual message to chat_id: {chat_id}")
-        resp = requests.post(url, data=data)
+        resp = http_client.post(url, data=data)
         
         if resp.status_code != 200 or not resp.json().get("ok"):
             error_msg = resp.json().get("description", f"Status code: {resp.status_code}")
@@ -172,7 +173,7 @@ def bot_username(token):
     """Get the bot's username to provide better instructions"""
     try:
         url = f"https://api.telegram.org/bot{token}/getMe"
-        resp = requests.get(url)
+        resp = http_client.get(url)
         if resp.status_code == 200 and resp.json().get("ok"):
             return resp.json()["result"]["username"]
         return "your_bot"
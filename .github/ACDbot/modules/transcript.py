@@ -1,26 +1,10 @@
 import os
 import json
-from modules import zoom, discourse, tg
+from modules import zoom, discourse, discourse_artifacts, tg
+from modules.meeting_store import load_meeting_topic_mapping
 import requests
 import urllib.parse
 
-MAPPING_FILE = ".github/ACDbot/meeting_topic_mapping.json"
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            # Handle potential JSON errors
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                print(f"::error::Failed to decode JSON from {MAPPING_FILE}. Returning empty mapping.")
-                return {}
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f, indent=2) # Added indent for readability
-
 def post_zoom_transcript_to_discourse(meeting_id: str, occurrence_details: dict = None, meeting_uuid_for_summary: str = None):
     """
     Posts the Zoom meeting recording link and summary to Discourse.
@@ -55,8 +39,11 @@ def post_zoom_transcript_to_discourse(meeting_id: str, occurrence_details: dict
         print(f"::error::No valid Discourse topic ID found for meeting ID {meeting_id} (occurrence: {occurrence_details.get('issue_number', 'N/A') if occurrence_details else 'N/A'}). Provided ID: {discourse_topic_id}")
         return False # Indicate failure
 
+    # The occurrence (or, for legacy calls, the mapping entry) records the post once made
+    record = occurrence_details if isinstance(occurrence_details, dict) else entry
+
     # Check existing posts in Discourse
-    if discourse.check_if_transcript_posted(discourse_topic_id, meeting_id):
+    if discourse.check_if_transcript_posted(discourse_topic_id, meeting_id, record):
         print(f"Transcript already posted for meeting {meeting_id} in topic {discourse_topic_id}.")
         # Return True because the goal (transcript posted) is achieved.
         return True
@@ -249,24 +236,31 @@ def post_zoom_transcript_to_discourse(meeting_id: str, occurrence_details: dict
     else:
         post_content += "\n- *Download URL for chat not found.*"
 
+    # Telegram gets the same content once it is on Discourse. Failure there is
+    # less critical than Discourse posting, so it doesn't fail the function.
+    def send_to_telegram():
+        try:
+            tg.send_message(post_content)
+            print("Message sent to Telegram successfully.")
+        except Exception as e:
+            print(f"Error sending message to Telegram: {e}")
+
     try:
-        discourse.create_post(
+        # Inside a discourse_artifacts.batch() the post is written when the batch ends
+        discourse_artifacts.publish(
             topic_id=discourse_topic_id,
-            body=post_content
+            occurrence_key=discourse.transcript_key(meeting_id, record),
+            kind="transcript",
+            key=discourse.transcript_key(meeting_id, record),
+            body=post_content,
+            record=record,
+            on_published=send_to_telegram,
         )
-        print(f"Posted recording links for meeting {meeting_id} to topic {discourse_topic_id}")
+        print(f"Published recording links for meeting {meeting_id} to topic {discourse_topic_id}")
     except Exception as e:
-        print(f"::error::Failed to create Discourse post for topic {discourse_topic_id}: {e}")
+        print(f"::error::Failed to publish recording links to Discourse topic {discourse_topic_id}: {e}")
         # Failure to post to Discourse should be considered a failure of this function
         return False
 
-    # Now, send the same content to Telegram
-    # Failure here is less critical than Discourse posting, so don't return False
-    try:
-        tg.send_message(post_content)
-        print("Message sent to Telegram successfully.")
-    except Exception as e:
-        print(f"Error sending message to Telegram: {e}")
-
     # If we reached here, the core task (posting to Discourse) was successful.
     return True
\ No newline at end of file
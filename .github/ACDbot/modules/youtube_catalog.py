@@ -0,0 +1,204 @@
+"""
+Incremental catalog of the videos on a YouTube channel.
+
+Instead of paging through search().list (100 quota units per 50 videos), the
+catalog reads the channel's uploads playlist with playlistItems.list (1 unit
+per page). The playlist is newest first, so a refresh stops at the first video
+it already knows, and the first page is requested with the ETag of the last
+refresh: an unchanged channel costs a single 304.
+
+The catalog is kept in youtube_catalog.json and committed alongside the
+mapping. It only stores what lookups need: ID, title, publish time, and the
+Zoom meeting ID and GitHub issue number parsed from the description that
+upload_zoom_recording writes. Videos deleted from the channel stay listed
+until a full refresh.
+
+Configuration (environment variables):
+  - ACDBOT_YOUTUBE_CATALOG_MAX_AGE  seconds a refresh is reused within a run (default 300)
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from googleapiclient.errors import HttpError
+
+from modules import mapping_commit, youtube_quota
+from modules.meeting_store import write_json_atomic
+
+CATALOG_FILE = ".github/ACDbot/youtube_catalog.json"
+CATALOG_MAX_AGE = float(os.environ.get("ACDBOT_YOUTUBE_CATALOG_MAX_AGE", "300"))
+PAGE_SIZE = 50
+# The channel of the authenticated account
+MINE = "mine"
+
+MEETING_ID_PATTERN = re.compile(r"Original Zoom Meeting ID:\s*(\d+)")
+ISSUE_PATTERN = re.compile(r"/issues/(\d+)")
+
+_lock = threading.Lock()
+# channel key -> time.monotonic() of this process's last refresh
+_refreshed_at = {}
+
+
+def load_catalog():
+    """Returns the cached catalog ({"channels": {key: channel}}), empty if there is none."""
+    try:
+        with open(CATALOG_FILE, "r") as f:
+            catalog = json.load(f)
+    except FileNotFoundError:
+        catalog = None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARN] Could not read {CATALOG_FILE}, rebuilding the YouTube catalog: {e}")
+        catalog = None
+    if not isinstance(catalog, dict):
+        catalog = {}
+    catalog.setdefault("channels", {})
+    return catalog
+
+
+def save_catalog(catalog):
+    write_json_atomic(CATALOG_FILE, catalog)
+    mapping_commit.request_file_commit(CATALOG_FILE, "Refresh YouTube channel catalog", merge=merge_catalogs)
+
+
+def merge_catalogs(remote, local):
+    """Unions the videos another run added with ours; our playlist IDs and ETags win."""
+    merged = {"channels": dict(remote.get("channels", {}))}
+    for key, channel in local.get("channels", {}).items():
+        remote_channel = merged["channels"].get(key)
+        if remote_channel:
+            videos = {video["video_id"]: video for video in remote_channel.get("videos", [])}
+            videos.update((video["video_id"], video) for video in channel.get("videos", []))
+            channel = dict(channel, videos=sorted(videos.values(), key=_published_at, reverse=True))
+        merged["channels"][key] = channel
+    return merged
+
+
+def refresh_channel(youtube, channel_id=None, full=False):
+    """
+    Brings the catalog of channel_id (default: the authenticated channel) up to
+    date and returns its entry. A refresh done less than CATALOG_MAX_AGE seconds
+    ago in this process is reused. full=True re-reads the whole playlist.
+    """
+    key = channel_id or MINE
+    with _lock:
+        refreshed = _refreshed_at.get(key)
+        catalog = load_catalog()
+        channel = catalog["channels"].get(key)
+        if channel and not full and refreshed is not None and time.monotonic() - refreshed < CATALOG_MAX_AGE:
+            return channel
+
+        channel = dict(channel or {})
+        if not channel.get("uploads_playlist_id"):
+            channel["channel_id"], channel["uploads_playlist_id"] = _uploads_playlist(youtube, channel_id)
+
+        known = set() if full else {video["video_id"] for video in channel.get("videos", [])}
+        changes = _read_new_videos(youtube, channel, known, use_etag=not full)
+        if changes is not None:
+            new_videos, etag = changes
+            if full:
+                channel["videos"] = new_videos
+            else:
+                channel["videos"] = new_videos + channel.get("videos", [])
+            channel["etag"] = etag
+            print(f"[DEBUG] YouTube catalog: {len(new_videos)} new videos, {len(channel['videos'])} total")
+        channel.setdefault("videos", [])
+        channel["refreshed_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        catalog["channels"][key] = channel
+        save_catalog(catalog)
+        _refreshed_at[key] = time.monotonic()
+        return channel
+
+
+def list_videos(youtube, channel_id=None):
+    """Every video of the channel, newest first."""
+    return refresh_channel(youtube, channel_id)["videos"]
+
+
+def find_meeting_video(youtube, meeting_id, issue_number=None, channel_id=None):
+    """
+    Returns the catalog entry of a video uploaded for this Zoom meeting (and,
+    if given, this issue's occurrence), or None.
+    """
+    meeting_id = str(meeting_id)
+    for video in list_videos(youtube, channel_id):
+        if video.get("meeting_id") != meeting_id:
+            continue
+        if issue_number is not None and video.get("issue_number") != int(issue_number):
+            continue
+        return video
+    return None
+
+
+def _uploads_playlist(youtube, channel_id):
+    """(channel ID, uploads playlist ID) of channel_id or the authenticated channel."""
+    if channel_id:
+        request = youtube.channels().list(part="id,contentDetails", id=channel_id)
+    else:
+        request = youtube.channels().list(part="id,contentDetails", mine=True)
+    response = youtube_quota.execute(request, "channels.list", youtube_quota.DISCOVERY)
+    items = response.get("items", [])
+    if not items:
+        raise ValueError(f"YouTube channel {channel_id or '(authenticated)'} not found")
+    return items[0]["id"], items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+
+def _read_new_videos(youtube, channel, known, use_etag):
+    """
+    Pages through the uploads playlist until the first known video. Returns
+    (new videos newest first, ETag of the first page), or None if the first
+    page is unchanged since the stored ETag.
+    """
+    videos = []
+    etag = None
+    page_token = None
+    while True:
+        request = youtube.playlistItems().list(
+            part="snippet,contentDetails",
+            playlistId=channel["uploads_playlist_id"],
+            maxResults=PAGE_SIZE,
+            pageToken=page_token,
+        )
+        if page_token is None and use_etag and channel.get("etag"):
+            request.headers["If-None-Match"] = channel["etag"]
+        try:
+            response = youtube_quota.execute(request, "playlistItems.list", youtube_quota.DISCOVERY)
+        except HttpError as e:
+            if e.resp.status == 304:
+                return None
+            raise
+        if page_token is None:
+            etag = response.get("etag")
+
+        for item in response.get("items", []):
+            video = _catalog_entry(item)
+            if video["video_id"] in known:
+                return videos, etag
+            videos.append(video)
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return videos, etag
+
+
+def _catalog_entry(item):
+    snippet = item.get("snippet", {})
+    details = item.get("contentDetails", {})
+    description = snippet.get("description", "")
+    meeting = MEETING_ID_PATTERN.search(description)
+    issue = ISSUE_PATTERN.search(description)
+    return {
+        "video_id": details.get("videoId") or snippet.get("resourceId", {}).get("videoId"),
+        "title": snippet.get("title"),
+        "published_at": details.get("videoPublishedAt") or snippet.get("publishedAt"),
+        "meeting_id": meeting.group(1) if meeting else None,
+        "issue_number": int(issue.group(1)) if issue else None,
+    }
+
+
+def _published_at(video):
+    # ISO 8601 UTC timestamps sort chronologically as strings
+    return "" if video.get("published_at") is None else video["published_at"]
@@ -0,0 +1,199 @@
+"""
+Daily YouTube Data API quota budget.
+
+Every YouTube call is charged against a ledger of the units spent today,
+persisted in youtube_quota.json and committed alongside the mapping, so
+separate workflow runs share one budget. The quota resets at midnight
+Pacific time, like Google's.
+
+Calls have a priority. Uploads may spend the whole budget; stream creation has
+to leave UPLOAD_RESERVE units for uploads; discovery (search/list scans) has to
+leave DISCOVERY_RESERVE. A call that would cut into its reserve raises
+QuotaDeferred before anything is sent, so callers can skip it and retry on a
+later run. A quotaExceeded error from the API marks the day's budget as used up.
+
+Configuration (environment variables):
+  - ACDBOT_YOUTUBE_DAILY_QUOTA        units per day (default 10000)
+  - ACDBOT_YOUTUBE_UPLOAD_RESERVE     units stream creation leaves free (default 3200)
+  - ACDBOT_YOUTUBE_DISCOVERY_RESERVE  units discovery calls leave free (default 5000)
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import pytz
+
+from modules import mapping_commit
+from modules.meeting_store import write_json_atomic
+
+LEDGER_FILE = ".github/ACDbot/youtube_quota.json"
+DAILY_QUOTA = int(os.environ.get("ACDBOT_YOUTUBE_DAILY_QUOTA", "10000"))
+UPLOAD_RESERVE = int(os.environ.get("ACDBOT_YOUTUBE_UPLOAD_RESERVE", "3200"))
+DISCOVERY_RESERVE = int(os.environ.get("ACDBOT_YOUTUBE_DISCOVERY_RESERVE", "5000"))
+QUOTA_TIMEZONE = pytz.timezone("America/Los_Angeles")
+
+# Priorities, highest first
+UPLOAD = "upload"
+STREAM = "stream"
+DISCOVERY = "discovery"
+
+# Units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+COSTS = {
+    "videos.insert": 1600,
+    "search.list": 100,
+    "liveBroadcasts.insert": 50,
+    "liveBroadcasts.bind": 50,
+    "liveBroadcasts.delete": 50,
+    "liveStreams.insert": 50,
+    "thumbnails.set": 50,
+    "videos.update": 50,
+}
+DEFAULT_COST = 1  # list calls
+
+_lock = threading.Lock()
+_run_id = None
+
+
+class QuotaDeferred(Exception):
+    """Raised when a call would spend quota reserved for higher-priority calls."""
+
+
+def cost(method):
+    return COSTS.get(method, DEFAULT_COST)
+
+
+def reserve_for(priority):
+    """Units a call of this priority must leave unspent."""
+    if priority == UPLOAD:
+        return 0
+    if priority == STREAM:
+        return UPLOAD_RESERVE
+    return DISCOVERY_RESERVE
+
+
+def quota_day(now=None):
+    """The quota day (Pacific date) as YYYY-MM-DD."""
+    now = now or datetime.now(pytz.UTC)
+    return now.astimezone(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def load_ledger():
+    """Returns today's ledger ({"date", "runs": {run_id: {"units", "calls"}}}), empty on a new day."""
+    today = quota_day()
+    try:
+        with open(LEDGER_FILE, "r") as f:
+            ledger = json.load(f)
+    except FileNotFoundError:
+        ledger = None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARN] Could not read {LEDGER_FILE}, starting a new quota ledger: {e}")
+        ledger = None
+    if not isinstance(ledger, dict) or ledger.get("date") != today:
+        ledger = {"date": today, "runs": {}}
+    ledger.setdefault("runs", {})
+    return ledger
+
+
+def used_units(ledger):
+    return sum(run.get("units", 0) for run in ledger["runs"].values())
+
+
+def available(priority=UPLOAD):
+    """Units a call of this priority may still spend today."""
+    with _lock:
+        return max(0, DAILY_QUOTA - used_units(load_ledger()) - reserve_for(priority))
+
+
+def usage():
+    """Today's usage: date, used, limit, remaining and calls per method."""
+    with _lock:
+        ledger = load_ledger()
+    calls = {}
+    for run in ledger["runs"].values():
+        for method, count in run.get("calls", {}).items():
+            calls[method] = calls.get(method, 0) + count
+    used = used_units(ledger)
+    return {
+        "date": ledger["date"],
+        "used": used,
+        "limit": DAILY_QUOTA,
+        "remaining": max(0, DAILY_QUOTA - used),
+        "calls": calls,
+    }
+
+
+def charge(method, priority=STREAM, units=None):
+    """
+    Records a call before it is made. Raises QuotaDeferred, recording nothing,
+    if it would leave less than the priority's reserve.
+    """
+    units = cost(method) if units is None else units
+    with _lock:
+        ledger = load_ledger()
+        remaining = DAILY_QUOTA - used_units(ledger)
+        if remaining - units < reserve_for(priority):
+            raise QuotaDeferred(
+                f"YouTube {method} ({units} units, {priority} priority) deferred: "
+                f"{remaining} of {DAILY_QUOTA} units left today, {reserve_for(priority)} reserved"
+            )
+        run = ledger["runs"].setdefault(current_run_id(), {"units": 0, "calls": {}})
+        run["units"] += units
+        run["calls"][method] = run["calls"].get(method, 0) + 1
+        _save_ledger(ledger)
+
+
+def mark_exhausted():
+    """The API reported quotaExceeded: nothing else is spent until the quota resets."""
+    with _lock:
+        ledger = load_ledger()
+        run = ledger["runs"].setdefault(current_run_id(), {"units": 0, "calls": {}})
+        run["units"] += max(0, DAILY_QUOTA - used_units(ledger))
+        _save_ledger(ledger)
+    print(f"[WARN] YouTube quota exhausted for {ledger['date']}, deferring further calls.")
+
+
+def execute(request, method, priority=STREAM):
+    """Charges method's cost and executes a googleapiclient request."""
+    charge(method, priority)
+    try:
+        return request.execute()
+    except Exception as e:
+        if is_quota_exceeded(e):
+            mark_exhausted()
+        raise
+
+
+def is_quota_exceeded(error):
+    content = getattr(error, "content", b"") or b""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    return "quotaExceeded" in content or "dailyLimitExceeded" in content
+
+
+def merge_ledgers(remote, local):
+    """Concurrent runs each add their own run entry; keep the later day, and every run of it."""
+    if remote.get("date") != local.get("date"):
+        return remote if remote.get("date", "") > local.get("date", "") else local
+    runs = dict(remote.get("runs", {}))
+    for run_id, run in local.get("runs", {}).items():
+        if run.get("units", 0) >= runs.get(run_id, {}).get("units", 0):
+            runs[run_id] = run
+    return {"date": local["date"], "runs": runs}
+
+
+def current_run_id():
+    global _run_id
+    if _run_id is None:
+        run = os.environ.get("GITHUB_RUN_ID")
+        if run:
+            _run_id = f"{os.environ.get('GITHUB_WORKFLOW', 'run')}-{run}.{os.environ.get('GITHUB_RUN_ATTEMPT', '1')}"
+        else:
+            _run_id = f"local-{os.getpid()}-{int(time.time())}"
+    return _run_id
+
+
+def _save_ledger(ledger):
+    write_json_atomic(LEDGER_FILE, ledger)
+    mapping_commit.request_file_commit(LEDGER_FILE, f"YouTube quota ledger for {ledger['date']}", merge=merge_ledgers)
@@ -7,10 +7,17 @@ from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
 import calendar
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaInMemoryUpload
+from modules import youtube_catalog, youtube_quota
 
 # Define the thumbnail path (corrected)
 THUMBNAIL_PATH = ".github/ACDbot/Pectra YT.jpg"
+# Broadcast insert, bind and thumbnail for each event; the ingestion stream is shared
+BROADCAST_QUOTA_COST = sum(youtube_quota.cost(method) for method in (
+    "liveBroadcasts.insert", "liveBroadcasts.bind", "thumbnails.set"))
+# The batch endpoint accepts at most this many calls per request
+BATCH_LIMIT = 50
+_thumbnail_bytes = None
 
 def get_youtube_service():
     """
@@ -62,22 +69,22 @@ def get_channel_id_by_custom_url(custom_url):
     try:
         youtube = get_youtube_service()
 
-        response = youtube.channels().list(
+        response = youtube_quota.execute(youtube.channels().list(
             part='id',
             forUsername=custom_url
-        ).execute()
+        ), "channels.list", youtube_quota.DISCOVERY)
 
         items = response.get('items', [])
         if items:
             return items[0]['id']
         else:
             # Try retrieving by channel custom URL path
-            response = youtube.search().list(
+            response = youtube_quota.execute(youtube.search().list(
                 part='snippet',
                 q=custom_url,
                 type='channel',
                 maxResults=1
-            ).execute()
+            ), "search.list", youtube_quota.DISCOVERY)
             items = response.get('items', [])
             if items:
                 return items[0]['snippet']['channelId']
@@ -88,30 +95,16 @@ def get_channel_id_by_custom_url(custom_url):
         print(f"::error::{error_msg}")
         raise
 
-def get_channel_videos(channel_id):
+def get_channel_videos(channel_id=None):
+    """
+    Lists the channel's videos (default: the authenticated channel), newest
+    first, as youtube_catalog entries ({"video_id", "title", "published_at",
+    "meeting_id", "issue_number"}). Only videos uploaded since the last call
+    are fetched.
+    """
     try:
         youtube = get_youtube_service()
-
-        videos = []
-        next_page_token = None
-
-        while True:
-            res = youtube.search().list(
-                part='snippet',
-                channelId=channel_id,
-                maxResults=50,
-                pageToken=next_page_token,
-                order='date',
-                type='video'
-            ).execute()
-
-            videos.extend(res['items'])
-            next_page_token = res.get('nextPageToken')
-
-            if not next_page_token:
-                break
-
-        return videos
+        return youtube_catalog.list_videos(youtube, channel_id)
     except Exception as e:
         error_msg = f"Error getting channel videos: {str(e)}"
         print(f"::error::{error_msg}")
@@ -150,7 +143,7 @@ def create_youtube_stream(title, description, start_time, privacy_status='public
         print(f"[DEBUG] Using formatted start time: {start_time}")
         
         # Create the broadcast
-        broadcast_insert_response = youtube.liveBroadcasts().insert(
+        broadcast_insert_response = youtube_quota.execute(youtube.liveBroadcasts().insert(
             part="snippet,status,contentDetails", # Add contentDetails for thumbnail
             body={
                 "snippet": {
@@ -167,29 +160,17 @@ def create_youtube_stream(title, description, start_time, privacy_status='public
                     "enableAutoStop": True   # Example: Enable auto stop
                 }
             }
-        ).execute()
+        ), "liveBroadcasts.insert")
 
         broadcast_id = broadcast_insert_response["id"]
         print(f"[DEBUG] Created broadcast with ID: {broadcast_id}")
         
         # --- Add Thumbnail Setting Logic --- 
-        if os.path.exists(THUMBNAIL_PATH):
-            print(f"[DEBUG] Setting custom thumbnail for broadcast {broadcast_id} from {THUMBNAIL_PATH}")
-            try:
-                request = youtube.thumbnails().set(
-                    videoId=broadcast_id, # Use broadcast_id for thumbnail
-                    media_body=MediaFileUpload(THUMBNAIL_PATH)
-                )
-                response = request.execute()
-                print(f"[DEBUG] Successfully set custom thumbnail: {response['items'][0]['default']['url']}")
-            except Exception as thumb_error:
-                print(f"::warning::Failed to set custom thumbnail for broadcast {broadcast_id}: {thumb_error}")
-        else:
-            print(f"::warning::Thumbnail file not found at {THUMBNAIL_PATH}. Skipping custom thumbnail.")
+        set_broadcast_thumbnail(youtube, broadcast_id)
         # --- End Thumbnail Setting Logic --- 
 
         # Create the stream
-        stream_insert_response = youtube.liveStreams().insert(
+        stream_insert_response = youtube_quota.execute(youtube.liveStreams().insert(
             part="snippet,cdn",
             body={
                 "snippet": {
@@ -201,17 +182,17 @@ def create_youtube_stream(title, description, start_time, privacy_status='public
                     "resolution": "variable"
                 }
             }
-        ).execute()
+        ), "liveStreams.insert")
 
         stream_id = stream_insert_response["id"]
         print(f"[DEBUG] Created stream with ID: {stream_id}")
 
         # Bind the broadcast to the stream
-        youtube.liveBroadcasts().bind(
+        youtube_quota.execute(youtube.liveBroadcasts().bind(
             part="id,contentDetails",
             id=broadcast_id,
             streamId=stream_id
-        ).execute()
+        ), "liveBroadcasts.bind")
         print(f"[DEBUG] Bound broadcast {broadcast_id} to stream {stream_id}")
 
         # Get the ingestion URL and stream name for RTMP streaming
@@ -232,6 +213,177 @@ def create_youtube_stream(title, description, start_time, privacy_status='public
             print(f"[DEBUG] This may be a quota issue with the YouTube API")
         raise
 
+def read_thumbnail():
+    """The custom thumbnail's bytes, read from disk once per process (None if the file is missing)"""
+    global _thumbnail_bytes
+    if _thumbnail_bytes is None and os.path.exists(THUMBNAIL_PATH):
+        with open(THUMBNAIL_PATH, "rb") as f:
+            _thumbnail_bytes = f.read()
+    return _thumbnail_bytes
+
+def set_broadcast_thumbnail(youtube, broadcast_id):
+    """Sets the shared custom thumbnail on a broadcast; failures only warn"""
+    thumbnail = read_thumbnail()
+    if thumbnail is None:
+        print(f"::warning::Thumbnail file not found at {THUMBNAIL_PATH}. Skipping custom thumbnail.")
+        return
+    print(f"[DEBUG] Setting custom thumbnail for broadcast {broadcast_id} from {THUMBNAIL_PATH}")
+    try:
+        request = youtube.thumbnails().set(
+            videoId=broadcast_id, # Use broadcast_id for thumbnail
+            media_body=MediaInMemoryUpload(thumbnail, mimetype="image/jpeg")
+        )
+        response = youtube_quota.execute(request, "thumbnails.set")
+        print(f"[DEBUG] Successfully set custom thumbnail: {response['items'][0]['default']['url']}")
+    except Exception as thumb_error:
+        print(f"::warning::Failed to set custom thumbnail for broadcast {broadcast_id}: {thumb_error}")
+
+def execute_batch(youtube, calls):
+    """
+    Sends calls ((key, request, quota method) tuples) through the batch
+    endpoint, BATCH_LIMIT per round trip. Returns ({key: response}, {key: error}).
+    """
+    responses, errors = {}, {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            errors[request_id] = exception
+            if youtube_quota.is_quota_exceeded(exception):
+                youtube_quota.mark_exhausted()
+        else:
+            responses[request_id] = response
+
+    for offset in range(0, len(calls), BATCH_LIMIT):
+        batch = youtube.new_batch_http_request(callback=collect)
+        for key, request, method in calls[offset:offset + BATCH_LIMIT]:
+            youtube_quota.charge(method)
+            batch.add(request, request_id=key)
+        batch.execute()
+    return responses, errors
+
+def delete_broadcasts(youtube, broadcast_ids, reason):
+    """
+    Deletes broadcasts that create_streams_batch could not use, in one batch.
+    Any that cannot be deleted are reported by ID for manual cleanup.
+    """
+    if not broadcast_ids:
+        return
+    print(f"[DEBUG] Deleting broadcasts {', '.join(broadcast_ids)}: {reason}")
+    calls = [(broadcast_id, youtube.liveBroadcasts().delete(id=broadcast_id), "liveBroadcasts.delete")
+             for broadcast_id in broadcast_ids]
+    try:
+        _, errors = execute_batch(youtube, calls)
+    except Exception as e:
+        errors = {broadcast_id: e for broadcast_id in broadcast_ids}
+    for broadcast_id, error in errors.items():
+        print(f"::warning::Could not delete YouTube broadcast {broadcast_id} ({reason}), delete it manually: {error}")
+
+def create_streams_batch(events, description, privacy_status='public', stream_title=None):
+    """
+    Creates a live broadcast for each (title, start_time) in events, all bound
+    to one shared RTMP ingestion stream.
+
+    The stream and broadcast inserts go out in one batch request and the binds
+    in a second; thumbnails (media uploads, which the batch endpoint does not
+    take) are then set one by one from bytes read once. Events whose broadcast
+    could not be created or bound to the stream are left out with a warning
+    (unbound broadcasts are deleted, as they could never go live). If the
+    stream itself cannot be created, the broadcasts are deleted and the error
+    is raised.
+    Returns a list of dicts like create_youtube_stream, plus scheduled_time.
+    """
+    youtube = get_youtube_service()
+    stream_title = stream_title or (events[0][0] if events else "")
+
+    calls = [("stream", youtube.liveStreams().insert(
+        part="snippet,cdn",
+        body={
+            "snippet": {
+                "title": stream_title,
+            },
+            "cdn": {
+                "frameRate": "variable",
+                "ingestionType": "rtmp",
+                "resolution": "variable"
+            }
+        }
+    ), "liveStreams.insert")]
+    for i, (title, start_time) in enumerate(events):
+        calls.append((f"broadcast-{i}", youtube.liveBroadcasts().insert(
+            part="snippet,status,contentDetails",
+            body={
+                "snippet": {
+                    "title": title,
+                    "scheduledStartTime": start_time,
+                    "description": description,
+                },
+                "status": {
+                    "privacyStatus": privacy_status,
+                    "selfDeclaredMadeForKids": False,
+                },
+                "contentDetails": {
+                    "enableAutoStart": True,
+                    "enableAutoStop": True
+                }
+            }
+        ), "liveBroadcasts.insert"))
+
+    print(f"[DEBUG] Creating 1 ingestion stream and {len(events)} broadcasts in one batch")
+    responses, errors = execute_batch(youtube, calls)
+    if "stream" not in responses:
+        orphans = [responses[key]["id"] for key, _, _ in calls[1:] if key in responses]
+        delete_broadcasts(youtube, orphans, "their ingestion stream could not be created")
+        raise errors.get("stream") or RuntimeError("YouTube batch returned no ingestion stream")
+    stream = responses["stream"]
+    stream_id = stream["id"]
+    ingestion_info = stream.get("cdn", {}).get("ingestionInfo", {})
+    ingestion_address = ingestion_info.get("ingestionAddress", "")
+    stream_name = ingestion_info.get("streamName", "")
+    rtmp_url = f"{ingestion_address}/{stream_name}" if ingestion_address and stream_name else ""
+    print(f"[DEBUG] Created stream with ID: {stream_id}")
+
+    created = []
+    for i, (title, start_time) in enumerate(events):
+        key = f"broadcast-{i}"
+        if key in responses:
+            created.append((responses[key]["id"], start_time))
+            print(f"[DEBUG] Created broadcast with ID: {responses[key]['id']} ({title})")
+        else:
+            print(f"::warning::Failed to create YouTube broadcast '{title}': {errors.get(key)}")
+    if events and not created:
+        raise RuntimeError(f"No YouTube broadcast could be created: {next(iter(errors.values()), 'unknown error')}")
+
+    bind_calls = [
+        (broadcast_id, youtube.liveBroadcasts().bind(
+            part="id,contentDetails",
+            id=broadcast_id,
+            streamId=stream_id
+        ), "liveBroadcasts.bind")
+        for broadcast_id, _ in created
+    ]
+    _, bind_errors = execute_batch(youtube, bind_calls)
+    for broadcast_id, error in bind_errors.items():
+        print(f"::warning::Failed to bind broadcast {broadcast_id} to stream {stream_id}: {error}")
+    if bind_errors:
+        delete_broadcasts(youtube, list(bind_errors), f"they could not be bound to stream {stream_id}")
+        created = [(broadcast_id, start_time) for broadcast_id, start_time in created
+                   if broadcast_id not in bind_errors]
+        if not created:
+            raise RuntimeError(f"No YouTube broadcast could be bound to stream {stream_id}: "
+                               f"{next(iter(bind_errors.values()))}")
+
+    streams = []
+    for broadcast_id, start_time in created:
+        set_broadcast_thumbnail(youtube, broadcast_id)
+        streams.append({
+            "broadcast_id": broadcast_id,
+            "stream_id": stream_id,
+            "stream_url": f"https://youtube.com/watch?v={broadcast_id}",
+            "rtmp_url": rtmp_url,
+            "scheduled_time": start_time,
+        })
+    return streams
+
 def create_recurring_streams(title, description, start_time, occurrence_rate, num_events=1):
     """
     Creates multiple YouTube live stream events for recurring meetings
@@ -245,7 +397,7 @@ def create_recurring_streams(title, description, start_time, occurrence_rate, nu
         List of dictionaries containing stream details
     """
     try:
-        streams = []
+        events = []
         
         # Ensure start_time is parsed correctly
         if isinstance(start_time, str):
@@ -257,6 +409,14 @@ def create_recurring_streams(title, description, start_time, occurrence_rate, nu
             current_time = start_time
             
         print(f"[DEBUG] Creating {num_events} recurring stream(s) for '{title}' starting at {current_time}")
+
+        # Don't leave a series half scheduled: check the whole batch fits the budget first
+        needed = youtube_quota.cost("liveStreams.insert") + num_events * BROADCAST_QUOTA_COST
+        if youtube_quota.available(youtube_quota.STREAM) < needed:
+            raise youtube_quota.QuotaDeferred(
+                f"Creating {num_events} stream(s) needs {needed} YouTube quota units, "
+                f"only {youtube_quota.available(youtube_quota.STREAM)} available for streams today"
+            )
         
         for i in range(num_events):
             # Calculate next event time based on occurrence rate
@@ -373,20 +533,11 @@ def create_recurring_streams(title, description, start_time, occurrence_rate, nu
             
             # Use the original title, only add number if creating multiple streams
             event_title = title if num_events == 1 else f"{title} {i+1}"
-            print(f"[DEBUG] Creating stream {i+1}/{num_events}: {event_title}")
-            
-            stream_details = create_youtube_stream(
-                event_title,
-                description, # Description uses the base title passed in
-                formatted_start_time
-            )
-            
-            # Store the scheduled time in the stream details for later use
-            stream_details['scheduled_time'] = formatted_start_time
-            
-            streams.append(stream_details)
-        
-        return streams
+            print(f"[DEBUG] Scheduling stream {i+1}/{num_events}: {event_title} at {formatted_start_time}")
+            events.append((event_title, formatted_start_time))
+
+        # Description uses the base title passed in; all events share one ingestion stream
+        return create_streams_batch(events, description, stream_title=title)
     except Exception as e:
         error_msg = f"Error creating recurring YouTube streams: {str(e)}"
         print(f"::error::{error_msg}")
@@ -400,7 +551,7 @@ def get_live_streams(channel_id):
         next_page_token = None
 
         while True:
-            res = youtube.search().list(
+            res = youtube_quota.execute(youtube.search().list(
                 part='snippet',
                 channelId=channel_id,
                 eventType='live',
@@ -408,7 +559,7 @@ def get_live_streams(channel_id):
                 order='date',
                 maxResults=50,
                 pageToken=next_page_token
-            ).execute()
+            ), "search.list", youtube_quota.DISCOVERY)
 
             live_streams.extend(res['items'])
             next_page_token = res.get('nextPageToken')
@@ -431,9 +582,7 @@ if __name__ == "__main__":
         videos = get_channel_videos(channel_id)
         print("Videos:")
         for video in videos:
-            video_id = video['id']['videoId']
-            title = video['snippet']['title']
-            print(f"{title}: https://www.youtube.com/watch?v={video_id}")
+            print(f"{video['title']}: https://www.youtube.com/watch?v={video['video_id']}")
 
         live_streams = get_live_streams(channel_id)
         print("\nLive Streams:")
@@ -4,6 +4,14 @@ from datetime import datetime, timedelta, timezone
 import json
 import urllib.parse
 import calendar
+import contextlib
+import threading
+import time
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+from modules import http_client
 
 account_id=os.environ.get("ZOOM_ACCOUNT_ID", "")
 client_id=os.environ["ZOOM_CLIENT_ID"]
@@ -13,12 +21,25 @@ refresh_token=os.environ.get("ZOOM_REFRESH_TOKEN", "")
 auth_token_url = "https://zoom.us/oauth/token"
 api_base_url = "https://api.zoom.us/v2"
 
-def create_meeting(topic, start_time, duration):
+# Access tokens are shared across processes through the same tokens/ directory
+# that already receives the rotated refresh token.
+TOKEN_DIR = os.path.join(os.getcwd(), ".github", "ACDbot", "tokens")
+REFRESH_TOKEN_FILE = os.path.join(TOKEN_DIR, "zoom_new_refresh_token.txt")
+ACCESS_TOKEN_CACHE_FILE = os.path.join(TOKEN_DIR, "zoom_access_token.json")
+TOKEN_LOCK_FILE = os.path.join(TOKEN_DIR, "zoom_token.lock")
+# Zoom access tokens live for an hour; refresh a few minutes before the deadline
+DEFAULT_TOKEN_LIFETIME = 3600
+TOKEN_EXPIRY_MARGIN = int(os.environ.get("ZOOM_TOKEN_EXPIRY_MARGIN", "300"))
+# Largest page Zoom allows for the recordings list
+RECORDINGS_PAGE_SIZE = 300
+
+_token_lock = threading.Lock()
+_access_token = None
+_access_token_expires_at = 0.0
 
-    access_token = get_access_token()
+def create_meeting(topic, start_time, duration):
 
     headers = {
-        "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
     
@@ -48,9 +69,9 @@ def create_meeting(topic, start_time, duration):
             },
         }
     }
-    resp = requests.post(f"{api_base_url}/users/me/meetings", 
-                            headers=headers, 
-                            json=payload)
+    resp = api_request("POST", f"{api_base_url}/users/me/meetings", 
+                       headers=headers, 
+                       json=payload)
     
     if resp.status_code!=201:
         print("Unable to generate meeting link")
@@ -73,9 +94,128 @@ def get_access_token():
     """
     Get an access token using the refresh token (OAuth 2.0) for a General (User Managed) app
     instead of account_credentials used for Server-to-Server apps.
+
+    The token is cached in memory and in the tokens/ directory together with its
+    expiry deadline, so every Zoom call in this process (and later processes in the
+    same checkout) reuses it. A refresh only happens when the token is within
+    TOKEN_EXPIRY_MARGIN seconds of expiring, or after invalidate_access_token().
     """
-    global refresh_token
-    
+    global _access_token, _access_token_expires_at
+
+    if _token_is_fresh(_access_token, _access_token_expires_at):
+        return _access_token
+
+    with _token_lock, _token_file_lock():
+        # Another thread may have refreshed while we were waiting for the lock
+        if _token_is_fresh(_access_token, _access_token_expires_at):
+            return _access_token
+        # Another process may have left a valid token behind
+        cached_token, cached_expires_at = _read_cached_access_token()
+        if _token_is_fresh(cached_token, cached_expires_at):
+            print("[DEBUG] Reusing cached Zoom access token")
+            _access_token = cached_token
+            _access_token_expires_at = cached_expires_at
+            return _access_token
+
+        return _refresh_access_token()
+
+def invalidate_access_token(token):
+    """
+    Drops a token Zoom rejected (revoked, or replaced before its deadline) from
+    memory and the tokens/ cache, so the next get_access_token() call refreshes.
+    A newer token another thread or process already fetched is kept.
+    """
+    global _access_token, _access_token_expires_at
+
+    with _token_lock, _token_file_lock():
+        if _access_token == token:
+            _access_token = None
+            _access_token_expires_at = 0.0
+        if _read_cached_access_token()[0] == token:
+            try:
+                os.remove(ACCESS_TOKEN_CACHE_FILE)
+            except OSError:
+                pass
+
+def api_request(method, url, headers=None, **kwargs):
+    """
+    Sends a request to Zoom (an API endpoint or a recording download URL) with
+    the current access token, through http_client. If Zoom answers 401, the
+    token is invalidated and the request is sent once more with a fresh one.
+    """
+    token = get_access_token()
+    response = http_client.request(method, url, headers=_with_token(headers, token), **kwargs)
+    if response.status_code == 401:
+        print(f"[WARN] Zoom rejected the access token for {method} {url.split('?')[0]}, refreshing it and retrying")
+        response.close()
+        invalidate_access_token(token)
+        response = http_client.request(method, url, headers=_with_token(headers, get_access_token()), **kwargs)
+    return response
+
+def _with_token(headers, token):
+    return dict(headers or {}, Authorization=f"Bearer {token}")
+
+def _token_is_fresh(token, expires_at):
+    return bool(token) and time.time() < expires_at - TOKEN_EXPIRY_MARGIN
+
+@contextlib.contextmanager
+def _token_file_lock():
+    """Serialises token refreshes across processes sharing the tokens/ directory."""
+    if fcntl is None:
+        yield
+        return
+    try:
+        os.makedirs(TOKEN_DIR, exist_ok=True)
+        lock_file = open(TOKEN_LOCK_FILE, "w")
+    except OSError as e:
+        print(f"[WARN] Could not open Zoom token lock file, continuing without it: {e}")
+        yield
+        return
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+def _read_cached_access_token():
+    try:
+        with open(ACCESS_TOKEN_CACHE_FILE, "r") as f:
+            cached = json.load(f)
+        return cached.get("access_token"), float(cached.get("expires_at", 0))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None, 0.0
+
+def _write_cached_access_token(token, expires_at):
+    try:
+        os.makedirs(TOKEN_DIR, exist_ok=True)
+        tmp_file = f"{ACCESS_TOKEN_CACHE_FILE}.tmp"
+        # The file holds a bearer token, keep it private to the runner user
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"access_token": token, "expires_at": expires_at}, f)
+        os.replace(tmp_file, ACCESS_TOKEN_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: Failed to cache Zoom access token: {str(e)}")
+
+def _read_rotated_refresh_token():
+    """Returns the refresh token saved by the last rotation in this checkout, if any."""
+    try:
+        with open(REFRESH_TOKEN_FILE, "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _refresh_access_token():
+    """Performs the OAuth refresh POST. Callers must hold the token locks."""
+    global refresh_token, _access_token, _access_token_expires_at
+
+    # A refresh in another process rotates the refresh token and invalidates ours
+    rotated_refresh_token = _read_rotated_refresh_token()
+    if rotated_refresh_token and rotated_refresh_token != refresh_token:
+        print("[DEBUG] Using refresh token rotated by a previous run")
+        refresh_token = rotated_refresh_token
+
     if not refresh_token:
         raise ValueError("ZOOM_REFRESH_TOKEN environment variable is required for User Managed apps")
         
@@ -84,7 +224,8 @@ def get_access_token():
         "refresh_token": refresh_token
     }
     
-    response = requests.post(auth_token_url, 
+    requested_at = time.time()
+    response = http_client.post(auth_token_url, 
                              auth=(client_id, client_secret), 
                              data=data)
     
@@ -106,16 +247,21 @@ def get_access_token():
             
             # Save to a temporary file in a shared location that can be read by other workflow steps
             try:
-                token_dir = os.path.join(os.getcwd(), ".github", "ACDbot", "tokens")
-                os.makedirs(token_dir, exist_ok=True)
-                token_file = os.path.join(token_dir, "zoom_new_refresh_token.txt")
-                with open(token_file, "w") as f:
+                os.makedirs(TOKEN_DIR, exist_ok=True)
+                with open(REFRESH_TOKEN_FILE, "w") as f:
                     f.write(new_refresh_token)
-                print(f"New refresh token saved to {token_file} for GitHub Actions update")
+                print(f"New refresh token saved to {REFRESH_TOKEN_FILE} for GitHub Actions update")
             except Exception as e:
                 print(f"Warning: Failed to save new refresh token to file: {str(e)}")
+
+        # Measure expiry from when the request was sent so a slow response can't overrun it
+        expires_in = response_data.get("expires_in", DEFAULT_TOKEN_LIFETIME)
+        _access_token = response_data["access_token"]
+        _access_token_expires_at = requested_at + float(expires_in)
+        _write_cached_access_token(_access_token, _access_token_expires_at)
+        print(f"[DEBUG] Refreshed Zoom access token (expires in {expires_in}s)")
             
-        return response_data["access_token"]
+        return _access_token
 
 def get_meeting_recording(meeting_identifier):
     """Fetches recording details for a specific meeting instance using its ID or UUID.
@@ -127,11 +273,6 @@ def get_meeting_recording(meeting_identifier):
     Returns:
         A dictionary containing recording details, or None if an error occurs.
     """
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
-    
     # Check if the identifier is a UUID that needs double encoding
     identifier_str = str(meeting_identifier)
     if "/" in identifier_str or "//" in identifier_str:
@@ -150,7 +291,7 @@ def get_meeting_recording(meeting_identifier):
     url = f"{api_base_url}/meetings/{encoded_identifier}/recordings"
     print(f"[DEBUG] Requesting recordings from URL: {url}")
 
-    response = requests.get(url, headers=headers)
+    response = api_request("GET", url)
     if response.status_code != 200:
         error_details = response.json()
         print(f"Error fetching meeting recording: {response.status_code} {response.reason} - {error_details}")
@@ -165,12 +306,8 @@ def get_meeting_transcript(meeting_id):
     :param meeting_id: The Zoom meeting ID
     :return: Transcript text content
     """
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
     url = f"{api_base_url}/meetings/{meeting_id}/recordings"
-    response = requests.get(url, headers=headers)
+    response = api_request("GET", url)
     if response.status_code != 200:
         print(f"Error fetching meeting recordings: {response.status_code} {response.text}")
         response.raise_for_status()
@@ -193,56 +330,77 @@ def get_meeting_transcript(meeting_id):
         raise ValueError("Transcript download URL not found.")
 
     # Download the transcript file
-    transcript_content = download_zoom_file(download_url, access_token)
+    transcript_content = download_zoom_file(download_url)
     return transcript_content
 
-def download_zoom_file(download_url, access_token):
+def download_zoom_file(download_url):
     """
     Downloads a file from Zoom using the access token.
 
     :param download_url: The URL to the file
-    :param access_token: Zoom access token
     :return: Content of the file
     """
-    response = requests.get(download_url, headers={"Authorization": f"Bearer {access_token}"})
+    response = api_request("GET", download_url)
     if response.status_code != 200:
         print(f"Error downloading file: {response.status_code} {response.text}")
         response.raise_for_status()
     return response.content.decode('utf-8')
 
-def get_recordings_list():
+def iter_recordings(from_date=None, to_date=None, page_size=RECORDINGS_PAGE_SIZE):
     """
-    Retrieves a list of cloud recordings for the user.
+    Yields the cloud recordings ("meetings" items of /users/me/recordings) between
+    from_date and to_date (dates or datetimes, default: the last 30 days),
+    following next_page_token across pages. Zoom only accepts ranges of up to a
+    month per query, so longer ranges are walked in 30-day windows, newest first.
     """
-    access_token = get_access_token()
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
-    params = {
-        "page_size": 100,
-        "from": (datetime.utcnow() - timedelta(days=30)).strftime("%Y-%m-%d"),  # Extend from 7 to 30 days
-        "to": datetime.utcnow().strftime("%Y-%m-%d")
-    }
-    response = requests.get(f"{api_base_url}/users/me/recordings", headers=headers, params=params)
-    if response.status_code != 200:
-        print(f"Error fetching recordings: {response.status_code} {response.text}")
-        response.raise_for_status()
-    data = response.json()
-    return data.get("meetings", [])
+    to_date = _as_date(to_date) or datetime.utcnow().date()
+    from_date = _as_date(from_date) or (to_date - timedelta(days=30))
+
+    window_end = to_date
+    while window_end >= from_date:
+        window_start = max(from_date, window_end - timedelta(days=30))
+        next_page_token = ""
+        while True:
+            params = {
+                "page_size": page_size,
+                "from": window_start.strftime("%Y-%m-%d"),
+                "to": window_end.strftime("%Y-%m-%d"),
+            }
+            if next_page_token:
+                params["next_page_token"] = next_page_token
+            response = api_request("GET", f"{api_base_url}/users/me/recordings", params=params)
+            if response.status_code != 200:
+                print(f"Error fetching recordings: {response.status_code} {response.text}")
+                response.raise_for_status()
+            data = response.json()
+            for meeting in data.get("meetings", []):
+                yield meeting
+            next_page_token = data.get("next_page_token")
+            if not next_page_token:
+                break
+        window_end = window_start - timedelta(days=1)
+
+def get_recordings_list(from_date=None, to_date=None):
+    """
+    Retrieves a list of cloud recordings for the user (all pages, last 30 days by default).
+    """
+    return list(iter_recordings(from_date, to_date))
+
+def _as_date(value):
+    if value is None:
+        return None
+    return value.date() if isinstance(value, datetime) else value
 
 def get_meeting_summary(meeting_uuid: str) -> dict:
     """Temporary workaround for summary endpoint"""
     try:
-        # First try with server-to-server token
-        access_token = get_access_token()
-        headers = {"Authorization": f"Bearer {access_token}"}
         encoded_uuid = requests.utils.quote(meeting_uuid, safe='')
         
         print(f"Attempting summary with UUID: {encoded_uuid}")  # Debug
         
-        response = requests.get(
-            f"https://api.zoom.us/v2/meetings/{encoded_uuid}/meeting_summary",
-            headers=headers
+        response = api_request(
+            "GET",
+            f"https://api.zoom.us/v2/meetings/{encoded_uuid}/meeting_summary"
         )
         
         print(f"API Response: {response.status_code}")  # Debug
@@ -267,14 +425,12 @@ def get_meeting(meeting_id):
     Retrieves details for a specific Zoom meeting.
     Returns: dict with meeting details including 'join_url'
     """
-    access_token = get_access_token()
     headers = {
-        "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
     
     get_url = f"{api_base_url}/meetings/{meeting_id}"
-    response = requests.get(get_url, headers=headers)
+    response = api_request("GET", get_url, headers=headers)
     response.raise_for_status()
     
     return response.json()
@@ -290,9 +446,7 @@ def update_meeting(meeting_id, topic, start_time, duration):
     :param duration: Updated duration in minutes.
     :return: A dict confirming the update.
     """
-    access_token = get_access_token()
     headers = {
-        "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
     payload = {
@@ -301,7 +455,7 @@ def update_meeting(meeting_id, topic, start_time, duration):
         "duration": duration
     }
     update_url = f"{api_base_url}/meetings/{meeting_id}"
-    resp = requests.patch(update_url, headers=headers, json=payload)
+    resp = api_request("PATCH", update_url, headers=headers, json=payload)
     
     if resp.status_code != 204:
         print(f"Error updating meeting {meeting_id}: {resp.status_code} {resp.text}")
@@ -327,10 +481,7 @@ def create_recurring_meeting(topic, start_time, duration, occurrence_rate):
     Returns:
         Tuple of (join_url, meeting_id)
     """
-    access_token = get_access_token()
-
     headers = {
-        "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
     
@@ -454,9 +605,9 @@ def create_recurring_meeting(topic, start_time, duration, occurrence_rate):
     print(f"[DEBUG] Creating recurring Zoom meeting with payload: {json.dumps(payload, indent=2)}")
     
     try:
-        resp = requests.post(f"{api_base_url}/users/me/meetings", 
-                            headers=headers, 
-                            json=payload)
+        resp = api_request("POST", f"{api_base_url}/users/me/meetings", 
+                           headers=headers, 
+                           json=payload)
         
         # Check response
         if resp.status_code == 201:
@@ -508,9 +659,9 @@ def create_recurring_meeting(topic, start_time, duration, occurrence_rate):
                 print(f"[DEBUG] Retrying with modified payload: {json.dumps(payload, indent=2)}")
                 
                 # Try again
-                resp = requests.post(f"{api_base_url}/users/me/meetings", 
-                                    headers=headers, 
-                                    json=payload)
+                resp = api_request("POST", f"{api_base_url}/users/me/meetings", 
+                                   headers=headers, 
+                                   json=payload)
                                     
                 if resp.status_code == 201:
                     response_data = resp.json()
@@ -614,10 +765,7 @@ def check_and_fix_recurrence_pattern(meeting_id, expected_pattern, response_data
         if current_type == 2 and "weekly_days" in recurrence and expected_pattern == "monthly":
             print(f"[DEBUG] Meeting {meeting_id} has incorrect pattern: weekly when it should be monthly")
             
-            # Get access token for API calls
-            access_token = get_access_token()
             headers = {
-                "Authorization": f"Bearer {access_token}",
                 "Content-Type": "application/json"
             }
             
@@ -650,7 +798,7 @@ def check_and_fix_recurrence_pattern(meeting_id, expected_pattern, response_data
                     print(json.dumps(corrected_recurrence, indent=2))
                     
                     try:
-                        resp = requests.patch(update_url, headers=headers, json=corrected_recurrence)
+                        resp = api_request("PATCH", update_url, headers=headers, json=corrected_recurrence)
                         
                         if resp.status_code == 204:
                             print(f"[DEBUG] Successfully updated meeting {meeting_id} to monthly pattern")
@@ -1,35 +1,17 @@
 import os
 import sys
 import argparse
-from modules import discourse, zoom, gcal, email_utils, tg, rss_utils
+from modules import discourse, zoom, gcal, email_utils, tg, rss_utils, mapping_commit, issue_parser, issue_plan
 # Import the custom exception again
 from modules.discourse import DiscourseDuplicateTitleError 
 from github import Github
 import re
 from datetime import datetime as dt
-import json
 import requests
-from github import InputGitAuthor
 
 # Add youtube_utils import
-from modules import youtube_utils
-
-MAPPING_FILE = ".github/ACDbot/meeting_topic_mapping.json"
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            # Add error handling for invalid JSON
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                print(f"::error::Failed to decode JSON from {MAPPING_FILE}. Returning empty mapping.")
-                return {}
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f, indent=2)
+from modules import youtube_utils, youtube_quota
+from modules.meeting_store import get_store, is_valid_topic_id, save_meeting_topic_mapping
 
 def extract_facilitator_info(issue_body):
     """
@@ -41,37 +23,7 @@ def extract_facilitator_info(issue_body):
     - "Facilitator email: email5"
     Returns a list of email addresses.
     """
-    pattern_list = r"(?im)^Facilitator emails:\s*(.+)"
-    pattern_markdown = r"(?im)^-\s*Facilitator email:\s*\[([^]]+)\]\(mailto:[^)]+\)"
-    # Combined pattern for plain text email, dash optional
-    pattern_plain_combined = r"(?im)^(?:-\s*)?Facilitator email:\s*([^@\s]+@[^@\s\n]+)"
-    print(f"[DEBUG] Extracting facilitator emails from issue body")
-    
-    facilitator_emails = []
-    
-    # Try matching the comma-separated list format first
-    match_list = re.search(pattern_list, issue_body)
-    if match_list:
-        emails_str = match_list.group(1)
-        found_emails = [email.strip() for email in emails_str.split(',') if email.strip()]
-        facilitator_emails.extend(found_emails)
-    else:
-        # If list format not found, try the single email formats
-        # Try markdown link first (as it's more specific with the dash)
-        match_markdown = re.search(pattern_markdown, issue_body)
-        if match_markdown:
-            facilitator_emails.append(match_markdown.group(1).strip())
-        else:
-            # Then try the combined plain text pattern (dash optional)
-            match_plain_combined = re.search(pattern_plain_combined, issue_body)
-            if match_plain_combined:
-                facilitator_emails.append(match_plain_combined.group(1).strip())
-    if facilitator_emails:
-        print(f"[DEBUG] Extracted facilitator emails: {facilitator_emails}")
-        return facilitator_emails
-    else:
-        print(f"[DEBUG] No facilitator emails found in the expected format.")
-        return [] # Return an empty list if no match
+    return issue_parser.parse_issue(issue_body).facilitator_emails
 
 def extract_recurring_info(issue_body):
     """
@@ -79,95 +31,42 @@ def extract_recurring_info(issue_body):
     Returns a tuple of (is_recurring, occurrence_rate).
     For one-time calls, these fields might be missing - default to false/none.
     """
-    recurring_pattern = r"Recurring meeting\s*:\s*(true|false)"
-    occurrence_pattern = r"Occurrence rate\s*:\s*(none|weekly|bi-weekly|monthly)"
-    
-    recurring_match = re.search(recurring_pattern, issue_body, re.IGNORECASE)
-    occurrence_match = re.search(occurrence_pattern, issue_body, re.IGNORECASE)
-    
-    # Default to false and none if fields are missing (one-time meeting template)
-    is_recurring = recurring_match and recurring_match.group(1).lower() == 'true'
-    occurrence_rate = occurrence_match.group(1).lower() if occurrence_match else 'none'
-    
-    return is_recurring, occurrence_rate
+    config = issue_parser.parse_issue(issue_body)
+    return config.is_recurring, config.occurrence_rate
 
 def extract_already_on_calendar(issue_body):
     """
     Extracts information about whether a meeting is already on the Ethereum Calendar.
     Returns a boolean indicating if the meeting is already on the calendar.
     """
-    calendar_pattern = r"Already on Ethereum Calendar\s*:\s*(true|false)"
-    
-    calendar_match = re.search(calendar_pattern, issue_body, re.IGNORECASE)
-    already_on_calendar = calendar_match and calendar_match.group(1).lower() == 'true'
-    
-    return already_on_calendar
+    return issue_parser.parse_issue(issue_body).already_on_calendar
 
 def extract_call_series(issue_body):
     """
     Extracts and normalizes the 'Call series' field from the issue body.
     """
-    call_series_pattern = r"Call series\s*:\s*([^\n]+)"
-    match = re.search(call_series_pattern, issue_body, re.IGNORECASE)
-    return match.group(1).strip().lower() if match else None
+    return issue_parser.parse_issue(issue_body).call_series
 
 def extract_need_youtube_streams(issue_body):
     """
     Extracts information about whether YouTube stream links are needed.
     Returns a boolean indicating if stream links should be created.
     """
-    youtube_pattern = r"Need YouTube stream links\s*:\s*(true|false)"
-    
-    youtube_match = re.search(youtube_pattern, issue_body, re.IGNORECASE)
-    need_youtube_streams = youtube_match and youtube_match.group(1).lower() == 'true'
-    
-    return need_youtube_streams
-
-def check_existing_youtube_streams(call_series, mapping):
-    """
-    Check if there are existing YouTube streams for a call series.
-    Returns a list of stream links previously created, if any.
-    """
-    if not call_series:
-        return None
-        
-    # Find all entries with the same call_series
-    existing_entries = [entry for entry in mapping.values() 
-                      if entry.get("call_series") == call_series 
-                      and "youtube_streams" in entry]
-    
-    # Sort by issue number if available (to get the most recent ones)
-    existing_entries.sort(key=lambda e: e.get("issue_number", 0), reverse=True)
-    
-    # Return the YouTube streams from the most recent entry
-    if existing_entries:
-        return existing_entries[0].get("youtube_streams")
-    
-    return None
+    return issue_parser.parse_issue(issue_body).need_youtube_streams
 
 def extract_already_zoom_meeting(issue_body):
     """
     Extracts information about whether a Zoom meeting ID already exists.
     Returns a boolean indicating if Zoom creation should be skipped.
     """
-    zoom_pattern = r"Already a Zoom meeting ID\s*:\s*(true|false)"
-    
-    zoom_match = re.search(zoom_pattern, issue_body, re.IGNORECASE)
-    skip_zoom_creation = zoom_match and zoom_match.group(1).lower() == 'true'
-    
-    return skip_zoom_creation
+    return issue_parser.parse_issue(issue_body).already_zoom_meeting
 
 def extract_display_zoom_link(issue_body):
     """
     Extracts the boolean flag indicating whether to display the Zoom link in the calendar invite.
     Defaults to False if the line is not found or value is not 'true'.
     """
-    display_pattern = r"display zoom link in invite\s*:\s*(true|false)"
-    match = re.search(display_pattern, issue_body, re.IGNORECASE)
-    
-    display_link = match and match.group(1).lower() == 'true'
-    print(f"[DEBUG] Extracted display_zoom_link_in_invite: {display_link}")
-    return display_link
+    return issue_parser.parse_issue(issue_body).display_zoom_link
 
 def handle_github_issue(issue_number: int, repo_name: str):
     """
@@ -181,8 +80,9 @@ def handle_github_issue(issue_number: int, repo_name: str):
     comment_lines = []
     mapping_updated = False
     
-    # Load existing mapping
-    mapping = load_meeting_topic_mapping()
+    # Load existing mapping (shared, indexed store)
+    store = get_store()
+    mapping = store.mapping
 
     # Ensure meeting_id is always defined
     meeting_id = None
@@ -198,119 +98,65 @@ def handle_github_issue(issue_number: int, repo_name: str):
     start_time = None
     duration = None
 
-    # Extract configuration from issue body
-    is_recurring, occurrence_rate = extract_recurring_info(issue_body)
-    need_youtube_streams = extract_need_youtube_streams(issue_body)
-    call_series = extract_call_series(issue_body)
-    skip_zoom_creation = extract_already_zoom_meeting(issue_body)
-    skip_gcal_creation = extract_already_on_calendar(issue_body)
-    display_zoom_link_in_invite = extract_display_zoom_link(issue_body) # Extract the new flag
+    # Work out everything this run will do before touching any service
+    plan = issue_plan.plan_issue(issue_number, issue_title, issue_body, issue.html_url, store)
+    print(issue_plan.format_plan(plan))
+    if plan.is_empty:
+        print(f"[INFO] Nothing to do for issue #{issue_number}.")
+        return
+
+    issue_config = plan.config
+    is_recurring, occurrence_rate = issue_config.is_recurring, issue_config.occurrence_rate
+    need_youtube_streams = issue_config.need_youtube_streams
+    call_series = issue_config.call_series
+    display_zoom_link_in_invite = issue_config.display_zoom_link
+    skip_zoom_creation = plan.skip_zoom
+    skip_gcal_creation = plan.skip_gcal
+
+    # Existing YouTube streams of this call series (listed in the Discourse topic)
+    existing_youtube_streams = plan.series_streams
+
+    # Reuse of the series' meeting (OVERRIDES issue input) was decided by the plan
+    existing_series_entry_for_zoom = plan.series_entry
 
-    # Check for existing YouTube streams for this call series
-    existing_youtube_streams = check_existing_youtube_streams(call_series, mapping)
-    
-    # --- Start Refactor: Separate Zoom and GCal skip logic --- 
-    # Extract whether to skip Zoom creation
-    skip_zoom_creation = extract_already_zoom_meeting(issue_body)
-    # Extract whether to skip Google Calendar creation
-    skip_gcal_creation = extract_already_on_calendar(issue_body)
-
-    # Automatic skip logic based on existing series (OVERRIDES issue input)
-    existing_series_entry_for_zoom = None # Keep track if we reuse for Zoom
-    if is_recurring and call_series:
-        # Find the most recent entry for this call series with a meeting_id
-        series_entries = [
-            entry for entry in mapping.values() 
-            if entry.get("call_series") == call_series and "meeting_id" in entry
-        ]
-        if series_entries:
-            series_entries.sort(key=lambda e: e.get("issue_number", 0), reverse=True)
-            # Check the most recent entry for this series
-            potential_existing_series = series_entries[0]
-            existing_series_meeting_id = potential_existing_series.get("meeting_id")
-            is_placeholder_id = (str(existing_series_meeting_id) == "null" or 
-                                 str(existing_series_meeting_id).startswith("placeholder-"))
-
-            if existing_series_meeting_id and not is_placeholder_id:
-                # Found a valid, non-placeholder meeting ID - force reuse
-                existing_series_entry_for_zoom = potential_existing_series # Confirm this is the one we reuse
-                if not skip_zoom_creation:
-                    print(f"[INFO] Overriding 'Already a Zoom meeting ID: false' because a *valid* existing meeting ({existing_series_meeting_id}) for series '{call_series}' was found.")
-                skip_zoom_creation = True # Force skip Zoom creation
-            elif is_placeholder_id:
-                print(f"[INFO] Found existing series '{call_series}' but meeting ID is a placeholder ('{existing_series_meeting_id}'). Will not force reuse based on this placeholder.")
-                # Do NOT force skip_zoom_creation or skip_gcal_creation based on a placeholder.
-                # Let the script decide based on issue input later.
-                # Still set existing_series_entry_for_zoom in case other details (like GCal ID) are valid and reusable
-                existing_series_entry_for_zoom = potential_existing_series 
-            # Else: No meeting ID found in the most recent entry, do nothing here.
-    
     # Add comments based on final skip decisions
     if skip_zoom_creation and not existing_series_entry_for_zoom: # Skipped via issue input, not series reuse
         comment_lines.append("\n**Note:** Zoom meeting creation skipped as requested in issue.")
     if skip_gcal_creation and not existing_series_entry_for_zoom: # Skipped via issue input, not series reuse
         comment_lines.append("\n**Note:** Google Calendar event creation skipped as requested in issue.")
     # Note for series reuse is added within the Zoom processing block later
-    # --- End Refactor --- 
 
-    # 2. Check for existing topic_id and previous details by searching mapping correctly
-    topic_id = None
+    # 2. Existing topic_id and previous details for this issue, as found by the plan
+    topic_id = plan.topic_id
+    found_meeting_id_for_issue = plan.meeting_id
+    existing_occurrence_data = plan.occurrence
+    is_first_run_for_issue = plan.is_first_run # First time processing THIS issue
     previous_zoom_id = None
     previous_join_url = None
-    found_meeting_id_for_issue = None
-    existing_occurrence_data = None
-    is_first_run_for_issue = True # Flag to track if this is the first time processing THIS issue
-
-    print(f"[DEBUG] Searching mapping for existing data related to issue #{issue_number}")
-    # Iterate through top-level meeting entries
-    for m_id, entry_data in mapping.items():
-        # Check if issue number is directly under this meeting ID (for non-recurring/older format)
-        if entry_data.get("issue_number") == issue_number:
-            found_meeting_id_for_issue = m_id
-            existing_occurrence_data = entry_data # Treat top-level as the occurrence data
-            print(f"[DEBUG] Found issue #{issue_number} directly under meeting_id {m_id}.")
-            break # Found it
-        
-        # If not found directly, check inside occurrences list if it exists
-        elif "occurrences" in entry_data and isinstance(entry_data["occurrences"], list):
-            for occurrence in entry_data["occurrences"]:
-                if isinstance(occurrence, dict) and occurrence.get("issue_number") == issue_number:
-                    found_meeting_id_for_issue = m_id # The meeting ID this occurrence belongs to
-                    existing_occurrence_data = occurrence
-                    print(f"[DEBUG] Found issue #{issue_number} within occurrences of meeting_id {m_id}.")
-                    break # Found the occurrence
-            if found_meeting_id_for_issue: # Break outer loop if found in inner loop
-                break
-
-    # Now use the found data (if any) to set initial topic_id and previous Zoom details
-    if found_meeting_id_for_issue and existing_occurrence_data:
-        print(f"[DEBUG] Processing data found for issue #{issue_number} under meeting_id {found_meeting_id_for_issue}")
-        is_first_run_for_issue = False # Found existing data for this issue, so not the first run
-        # Get potential topic ID from the occurrence data itself
-        potential_topic_id = existing_occurrence_data.get("discourse_topic_id")
-        if potential_topic_id and not str(potential_topic_id).startswith("placeholder"):
-            topic_id = potential_topic_id
-            print(f"[DEBUG] Found valid existing topic_id {topic_id} in mapping for issue {issue_number}.")
-        else:
-            print(f"[DEBUG] Found mapping entry for issue {issue_number}, but discourse_topic_id is missing or placeholder: {potential_topic_id}")
-        
-        # Get previous Zoom details from the TOP-LEVEL meeting entry associated with this issue
+    if found_meeting_id_for_issue:
         # Only store the meeting ID, not the link (as per updated requirements)
-        series_data = mapping.get(found_meeting_id_for_issue, {}) # Get the main dict for the meeting_id
-        previous_zoom_id = series_data.get("meeting_id") # which is the key itself
-        print(f"[DEBUG] Found previous Zoom meeting ID associated with issue #{issue_number} (meeting_id {found_meeting_id_for_issue}): ID={previous_zoom_id}")
+        previous_zoom_id = mapping.get(found_meeting_id_for_issue, {}).get("meeting_id")
+        print(f"[DEBUG] Found issue #{issue_number} under meeting_id {found_meeting_id_for_issue} "
+              f"(topic {topic_id}, previous Zoom ID {previous_zoom_id}).")
     else:
         print(f"[DEBUG] No previous mapping entry found containing issue #{issue_number}. Assuming new meeting context.")
 
-    issue_link = f"[GitHub Issue]({issue.html_url})"
-    updated_body = f"{issue_body}\n\n{issue_link}"
+    # Issue body, link and the series' stream links, built by the plan so one write sends it all
+    updated_body = plan.discourse_body
 
     # Initialize discourse_url to ensure it has a value
     discourse_url = None
     action = None # Initialize action
     # 3. Discourse handling
     # First, check if we already have a valid topic_id from the mapping search above
-    if topic_id: # We already established this is a valid, non-placeholder ID from mapping
+    if topic_id and plan.discourse_action == "unchanged":
+        print(f"[DEBUG] Discourse topic {topic_id} is unchanged, nothing to send.")
+        action = "unchanged"
+        discourse_url = f"{os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')}/t/{topic_id}"
+        comment_lines.append(f"**Discourse Topic ID:** {topic_id}")
+        comment_lines.append(f"- Action: {action.capitalize()}")
+        comment_lines.append(f"- URL: {discourse_url}")
+    elif topic_id: # We already established this is a valid, non-placeholder ID from mapping
         print(f"[DEBUG] Updating existing Discourse topic {topic_id} based on mapping.")
         try:
             update_response = discourse.update_topic(
@@ -368,49 +214,18 @@ def handle_github_issue(issue_number: int, repo_name: str):
             # Try to find the topic_id from the mapping based on call_series for recurring meetings
             if is_recurring and call_series:
                 print(f"[DEBUG] Searching mapping for call series: '{call_series}'")
-                # Find entries matching the call series with a valid topic ID, sort by issue number desc
-                series_entries = sorted(
-                    [entry for entry in mapping.values() 
-                     if entry.get("call_series") == call_series and 
-                        entry.get("discourse_topic_id") and # Check top-level first (older format?)
-                        not str(entry.get("discourse_topic_id")).startswith("placeholder")],
-                    key=lambda e: e.get("issue_number", 0), # May not have issue_number at top level
-                    reverse=True
+                # Most recent occurrence (or legacy top-level entry) in the series with a valid topic ID
+                _, series_occurrence = store.latest_in_series(
+                    call_series,
+                    lambda m_id, entry, occ: is_valid_topic_id(occ.get("discourse_topic_id"))
                 )
-                # If not found at top level, check occurrences within matching series entries
-                if not series_entries:
-                    potential_series_matches = [
-                        (m_id, entry) for m_id, entry in mapping.items() 
-                        if entry.get("call_series") == call_series and "occurrences" in entry
-                    ]
-                    for m_id, entry in potential_series_matches:
-                         # Sort occurrences by issue number within the series
-                         sorted_occurrences = sorted(
-                             [occ for occ in entry.get("occurrences", []) 
-                              if isinstance(occ, dict) and occ.get("discourse_topic_id") and 
-                                 not str(occ.get("discourse_topic_id")).startswith("placeholder")],
-                             key=lambda o: o.get("issue_number", 0),
-                             reverse=True
-                         )
-                         if sorted_occurrences:
-                             # Found the most recent valid topic ID within this series' occurrences
-                             topic_id = sorted_occurrences[0]["discourse_topic_id"]
-                             series_entries = [entry] # Use the parent entry for logging context below
-                             print(f"[DEBUG] Found existing topic ID {topic_id} in occurrences for series '{call_series}'")
-                             break # Found it in this series, stop searching others
-
-                if series_entries: # If found either at top-level or in occurrences
-                    if not topic_id: # If found at top-level
-                         topic_id = series_entries[0]["discourse_topic_id"]
-                         print(f"[DEBUG] Found existing topic ID {topic_id} at top-level for series '{call_series}'")
-
+                if series_occurrence:
+                    topic_id = series_occurrence["discourse_topic_id"]
                     found_existing_in_mapping = True
                     action = "found_duplicate_series"
                     discourse_url = f"{os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')}/t/{topic_id}"
                     # Log the issue number where the ID was found if possible
-                    found_in_issue_num = series_entries[0].get('issue_number', 'N/A') 
-                    if sorted_occurrences: # If found in occurrences, get issue from there
-                         found_in_issue_num = sorted_occurrences[0].get('issue_number', 'N/A')
+                    found_in_issue_num = series_occurrence.get('issue_number', 'N/A')
                     print(f"[DEBUG] Using existing topic ID {topic_id} for series '{call_series}' (found via issue #{found_in_issue_num}).")
                     comment_lines.append(f"- Using existing Topic ID found in mapping: {topic_id}")
                     comment_lines.append(f"- URL: {discourse_url}")
@@ -434,51 +249,16 @@ def handle_github_issue(issue_number: int, repo_name: str):
             discourse_url = "https://ethereum-magicians.org (API error occurred)"
             action = "failed"
 
-    # Add existing YouTube stream links (only if action indicates success/found and streams exist)
-    # Refine condition to check action status properly
-    # Make sure topic_id is valid before using it
-    if action in ["created", "updated", "found_duplicate_series"] and topic_id and not str(topic_id).startswith("placeholder") and existing_youtube_streams:
-        print(f"[DEBUG] Adding existing YouTube streams to Discourse topic {topic_id}")
+    # The series' existing stream links went into the topic body above; list them in the comment too
+    if action in ["created", "updated", "unchanged", "found_duplicate_series"] and existing_youtube_streams:
         comment_lines.append("\n**Existing YouTube Stream Links:**")
-        stream_links = []
-        for i, stream in enumerate(existing_youtube_streams, 1):
-            stream_date = ""
-            if 'scheduled_time' in stream:
-                try:
-                    from datetime import datetime
-                    scheduled_time = stream['scheduled_time']
-                    if scheduled_time.endswith('Z'):
-                        scheduled_time = scheduled_time.replace('Z', '+00:00')
-                    date_obj = datetime.fromisoformat(scheduled_time)
-                    stream_date = f" ({date_obj.strftime('%b %d, %Y')})"
-                except Exception as e:
-                    print(f"[DEBUG] Error formatting stream date: {e}")
-            comment_lines.append(f"- Stream {i}{stream_date}: {stream['stream_url']}")
-            stream_links.append(f"- Stream {i}{stream_date}: {stream['stream_url']}")
-        
-        # Update Discourse post with stream links
-        try:
-            # Prepare the body content to append
-            youtube_links_body = f"\n\n**Existing YouTube Stream Links:**\n" + "\n".join(stream_links)
-            # Get the current content of the first post to append to it
-            posts = discourse.get_posts_in_topic(topic_id)
-            if posts:
-                 first_post_raw = posts[0].get("raw")
-                 # Check if links are already there to avoid duplicates
-                 if youtube_links_body not in first_post_raw:
-                     updated_discourse_body = first_post_raw + youtube_links_body
-                     discourse.update_topic(
-                         topic_id=topic_id,
-                         body=updated_discourse_body # Update the body with appended links
-                     )
-                     print(f"[DEBUG] Successfully appended YouTube links to topic {topic_id}")
-                 else:
-                     print(f"[DEBUG] YouTube links already present in topic {topic_id}, skipping append.")
-            else:
-                  print(f"[WARN] Could not get posts for topic {topic_id} to append YouTube links.")
-        except Exception as e:
-            print(f"[ERROR] Failed to add existing YouTube streams to Discourse topic {topic_id}: {str(e)}")
-            comment_lines.append(f"- ⚠️ Failed to add existing YouTube streams to Discourse topic {topic_id}")
+        comment_lines.extend(issue_plan.stream_links(existing_youtube_streams))
+
+    # Agenda-only edit: the Discourse sync above was all there was to do
+    if plan.schedule_unchanged:
+        print(f"[INFO] Scheduling fields of issue #{issue_number} are unchanged; skipping Zoom, YouTube, "
+              "Calendar, Telegram and the GitHub comment.")
+        return
 
     # Determine the base title for recurring events
     event_base_title = issue_title # Default to issue title
@@ -498,7 +278,9 @@ def handle_github_issue(issue_number: int, repo_name: str):
 
     try:
         # 1. Parse time and duration first
-        start_time, duration = parse_issue_for_time(issue_body)
+        if issue_config.time_error:
+            raise ValueError(issue_config.time_error)
+        start_time, duration = issue_config.start_time, issue_config.duration
 
         # 2. Check if we should skip Zoom API calls entirely
         if skip_zoom_creation:
@@ -637,7 +419,7 @@ def handle_github_issue(issue_number: int, repo_name: str):
                     # Store UUID in the mapping for this meeting
                     if "uuid" not in mapping_entry or mapping_entry.get("uuid") != meeting_details.get('uuid'):
                         mapping_entry["uuid"] = meeting_details.get('uuid')
-                        mapping[current_meeting_id] = mapping_entry
+                        store.upsert_series(current_meeting_id, mapping_entry)
                         mapping_updated = True
                         print(f"[DEBUG] Stored Zoom UUID in mapping: {meeting_details.get('uuid')}")
             else:
@@ -663,7 +445,7 @@ def handle_github_issue(issue_number: int, repo_name: str):
                     # Store UUID in the mapping for this meeting
                     if "uuid" not in mapping_entry or mapping_entry.get("uuid") != meeting_details.get('uuid'):
                         mapping_entry["uuid"] = meeting_details.get('uuid')
-                        mapping[meeting_id] = mapping_entry
+                        store.upsert_series(meeting_id, mapping_entry)
                         mapping_updated = True
                         print(f"[DEBUG] Stored Zoom UUID in mapping: {meeting_details.get('uuid')}")
             else:
@@ -722,19 +504,7 @@ def handle_github_issue(issue_number: int, repo_name: str):
                      occurrence_youtube_streams = existing_occurrence_data.get("youtube_streams")
                      comment_lines.append("\n**Existing YouTube Stream Links (Reused):**")
                      # Add stream links to comments again for clarity
-                     stream_links = []
-                     for i, stream in enumerate(occurrence_youtube_streams, 1):
-                          stream_date = ""
-                          if 'scheduled_time' in stream:
-                              try:
-                                  from datetime import datetime
-                                  scheduled_time = stream['scheduled_time']
-                                  if scheduled_time.endswith('Z'): scheduled_time = scheduled_time.replace('Z', '+00:00')
-                                  date_obj = datetime.fromisoformat(scheduled_time)
-                                  stream_date = f" ({date_obj.strftime('%b %d, %Y')})"
-                              except Exception as e: print(f"[DEBUG] Error formatting stream date: {e}")
-                          comment_lines.append(f"- Stream {i}{stream_date}: {stream['stream_url']}")
-                          stream_links.append(f"- Stream {i}{stream_date}: {stream['stream_url']}")
+                     comment_lines.extend(issue_plan.stream_links(occurrence_youtube_streams))
 
                      should_create_streams = False # Don't create new ones
                  # TODO: Optional: Consider reusing series-level streams (`existing_youtube_streams`) if no occurrence-specific ones exist?
@@ -760,43 +530,26 @@ def handle_github_issue(issue_number: int, repo_name: str):
                          # Add stream URLs to comment
                          if occurrence_youtube_streams:
                              comment_lines.append("\n**YouTube Stream Links:**")
-                             stream_links = []
-                             for i, stream in enumerate(occurrence_youtube_streams, 1):
-                                 # Extract date from stream details if available
-                                 stream_date = ""
-                                 if 'scheduled_time' in stream:
-                                     try:
-                                         # Import datetime in this scope
-                                         from datetime import datetime
-                                         # Parse the scheduled_time string to a datetime object
-                                         scheduled_time = stream['scheduled_time']
-                                         if scheduled_time.endswith('Z'):
-                                             scheduled_time = scheduled_time.replace('Z', '+00:00')
-                                         date_obj = datetime.fromisoformat(scheduled_time)
-                                         # Format as "Mon DD, YYYY"
-                                         stream_date = f" ({date_obj.strftime('%b %d, %Y')})"
-                                     except Exception as e:
-                                         print(f"[DEBUG] Error formatting stream date: {e}")
-                                         # If parsing fails, leave date empty
-                                         pass
-                                 
-                                 # Add date to stream links
-                                 comment_lines.append(f"- Stream {i}{stream_date}: {stream['stream_url']}")
-                                 stream_links.append(f"- Stream {i}{stream_date}: {stream['stream_url']}")
-                             
+                             comment_lines.extend(issue_plan.stream_links(occurrence_youtube_streams))
+
                              # Update Discourse post with stream links if we have a topic ID
                              if topic_id and not str(topic_id).startswith("placeholder-"):
                                  try:
-                                     discourse_content = f"{updated_body}\n\n**YouTube Stream Links:**\n" + "\n".join(stream_links)
+                                     # The same body the next edit's plan builds, so it is not resent
                                      discourse.update_topic(
                                          topic_id=topic_id,
-                                         body=discourse_content
+                                         body=issue_plan.discourse_body(issue_body, issue.html_url,
+                                                                        existing_youtube_streams,
+                                                                        occurrence_youtube_streams)
                                      )
                                  except Exception as e:
                                      print(f"[DEBUG] Error updating Discourse topic with YouTube streams: {str(e)}")
                              
                              # Flag that streams were generated (will be saved in occurrence data later)
                              # mapping_updated = True # Handled later when saving occurrence
+                     except youtube_quota.QuotaDeferred as e:
+                         print(f"[WARN] {e}")
+                         comment_lines.append("\n**⚠️ YouTube streams were not created: today's YouTube API quota is reserved for recording uploads. Edit the issue after the quota resets (midnight Pacific time) to create them.**")
                      except Exception as e:
                          print(f"[DEBUG] Error creating YouTube streams: {str(e)}")
                          comment_lines.append("\n**⚠️ Failed to create YouTube streams. Please check credentials.**")
@@ -959,6 +712,10 @@ def handle_github_issue(issue_number: int, repo_name: str):
         skip_transcript = skip_zoom_creation
         # Get youtube streams created specifically for this occurrence
         current_occurrence_streams = occurrence_youtube_streams if 'occurrence_youtube_streams' in locals() else None
+        # Only remember the fingerprint once the schedule is applied everywhere, so a failed step is retried on the next edit
+        schedule_applied = (not zoom_action.startswith("failed")
+                            and (skip_gcal_creation or bool(event_id))
+                            and not (plan.streams_action == "create" and not current_occurrence_streams))
         
         # Base data for the new/updated occurrence
         occurrence_data = {
@@ -975,6 +732,7 @@ def handle_github_issue(issue_number: int, repo_name: str):
             "transcript_attempt_count": 0,
             "telegram_message_id": None, # Placeholder, will be updated if msg sent
             "youtube_streams_posted_to_discourse": False,
+            "scheduling_fingerprint": plan.fingerprint if schedule_applied else None,
             "youtube_streams": [ # Store created streams here
                 {
                     "stream_url": stream.get("stream_url"),
@@ -1016,6 +774,10 @@ def handle_github_issue(issue_number: int, repo_name: str):
                  print("[DEBUG] Preserving existing youtube_streams in occurrence.")
                  occurrence_data["youtube_streams"] = existing_occurrence.get("youtube_streams")
 
+            # Keep the record of what was already posted to Discourse
+            if existing_occurrence.get("discourse_posts"):
+                preserve_flags["discourse_posts"] = existing_occurrence["discourse_posts"]
+
             occurrence_data.update(preserve_flags) # Apply preserved flags over defaults
             mapping_entry["occurrences"][existing_occurrence_index] = occurrence_data
         else:
@@ -1071,7 +833,7 @@ def handle_github_issue(issue_number: int, repo_name: str):
         
         # Perform a deep comparison if necessary (simple check is usually sufficient here)
         if original_entry_before_update != mapping_entry:
-            mapping[meeting_id] = mapping_entry
+            store.upsert_series(meeting_id, mapping_entry)
             mapping_updated = True # Mark that the mapping file needs saving
             print(f"Mapping updated for meeting ID {meeting_id} with occurrence details from issue #{issue.number}.")
             if series_updated:
@@ -1082,7 +844,8 @@ def handle_github_issue(issue_number: int, repo_name: str):
         # --- Notification Logic ---
         print("[DEBUG] Entering Notification Block")
         # Extract facilitator information
-        facilitator_emails = extract_facilitator_info(issue_body)
+        facilitator_emails = issue_config.facilitator_emails
+        print(f"[DEBUG] Facilitator emails: {facilitator_emails}")
         
         # Initialize flags
         email_sent = False
@@ -1277,6 +1040,8 @@ This email was sent automatically by the Ethereum Protocol Call Bot because meet
                         print(f"[ERROR] Telegram channel notification failed: {error_msg}")
                         # Add a generic message to the comment
                         comment_lines.append(f"\n**⚠️ Telegram Channel Notification Failed**: {error_msg}")
+                    if not telegram_channel_sent:
+                        current_occurrence["scheduling_fingerprint"] = None # Retry the message on the next edit
                 else:
                     print("[DEBUG] Telegram channel ID not configured or tg module not available.")
 
@@ -1291,7 +1056,7 @@ This email was sent automatically by the Ethereum Protocol Call Bot because meet
         if mapping_entry and meeting_id:
             # Add the meeting_id to the entry itself to prevent filtering
             mapping_entry["meeting_id"] = meeting_id  # ADD THIS LINE
-            mapping[meeting_id] = mapping_entry
+            store.upsert_series(meeting_id, mapping_entry)
             mapping_updated = True  # Mark for saving regardless of RSS outcome
             print(f"[DEBUG] Core mapping for meeting ID {meeting_id} prepared for saving")
 
@@ -1392,7 +1157,8 @@ This email was sent automatically by the Ethereum Protocol Call Bot because meet
         print("[DEBUG] Mapping was updated, attempting to save and commit.")
         try:
             save_meeting_topic_mapping(mapping)
-            commit_mapping_file()
+            mapping_commit.request_commit(f"Issue #{issue_number}: {issue_title}")
+            mapping_commit.flush_commits()
             print(f"Successfully saved and committed mapping file.")
             # Include meeting_id in final print statement if available
             final_meeting_id_str = f" Zoom Meeting ID {meeting_id}" if 'meeting_id' in locals() else ""
@@ -1409,173 +1175,10 @@ def parse_issue_for_time(issue_body: str):
     - Date/time line followed by a duration line (with or without "Duration in minutes" preceding it)
     - Accepts both abbreviated and full month names
     - Handles formats like "Apr 22 (Tues), 2025, 14:00 UTC"
-    """
-    
-    # -------------------------------------------------------------------------
-    # 1. Regex pattern to find the date/time in the issue body
-    # -------------------------------------------------------------------------
-    # Original pattern
-    date_pattern = re.compile(
-        r"""
-        \[?                                        # Optional opening bracket
-        (?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s+)?    # Optional day of the week
-        (?P<month>[A-Za-z]{3,9})\s+               # Full or abbreviated month name
-        (?P<day>\d{1,2}),?\s+                      # Day of the month, comma optional
-        (?P<year>\d{4}),?\s+                       # Year, comma optional
-        (?P<hour>\d{1,2}):(?P<minute>\d{2})        # Start time HH:MM
-        (?:-(?P<end_hour>\d{1,2}):(?P<end_minute>\d{2}))?  # Optional end time HH:MM
-        \s*UTC                                     # UTC timezone
-        \]?                                        # Optional closing bracket
-        """,
-        re.IGNORECASE | re.VERBOSE
-    )
-    
-    # Alternative pattern for PeerDAS format: "Apr 22 (Tues), 2025, 14:00 UTC"
-    alt_date_pattern = re.compile(
-        r"""
-        (?P<month>[A-Za-z]{3,9})\s+                # Month name (abbreviated or full)
-        (?P<day>\d{1,2})                           # Day number
-        \s*(?:\([A-Za-z]{3,4}\))?,?\s*            # Optional day of week in parentheses, optional comma
-        (?P<year>\d{4}),?\s*                      # Year, optional comma
-        (?P<hour>\d{1,2}):(?P<minute>\d{2})        # Start time HH:MM
-        (?:\s*-\s*(?P<end_hour>\d{1,2}):(?P<end_minute>\d{2}))?  # Optional end time HH:MM
-        \s*UTC                                     # UTC timezone
-        """,
-        re.IGNORECASE | re.VERBOSE
-    )
-
-    # Try original pattern first
-    date_match = date_pattern.search(issue_body)
-    if not date_match:
-        # Try alternative pattern
-        date_match = alt_date_pattern.search(issue_body)
-        
-    if not date_match:
-        # Try to find any date-like mentions in the issue
-        date_samples = re.findall(r'[A-Za-z]+\s+\d{1,2}(?:,?\s*\d{4})(?:,?\s*\d{1,2}:\d{2})?', issue_body)
-        time_samples = re.findall(r'\d{1,2}:\d{2}\s*(?:UTC|GMT|EST|PST|[+-]\d{2}:\d{2})?', issue_body)
-        error_msg = "Missing or invalid date/time format."
-        
-        if date_samples or time_samples:
-            error_msg += f" Found potential date/time fragments: {', '.join(date_samples[:2])} {', '.join(time_samples[:2])}"
-        
-        print(f"[DEBUG] Could not match date pattern. Issue body excerpt: '{issue_body[:200].replace(chr(10), ' ')}'")
-        raise ValueError(error_msg)
-
-    month = date_match.group('month')
-    day = date_match.group('day')
-    year = date_match.group('year')
-    hour = date_match.group('hour')
-    minute = date_match.group('minute')
-    end_hour = date_match.group('end_hour')
-    end_minute = date_match.group('end_minute')
-
-    # Construct the datetime string
-    datetime_str = f"{month} {day} {year} {hour}:{minute}"
-    try:
-        start_dt = dt.strptime(datetime_str, "%B %d %Y %H:%M")  # Full month name
-    except ValueError:
-        try:
-            start_dt = dt.strptime(datetime_str, "%b %d %Y %H:%M")  # Abbreviated month name
-        except ValueError as e:
-            raise ValueError(f"Unable to parse the start time: {e}")
 
-    # Convert to UTC ISO format with Z suffix for Zoom API
-    start_time_utc = start_dt.isoformat() + "Z"
-    
-    # For debugging timezone issues
-    print(f"[DEBUG] Parsed date: {month} {day}, {year} at {hour}:{minute} UTC")
-    print(f"[DEBUG] Formatted as ISO 8601 for API: {start_time_utc}")
-    print(f"[DEBUG] Day of week: {start_dt.strftime('%A')}")
-
-    # -------------------------------------------------------------------------
-    # 2. Extract duration from issue body using a unified regex
-    # -------------------------------------------------------------------------
-    duration_match = re.search(
-        r"(?i)duration(?:\s*(?:in)?\s*minutes)?[:\s-]*(\d+)\s*(?:minutes|min|m)?\b",
-        issue_body
-    )
-    if not duration_match:
-        # Fallback: match a line starting with '-' followed by a number (e.g., '- 15 minutes')
-        duration_match = re.search(
-            r"(?m)^\s*-\s*(\d+)\s*(?:minutes|min|m)?\b",
-            issue_body
-        )
-    
-    if duration_match:
-        return start_time_utc, int(duration_match.group(1))
-
-    # -------------------------------------------------------------------------
-    # 3. If an end time is provided, compute duration from start and end times.
-    # -------------------------------------------------------------------------
-    if end_hour and end_minute:
-        end_time_str = f"{month} {day} {year} {end_hour}:{end_minute}"
-        try:
-            end_dt = dt.strptime(end_time_str, "%B %d %Y %H:%M")
-        except ValueError:
-            end_dt = dt.strptime(end_time_str, "%b %d %Y %H:%M")
-
-        if end_dt <= start_dt:
-            raise ValueError("End time must be after start time.")
-
-        duration_minutes = int((end_dt - start_dt).total_seconds() // 60)
-        return start_time_utc, duration_minutes
-
-    # No valid duration found
-    raise ValueError("Missing or invalid duration format. Provide duration in minutes after the date/time.")
-
-def commit_mapping_file():
-    file_path = MAPPING_FILE
-    commit_message = "Update meeting-topic mapping"
-    branch = os.environ.get("GITHUB_REF_NAME", "main")
-    author = InputGitAuthor(
-        name="GitHub Actions Bot",
-        email="actions@github.com"
-    )
-    
-    # Add repo initialization
-    token = os.environ["GITHUB_TOKEN"]
-    repo_name = os.environ["GITHUB_REPOSITORY"]
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-
-    # Read the LOCAL updated file content
-    with open(file_path, "r") as f:
-        file_content = f.read()
-
-    try:
-        # Get the CURRENT file state from repository
-        contents = repo.get_contents(file_path, ref=branch)
-        
-        # Verify we're updating the correct file
-        if contents.path != file_path:
-            raise ValueError(f"Path mismatch: {contents.path} vs {file_path}")
-
-        # Perform the update
-        update_result = repo.update_file(
-            path=contents.path,
-            message=commit_message,
-            content=file_content,
-            sha=contents.sha,
-            branch=branch,
-            author=author,
-        )
-        print(f"Successfully updated {file_path} in repository. Commit SHA: {update_result['commit'].sha}")
-        
-    except Exception as e:
-        # If file doesn't exist, create it
-        if isinstance(e, Exception) and "404" in str(e):
-            print(f"Creating new file {file_path} as it doesn't exist in repo")
-            repo.create_file(
-                path=file_path,
-                message=commit_message,
-                content=file_content,
-                branch=branch,
-                author=author,
-            )
-        else:
-            print(f"Failed to commit mapping file: {str(e)}")
-            raise
+    Raises ValueError if either is missing (see issue_parser.parse_issue_time).
+    """
+    return issue_parser.parse_issue_time(issue_body)
 
 def create_calendar_event(is_recurring, occurrence_rate, **kwargs):
     """Helper function to create the appropriate type of calendar event"""
@@ -1777,14 +1380,38 @@ def main():
     parser = argparse.ArgumentParser(description="Handle GitHub issue and create/update Discourse topic.")
     parser.add_argument("--issue_number", required=True, type=int, help="GitHub issue number")
     parser.add_argument("--repo", required=True, help="GitHub repository (e.g., 'org/repo')")
+    parser.add_argument("--plan", action="store_true",
+                        help="Print what would be done for the issue and exit, without calling any service")
+    parser.add_argument("--body-file", help="With --plan: read the issue body from this file instead of GitHub")
+    parser.add_argument("--title", help="With --plan and --body-file: the issue title")
     args = parser.parse_args()
 
     if not args.issue_number or not args.repo:
         print("Empty issue number or repository provided. Exiting without processing.")
         sys.exit(0)
 
+    if args.plan:
+        sys.exit(print_plan(args.issue_number, args.repo, body_file=args.body_file, title=args.title))
+
     handle_github_issue(issue_number=args.issue_number, repo_name=args.repo)
 
 
+def print_plan(issue_number, repo_name, body_file=None, title=None):
+    """Prints the plan for an issue (see modules/issue_plan.py); returns the exit status."""
+    if body_file:
+        with open(body_file) as f:
+            issue_body = f.read()
+        issue_title = title or f"Issue #{issue_number}"
+        issue_url = f"https://github.com/{repo_name}/issues/{issue_number}"
+    else:
+        issue = Github(os.environ["GITHUB_TOKEN"]).get_repo(repo_name).get_issue(number=issue_number)
+        issue_body = issue.body or "(No issue body provided.)"
+        issue_title = title or issue.title
+        issue_url = issue.html_url
+    plan = issue_plan.plan_issue(issue_number, issue_title, issue_body, issue_url, get_store())
+    print(issue_plan.format_plan(plan))
+    return 1 if plan.errors else 0
+
+
 if __name__ == "__main__":
     main()
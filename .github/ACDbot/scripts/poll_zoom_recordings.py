@@ -1,57 +1,22 @@
 import os
+import copy
 import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 import pytz
-from modules import zoom, transcript, youtube_utils, rss_utils, discourse
-from github import Github, InputGitAuthor
-
-MAPPING_FILE = ".github/ACDbot/meeting_topic_mapping.json"
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f, indent=2)
-
-def commit_mapping_file():
-    commit_message = "Update meeting-topic mapping"
-    branch = os.environ.get("GITHUB_REF_NAME", "main")
-    token = os.environ["GITHUB_TOKEN"]
-    repo_name = os.environ["GITHUB_REPOSITORY"]
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-    author = InputGitAuthor(
-        name="GitHub Actions Bot",
-        email="actions@github.com"
-    )
-    file_path = MAPPING_FILE
-    with open(file_path, "r") as f:
-        file_content = f.read()
-    try:
-        contents = repo.get_contents(file_path, ref=branch)
-        repo.update_file(
-            path=contents.path,
-            message=commit_message,
-            content=file_content,
-            sha=contents.sha,
-            branch=branch,
-            author=author,
-        )
-        print(f"Updated {file_path} in the repository.")
-    except Exception:
-        repo.create_file(
-            path=file_path,
-            message=commit_message,
-            content=file_content,
-            branch=branch,
-            author=author,
-        )
-        print(f"Created {file_path} in the repository.")
+from modules import zoom, transcript, youtube_utils, rss_utils, discourse, discourse_artifacts, mapping_commit
+from modules.meeting_store import get_store, iter_occurrences, parse_start_time, write_json_atomic
+
+# High-water mark of the recordings already seen, committed next to the mapping
+# (the mapping itself only holds meeting entries)
+POLL_STATE_FILE = ".github/ACDbot/zoom_poll_state.json"
+# How far back to look on the first run, and the furthest back a pending occurrence can pull the window
+MAX_LOOKBACK_DAYS = int(os.environ.get("ZOOM_POLL_MAX_LOOKBACK_DAYS", "30"))
+# Recordings ending this close to the cursor are looked at again, in case Zoom was still processing them
+CURSOR_OVERLAP = timedelta(days=1)
+# Occurrences processed in parallel; http_client additionally caps requests per host
+POLL_WORKERS = max(1, int(os.environ.get("ZOOM_POLL_WORKERS", "4")))
 
 def is_meeting_eligible(meeting_end_time):
     """
@@ -67,6 +32,66 @@ def is_meeting_eligible(meeting_end_time):
 def validate_meeting_id(meeting_id):
     return str(meeting_id).strip()
 
+def load_poll_state():
+    """Returns the persisted poll cursor ({"last_end_time": ..., "last_uuid": ...}), or {} if none."""
+    try:
+        with open(POLL_STATE_FILE, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[WARN] Could not read {POLL_STATE_FILE}, polling the full lookback window: {e}")
+        return {}
+
+def save_poll_state(state):
+    """Writes the poll cursor and schedules it for the run's commit."""
+    write_json_atomic(POLL_STATE_FILE, state)
+    mapping_commit.request_file_commit(POLL_STATE_FILE, f"Zoom poll cursor: {state.get('last_end_time')}", merge=merge_poll_state)
+
+def merge_poll_state(remote, local):
+    """Keeps whichever cursor is further ahead when another run moved it concurrently."""
+    remote_end = parse_start_time(remote.get("last_end_time"))
+    local_end = parse_start_time(local.get("last_end_time"))
+    if remote_end is not None and (local_end is None or remote_end > local_end):
+        return remote
+    return local
+
+def occurrence_is_pending(occurrence):
+    """True if process_single_occurrence still has work to do for this occurrence."""
+    topic_id = occurrence.get("discourse_topic_id")
+    if not topic_id:
+        return False
+    if not occurrence.get("transcript_processed") and occurrence.get("transcript_attempt_count", 0) < 10:
+        return True
+    return bool(occurrence.get("youtube_streams")) and not occurrence.get("youtube_streams_posted_to_discourse")
+
+def recording_end_time(recording):
+    """End of a recording: the latest recording_end of its files, else start_time + duration."""
+    ends = [parse_start_time(f.get("recording_end")) for f in recording.get("recording_files", [])]
+    ends = [end for end in ends if end is not None]
+    if ends:
+        return max(ends)
+    start = parse_start_time(recording.get("start_time"))
+    if start is None:
+        return None
+    return start + timedelta(minutes=recording.get("duration", 0))
+
+def poll_window_start(store, cursor_end, now):
+    """
+    Earliest date to ask Zoom for: just before the cursor, or earlier if a past
+    occurrence is still pending, but never more than MAX_LOOKBACK_DAYS ago.
+    """
+    earliest = now - timedelta(days=MAX_LOOKBACK_DAYS)
+    if cursor_end is None:
+        return earliest
+    start = cursor_end - CURSOR_OVERLAP
+    for entry in store.mapping.values():
+        for occurrence in iter_occurrences(entry):
+            occurrence_start = parse_start_time(occurrence.get("start_time"))
+            if occurrence_start and occurrence_start < start and occurrence_start <= now and occurrence_is_pending(occurrence):
+                start = occurrence_start
+    return max(start, earliest)
+
 def process_meeting(meeting_id, mapping):
     """Process a single meeting's recordings and transcripts"""
     entry = mapping.get(str(meeting_id)) # Ensure meeting_id is string
@@ -120,8 +145,7 @@ def process_meeting(meeting_id, mapping):
             # Mark as processed to avoid future attempts
             entry["skip_youtube_upload"] = True
             entry["Youtube_upload_processed"] = True
-            save_meeting_topic_mapping(mapping)
-            commit_mapping_file()
+            mapping_commit.request_commit(f"Meeting {meeting_id}: skip YouTube upload for recurring meeting")
         # Only attempt upload for non-recurring meetings that haven't been processed
         elif not entry.get("Youtube_upload_processed") and not entry.get("skip_youtube_upload", False):
             # Import directly from package path rather than relative path
@@ -137,8 +161,7 @@ def process_meeting(meeting_id, mapping):
         if discourse_topic_id:
             transcript.post_zoom_transcript_to_discourse(meeting_id)
             entry["transcript_processed"] = True
-            save_meeting_topic_mapping(mapping)
-            commit_mapping_file()
+            mapping_commit.request_commit(f"Meeting {meeting_id}: transcript posted")
             
             # Update RSS feed with transcript info
             try:
@@ -163,15 +186,17 @@ def process_meeting(meeting_id, mapping):
                     ])
                     discourse_body = f"**Previously Generated YouTube Stream Links:**\n{stream_links_text}"
                     try:
-                        discourse.create_post(
+                        discourse_artifacts.publish(
                             topic_id=discourse_topic_id,
-                            body=discourse_body
+                            occurrence_key=discourse.transcript_key(meeting_id, entry),
+                            kind="youtube_streams",
+                            key=str(meeting_id),
+                            body=discourse_body,
+                            record=entry,
                         )
                         entry["youtube_streams_posted_to_discourse"] = True
                         print(f"Successfully posted YouTube streams to Discourse topic {discourse_topic_id}")
-                        # Save mapping after successful post
-                        save_meeting_topic_mapping(mapping)
-                        commit_mapping_file()
+                        mapping_commit.request_commit(f"Meeting {meeting_id}: YouTube streams posted")
                     except Exception as e:
                         print(f"Error posting YouTube streams to Discourse topic {discourse_topic_id}: {e}")
 
@@ -179,41 +204,30 @@ def process_meeting(meeting_id, mapping):
         # Increment attempt counter on failure
         entry["transcript_attempt_count"] = entry.get("transcript_attempt_count", 0) + 1
         print(f"Transcript attempt {entry['transcript_attempt_count']} of 10 failed for meeting {meeting_id}")
-        save_meeting_topic_mapping(mapping)
-        commit_mapping_file()
+        mapping_commit.request_commit(f"Meeting {meeting_id}: transcript attempt failed")
         print(f"Error processing meeting {meeting_id}: {e}")
 
-def find_matching_occurrence(occurrences, recording_start_time_str, tolerance_minutes=30):
-    """Finds the occurrence matching the recording start time."""
-    if not occurrences:
-        return None, -1
-
-    try:
-        recording_start_time = datetime.fromisoformat(recording_start_time_str.replace('Z', '+00:00'))
-    except ValueError:
+def find_matching_occurrence(store, meeting_id, recording_start_time_str, tolerance_minutes=30):
+    """Finds the occurrence of meeting_id whose start time is closest to the recording start time."""
+    recording_start_time = parse_start_time(recording_start_time_str)
+    if recording_start_time is None:
         print(f"[ERROR] Invalid recording start time format: {recording_start_time_str}")
-        return None, -1
+        return None
 
-    tolerance = timedelta(minutes=tolerance_minutes)
+    _, occurrence = store.find_by_start_time(recording_start_time, tolerance_minutes, meeting_id=meeting_id)
+    if occurrence is None:
+        print(f"[WARN] No occurrence found matching recording start time {recording_start_time}")
+        return None
 
-    for index, occurrence in enumerate(occurrences):
-        occurrence_start_time_str = occurrence.get("start_time")
-        if not occurrence_start_time_str:
-            continue
-        try:
-            occurrence_start_time = datetime.fromisoformat(occurrence_start_time_str.replace('Z', '+00:00'))
-            if abs(recording_start_time - occurrence_start_time) <= tolerance:
-                print(f"[DEBUG] Matched recording start time {recording_start_time} with occurrence #{occurrence.get('issue_number')} start time {occurrence_start_time}")
-                return occurrence, index
-        except ValueError:
-            print(f"[WARN] Invalid start_time format in occurrence: {occurrence_start_time_str}")
-            continue
+    print(f"[DEBUG] Matched recording start time {recording_start_time} with occurrence #{occurrence.get('issue_number')} start time {occurrence.get('start_time')}")
+    return occurrence
 
-    print(f"[WARN] No occurrence found matching recording start time {recording_start_time}")
-    return None, -1
-
-def process_single_occurrence(recording, occurrence, occurrence_index, series_entry, mapping, force_process=False):
-    """Processes transcript and Discourse posts for a single matched recording and occurrence."""
+def process_single_occurrence(recording, occurrence, series_entry, force_process=False, notifications=None):
+    """
+    Processes transcript and Discourse posts for a single matched recording and occurrence.
+    If a notifications list is given, RSS notifications are appended to it as
+    (type, content, url) instead of being added to the shared mapping.
+    """
     mapping_updated = False
     recording_meeting_id = str(series_entry.get("meeting_id")) # Should be the same as recording.get("id")
     occurrence_issue_number = occurrence.get("issue_number")
@@ -255,35 +269,33 @@ def process_single_occurrence(recording, occurrence, occurrence_index, series_en
             )
 
             if transcript_success:
-                mapping[recording_meeting_id]["occurrences"][occurrence_index]["transcript_processed"] = True
+                occurrence["transcript_processed"] = True
                 # Reset attempt count on success
-                mapping[recording_meeting_id]["occurrences"][occurrence_index]["transcript_attempt_count"] = 0
+                occurrence["transcript_attempt_count"] = 0
                 mapping_updated = True
                 print(f"  -> Transcript posted successfully for occurrence #{occurrence_issue_number} to topic {discourse_topic_id}.")
 
                 # Update RSS feed with transcript info
-                try:
-                    rss_utils.add_notification_to_meeting(
-                        recording_meeting_id,
-                        occurrence_issue_number, # Pass issue number to identify occurrence
-                        "transcript_posted",
-                        "Meeting transcript posted to Discourse",
-                        f"{os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')}/t/{discourse_topic_id}"
-                    )
-                    print(f"  -> Updated RSS feed with transcript info.")
-                except Exception as e:
-                    print(f"[ERROR] Failed to update RSS feed for transcript: {e}")
+                notification = (
+                    "transcript_posted",
+                    "Meeting transcript posted to Discourse",
+                    f"{os.environ.get('DISCOURSE_BASE_URL', 'https://ethereum-magicians.org')}/t/{discourse_topic_id}"
+                )
+                if notifications is not None:
+                    notifications.append(notification)
+                else:
+                    add_rss_notifications(recording_meeting_id, occurrence_issue_number, [notification])
             else:
                  # Increment attempt counter only if not forced
                  if not force_process:
-                    mapping[recording_meeting_id]["occurrences"][occurrence_index]["transcript_attempt_count"] = transcript_attempts + 1
+                    occurrence["transcript_attempt_count"] = transcript_attempts + 1
                  mapping_updated = True
                  print(f"  -> Transcript posting failed.")
 
         except Exception as e:
             # Increment attempt counter only if not forced
             if not force_process:
-                mapping[recording_meeting_id]["occurrences"][occurrence_index]["transcript_attempt_count"] = transcript_attempts + 1
+                occurrence["transcript_attempt_count"] = transcript_attempts + 1
             mapping_updated = True
             print(f"[ERROR] Error posting transcript for occurrence #{occurrence_issue_number}: {e}")
     elif transcript_processed:
@@ -309,8 +321,15 @@ def process_single_occurrence(recording, occurrence, occurrence_index, series_en
          title = "**YouTube Stream Links:**" # Changed title slightly as context might be different
          discourse_body = f"{title}\n{stream_links_text}"
          try:
-             discourse.create_post(topic_id=discourse_topic_id, body=discourse_body)
-             mapping[recording_meeting_id]["occurrences"][occurrence_index]["youtube_streams_posted_to_discourse"] = True
+             discourse_artifacts.publish(
+                 topic_id=discourse_topic_id,
+                 occurrence_key=discourse.transcript_key(recording_meeting_id, occurrence),
+                 kind="youtube_streams",
+                 key=f"{recording_meeting_id}-{occurrence_issue_number}",
+                 body=discourse_body,
+                 record=occurrence,
+             )
+             occurrence["youtube_streams_posted_to_discourse"] = True
              mapping_updated = True
              print(f"  -> Successfully posted YouTube streams to Discourse.")
          except Exception as e:
@@ -324,22 +343,80 @@ def process_single_occurrence(recording, occurrence, occurrence_index, series_en
 
     return mapping_updated
 
-def process_recordings(mapping):
-    """Fetch recent recordings, match to occurrences, and process transcripts/Discourse posts."""
-    print("Fetching recent Zoom recordings...")
-    recordings = zoom.get_recordings_list()
-    if not recordings:
-        print("No recent recordings found on Zoom.")
-        return
+def add_rss_notifications(meeting_id, issue_number, notifications):
+    for notification_type, content, url in notifications:
+        try:
+            rss_utils.add_notification_to_meeting(meeting_id, issue_number, notification_type, content, url)
+            print(f"  -> Updated RSS feed with {notification_type} notification for occurrence #{issue_number}.")
+        except Exception as e:
+            print(f"[ERROR] Failed to update RSS feed for occurrence #{issue_number}: {e}")
 
-    print(f"Found {len(recordings)} recordings to check.")
+def process_occurrence_recordings(recordings, occurrence, series_entry):
+    """
+    Worker-thread half of process_recordings: runs every recording matched to one
+    occurrence, in order, against a private copy of that occurrence.
+    Everything they publish to Discourse goes out as one write at the end.
+    Returns (updated copy, RSS notifications, mapping_updated).
+    """
+    notifications = []
     mapping_updated = False
+    before = copy.deepcopy(occurrence)
+    try:
+        with discourse_artifacts.batch():
+            for recording in recordings:
+                updated = process_single_occurrence(
+                    recording=recording,
+                    occurrence=occurrence,
+                    series_entry=series_entry,
+                    force_process=False,
+                    notifications=notifications,
+                )
+                mapping_updated = updated or mapping_updated
+    except Exception as e:
+        # The artifacts never reached Discourse: forget what was marked as posted
+        print(f"[ERROR] Failed to publish Discourse artifacts for occurrence #{occurrence.get('issue_number')}: {e}")
+        occurrence = before
+        if not occurrence.get("transcript_processed"):
+            occurrence["transcript_attempt_count"] = occurrence.get("transcript_attempt_count", 0) + 1
+        return occurrence, [], True
+    return occurrence, notifications, mapping_updated
+
+def apply_occurrence_result(meeting_id, occurrence, result):
+    """Main-thread half: copies a worker's changes into the shared mapping."""
+    updated_occurrence, notifications, mapping_updated = result
+    for key, value in updated_occurrence.items():
+        if occurrence.get(key) != value:
+            occurrence[key] = value
+    add_rss_notifications(meeting_id, occurrence.get("issue_number"), notifications)
+    if mapping_updated:
+        mapping_commit.request_commit(f"Issue #{occurrence.get('issue_number')}: recording processed")
+
+def process_recordings(store):
+    """
+    Fetch new Zoom recordings (those ending after the persisted cursor) plus any
+    still matching a pending occurrence, and process transcripts/Discourse posts.
+    """
+    state = load_poll_state()
+    cursor_end = parse_start_time(state.get("last_end_time"))
+    now = datetime.now(timezone.utc)
+    from_date = poll_window_start(store, cursor_end, now)
+    print(f"Fetching Zoom recordings since {from_date.date()} (cursor: {state.get('last_end_time', 'none')})...")
+
+    tasks = {}
+    newest_end, newest_uuid = cursor_end, state.get("last_uuid")
+
+    for recording in zoom.iter_recordings(from_date=from_date, to_date=now):
+        recording_end = recording_end_time(recording)
+        is_new = cursor_end is None or recording_end is None or recording_end > cursor_end
+        # Only an eligible recording may move the cursor: Zoom can still be processing newer ones
+        if recording_end is not None and is_meeting_eligible(recording_end) and (newest_end is None or recording_end > newest_end):
+            newest_end, newest_uuid = recording_end, recording.get("uuid")
 
-    for recording in recordings:
         # --- Check Recording Duration --- 
         recording_duration = recording.get('duration', 0)
         if recording_duration < 10:
-            print(f"[INFO] Skipping recording (Topic: {recording.get('topic', 'N/A')}, Start: {recording.get('start_time', 'N/A')}) - Duration ({recording_duration} min) is less than 10 minutes.")
+            if is_new:
+                print(f"[INFO] Skipping recording (Topic: {recording.get('topic', 'N/A')}, Start: {recording.get('start_time', 'N/A')}) - Duration ({recording_duration} min) is less than 10 minutes.")
             continue # Move to the next recording in the list
         # --- End Duration Check ---
         
@@ -352,36 +429,64 @@ def process_recordings(mapping):
             continue
 
         # Get the series entry from mapping
-        series_entry = mapping.get(recording_meeting_id)
-        if not isinstance(series_entry, dict) or "occurrences" not in series_entry:
-            print(f"[INFO] No mapping entry or occurrences found for meeting ID {recording_meeting_id}. Skipping recording processing.")
+        series_entry = store.get_series(recording_meeting_id)
+        if not series_entry or "occurrences" not in series_entry:
+            if is_new:
+                print(f"[INFO] No mapping entry or occurrences found for meeting ID {recording_meeting_id}. Skipping recording processing.")
             continue
 
-        occurrences = series_entry.get("occurrences", [])
-        matched_occurrence, occurrence_index = find_matching_occurrence(occurrences, recording_start_time_str)
+        matched_occurrence = find_matching_occurrence(store, recording_meeting_id, recording_start_time_str)
 
         if matched_occurrence is None:
             print(f"[INFO] Could not match recording ({recording.get('topic', 'N/A')} at {recording_start_time_str}) to any occurrence for meeting ID {recording_meeting_id}.")
             continue
 
-        # Call the refactored processing function
-        updated = process_single_occurrence(
-            recording=recording,
-            occurrence=matched_occurrence,
-            occurrence_index=occurrence_index,
-            series_entry=series_entry,
-            mapping=mapping,
-            force_process=False # Pass the specific instance UUID
-        )
-        if updated:
-            mapping_updated = True # Mark that some change occurred in the loop
-
-    # Save and commit mapping if any changes were made during the loop
-    if mapping_updated:
-        print("Saving updated mapping file...")
-        save_meeting_topic_mapping(mapping)
+        # Recordings behind the cursor are only revisited while their occurrence has work left
+        if not is_new and not occurrence_is_pending(matched_occurrence):
+            continue
+
+        # Several recordings (e.g. a restarted call) can match the same occurrence;
+        # they go to the same worker so they are handled one after another
+        key = id(matched_occurrence)
+        if key not in tasks:
+            tasks[key] = (recording_meeting_id, matched_occurrence, series_entry, [])
+        tasks[key][3].append(recording)
+
+    checked = sum(len(task[3]) for task in tasks.values())
+    if tasks:
+        print(f"Processing {len(tasks)} occurrences with up to {POLL_WORKERS} workers...")
+        # Workers only see copies; every mapping change is applied here on the main thread
+        with ThreadPoolExecutor(max_workers=POLL_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    process_occurrence_recordings,
+                    recordings,
+                    copy.deepcopy(occurrence),
+                    copy.deepcopy(series_entry),
+                ): (meeting_id, occurrence)
+                for meeting_id, occurrence, series_entry, recordings in tasks.values()
+            }
+            for future in as_completed(futures):
+                meeting_id, occurrence = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Unexpected error processing occurrence #{occurrence.get('issue_number')}: {e}")
+                    continue
+                apply_occurrence_result(meeting_id, occurrence, result)
+
+    print(f"Checked {checked} new or pending recordings.")
+    if newest_end is not None and newest_end != cursor_end:
+        save_poll_state({
+            "last_end_time": newest_end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "last_uuid": newest_uuid,
+        })
+
+    # One commit for every change made during the loop
+    if mapping_commit.has_pending_commit():
+        print("Committing updated mapping file...")
         try:
-            commit_mapping_file()
+            mapping_commit.flush_commits()
         except Exception as e:
             print(f"::error::Failed to commit mapping file: {e}")
     else:
@@ -393,13 +498,13 @@ def main():
     parser.add_argument("--force_issue_number", required=False, type=int, help="Force processing for a specific occurrence identified by issue number (requires --force_meeting_id)")
     args = parser.parse_args()
 
-    mapping = load_meeting_topic_mapping()
+    store = get_store()
 
     if args.force_meeting_id:
         meeting_id = validate_meeting_id(args.force_meeting_id)
         if meeting_id:
             print(f"Attempting forced processing for meeting {meeting_id}")
-            series_entry = mapping.get(meeting_id)
+            series_entry = store.get_series(meeting_id)
             if not series_entry or "occurrences" not in series_entry:
                 print(f"::error::Meeting ID {meeting_id} not found in mapping or has no occurrences.")
                 return
@@ -407,14 +512,7 @@ def main():
             if args.force_issue_number:
                 occurrence_issue_number = args.force_issue_number
                 print(f"Searching for occurrence with Issue Number: {occurrence_issue_number}")
-                # Find the specific occurrence and its index
-                target_occurrence = None
-                occurrence_index = -1
-                for idx, occ in enumerate(series_entry["occurrences"]):
-                    if occ.get("issue_number") == occurrence_issue_number:
-                        target_occurrence = occ
-                        occurrence_index = idx
-                        break
+                target_occurrence = store.find_occurrence_in_series(meeting_id, occurrence_issue_number)
 
                 if not target_occurrence:
                     print(f"::error::Issue number {occurrence_issue_number} not found within occurrences for meeting ID {meeting_id}.")
@@ -428,7 +526,12 @@ def main():
 
                 # Fetch recordings and find the matching one
                 print("Fetching Zoom recordings to find match...")
-                recordings = zoom.get_recordings_list() # Fetch recent recordings
+                # Only the days around the occurrence, however long ago it was
+                occurrence_start = parse_start_time(occurrence_start_time_str)
+                if occurrence_start:
+                    recordings = zoom.get_recordings_list(occurrence_start - timedelta(days=1), occurrence_start + timedelta(days=1))
+                else:
+                    recordings = zoom.get_recordings_list() # Fetch recent recordings
                 if not recordings:
                     print("::error::No recent recordings found on Zoom to match against.")
                     return
@@ -472,17 +575,15 @@ def main():
                 mapping_updated = process_single_occurrence(
                     recording=matching_recording,
                     occurrence=target_occurrence,
-                    occurrence_index=occurrence_index,
                     series_entry=series_entry,
-                    mapping=mapping,
                     force_process=True, # Enable force mode
                 )
 
                 if mapping_updated:
-                    print("Saving updated mapping file after forced processing...")
-                    save_meeting_topic_mapping(mapping)
+                    print("Committing updated mapping file after forced processing...")
+                    mapping_commit.request_commit(f"Issue #{occurrence_issue_number}: forced recording processing")
                     try:
-                        commit_mapping_file()
+                        mapping_commit.flush_commits()
                     except Exception as e:
                         print(f"::error::Failed to commit mapping file after forced run: {e}")
                 else:
@@ -497,7 +598,7 @@ def main():
             return
 
     # --- Regular Polling Logic ---
-    process_recordings(mapping)
+    process_recordings(store)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
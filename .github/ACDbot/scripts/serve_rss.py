@@ -1,77 +1,268 @@
 #!/usr/bin/env python3
 """
-Simple HTTP server to serve the RSS feed.
-This can be used for testing or as a simple production server.
-For production, consider using a proper web server like Nginx or Apache.
+HTTP server for the RSS feeds (see rss_utils for the feeds themselves).
+
+Each request is handled on its own thread, so a slow client cannot hold up
+the others. Feeds are served from memory: a file is read (and compressed with
+gzip, and brotli when the brotli package is installed) once per change, not
+once per request. Responses carry ETag, Last-Modified and Cache-Control, and
+conditional requests for an unchanged feed get a headers-only 304.
+
+Rebuilds run on a background thread, never inside a request: /update asks for
+one and returns 202 straight away, and the mapping file is watched so that a
+change to it triggers one too. Requests keep getting the previous feed while
+a rebuild runs.
+
+Configuration (environment variables):
+  - ACDBOT_RSS_CACHE_MAX_AGE   Cache-Control max-age sent to clients, in seconds (default 300)
+  - ACDBOT_RSS_WATCH_INTERVAL  how often the mapping file is checked for changes, in seconds (default 30)
 """
 
 import os
 import sys
+import gzip
+import hashlib
+import threading
 import http.server
-import socketserver
 import argparse
+from email.utils import formatdate, parsedate_to_datetime
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
 from modules import rss_utils
-from modules.transcript import load_meeting_topic_mapping
+from modules.meeting_store import MAPPING_FILE, load_meeting_topic_mapping
 
 # Default port
 PORT = 8000
+CACHE_MAX_AGE = int(os.environ.get("ACDBOT_RSS_CACHE_MAX_AGE", "300"))
+WATCH_INTERVAL = float(os.environ.get("ACDBOT_RSS_WATCH_INTERVAL", "30"))
+# Seconds a client may take to send its request or read the response
+CLIENT_TIMEOUT = 30
+
+
+class CachedFeed:
+    """One feed file held in memory, with its compressed variants and validators."""
+
+    def __init__(self, content, mtime):
+        self.mtime = mtime
+        self.etag = '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.bodies = {"identity": content, "gzip": gzip.compress(content, 9, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(content)
+
+    def body_for(self, accept_encoding):
+        """(encoding, body) of the best variant the client accepts."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding, self.bodies[encoding]
+        return "identity", self.bodies["identity"]
+
+    def etag_for(self, encoding):
+        # Each encoding is a different representation, so it gets its own tag
+        return self.etag if encoding == "identity" else f'{self.etag[:-1]}-{encoding}"'
+
+    def not_modified(self, encoding, if_none_match, if_modified_since):
+        """True if the client's validators show it already has this version of the encoding body_for picked."""
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag_for(encoding) in tags
+        if if_modified_since:
+            try:
+                return int(self.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class FeedCache:
+    """Feed files by path, reloaded when their modification time changes."""
+
+    def __init__(self):
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """The CachedFeed for path, or None if the file does not exist."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        feed = self._feeds.get(path)
+        if feed is not None and feed.mtime == mtime:
+            return feed
+        with self._lock:
+            feed = self._feeds.get(path)
+            if feed is None or feed.mtime != mtime:
+                with open(path, 'rb') as f:
+                    feed = CachedFeed(f.read(), mtime)
+                self._feeds[path] = feed
+            return feed
+
+
+class FeedRebuilder:
+    """
+    Background thread that rebuilds the feeds when asked, or when the mapping
+    file changes. Requests made while a rebuild runs are folded into the next one.
+    """
+
+    def __init__(self, mapping_path=MAPPING_FILE, interval=WATCH_INTERVAL):
+        self.mapping_path = mapping_path
+        self.interval = interval
+        self.rebuilds = 0
+        self._wanted = threading.Event()
+        self._stopped = threading.Event()
+        self._mapping_mtime = self._mtime()
+        self._thread = threading.Thread(target=self._run, name="rss-rebuilder", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def request(self):
+        self._wanted.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wanted.set()
+        self._thread.join(timeout=5)
+
+    def rebuild(self):
+        mapping = load_meeting_topic_mapping(reload=True)
+        rss_utils.create_or_update_rss_feed(mapping)
+        self.rebuilds += 1
+
+    def _mtime(self):
+        try:
+            return os.stat(self.mapping_path).st_mtime
+        except OSError:
+            return None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            requested = self._wanted.wait(self.interval)
+            if self._stopped.is_set():
+                return
+            self._wanted.clear()
+            mtime = self._mtime()
+            if not requested and mtime == self._mapping_mtime:
+                continue
+            self._mapping_mtime = mtime
+            try:
+                self.rebuild()
+                print(f"RSS feeds rebuilt ({'requested' if requested else 'mapping changed'})")
+            except Exception as e:
+                print(f"Error updating RSS feed: {e}")
+
+
+class RSSHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the feeds from the server's FeedCache"""
+
+    protocol_version = "HTTP/1.1"
+    timeout = CLIENT_TIMEOUT
 
-class RSSHandler(http.server.SimpleHTTPRequestHandler):
-    """Custom handler to serve the RSS feed"""
-    
     def do_GET(self):
         """Handle GET requests"""
-        if self.path == '/rss' or self.path == '/rss/':
-            self.serve_rss()
-        elif self.path == '/update' or self.path == '/update/':
+        self.handle_request(send_body=True)
+
+    def do_HEAD(self):
+        self.handle_request(send_body=False)
+
+    def handle_request(self, send_body):
+        if self.path in ('/update', '/update/'):
             self.update_rss()
-        else:
-            # Serve static files
-            super().do_GET()
-    
-    def serve_rss(self):
-        """Serve the RSS feed"""
+            return
+        feed_path = rss_utils.feed_file_for(self.path)
+        if feed_path is None:
+            self.send_error(404, "Not found")
+            return
+        self.serve_rss(feed_path, send_body)
+
+    def serve_rss(self, feed_path, send_body=True):
+        """Serve an RSS feed from memory, honouring conditional requests"""
         try:
-            # Ensure RSS file exists
+            feed = self.server.feeds.get(feed_path)
+        except OSError as e:
+            self.send_error(500, f"Error serving RSS feed: {str(e)}")
+            return
+        if feed is None:
+            # Not built yet (or no such series/year): ask for a build if the main feed is missing
             if not os.path.exists(rss_utils.RSS_FILE_PATH):
-                mapping = load_meeting_topic_mapping()
-                rss_utils.create_or_update_rss_feed(mapping)
-            
-            # Read the RSS file
-            with open(rss_utils.RSS_FILE_PATH, 'rb') as f:
-                content = f.read()
-            
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-type', 'application/rss+xml')
+                self.server.rebuilder.request()
+            self.send_error(404, "No such feed")
+            return
+
+        encoding, body = feed.body_for(self.headers.get('Accept-Encoding'))
+        if feed.not_modified(encoding, self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')):
+            self.send_response(304)
+            self.send_validators(feed, encoding)
             self.end_headers()
-            self.wfile.write(content)
-        except Exception as e:
-            self.send_error(500, f"Error serving RSS feed: {str(e)}")
-    
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        if encoding != "identity":
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_validators(feed, encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def send_validators(self, feed, encoding):
+        self.send_header('ETag', feed.etag_for(encoding))
+        self.send_header('Last-Modified', feed.last_modified)
+        self.send_header('Cache-Control', f'public, max-age={CACHE_MAX_AGE}')
+        self.send_header('Vary', 'Accept-Encoding')
+
     def update_rss(self):
-        """Update the RSS feed"""
-        try:
-            mapping = load_meeting_topic_mapping()
-            rss_utils.create_or_update_rss_feed(mapping)
-            
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b"RSS feed updated successfully")
-        except Exception as e:
-            self.send_error(500, f"Error updating RSS feed: {str(e)}")
+        """Ask the background rebuilder for a fresh feed"""
+        self.server.rebuilder.request()
+        body = b"RSS feed update scheduled"
+        self.send_response(202)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class RSSServer(http.server.ThreadingHTTPServer):
+    """Thread-per-request server sharing one FeedCache and FeedRebuilder"""
+
+    daemon_threads = True
+
+    def __init__(self, address, rebuilder=None):
+        super().__init__(address, RSSHandler)
+        self.feeds = FeedCache()
+        self.rebuilder = rebuilder or FeedRebuilder()
+
+
+def parse_accept_encoding(value):
+    """{encoding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for item in (value or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
 
 def main():
     parser = argparse.ArgumentParser(description="Serve the RSS feed")
     parser.add_argument("--port", type=int, default=PORT, help=f"Port to serve on (default: {PORT})")
     parser.add_argument("--update-only", action="store_true", help="Update the RSS feed and exit")
     args = parser.parse_args()
-    
-    # Change to the directory containing the RSS file
-    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
+
     if args.update_only:
         try:
             mapping = load_meeting_topic_mapping()
@@ -81,15 +272,19 @@ def main():
         except Exception as e:
             print(f"Error updating RSS feed: {e}")
             sys.exit(1)
-    
+
     # Start the server
-    with socketserver.TCPServer(("", args.port), RSSHandler) as httpd:
+    rebuilder = FeedRebuilder().start()
+    rebuilder.request()  # Serve a feed that matches the current mapping
+    with RSSServer(("", args.port), rebuilder) as httpd:
         print(f"Serving RSS feed at http://localhost:{args.port}/rss")
         print("Press Ctrl+C to stop")
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nServer stopped")
+        finally:
+            rebuilder.stop()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,24 +1,28 @@
 import os
+import copy
+import queue
 import time
 import tempfile
 import requests
 import argparse
+import httplib2
 import google.oauth2.credentials
 import google_auth_oauthlib.flow
 import googleapiclient.discovery
 import googleapiclient.errors
+import googleapiclient.http
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from modules import zoom, transcript, discourse, tg
+from modules import zoom, transcript, discourse, discourse_artifacts, tg, http_client, mapping_commit, media_stream, youtube_catalog, youtube_quota
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta, timezone
+from modules.meeting_store import get_store, load_meeting_topic_mapping, iter_occurrences, parse_start_time
 from github import Github
 from google.auth.transport.requests import Request
-import json
-import subprocess
 from modules.zoom import (
     get_meeting_recording,
-    get_access_token,
     get_meeting_summary
 )
 from google.oauth2 import service_account
@@ -36,9 +40,19 @@ SCOPES = [
     "https://www.googleapis.com/auth/youtube"
 ]
 CLIENT_SECRETS_FILE = "client_secrets.json"
-
-# Add these functions at the top of the file
-MAPPING_FILE = ".github/ACDbot/meeting_topic_mapping.json"
+# "stream" pipes the Zoom download straight into the YouTube upload,
+# "file" downloads the whole recording to a temp file first
+UPLOAD_MODE = os.environ.get("ACDBOT_YOUTUBE_UPLOAD_MODE", "stream").lower()
+UPLOAD_NUM_RETRIES = int(os.environ.get("ACDBOT_YOUTUBE_UPLOAD_RETRIES", "5"))
+# Consecutive failed chunks (transport errors, 5xx after UPLOAD_NUM_RETRIES)
+# before giving up; the saved session lets the next run continue
+UPLOAD_CHUNK_RETRIES = int(os.environ.get("ACDBOT_YOUTUBE_CHUNK_RETRIES", "3"))
+# Recordings uploaded at once when draining the queue (each holds one Zoom download)
+UPLOAD_WORKERS = max(1, int(os.environ.get("ACDBOT_YOUTUBE_UPLOAD_WORKERS", "2")))
+# Older occurrences are left alone: Zoom may have deleted their recordings
+UPLOAD_MAX_AGE_DAYS = int(os.environ.get("ACDBOT_YOUTUBE_UPLOAD_MAX_AGE_DAYS", "30"))
+# A recording belongs to an occurrence if it started within this many minutes of it
+RECORDING_MATCH_MINUTES = 30
 
 def get_authenticated_service():
     # Initialize credentials from environment variables
@@ -62,10 +76,28 @@ def video_exists(youtube, meeting_id):
         return False
     return True
 
-def download_zoom_recording(meeting_id):
-    """Download Zoom recording MP4 file to temp location"""
+def find_existing_video(youtube, meeting_id, issue_number):
+    """The channel catalog entry already uploaded for this occurrence, or None if there is none or the lookup fails"""
     try:
-        recording_info = get_meeting_recording(meeting_id)
+        return youtube_catalog.find_meeting_video(youtube, meeting_id, int(issue_number))
+    except (youtube_quota.QuotaDeferred, HttpError, ValueError, TypeError) as e:
+        print(f"[WARN] Could not check the YouTube channel for an existing video: {e}")
+        return None
+
+def find_zoom_mp4(meeting_id, occurrence=None):
+    """
+    Returns the MP4 entry of the meeting's recording files, or None.
+
+    With an occurrence that has a start_time, the recording of that instance is
+    looked up (closest start within RECORDING_MATCH_MINUTES); otherwise the
+    meeting's latest recording is used.
+    """
+    occurrence_start = parse_start_time(occurrence.get("start_time")) if occurrence else None
+    try:
+        if occurrence_start is not None:
+            recording_info = find_occurrence_recording(meeting_id, occurrence_start)
+        else:
+            recording_info = get_meeting_recording(meeting_id)
     except Exception as e:
         print(f"Error fetching meeting recording for meeting {meeting_id}: {e}")
         return None
@@ -75,33 +107,205 @@ def download_zoom_recording(meeting_id):
 
     for file in recording_info['recording_files']:
         if file.get('file_type') == 'MP4' and file.get('download_url'):
-            download_url = file['download_url']
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-            
-            headers = {
-                "Authorization": f"Bearer {get_access_token()}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(download_url, headers=headers, stream=True)
-            if response.status_code == 200:
-                for chunk in response.iter_content(chunk_size=1024*1024):
-                    if chunk:
-                        temp_file.write(chunk)
-                temp_file.close()
-                return temp_file.name
+            return file
     return None
 
-def upload_recording(meeting_id, occurrence_issue_number=None):
-    """Uploads Zoom recording to YouTube for a specific occurrence."""
+def find_occurrence_recording(meeting_id, occurrence_start):
+    """The meeting's cloud recording starting closest to occurrence_start, or None"""
+    best, best_delta = None, None
+    for recording in zoom.iter_recordings(from_date=occurrence_start - timedelta(days=1),
+                                          to_date=occurrence_start + timedelta(days=1)):
+        recording_start = parse_start_time(recording.get("start_time"))
+        if str(recording.get("id")) != meeting_id or recording_start is None:
+            continue
+        delta = abs(recording_start - occurrence_start)
+        if delta <= timedelta(minutes=RECORDING_MATCH_MINUTES) and (best_delta is None or delta < best_delta):
+            best, best_delta = recording, delta
+    return best
+
+def open_zoom_download(recording_file, offset=0):
+    """
+    Starts streaming a Zoom recording file from byte offset (via a Range
+    request). Returns the open response, or None.
+    """
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    response = zoom.api_request("GET", recording_file['download_url'], headers=headers, stream=True)
+    if response.status_code not in (200, 206):
+        print(f"Error downloading Zoom recording: {response.status_code}")
+        response.close()
+        return None
+    return response
+
+def skip_bytes(chunks, count):
+    """Drops the first count bytes of a chunk iterator"""
+    for chunk in chunks:
+        if count >= len(chunk):
+            count -= len(chunk)
+            continue
+        yield chunk[count:]
+        count = 0
+
+def download_zoom_recording(meeting_id, occurrence=None):
+    """Download Zoom recording MP4 file to temp location"""
+    recording_file = find_zoom_mp4(meeting_id, occurrence)
+    if not recording_file:
+        return None
+
+    response = open_zoom_download(recording_file)
+    if response is None:
+        return None
+    with response, tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_file:
+        for chunk in response.iter_content(chunk_size=1024*1024):
+            if chunk:
+                temp_file.write(chunk)
+    return temp_file.name
+
+def open_recording_media(meeting_id, occurrence=None, offset=0):
+    """
+    Returns (media, cleanup) for uploading the meeting's MP4, or (None, None).
+
+    In "stream" mode the Zoom download is piped into the YouTube upload through
+    a bounded in-memory buffer, starting at offset when resuming an upload; in
+    "file" mode it is downloaded to a temp file first. cleanup() must be called
+    once the upload is done.
+    """
+    if UPLOAD_MODE == "file":
+        video_path = download_zoom_recording(meeting_id, occurrence)
+        if not video_path:
+            return None, None
+        media = googleapiclient.http.MediaFileUpload(
+            video_path, mimetype="video/mp4", chunksize=media_stream.CHUNK_SIZE, resumable=True
+        )
+        return media, lambda: os.unlink(video_path)
+
+    recording_file = find_zoom_mp4(meeting_id, occurrence)
+    if not recording_file:
+        return None, None
+    response = open_zoom_download(recording_file, offset)
+    if response is None:
+        return None, None
+
+    chunks = response.iter_content(chunk_size=1024*1024)
+    if response.status_code == 206:
+        # Content-Range: bytes <first>-<last>/<total>
+        size = response.headers.get("Content-Range", "").rpartition("/")[2]
+    else:
+        # Range ignored, the whole file is coming
+        size = response.headers.get("Content-Length")
+        chunks = skip_bytes(chunks, offset)
+    size = size if size and size.isdigit() else recording_file.get("file_size")
+    media = media_stream.StreamingMediaUpload(chunks, size=int(size) if size else None, start=offset)
+
+    def cleanup():
+        media.close()
+        response.close()
+    return media, cleanup
+
+class UploadSessionExpired(Exception):
+    """The saved resumable upload session is no longer known to YouTube"""
+
+def query_upload_session(uri, total_size=None):
+    """
+    Asks YouTube how much of a resumable upload session it has received.
+    Returns (offset, video): the byte offset to resume from, or the created
+    video if the upload already completed. Raises UploadSessionExpired when
+    YouTube no longer knows the session.
+    """
+    response = http_client.put(uri, allow_redirects=False, headers={
+        "Content-Length": "0",
+        "Content-Range": f"bytes */{total_size if total_size is not None else '*'}",
+    })
+    if response.status_code in (404, 410):
+        raise UploadSessionExpired(f"Upload session expired (HTTP {response.status_code})")
+    if response.status_code in (200, 201):
+        return total_size, response.json()
+    if response.status_code != 308:
+        response.raise_for_status()
+        raise RuntimeError(f"Unexpected upload session status {response.status_code}")
+    # Range: bytes=0-<last received byte>; absent when nothing was received
+    received = response.headers.get("Range", "").rpartition("-")[2]
+    return (int(received) + 1 if received.isdigit() else 0), None
+
+def upload_media(youtube, request_body, media, session=None, checkpoint=None):
+    """
+    Runs the resumable videos().insert() upload chunk by chunk and returns the
+    created video.
+
+    session ({"uri", "offset"}) resumes an upload started by an earlier run.
+    checkpoint(uri, offset) is called whenever the server confirms more bytes,
+    so a later run can resume from there. A failed chunk is retried up to
+    UPLOAD_CHUNK_RETRIES times in a row with backoff; each retry first asks
+    YouTube how much it actually received. A resumed session is likewise
+    queried first (query_upload_session), since the server may have more than
+    the saved offset.
+    """
+    request = youtube.videos().insert(
+        part="snippet,status",
+        body=request_body,
+        media_body=media
+    )
+    if session:
+        offset, video = query_upload_session(session["uri"], media.size())
+        if video is not None:
+            return video
+        if offset != session.get("offset", 0):
+            print(f"[DEBUG] YouTube has {offset} bytes of the upload, saved checkpoint was {session.get('offset', 0)}")
+        request.resumable_uri = session["uri"]
+        request.resumable_progress = offset
+    else:
+        youtube_quota.charge("videos.insert", youtube_quota.UPLOAD)
+
+    response = None
+    failures = 0
+    while response is None:
+        try:
+            status, response = request.next_chunk(num_retries=UPLOAD_NUM_RETRIES)
+        except HttpError as e:
+            if session and request.resumable_uri == session["uri"] and e.resp.status in (404, 410):
+                raise UploadSessionExpired(f"Upload session expired (HTTP {e.resp.status})") from e
+            if youtube_quota.is_quota_exceeded(e):
+                youtube_quota.mark_exhausted()
+                raise
+            if e.resp.status < 500 and e.resp.status != 429:
+                raise
+            failures = _chunk_failed(failures, e)
+            continue
+        except (OSError, httplib2.HttpLib2Error) as e:
+            failures = _chunk_failed(failures, e)
+            continue
+        finally:
+            if checkpoint and request.resumable_uri:
+                checkpoint(request.resumable_uri, request.resumable_progress)
+
+        failures = 0
+        if status and status.total_size:
+            print(f"[DEBUG] Uploaded {int(status.progress() * 100)}% ({status.resumable_progress} bytes)")
+    return response
+
+def _chunk_failed(failures, error):
+    if failures >= UPLOAD_CHUNK_RETRIES:
+        raise error
+    delay = http_client.backoff_delay(failures)
+    print(f"[WARN] YouTube upload chunk failed ({error}), retrying in {delay:.1f}s ({failures + 1}/{UPLOAD_CHUNK_RETRIES})")
+    time.sleep(delay)
+    return failures + 1
+
+def upload_recording(meeting_id, occurrence_issue_number=None, updates=None):
+    """
+    Uploads Zoom recording to YouTube for a specific occurrence.
+
+    With updates (a queue.Queue), the upload runs against a private copy of the
+    occurrence and every mapping or RSS change is put on the queue as a
+    callable for the main thread to run, so uploads can go in worker threads.
+    """
 
     # Ensure meeting_id is a string
     meeting_id = str(meeting_id)
 
     youtube = get_authenticated_service()
-    mapping = load_meeting_topic_mapping()
+    store = get_store()
     
-    series_entry = mapping.get(meeting_id)
+    series_entry = store.get_series(meeting_id)
 
     if not series_entry:
         print(f"[ERROR] Meeting ID {meeting_id} not found in mapping.")
@@ -112,19 +316,33 @@ def upload_recording(meeting_id, occurrence_issue_number=None):
         # Try to find the most recent occurrence if not specified (best effort)
         if series_entry.get("occurrences"):
             matched_occurrence = series_entry["occurrences"][-1] # Assume last is latest
-            occurrence_index = len(series_entry["occurrences"]) - 1
             occurrence_issue_number = matched_occurrence.get("issue_number", "[Unknown]")
             print(f"[WARN] occurrence_issue_number not provided, attempting upload for latest occurrence: Issue #{occurrence_issue_number}")
         else:
             print(f"[ERROR] No occurrences found for meeting {meeting_id} and occurrence_issue_number not specified.")
             return False
     else:
-        matched_occurrence, occurrence_index = find_occurrence_by_issue_number(series_entry, occurrence_issue_number)
+        matched_occurrence = store.find_occurrence_in_series(meeting_id, occurrence_issue_number)
 
     if matched_occurrence is None:
         print(f"[ERROR] Occurrence with issue number {occurrence_issue_number} not found for meeting ID {meeting_id}.")
         return False # Indicate failure
 
+    shared_occurrence = matched_occurrence
+    if updates is not None:
+        matched_occurrence = copy.deepcopy(matched_occurrence)
+
+    def on_main_thread(action):
+        if updates is None:
+            action()
+        else:
+            updates.put(action)
+
+    def update_occurrence(reason, **changes):
+        """Applies changes (None removes the key) to our view and to the shared mapping"""
+        apply_occurrence_changes(matched_occurrence, changes)
+        on_main_thread(lambda: apply_occurrence_changes(shared_occurrence, changes, reason))
+
     # --- Use occurrence-specific data --- 
     print(f"Processing YouTube upload for Meeting ID {meeting_id}, Occurrence Issue #{occurrence_issue_number}")
 
@@ -132,19 +350,44 @@ def upload_recording(meeting_id, occurrence_issue_number=None):
     if matched_occurrence.get("skip_youtube_upload", False):
         print(f"  -> Skipping: Occurrence marked as skip_youtube_upload.")
         # Mark as processed anyway so we don't retry?
-        # mapping[meeting_id]["occurrences"][occurrence_index]["Youtube_upload_processed"] = True # Or leave as is?
+        # matched_occurrence["Youtube_upload_processed"] = True # Or leave as is?
         # save_meeting_topic_mapping(mapping) # No commit here, let poll script handle batch commit
         return True # Indicate already processed
 
-    # Check attempt counter within the occurrence
-    attempt_count = matched_occurrence.get("upload_attempt_count", 0)
-    if attempt_count >= 10:
-        print(f"  -> Skipping: Max upload attempts reached for occurrence.")
-        return False # Indicate failure
+    # A video whose mapping update was lost (e.g. the run died before its commit)
+    # is already on the channel: record it instead of uploading a duplicate
+    if not matched_occurrence.get("Youtube_upload_processed") and not matched_occurrence.get("youtube_upload_session"):
+        existing = find_existing_video(youtube, meeting_id, occurrence_issue_number)
+        if existing:
+            print(f"  -> Found existing YouTube video {existing['video_id']} for occurrence, not uploading again.")
+            update_occurrence(f"Issue #{occurrence_issue_number}: YouTube video {existing['video_id']} found on channel",
+                              youtube_video_id=existing["video_id"], Youtube_upload_processed=True)
+            return True
+
+    # An earlier run's upload session that got further since it was last
+    # resumed is continued without counting as a new attempt
+    session = matched_occurrence.get("youtube_upload_session")
+    if session_is_resumable(session):
+        session = dict(session, resumed_from=session.get("offset", 0))
+        print(f"  -> Resuming YouTube upload at byte {session['resumed_from']}")
+        update_occurrence(f"Issue #{occurrence_issue_number}: YouTube upload resumed at byte {session['resumed_from']}",
+                          youtube_upload_session=session)
+    else:
+        # Check attempt counter within the occurrence
+        attempt_count = matched_occurrence.get("upload_attempt_count", 0)
+        if attempt_count >= 10:
+            print(f"  -> Skipping: Max upload attempts reached for occurrence.")
+            return False # Indicate failure
+
+        # A new upload costs a videos.insert; without the quota for it, don't use up an attempt
+        if not matched_occurrence.get("Youtube_upload_processed") and \
+                youtube_quota.available(youtube_quota.UPLOAD) < youtube_quota.cost("videos.insert"):
+            print(f"  -> Deferring: not enough YouTube quota left today for a new upload.")
+            return False
 
-    # Increment attempt count immediately
-    mapping[meeting_id]["occurrences"][occurrence_index]["upload_attempt_count"] = attempt_count + 1
-    save_meeting_topic_mapping(mapping) # Save attempt count increment
+        # Increment attempt count immediately
+        update_occurrence(f"Issue #{occurrence_issue_number}: YouTube upload attempt {attempt_count + 1}",
+                          upload_attempt_count=attempt_count + 1)
 
     # Only proceed if not already processed
     if matched_occurrence.get("Youtube_upload_processed"):
@@ -158,11 +401,21 @@ def upload_recording(meeting_id, occurrence_issue_number=None):
         f"\nGitHub Issue: https://github.com/{os.environ.get('GITHUB_REPOSITORY', '')}/issues/{occurrence_issue_number}" # Add link to specific issue
     )
 
-    video_path = download_zoom_recording(meeting_id)
-    if not video_path:
+    media, cleanup = open_recording_media(meeting_id, matched_occurrence, session.get("offset", 0) if session else 0)
+    if media is None:
         print(f"No MP4 recording available for meeting {meeting_id}")
         return False # Indicate failure
 
+    def checkpoint(uri, offset):
+        saved = matched_occurrence.get("youtube_upload_session") or {}
+        if saved.get("uri") == uri and saved.get("offset") == offset:
+            return
+        # A new session starts its own resume bookkeeping
+        checkpointed = dict(saved) if saved.get("uri") == uri else {}
+        checkpointed.update(uri=uri, offset=offset)
+        update_occurrence(f"Issue #{occurrence_issue_number}: YouTube upload checkpoint",
+                          youtube_upload_session=checkpointed)
+
     try:
         title = video_title
         description = video_description
@@ -178,21 +431,30 @@ def upload_recording(meeting_id, occurrence_issue_number=None):
             }
         }
 
-        media = googleapiclient.http.MediaFileUpload(video_path, chunksize=-1, resumable=True)
-        response = youtube.videos().insert(
-            part="snippet,status",
-            body=request_body,
-            media_body=media
-        ).execute()
+        try:
+            response = upload_media(youtube, request_body, media, session, checkpoint)
+        except UploadSessionExpired as e:
+            print(f"[WARN] {e}, restarting the upload from the beginning")
+            update_occurrence(f"Issue #{occurrence_issue_number}: YouTube upload session expired",
+                              youtube_upload_session=None)
+            cleanup()
+            cleanup = lambda: None
+            media, reopened_cleanup = open_recording_media(meeting_id, matched_occurrence)
+            if media is None:
+                print(f"No MP4 recording available for meeting {meeting_id}")
+                return False
+            cleanup = reopened_cleanup
+            response = upload_media(youtube, request_body, media, checkpoint=checkpoint)
 
         # --- Update occurrence flags in mapping ---
-        mapping[meeting_id]["occurrences"][occurrence_index]["youtube_video_id"] = response['id']
-        mapping[meeting_id]["occurrences"][occurrence_index]["Youtube_upload_processed"] = True
+        update_occurrence(
+            f"Issue #{occurrence_issue_number}: YouTube video {response['id']} uploaded",
+            youtube_video_id=response['id'],
+            Youtube_upload_processed=True,
+            youtube_upload_session=None,
+        )
         # Reset attempt count on success
-        # mapping[meeting_id]["occurrences"][occurrence_index]["upload_attempt_count"] = 0 # Optional reset
-
-        save_meeting_topic_mapping(mapping)
-        commit_mapping_file()
+        # matched_occurrence["upload_attempt_count"] = 0 # Optional reset
         
         youtube_link = f"https://youtu.be/{response['id']}"
         print(f"Uploaded YouTube video: {youtube_link}")
@@ -202,24 +464,35 @@ def upload_recording(meeting_id, occurrence_issue_number=None):
         if discourse_topic_id:
             post_body = f"YouTube recording available: {youtube_link}"
 
-            discourse.create_post(
+            posts = {"discourse_posts": matched_occurrence.get("discourse_posts")}
+            discourse_artifacts.publish(
                 topic_id=discourse_topic_id,
-                body=post_body # Use the simplified body
+                occurrence_key=discourse.transcript_key(meeting_id, matched_occurrence),
+                kind="youtube_video",
+                key=response['id'],
+                body=post_body, # Use the simplified body
+                record=posts,
+            )
+            update_occurrence(
+                f"Issue #{occurrence_issue_number}: YouTube video posted to Discourse",
+                discourse_posts=posts["discourse_posts"],
             )
 
         # --- Update RSS feed for this occurrence ---
         if rss_utils:
-            try:
-                rss_utils.add_notification_to_meeting(
-                    meeting_id,
-                    occurrence_issue_number, # Pass issue number to identify occurrence
-                    "youtube_upload",
-                    f"Meeting recording uploaded: {video_title}",
-                    youtube_link
-                )
-                print(f"Updated RSS feed with YouTube video for occurrence #{occurrence_issue_number}")
-            except Exception as e:
-                print(f"Failed to update RSS feed: {e}")
+            def add_rss_notification():
+                try:
+                    rss_utils.add_notification_to_meeting(
+                        meeting_id,
+                        occurrence_issue_number, # Pass issue number to identify occurrence
+                        "youtube_upload",
+                        f"Meeting recording uploaded: {video_title}",
+                        youtube_link
+                    )
+                    print(f"Updated RSS feed with YouTube video for occurrence #{occurrence_issue_number}")
+                except Exception as e:
+                    print(f"Failed to update RSS feed: {e}")
+            on_main_thread(add_rss_notification)
 
         # Send Telegram notification similar to handle_issue
         try:
@@ -244,8 +517,110 @@ def upload_recording(meeting_id, occurrence_issue_number=None):
     except HttpError as e:
         print(f"YouTube API error: {e}")
         return False # Indicate failure
+    except youtube_quota.QuotaDeferred as e:
+        print(f"[WARN] {e}")
+        return False
     finally:
-        os.unlink(video_path)  # Clean up temp file
+        cleanup()  # Stop the download / remove the temp file
+
+def apply_occurrence_changes(occurrence, changes, reason=None):
+    """Sets (or, for None, removes) occurrence keys and requests the mapping commit when given a reason"""
+    for key, value in changes.items():
+        if value is None:
+            occurrence.pop(key, None)
+        else:
+            occurrence[key] = value
+    if reason:
+        mapping_commit.request_commit(reason)
+
+def session_is_resumable(session):
+    """True for a saved upload session that got further since it was last resumed"""
+    return bool(session) and session.get("offset", 0) > session.get("resumed_from", -1)
+
+def occurrence_end_time(occurrence):
+    start = parse_start_time(occurrence.get("start_time"))
+    if start is None:
+        return None
+    return start + timedelta(minutes=int(occurrence.get("duration") or 0))
+
+def pending_uploads(store, now=None):
+    """
+    Every occurrence still waiting for its YouTube upload, as (meeting_id,
+    occurrence) in upload order: interrupted uploads that can be resumed first,
+    then by meeting end time, oldest first. Only meetings that ended at least
+    15 minutes and at most UPLOAD_MAX_AGE_DAYS ago are included.
+    """
+    now = now or datetime.now(timezone.utc)
+    pending = []
+    for meeting_id, entry in store.mapping.items():
+        # Skipped or failed meeting creations leave placeholder IDs without recordings
+        if not str(meeting_id).isdigit():
+            continue
+        for occurrence in iter_occurrences(entry):
+            if occurrence.get("skip_youtube_upload") or occurrence.get("Youtube_upload_processed"):
+                continue
+            resumable = session_is_resumable(occurrence.get("youtube_upload_session"))
+            if not resumable and occurrence.get("upload_attempt_count", 0) >= 10:
+                continue
+            end_time = occurrence_end_time(occurrence)
+            if end_time is None or not timedelta(minutes=15) <= now - end_time <= timedelta(days=UPLOAD_MAX_AGE_DAYS):
+                continue
+            pending.append((not resumable, end_time, meeting_id, occurrence))
+    pending.sort(key=lambda item: item[:2])
+    return [(meeting_id, occurrence) for _, _, meeting_id, occurrence in pending]
+
+def run_upload_queue(store):
+    """
+    Uploads every pending occurrence with up to UPLOAD_WORKERS uploads at once.
+    Fresh uploads are capped by what is left of today's YouTube quota (each
+    videos.insert costs 1600 units); resuming a saved session costs nothing.
+    """
+    queue_items = pending_uploads(store)
+    fresh_budget = youtube_quota.available(youtube_quota.UPLOAD) // youtube_quota.cost("videos.insert")
+    selected = []
+    deferred = 0
+    for meeting_id, occurrence in queue_items:
+        if not session_is_resumable(occurrence.get("youtube_upload_session")):
+            if fresh_budget <= 0:
+                deferred += 1
+                continue
+            fresh_budget -= 1
+        selected.append((meeting_id, occurrence.get("issue_number")))
+
+    print(f"{len(queue_items)} occurrences waiting for a YouTube upload, uploading {len(selected)} with up to {UPLOAD_WORKERS} workers")
+    if deferred:
+        print(f"[INFO] Deferring {deferred} uploads until the YouTube quota resets")
+    if not selected:
+        return
+
+    # Workers only see copies; every mapping change is applied here on the main thread
+    updates = queue.Queue()
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(upload_recording, meeting_id, issue_number, updates): (meeting_id, issue_number)
+            for meeting_id, issue_number in selected
+        }
+        waiting = set(futures)
+        while waiting:
+            done, waiting = wait(waiting, timeout=1, return_when=FIRST_COMPLETED)
+            _run_updates(updates)
+            for future in done:
+                meeting_id, issue_number = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Failed to process {meeting_id} / {issue_number}: {e}")
+    _run_updates(updates)
+    usage = youtube_quota.usage()
+    print(f"YouTube quota used on {usage['date']}: {usage['used']}/{usage['limit']} units")
+
+def _run_updates(updates):
+    while True:
+        try:
+            action = updates.get_nowait()
+        except queue.Empty:
+            return
+        action()
 
 def main():
     parser = argparse.ArgumentParser(description="Upload Zoom recording to YouTube")
@@ -271,87 +646,12 @@ def main():
             print(f"Failed to process latest occurrence for {args.meeting_id}: {e}")
         return
 
-    # Handle case where NO arguments are provided (check mapping)
+    # Handle case where NO arguments are provided (drain the upload queue)
     if not args.meeting_id and not args.occurrence_issue_number:
-        print("No meeting ID provided - checking last 5 meetings from mapping")
-        mapping = load_meeting_topic_mapping()
-        
-        # Get last 5 meetings sorted by insertion order (Python 3.7+ preserves dict order)
-        recent_meetings = list(mapping.items())[-5:]
-        
-        for meeting_id, details in recent_meetings:
-            if not isinstance(details, dict):
-                continue  # Skip legacy format entries
-                
-            # Iterate through occurrences within this meeting entry
-            if "occurrences" in details:
-                # Process occurrences in reverse (most recent first) for this check
-                for occurrence in reversed(details["occurrences"]):
-                    occ_issue_num = occurrence.get("issue_number")
-                    yt_processed = occurrence.get("Youtube_upload_processed", False)
-                    yt_skipped = occurrence.get("skip_youtube_upload", False)
-
-                    # Process if not skipped and not already processed
-                    if not yt_skipped and not yt_processed and occ_issue_num:
-                        print(f"\nProcessing occurrence from mapping: Meeting ID {meeting_id}, Issue #{occ_issue_num}")
-                        try:
-                            upload_recording(meeting_id, occ_issue_num)
-                            # Optionally break after processing one to avoid long runs?
-                            # break
-                        except Exception as e:
-                            print(f"Failed to process {meeting_id} / {occ_issue_num}: {e}")
-            # else: Handle non-recurring meetings if needed (legacy structure)
-            elif not details.get("is_recurring", False):
-                yt_processed = details.get("Youtube_upload_processed", False)
-                yt_skipped = details.get("skip_youtube_upload", False)
-                if not yt_skipped and not yt_processed:
-                    print(f"\nProcessing non-recurring meeting from mapping: {meeting_id}")
-                    try:
-                        upload_recording(meeting_id) # Assumes it needs top-level processing
-                    except Exception as e:
-                        print(f"Failed to process {meeting_id}: {e}")
-
-def load_meeting_topic_mapping():
-    if os.path.exists(MAPPING_FILE):
-        with open(MAPPING_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_meeting_topic_mapping(mapping):
-    with open(MAPPING_FILE, "w") as f:
-        json.dump(mapping, f, indent=2)
-
-def commit_mapping_file():
-    """Commit and push changes to the mapping file"""
-    try:
-        # Configure git user (required in CI)
-        subprocess.run(
-            ["git", "config", "--global", "user.email", "actions@github.com"],
-            check=True
-        )
-        subprocess.run(
-            ["git", "config", "--global", "user.name", "GitHub Actions"],
-            check=True
-        )
-        
-        # Commit and push
-        subprocess.run(["git", "add", MAPPING_FILE], check=True)
-        subprocess.run(
-            ["git", "commit", "-m", f"Update YouTube video mapping"],
-            check=True
-        )
-        subprocess.run(["git", "push"], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to commit mapping file: {e}")
-
-def find_occurrence_by_issue_number(series_entry, issue_number):
-    """Helper function to find an occurrence by issue number."""
-    if not series_entry or "occurrences" not in series_entry:
-        return None, -1
-    for index, occ in enumerate(series_entry["occurrences"]):
-        if occ.get("issue_number") == issue_number:
-            return occ, index
-    return None, -1
+        print("No meeting ID provided - uploading every pending occurrence from mapping")
+        run_upload_queue(get_store())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    # One commit for every mapping change made during the run
+    mapping_commit.flush_commits()
\ No newline at end of file
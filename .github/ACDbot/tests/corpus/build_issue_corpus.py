@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Builds issue_bodies.jsonl, the parser regression corpus used by
+tests/test_issue_parser.py and the benchmarks.
+
+Each body is one of the protocol-call issue templates (.github/ISSUE_TEMPLATE)
+filled in the ways authors actually fill them in: the date formats, duration
+lines and facilitator lines that have appeared in ethereum/pm issues, CRLF
+line endings as submitted by GitHub, and a real agenda taken from the meeting
+notes in this repository. Agendas are anonymised: email addresses, @handles
+and meeting links are replaced.
+
+Each line holds {"id", "body", "expected"}, where expected is the IssueConfig
+the parser returns for the body. Only rebuild the corpus when a parsing change
+is intended, and review the diff of issue_bodies.jsonl:
+
+    python tests/corpus/build_issue_corpus.py
+"""
+import json
+import pathlib
+import random
+import re
+import sys
+
+CORPUS_DIR = pathlib.Path(__file__).resolve().parent
+PROJECT_ROOT = CORPUS_DIR.parents[1]     # .github/ACDbot
+REPO_ROOT = CORPUS_DIR.parents[3]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules import issue_parser
+
+CORPUS_FILE = CORPUS_DIR / "issue_bodies.jsonl"
+TEMPLATE_DIR = REPO_ROOT / ".github" / "ISSUE_TEMPLATE"
+SIZE = 300
+SEED = 2025
+
+SERIES = ["ACDE", "ACDC", "ACDT", "FOCIL Breakout", "PeerDAS Breakout", "RollCall", "ePBS Breakout",
+          "EOF Implementers", "Stateless Implementers", "eth_simulate", "Portal Network", "testing call"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+SHORT_WEEKDAYS = ["Mon", "Tues", "Wed", "Thur", "Fri", "Sat", "Sun"]
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+HANDLE = re.compile(r"(?<![\w/])@[A-Za-z0-9_-]+")
+MEETING_LINK = re.compile(r"https?://[^\s)]*(?:zoom\.us|meet\.google|meet\.jit\.si)[^\s)]*")
+
+
+def load_templates():
+    templates = []
+    for path in sorted(TEMPLATE_DIR.glob("*.md")):
+        text = path.read_text()
+        # Drop the front matter
+        templates.append(text.split("---", 2)[2].lstrip() if text.startswith("---") else text)
+    return templates
+
+
+def anonymise(text):
+    text = EMAIL.sub("someone@example.org", text)
+    text = HANDLE.sub("@someone", text)
+    return MEETING_LINK.sub("https://example.org/meeting", text)
+
+
+def load_agendas():
+    """The agenda sections of the meeting notes in this repository."""
+    agendas = []
+    for path in sorted(REPO_ROOT.glob("*/*.md")):
+        lines = path.read_text(errors="ignore").splitlines()
+        for i, line in enumerate(lines):
+            if re.match(r"#+\s*Agenda", line):
+                section = []
+                for item in lines[i + 1:i + 26]:
+                    if item.startswith("#"):
+                        break
+                    section.append(item)
+                if any(item.strip() for item in section):
+                    agendas.append(anonymise("\n".join(section).strip()))
+                break
+    return agendas
+
+
+def date_text(rng, when):
+    month = MONTHS[when["month"] - 1]
+    abbr = month[:3]
+    day, year, hour, minute = when["day"], when["year"], when["hour"], when["minute"]
+    end = f"{(hour + 1) % 24:02d}:{minute:02d}"
+    link = f"https://savvytime.com/converter/utc/{abbr.lower()}-{day}-{year}/{hour}{minute:02d}"
+    weekday = rng.choice(WEEKDAYS)
+    formats = [
+        f"[{abbr} {day}, {year}, {hour:02d}:{minute:02d} UTC]({link})",
+        f"{abbr} {day}, {year}, {hour:02d}:{minute:02d} UTC",
+        f"[{abbr.lower()} {day} {year} {hour:02d}:{minute:02d} UTC]({link})",
+        f"[{weekday} {month} {day:02d}, {year}, {hour:02d}:{minute:02d} UTC]({link})",
+        f"[{abbr} {day}, {year}, {hour:02d}:{minute:02d}-{end} UTC]({link})",
+        f"{abbr} {day} ({rng.choice(SHORT_WEEKDAYS)}), {year}, {hour:02d}:{minute:02d} UTC",
+        f"{abbr} {day} ({rng.choice(SHORT_WEEKDAYS)}), {year}, {hour:02d}:{minute:02d} - {end} UTC",
+        f"{month} {day}, {year}, {hour}:{minute:02d} UTC",
+        # Formats the parser rejects
+        f"{abbr} {day}, {year} at {hour:02d}:{minute:02d} UTC",
+        f"{day} {month} {year}, {hour:02d}:{minute:02d} UTC",
+        "TBD",
+    ]
+    weights = [30, 10, 4, 6, 6, 4, 2, 6, 3, 2, 2]
+    return rng.choices(formats, weights)[0]
+
+
+def duration_lines(rng):
+    minutes = rng.choice([30, 45, 60, 60, 90, 90, 120])
+    return rng.choices([
+        f"- Duration in minutes : {minutes}",
+        f"- Duration in minutes: {minutes} minutes",
+        f"- Duration in minutes\n- {minutes}",
+        f"-   Duration    in    minutes\n-    {minutes}min",
+        f"- Duration: {minutes} mins",
+        "- Duration in minutes : XXX",
+        "",
+    ], [40, 10, 8, 3, 5, 4, 4])[0]
+
+
+def facilitator_line(rng, n):
+    first, second = f"facilitator{n}@example.org", f"cohost{n}@example.org"
+    return rng.choices([
+        f"Facilitator emails: {first}, {second}",
+        f"Facilitator emails: {first}",
+        f"- Facilitator email: [{first}](mailto:{first})",
+        f"Facilitator email: {first}",
+        "Facilitator emails: XXXXX, YYYYY",
+        "",
+    ], [40, 20, 8, 8, 8, 6])[0]
+
+
+def config_value(rng, label, recurring):
+    if label == "Recurring meeting":
+        return "true" if recurring else "false"
+    if label == "Occurrence rate":
+        return rng.choices(["weekly", "bi-weekly", "monthly", "none", "Weekly"], [40, 30, 15, 5, 5])[0]
+    if label == "Call series":
+        return rng.choice(SERIES)
+    # Booleans, sometimes with a different case or an invalid value
+    return rng.choices(["false", "true", "True", "FALSE", "yes"], [50, 35, 5, 5, 2])[0]
+
+
+def build_body(rng, n, template, agenda):
+    recurring = "Call series" in template
+    when = {"year": rng.choice([2024, 2025, 2026]), "month": rng.randint(1, 12), "day": rng.randint(1, 28),
+            "hour": rng.choice([12, 13, 14, 15, 16]), "minute": rng.choice([0, 0, 0, 30])}
+    series = rng.choice(SERIES)
+    title = f"# {series} #{rng.randint(1, 220)}, {MONTHS[when['month'] - 1]} {when['day']}, {when['year']}"
+
+    body = re.sub(r"^# Meeting title.*$", lambda m: title, template, count=1, flags=re.M)
+    body = re.sub(r"^- Date and time in UTC.*$", lambda m: f"- Date and time in UTC: {date_text(rng, when)}",
+                  body, count=1, flags=re.M)
+    body = re.sub(r"(# Agenda\s*\n).*?(\nOther comments)", lambda m: f"{m.group(1)}\n{agenda}\n{m.group(2)}",
+                  body, count=1, flags=re.S)
+    body = re.sub(r"^Facilitator emails:.*$", lambda m: facilitator_line(rng, n), body, count=1, flags=re.M)
+    body = re.sub(r"^- Duration in minutes.*$", lambda m: duration_lines(rng), body, count=1, flags=re.M)
+    for label in ["Recurring meeting", "Call series", "Occurrence rate", "Already a Zoom meeting ID",
+                  "Already on Ethereum Calendar", "Need YouTube stream links", "display zoom link in invite"]:
+        body = re.sub(rf"^(- {label} :) [^#\n]*", lambda m: f"{m.group(1)} {config_value(rng, label, recurring)} ",
+                      body, count=1, flags=re.M)
+    # Issue forms and the web editor submit CRLF line endings
+    if rng.random() < 0.3:
+        body = body.replace("\n", "\r\n")
+    return body
+
+
+def build_corpus(size=SIZE, seed=SEED):
+    rng = random.Random(seed)
+    templates = load_templates()
+    agendas = load_agendas()
+    corpus = []
+    for n in range(size):
+        body = build_body(rng, n, templates[n % len(templates)], agendas[n % len(agendas)])
+        corpus.append({"id": n, "body": body, "expected": issue_parser.parse_issue(body)._asdict()})
+    return corpus
+
+
+def main():
+    corpus = build_corpus()
+    with open(CORPUS_FILE, "w") as f:
+        for entry in corpus:
+            f.write(json.dumps(entry) + "\n")
+    print(f"Wrote {len(corpus)} issue bodies to {CORPUS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+import os
+import sys
+import pathlib
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import discourse, discourse_artifacts, discourse_cache
+
+
+class FakeResponse:
+
+    def __init__(self, json_data=None, ok=True, text=""):
+        self._json = json_data or {}
+        self.ok = ok
+        self.text = text
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise discourse.requests.exceptions.HTTPError(self.text)
+
+
+class TestUpdateTopicCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.get = mock.Mock(return_value=FakeResponse({"post_stream": {"posts": [{"id": 501}]}}))
+        self.put = mock.Mock(return_value=FakeResponse())
+        patches = [
+            mock.patch.object(discourse_cache, "CACHE_FILE", os.path.join(tmp.name, "discourse_topic_cache.json")),
+            mock.patch.object(discourse_cache.mapping_commit, "request_file_commit"),
+            mock.patch.object(discourse.http_client, "get", self.get),
+            mock.patch.object(discourse.http_client, "put", self.put),
+            mock.patch.dict(os.environ, {"DISCOURSE_API_KEY": "key", "DISCOURSE_API_USERNAME": "bot"}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def put_urls(self):
+        return [call.args[0].rsplit("/", 2)[-2] for call in self.put.call_args_list]
+
+    def test_first_update_looks_up_post_and_sends_everything(self):
+        result = discourse.update_topic(42, title="ACDE #1", body="Agenda", category_id=63)
+        self.assertEqual(self.get.call_count, 1)
+        self.assertEqual(self.put_urls(), ["t", "posts"])
+        self.assertTrue(result["topic_updated"] and result["post_updated"])
+        self.assertEqual(discourse_cache.get_topic(42)["first_post_id"], 501)
+
+    def test_unchanged_update_sends_nothing(self):
+        discourse.update_topic(42, title="ACDE #1", body="Agenda", category_id=63)
+        self.get.reset_mock()
+        self.put.reset_mock()
+
+        result = discourse.update_topic(42, title="ACDE #1", body="Agenda", category_id=63)
+        self.get.assert_not_called()
+        self.put.assert_not_called()
+        self.assertEqual(result, {"topic_id": 42, "topic_updated": False, "post_updated": False})
+
+    def test_body_edit_only_puts_the_post(self):
+        discourse.update_topic(42, title="ACDE #1", body="Agenda", category_id=63)
+        self.get.reset_mock()
+        self.put.reset_mock()
+
+        discourse.update_topic(42, title="ACDE #1", body="Agenda v2", category_id=63)
+        self.get.assert_not_called()
+        self.assertEqual(self.put_urls(), ["posts"])
+        self.assertIn("/posts/501.json", self.put.call_args.args[0])
+
+    def test_created_topic_needs_no_lookup(self):
+        with mock.patch.object(discourse.http_client, "post",
+                               return_value=FakeResponse({"id": 777, "topic_id": 55})):
+            discourse.create_topic("ACDC #2", "Agenda", category_id=63)
+
+        discourse.update_topic(55, title="ACDC #2", body="Agenda, edited", category_id=63)
+        self.get.assert_not_called()
+        self.assertEqual(self.put_urls(), ["posts"])
+        self.assertIn("/posts/777.json", self.put.call_args.args[0])
+
+    def test_failed_post_update_forgets_topic(self):
+        discourse.update_topic(42, body="Agenda")
+        self.put.return_value = FakeResponse(ok=False, text="Not found")
+        with self.assertRaises(discourse.requests.exceptions.HTTPError):
+            discourse.update_topic(42, body="Agenda v2")
+        self.assertEqual(discourse_cache.get_topic(42), {})
+
+    def test_merge_keeps_both_runs_topics(self):
+        merged = discourse_cache.merge_caches(
+            {"topics": {"1": {"title": "remote"}, "2": {"title": "old"}}},
+            {"topics": {"2": {"title": "new"}}},
+        )
+        self.assertEqual(merged, {"topics": {"1": {"title": "remote"}, "2": {"title": "new"}}})
+
+        merged = discourse_cache.merge_caches(
+            {"topics": {"2": {"title": "old", "artifacts_posts": {"111-1": 900}}}},
+            {"topics": {"2": {"title": "new", "artifacts_posts": {"111-2": 901}}}},
+        )
+        self.assertEqual(merged["topics"]["2"], {"title": "new", "artifacts_posts": {"111-1": 900, "111-2": 901}})
+
+
+class TestCacheCommitFromWorkers(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_file = os.path.join(tmp.name, "discourse_topic_cache.json")
+        mapping_commit = discourse_cache.mapping_commit
+        self.flush = mock.Mock()
+        patches = [
+            mock.patch.object(discourse_cache, "CACHE_FILE", self.cache_file),
+            mock.patch.object(mapping_commit, "_pending_since", None),
+            mock.patch.object(mapping_commit, "_pending_reasons", []),
+            mock.patch.object(mapping_commit, "_pending_files", {}),
+            mock.patch.object(mapping_commit, "_atexit_registered", True),
+            mock.patch.object(mapping_commit, "COMMIT_MAX_DELAY", 0),
+            mock.patch.object(mapping_commit, "flush_commits", self.flush),
+            mock.patch.object(discourse.http_client, "get",
+                              return_value=FakeResponse({"post_stream": {"posts": [{"id": 501}]}})),
+            mock.patch.object(discourse.http_client, "put", return_value=FakeResponse()),
+            mock.patch.dict(os.environ, {"DISCOURSE_API_KEY": "key", "DISCOURSE_API_USERNAME": "bot"}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_pool_workers_leave_the_commit_to_the_main_thread(self):
+        # As poll_zoom_recordings does: cache writes happen inside pool workers
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda tid: discourse.update_topic(tid, title=f"ACDE #{tid}", body="Agenda"), [1, 2]))
+        self.flush.assert_not_called()
+        self.assertIn(self.cache_file, discourse_cache.mapping_commit._pending_files)
+
+        discourse_cache.forget_topic(1)
+        self.flush.assert_called_once_with()
+
+
+class TestTranscriptMarkers(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = []
+        self.get = mock.Mock(side_effect=self._get)
+        patches = [
+            mock.patch.object(discourse.http_client, "get", self.get),
+            mock.patch.dict(os.environ, {"DISCOURSE_API_KEY": "key", "DISCOURSE_API_USERNAME": "bot"}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def bot_posts(self, posts):
+        """The bot's posts in the topic: {post_id: raw}."""
+        self.posts = posts
+
+    def _get(self, url, params=None, **kwargs):
+        if url.endswith("/t/42.json"):
+            self.assertEqual(params["username_filters"], "bot")
+            return FakeResponse({"post_stream": {"stream": list(self.posts)}})
+        ids = params["post_ids[]"]
+        self.pages.append(ids)
+        return FakeResponse({"post_stream": {"posts": [{"id": i, "raw": self.posts[i]} for i in ids]}})
+
+    def test_recorded_post_needs_no_request(self):
+        occurrence = {"issue_number": 7}
+        discourse.record_artifact(occurrence, "transcript", 42, 900, "summary")
+        self.assertTrue(discourse.check_if_transcript_posted(42, "111", occurrence))
+        self.get.assert_not_called()
+
+    def test_scan_pages_past_the_first_twenty_posts(self):
+        posts = {i: f"reply {i}" for i in range(1, 46)}
+        posts[45] = "summary\n\n" + discourse.artifact_marker("transcript", "111-7")
+        self.bot_posts(posts)
+        occurrence = {"issue_number": 7}
+
+        self.assertTrue(discourse.check_if_transcript_posted(42, "111", occurrence))
+        self.assertEqual([len(page) for page in self.pages], [20, 20, 5])
+        self.assertEqual(occurrence["discourse_posts"]["transcript"]["post_id"], 45)
+
+        # The scan result is recorded, so the next check is free
+        self.get.reset_mock()
+        self.assertTrue(discourse.check_if_transcript_posted(42, "111", occurrence))
+        self.get.assert_not_called()
+
+    def test_other_occurrence_transcript_does_not_match(self):
+        self.bot_posts({1: discourse.artifact_marker("transcript", "111-6")})
+        self.assertFalse(discourse.check_if_transcript_posted(42, "111", {"issue_number": 7}))
+
+    def test_legacy_transcript_file_marker_matches(self):
+        self.bot_posts({1: "see transcript-111.txt"})
+        self.assertTrue(discourse.check_if_transcript_posted(42, "111", {"issue_number": 7}))
+
+    def test_record_for_another_topic_is_ignored(self):
+        occurrence = {}
+        discourse.record_artifact(occurrence, "transcript", 41, 900)
+        self.bot_posts({})
+        self.assertFalse(discourse.check_if_transcript_posted(42, "111", occurrence))
+
+
+class TestArtifactPost(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.raw = {}  # post ID -> raw, as stored on Discourse
+        self.create = mock.Mock(side_effect=self._create)
+        self.update = mock.Mock(side_effect=lambda post_id, body: self.raw.__setitem__(post_id, body))
+        patches = [
+            mock.patch.object(discourse_cache, "CACHE_FILE", os.path.join(tmp.name, "discourse_topic_cache.json")),
+            mock.patch.object(discourse_cache.mapping_commit, "request_file_commit"),
+            mock.patch.object(discourse, "create_post", self.create),
+            mock.patch.object(discourse, "update_post", self.update),
+            mock.patch.object(discourse, "get_post", lambda post_id: {"id": post_id, "raw": self.raw[post_id]}),
+            mock.patch.object(discourse, "find_artifact_post", return_value=None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _create(self, topic_id, body):
+        post_id = 900 + len(self.raw)
+        self.raw[post_id] = body
+        return {"id": post_id}
+
+    def test_batch_writes_one_post_with_every_section(self):
+        occurrence = {"issue_number": 7}
+        sent = []
+        with discourse_artifacts.batch():
+            discourse_artifacts.publish(42, "111-7", "youtube_streams", "111-7", "links", record=occurrence)
+            discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary", record=occurrence,
+                                        on_published=lambda: sent.append("telegram"))
+            self.create.assert_not_called()
+            self.assertEqual(sent, [])
+
+        self.assertEqual(self.create.call_count, 1)
+        raw = self.raw[900]
+        self.assertIn(discourse_artifacts.post_marker("111-7"), raw)
+        self.assertLess(raw.index("summary"), raw.index("links"))
+        self.assertEqual(sent, ["telegram"])
+        self.assertEqual(occurrence["discourse_posts"]["transcript"]["post_id"], 900)
+        # The transcript duplicate check recognises the section
+        self.assertIn(discourse.artifact_marker("transcript", "111-7"), raw)
+
+    def test_later_artifact_edits_the_post(self):
+        discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary")
+        discourse_artifacts.publish(42, "111-7", "youtube_video", "abc", "YouTube recording available: https://youtu.be/abc")
+
+        self.assertEqual(self.create.call_count, 1)
+        self.assertEqual(self.update.call_count, 1)
+        sections = discourse_artifacts.parse(self.raw[900])
+        self.assertEqual(sections["transcript"], ("111-7", "summary"))
+        self.assertEqual(sections["youtube_video"][0], "abc")
+
+        # Republishing identical content sends nothing
+        discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary")
+        self.assertEqual(self.update.call_count, 1)
+
+    def test_occurrences_sharing_a_topic_keep_their_own_posts(self):
+        first, second = {"issue_number": 1}, {"issue_number": 2}
+        discourse_artifacts.publish(42, "111-1", "transcript", "111-1", "first summary", record=first)
+        discourse_artifacts.publish(42, "111-2", "transcript", "111-2", "second summary", record=second)
+        discourse_artifacts.publish(42, "111-1", "youtube_video", "abc", "first video")
+
+        # Each occurrence's first artifact is a new reply, so watchers hear about both meetings
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual(discourse_artifacts.parse(self.raw[900]),
+                         {"transcript": ("111-1", "first summary"), "youtube_video": ("abc", "first video")})
+        self.assertEqual(discourse_artifacts.parse(self.raw[901]), {"transcript": ("111-2", "second summary")})
+        self.assertEqual((first["discourse_posts"]["transcript"]["post_id"],
+                          second["discourse_posts"]["transcript"]["post_id"]), (900, 901))
+        self.assertEqual(discourse_cache.get_topic(42)["artifacts_posts"], {"111-1": 900, "111-2": 901})
+
+    def test_failed_batch_publishes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with discourse_artifacts.batch():
+                discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary")
+                raise RuntimeError("boom")
+        discourse_artifacts.flush()
+        self.create.assert_not_called()
+
+    def test_failed_write_leaves_nothing_pending(self):
+        occurrence = {"issue_number": 7}
+        with mock.patch.object(discourse, "create_post", side_effect=RuntimeError("Discourse down")):
+            with self.assertRaises(RuntimeError):
+                with discourse_artifacts.batch():
+                    discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary", record=occurrence)
+                    discourse_artifacts.publish(43, "222-8", "transcript", "222-8", "other summary")
+        self.assertNotIn("discourse_posts", occurrence)
+
+        # The next, unrelated occurrence publishes only its own artifacts
+        discourse_artifacts.publish(44, "333-9", "transcript", "333-9", "third summary")
+        self.assertEqual([call.args[0] for call in self.create.call_args_list], [44])
+        self.assertEqual(discourse_artifacts.flush(), {})
+
+    def test_debounce_writes_long_waiting_artifacts(self):
+        with mock.patch.object(discourse_artifacts, "DEBOUNCE", 0):
+            with discourse_artifacts.batch():
+                discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary")
+                self.assertEqual(self.create.call_count, 1)
+
+    def test_deleted_post_is_recreated(self):
+        discourse_artifacts.publish(42, "111-7", "transcript", "111-7", "summary")
+        gone = discourse.requests.exceptions.HTTPError(response=mock.Mock(status_code=404))
+        with mock.patch.object(discourse, "get_post", side_effect=gone):
+            discourse_artifacts.publish(42, "111-7", "youtube_video", "abc", "video")
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual(discourse_cache.get_topic(42)["artifacts_posts"], {"111-7": 901})
+
+
+if __name__ == "__main__":
+    unittest.main()
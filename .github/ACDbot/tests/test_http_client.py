@@ -0,0 +1,98 @@
+import sys
+import pathlib
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import http_client
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1_700_000_000 + self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class TestRateGovernor(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.session = mock.Mock()
+        patches = [
+            mock.patch.object(http_client, "time", self.clock),
+            mock.patch.object(http_client, "_host_buckets", {}),
+            mock.patch.object(http_client, "get_session", return_value=self.session),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.bucket = http_client.set_host_rate("forum.example", per_minute=60, burst=2)
+
+    def test_bucket_spaces_requests_after_the_burst(self):
+        waits = [self.bucket.acquire() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 1.0)
+        self.assertAlmostEqual(waits[3], 1.0)
+        self.assertAlmostEqual(self.bucket.waited, 2.0)
+
+    def test_429_queues_until_retry_after(self):
+        self.session.request.side_effect = [
+            FakeResponse(429, {"Retry-After": "30"}),
+            FakeResponse(200),
+        ]
+        response = http_client.post("https://forum.example/posts.json", data="{}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertAlmostEqual(self.bucket.waited, 30.0)
+        self.assertEqual(http_client.rate_limit_waits(), {"forum.example": self.bucket.waited})
+
+    def test_gives_up_beyond_max_rate_wait(self):
+        self.session.request.return_value = FakeResponse(429, {"Retry-After": "600"})
+        with mock.patch.object(http_client, "MAX_RATE_WAIT", 900):
+            response = http_client.post("https://forum.example/posts.json", data="{}")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.session.request.call_count, 2)
+
+    def test_exhausted_rate_limit_header_pauses_later_requests(self):
+        self.session.request.return_value = FakeResponse(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "20"})
+        http_client.get("https://forum.example/t/1.json")
+        self.session.request.return_value = FakeResponse(200)
+        http_client.get("https://forum.example/t/2.json")
+        self.assertAlmostEqual(self.bucket.waited, 20.0)
+
+    def test_ungoverned_hosts_do_not_wait(self):
+        self.session.request.return_value = FakeResponse(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "20"})
+        http_client.get("https://other.example/a")
+        http_client.get("https://other.example/b")
+        self.assertEqual(self.clock.sleeps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
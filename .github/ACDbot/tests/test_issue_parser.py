@@ -0,0 +1,145 @@
+import sys
+import json
+import time
+import pathlib
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import issue_parser
+
+CORPUS_FILE = current_dir / "corpus" / "issue_bodies.jsonl"
+
+
+def load_corpus():
+    with open(CORPUS_FILE) as f:
+        return [json.loads(line) for line in f]
+
+
+RECURRING_BODY = """
+# All Core Devs - Execution (ACDE) #206, February 27, 2025
+
+- Date and time in UTC in format `month, day, year, time` with link to savvytime.com or timeanddate.com. E.g. [Feb 27, 2025, 14:00 UTC](https://savvytime.com/converter/utc/feb-27-2025/2pm)
+
+# Agenda
+
+- Agenda point 1
+
+The zoom link will be sent to the facilitator via email
+Facilitator emails: alice@example.org, bob@example.org
+
+<details> <summary>🤖 config</summary>
+
+- Duration in minutes : 90
+- Recurring meeting : true
+- Call series : ACDE
+- Occurrence rate : bi-weekly # Options: weekly, bi-weekly, monthly
+- Already a Zoom meeting ID : false # Set to true if you bring your own link
+- Already on Ethereum Calendar : false # Set to true if this meeting is already on the calendar
+- Need YouTube stream links : true # Set to false if you don't want YouTube stream links created
+- display zoom link in invite : true # Set to true to add the Zoom link to the invite
+
+</details>
+"""
+
+
+class TestParseIssue(unittest.TestCase):
+
+    def test_recurring_template(self):
+        config = issue_parser.parse_issue(RECURRING_BODY)
+        self.assertTrue(config.is_recurring)
+        self.assertEqual(config.occurrence_rate, "bi-weekly")
+        self.assertEqual(config.call_series, "acde")
+        self.assertTrue(config.need_youtube_streams)
+        self.assertFalse(config.already_zoom_meeting)
+        self.assertFalse(config.already_on_calendar)
+        self.assertTrue(config.display_zoom_link)
+        self.assertEqual(config.facilitator_emails, ["alice@example.org", "bob@example.org"])
+        self.assertEqual((config.start_time, config.duration), ("2025-02-27T14:00:00Z", 90))
+        self.assertIsNone(config.time_error)
+        self.assertEqual(config.diagnostics, [])
+
+    def test_defaults_for_missing_fields(self):
+        config = issue_parser.parse_issue("Just an agenda")
+        self.assertFalse(config.is_recurring)
+        self.assertEqual(config.occurrence_rate, "none")
+        self.assertIsNone(config.call_series)
+        self.assertEqual(config.facilitator_emails, [])
+        self.assertIsNone(config.start_time)
+        self.assertIn("Missing or invalid date/time format", config.time_error)
+
+    def test_default_facilitator_list_is_not_shared(self):
+        first, second = issue_parser.parse_issue("a"), issue_parser.parse_issue("b")
+        self.assertIsNot(first.facilitator_emails, second.facilitator_emails)
+        first.facilitator_emails.append("x@example.org")
+        self.assertEqual(issue_parser.parse_issue("c").facilitator_emails, [])
+
+    def test_single_facilitator_formats(self):
+        markdown = issue_parser.parse_issue("- Facilitator email: [carol@example.org](mailto:carol@example.org)")
+        self.assertEqual(markdown.facilitator_emails, ["carol@example.org"])
+        plain = issue_parser.parse_issue("Facilitator email: dave@example.org")
+        self.assertEqual(plain.facilitator_emails, ["dave@example.org"])
+        # Only at the start of a line
+        self.assertEqual(issue_parser.parse_issue("Ask the facilitator email: x@y.z").facilitator_emails, [])
+
+    def test_invalid_and_repeated_values_are_reported(self):
+        config = issue_parser.parse_issue("Recurring meeting: maybe\nRecurring meeting: true\nRecurring meeting: false")
+        self.assertTrue(config.is_recurring)
+        self.assertEqual(len(config.diagnostics), 3)  # two ignored values, and the missing date
+        self.assertIn("'maybe'", config.diagnostics[0])
+
+    def test_end_time_gives_duration(self):
+        config = issue_parser.parse_issue("[Apr 22 (Tues), 2025, 14:00-15:30 UTC]")
+        self.assertEqual((config.start_time, config.duration), ("2025-04-22T14:00:00Z", 90))
+
+    def test_missing_duration(self):
+        with self.assertRaisesRegex(ValueError, "Missing or invalid duration"):
+            issue_parser.parse_issue_time("Jan 16, 2025, 14:00 UTC")
+
+
+class TestIssueCorpus(unittest.TestCase):
+    """Regression check against tests/corpus (see build_issue_corpus.py)."""
+
+    def test_corpus_parses_as_recorded(self):
+        corpus = load_corpus()
+        self.assertGreaterEqual(len(corpus), 300)
+        for entry in corpus:
+            with self.subTest(entry["id"]):
+                self.assertEqual(issue_parser.parse_issue(entry["body"])._asdict(), entry["expected"])
+
+    def test_corpus_parses_quickly(self):
+        bodies = [entry["body"] for entry in load_corpus()]
+        start = time.perf_counter()
+        for body in bodies:
+            issue_parser.parse_issue(body)
+        # A few milliseconds in practice; generous bound for slow CI machines
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+
+class TestPathologicalBodies(unittest.TestCase):
+    """Inputs that made the earlier patterns backtrack quadratically, at GitHub's 65536 character limit."""
+
+    BODIES = {
+        "letters": "a" * 65536,
+        "spaces after duration": "duration" + " " * 65528,
+        "spaces after day": "Jan 5" + " " * 65531,
+        "spaces after time": "Jan 5 (Tue), 2025, 14:00" + " " * 65512,
+        "blank lines": "\n" * 65536,
+        "unclosed weekday": "Apr 22 (" + "a" * 65528,
+        "repeated labels": "Recurring meeting : " * 3276,
+    }
+
+    def test_parse_time_is_linear(self):
+        for name, body in self.BODIES.items():
+            with self.subTest(name):
+                start = time.perf_counter()
+                issue_parser.parse_issue(body)
+                # Quadratic backtracking takes tens of seconds here; linear takes milliseconds
+                self.assertLess(time.perf_counter() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import io
+import sys
+import json
+import pathlib
+import contextlib
+
+import pytest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+# Optional: pip install pytest-benchmark (see the test extra in pyproject.toml)
+pytest.importorskip("pytest_benchmark")
+
+# zoom reads its credentials at import time; nothing here talks to Zoom
+os.environ.setdefault("ZOOM_CLIENT_ID", "test")
+os.environ.setdefault("ZOOM_CLIENT_SECRET", "test")
+
+from modules import issue_parser
+from scripts import handle_issue
+
+CORPUS_FILE = current_dir / "corpus" / "issue_bodies.jsonl"
+
+with open(CORPUS_FILE) as f:
+    BODIES = [json.loads(line)["body"] for line in f]
+
+# Everything handle_github_issue has used to read an issue body
+PARSERS = {
+    "parse_issue": issue_parser.parse_issue,
+    "extract_facilitator_info": handle_issue.extract_facilitator_info,
+    "extract_recurring_info": handle_issue.extract_recurring_info,
+    "extract_already_on_calendar": handle_issue.extract_already_on_calendar,
+    "extract_call_series": handle_issue.extract_call_series,
+    "extract_need_youtube_streams": handle_issue.extract_need_youtube_streams,
+    "extract_already_zoom_meeting": handle_issue.extract_already_zoom_meeting,
+    "extract_display_zoom_link": handle_issue.extract_display_zoom_link,
+    "parse_issue_for_time": handle_issue.parse_issue_for_time,
+}
+
+
+def parse_corpus(parser):
+    for body in BODIES:
+        try:
+            parser(body)
+        except ValueError:
+            pass  # Bodies with no valid date or duration
+
+
+@pytest.mark.parametrize("name", PARSERS)
+def test_parse_corpus(benchmark, name):
+    """Time to parse every corpus body (run with --benchmark-only; compare runs with --benchmark-compare)."""
+    benchmark.group = "issue parser"
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark(parse_corpus, PARSERS[name])
@@ -0,0 +1,73 @@
+import sys
+import time
+import pathlib
+import unittest
+
+import pytest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+# Optional: pip install hypothesis (see the test extra in pyproject.toml)
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, HealthCheck, strategies as st
+
+from modules import issue_parser
+
+# Pieces of text the issue patterns react to
+TOKENS = [
+    " ", "  ", "\t", "\n", "\r\n", ",", ":", "-", "(", ")", "[", "]", "@", "UTC", "utc",
+    "Jan", "February", "Sept", "Wed", "(Tues)", "5", "22", "2025", "14:00", "14:00-15:30", "9",
+    "duration", "Duration in minutes", "in", "minutes", "min", "m", "mailto:",
+    "Recurring meeting", "Occurrence rate", "Call series", "Facilitator emails", "Facilitator email",
+    "Already a Zoom meeting ID", "true", "false", "weekly", "bi-weekly", "x@example.org", "abc",
+]
+BODIES = st.lists(st.sampled_from(TOKENS), max_size=60).map("".join)
+# Worst cases for backtracking are long runs of a single piece after some prefix
+RUNS = st.tuples(BODIES, st.sampled_from(TOKENS), st.integers(min_value=500, max_value=2000), BODIES)
+
+
+def parse_seconds(body, repeat=3):
+    """Best of repeat timings of parse_issue(body), to shave off scheduler noise."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        issue_parser.parse_issue(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class TestIssueParserFuzz(unittest.TestCase):
+
+    @settings(max_examples=500, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(BODIES)
+    def test_never_raises(self, body):
+        config = issue_parser.parse_issue(body)
+        self.assertIsInstance(config, issue_parser.IssueConfig)
+        self.assertEqual(config.time_error is None, config.start_time is not None)
+
+    @settings(max_examples=50, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(RUNS)
+    def test_long_runs_parse_in_linear_time(self, parts):
+        prefix, token, count, suffix = parts
+        small = parse_seconds(prefix + token * count + suffix)
+        large = parse_seconds(prefix + token * (10 * count) + suffix)
+        # Ten times the run takes ~10x as long when parsing is linear and ~100x when quadratic.
+        # Compared with each other rather than a wall-clock limit, with slack for timer noise
+        # on runs that only take milliseconds.
+        self.assertLess(large, 30 * small + 0.1,
+                        f"{token!r} x {count} took {small:.3f}s, x {10 * count} took {large:.3f}s")
+
+    @settings(max_examples=300, deadline=None)
+    @given(BODIES)
+    def test_line_endings_do_not_matter(self, body):
+        unix = issue_parser.parse_issue(body.replace("\r\n", "\n"))
+        windows = issue_parser.parse_issue(body.replace("\r\n", "\n").replace("\n", "\r\n"))
+        self.assertEqual(unix._replace(time_error=None, diagnostics=None),
+                         windows._replace(time_error=None, diagnostics=None))
+
+
+if __name__ == "__main__":
+    unittest.main()
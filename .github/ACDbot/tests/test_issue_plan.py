@@ -0,0 +1,244 @@
+import os
+import sys
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import discourse_cache, issue_parser, issue_plan
+from modules.meeting_store import MeetingStore
+
+ISSUE_URL = "https://github.com/ethereum/pm/issues/20"
+
+ONE_OFF_BODY = """
+# FOCIL Breakout #3
+
+- Date and time in UTC: [Mar 4, 2025, 14:00 UTC](https://savvytime.com/converter/utc/mar-4-2025/2pm)
+- Duration in minutes : 60
+
+Facilitator emails: alice@example.org
+"""
+
+RECURRING_BODY = """
+- Date and time in UTC: [Mar 6, 2025, 14:00 UTC](https://savvytime.com/converter/utc/mar-6-2025/2pm)
+
+Facilitator emails: alice@example.org
+
+- Duration in minutes : 90
+- Recurring meeting : true
+- Call series : ACDE
+- Occurrence rate : bi-weekly
+- Already a Zoom meeting ID : false
+- Already on Ethereum Calendar : false
+- Need YouTube stream links : false
+"""
+
+
+def make_store():
+    return MeetingStore({
+        "111": {
+            "meeting_id": "111",
+            "is_recurring": True,
+            "call_series": "acde",
+            "calendar_event_id": "evt1",
+            "occurrences": [
+                {"issue_number": 10, "issue_title": "ACDE #205", "discourse_topic_id": 500,
+                 "start_time": "2025-02-20T14:00:00Z", "duration": 90},
+            ],
+        },
+        "222": {
+            "meeting_id": "222",
+            "call_series": "focil breakout",
+            "occurrences": [
+                {"issue_number": 20, "issue_title": "FOCIL Breakout #3", "discourse_topic_id": 600,
+                 "start_time": "2025-03-04T14:00:00Z", "duration": 60},
+            ],
+        },
+    })
+
+
+class TestPlanIssue(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patches = [
+            mock.patch.object(discourse_cache, "CACHE_FILE", os.path.join(tmp.name, "discourse_topic_cache.json")),
+            mock.patch.object(discourse_cache.mapping_commit, "request_file_commit"),
+            mock.patch.dict(os.environ, {}, clear=False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.environ.pop("TELEGRAM_CHAT_ID", None)
+        self.store = make_store()
+
+    def actions(self, plan):
+        return [(step.service, step.action) for step in plan.steps]
+
+    def test_new_one_off_issue(self):
+        plan = issue_plan.plan_issue(30, "EOF call", ONE_OFF_BODY, ISSUE_URL, self.store)
+        self.assertTrue(plan.is_first_run)
+        self.assertEqual(self.actions(plan), [
+            ("discourse", "create_topic"), ("zoom", "create_meeting"), ("gcal", "create_event"),
+            ("email", "send_email"), ("github", "update_or_create_comment"),
+        ])
+        self.assertEqual(plan.email_recipients, ["alice@example.org"])
+        self.assertIn(("<new meeting>.calendar_event_id", None, "<new event>"), plan.mapping_changes)
+
+    def test_recurring_issue_reuses_series_meeting_and_event(self):
+        body = RECURRING_BODY.replace("Already on Ethereum Calendar : false", "Already on Ethereum Calendar : true")
+        plan = issue_plan.plan_issue(31, "ACDE #206", body, ISSUE_URL, self.store)
+        self.assertTrue(plan.reuse_series_meeting)
+        self.assertEqual((plan.zoom_action, plan.gcal_action), ("reuse_series", "reuse_series"))
+        self.assertEqual(plan.event_base_title, "Acde")
+        self.assertNotIn("zoom", [step.service for step in plan.steps])
+        self.assertIn(("111.occurrences", None, "add issue #31"), plan.mapping_changes)
+        self.assertTrue(plan.notes)  # Why the series meeting is reused
+
+    def test_edit_with_unchanged_topic_skips_discourse(self):
+        body = f"{ONE_OFF_BODY}\n\n[GitHub Issue]({ISSUE_URL})"
+        discourse_cache.remember_topic(600, first_post_id=1, title="FOCIL Breakout #3", category_id=63, body=body)
+        plan = issue_plan.plan_issue(20, "FOCIL Breakout #3", ONE_OFF_BODY, ISSUE_URL, self.store)
+        self.assertFalse(plan.is_first_run)
+        self.assertEqual(plan.discourse_action, "unchanged")
+        self.assertEqual(self.actions(plan), [
+            ("zoom", "update_meeting"), ("gcal", "create_event"), ("github", "update_or_create_comment"),
+        ])
+        # No facilitator email on later runs
+        self.assertEqual(plan.email_recipients, [])
+
+        plan = issue_plan.plan_issue(20, "FOCIL Breakout #3 (moved)", ONE_OFF_BODY, ISSUE_URL, self.store)
+        self.assertEqual(plan.steps[0], issue_plan.PlanStep("discourse", "update_topic", "topic 600: title"))
+
+    def test_mapping_only_change_is_not_empty(self):
+        # Zoom and the calendar are skipped and the topic is unchanged, but the stored time must still move
+        body = ONE_OFF_BODY + "\n- Already a Zoom meeting ID : true\n- Already on Ethereum Calendar : true\n"
+        self.store = MeetingStore({"placeholder-skipped-20": {
+            "meeting_id": "placeholder-skipped-20",
+            "occurrences": [{"issue_number": 20, "issue_title": "FOCIL Breakout #3", "discourse_topic_id": 600,
+                             "start_time": "2025-03-04T13:00:00Z", "duration": 60}],
+        }})
+        discourse_cache.remember_topic(600, first_post_id=1, title="FOCIL Breakout #3", category_id=63,
+                                       body=f"{body}\n\n[GitHub Issue]({ISSUE_URL})")
+        plan = issue_plan.plan_issue(20, "FOCIL Breakout #3", body, ISSUE_URL, self.store)
+        self.assertEqual((plan.discourse_action, plan.zoom_action, plan.gcal_action),
+                         ("unchanged", "skipped_issue", "skipped"))
+        self.assertEqual(plan.mapping_changes, [("placeholder-skipped-20.occurrences[#20].start_time",
+                                                 "2025-03-04T13:00:00Z", "2025-03-04T14:00:00Z")])
+        self.assertFalse(plan.is_empty)
+        self.assertEqual(self.actions(plan), [("github", "update_or_create_comment")])
+
+    def test_stream_links_are_part_of_the_topic_body(self):
+        streams = [{"stream_url": "https://youtube.com/watch?v=s1", "scheduled_time": "2025-03-06T14:00:00Z"}]
+        self.store.mapping["111"]["youtube_streams"] = streams
+        self.store.mapping["111"]["occurrences"][0]["youtube_streams"] = streams
+        plan = issue_plan.plan_issue(10, "ACDE #205", RECURRING_BODY, ISSUE_URL, self.store)
+        self.assertEqual(plan.discourse_body, issue_plan.discourse_body(RECURRING_BODY, ISSUE_URL, streams, streams))
+        self.assertIn("- Stream 1 (Mar 06, 2025): https://youtube.com/watch?v=s1", plan.discourse_body)
+        # No separate step appends the links after the body sync
+        self.assertEqual([step for step in plan.steps if step.service == "discourse"],
+                         [issue_plan.PlanStep("discourse", "update_topic", "topic 500: title, category_id, body")])
+
+    def test_time_error_creates_nothing_on_zoom_or_calendar(self):
+        plan = issue_plan.plan_issue(32, "Some call", "No date here", ISSUE_URL, self.store)
+        self.assertEqual(plan.zoom_action, "time_error")
+        self.assertEqual(plan.gcal_action, "skipped_no_time")
+        self.assertEqual(len(plan.errors), 1)
+        self.assertIn("Error:", issue_plan.format_plan(plan))
+
+    def test_telegram_send_or_update(self):
+        os.environ["TELEGRAM_CHAT_ID"] = "-100"
+        self.store.mapping["222"]["occurrences"][0]["telegram_message_id"] = 77
+        self.assertEqual(issue_plan.plan_issue(30, "EOF call", ONE_OFF_BODY, ISSUE_URL, self.store).telegram_action,
+                         "send")
+        self.assertEqual(issue_plan.plan_issue(20, "FOCIL", ONE_OFF_BODY, ISSUE_URL, self.store).telegram_action,
+                         "update")
+
+    def test_planning_changes_nothing(self):
+        before = repr(self.store.mapping)
+        issue_plan.plan_issue(31, "ACDE #206", RECURRING_BODY, ISSUE_URL, self.store)
+        self.assertEqual(repr(self.store.mapping), before)
+        self.assertFalse(os.path.exists(discourse_cache.CACHE_FILE))
+
+
+class TestUnchangedSchedule(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patches = [
+            mock.patch.object(discourse_cache, "CACHE_FILE", os.path.join(tmp.name, "discourse_topic_cache.json")),
+            mock.patch.object(discourse_cache.mapping_commit, "request_file_commit"),
+            mock.patch.dict(os.environ, {"TELEGRAM_CHAT_ID": "-100"}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.store = make_store()
+        occurrence = self.store.mapping["222"]["occurrences"][0]
+        occurrence["telegram_message_id"] = 77
+        config = issue_parser.parse_issue(ONE_OFF_BODY)
+        occurrence["scheduling_fingerprint"] = issue_plan.scheduling_fingerprint(config, "FOCIL Breakout #3")
+        body = f"{ONE_OFF_BODY}\n\n[GitHub Issue]({ISSUE_URL})"
+        discourse_cache.remember_topic(600, first_post_id=1, title="FOCIL Breakout #3", category_id=63, body=body)
+
+    def plan(self, body, title="FOCIL Breakout #3"):
+        return issue_plan.plan_issue(20, title, body, ISSUE_URL, self.store)
+
+    def test_same_issue_plans_nothing(self):
+        plan = self.plan(ONE_OFF_BODY)
+        self.assertTrue(plan.schedule_unchanged)
+        self.assertTrue(plan.is_empty)
+        self.assertEqual(plan.mapping_changes, [])
+
+    def test_agenda_edit_only_syncs_discourse(self):
+        plan = self.plan(ONE_OFF_BODY + "\n# Agenda\n- One more item\n")
+        self.assertTrue(plan.schedule_unchanged)
+        self.assertEqual(plan.steps, [issue_plan.PlanStep("discourse", "update_topic", "topic 600: body")])
+        self.assertEqual((plan.zoom_action, plan.gcal_action, plan.telegram_action), ("unchanged",) * 3)
+
+    def test_scheduling_edits_run_the_pipeline(self):
+        edits = {
+            "time": ONE_OFF_BODY.replace("14:00 UTC", "15:00 UTC"),
+            "duration": ONE_OFF_BODY.replace(": 60", ": 90"),
+            "facilitators": ONE_OFF_BODY.replace("alice@", "bob@"),
+            "flags": ONE_OFF_BODY + "\n- Already on Ethereum Calendar : true\n",
+        }
+        for name, body in edits.items():
+            with self.subTest(name):
+                plan = self.plan(body)
+                self.assertFalse(plan.schedule_unchanged)
+                self.assertIn("zoom", [step.service for step in plan.steps])
+        self.assertFalse(self.plan(ONE_OFF_BODY, title="FOCIL Breakout #3 (moved)").schedule_unchanged)
+
+    def test_unchanged_edit_of_series_with_streams_plans_nothing(self):
+        streams = [{"stream_url": "https://youtube.com/watch?v=s1", "scheduled_time": "2025-03-06T14:00:00Z"}]
+        entry = self.store.mapping["111"]
+        entry["youtube_streams"] = streams
+        occurrence = entry["occurrences"][0]
+        occurrence.update(youtube_streams=streams, telegram_message_id=78, scheduling_fingerprint=
+                          issue_plan.scheduling_fingerprint(issue_parser.parse_issue(RECURRING_BODY), "ACDE #205"))
+        # As written by the run that created the streams
+        discourse_cache.remember_topic(500, first_post_id=2, title="ACDE #205", category_id=63,
+                                       body=issue_plan.discourse_body(RECURRING_BODY, ISSUE_URL, streams, streams))
+
+        plan = issue_plan.plan_issue(10, "ACDE #205", RECURRING_BODY, ISSUE_URL, self.store)
+        self.assertTrue(plan.schedule_unchanged)
+        self.assertEqual(plan.discourse_action, "unchanged")
+        self.assertTrue(plan.is_empty)
+
+    def test_no_fingerprint_without_valid_time(self):
+        self.store.mapping["222"]["occurrences"][0]["scheduling_fingerprint"] = None
+        plan = self.plan("No date here")
+        self.assertIsNone(plan.fingerprint)
+        self.assertFalse(plan.schedule_unchanged)
+
+
+if __name__ == "__main__":
+    unittest.main()
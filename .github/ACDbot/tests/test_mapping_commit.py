@@ -0,0 +1,227 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from github import GithubException
+
+from modules import mapping_commit, mapping_merge, meeting_store
+
+
+class FakeRepo:
+    """Minimal stand-in for a PyGithub Repository with one branch, written through the Git Data API."""
+
+    def __init__(self, content, conflicts=0):
+        self.files = {mapping_commit.MAPPING_FILE: content}
+        self.conflicts = conflicts
+        self.head = "c0"
+        self.commits = []
+        self.committed_paths = []
+        self._created = {}
+
+    @property
+    def content(self):
+        return self.files[mapping_commit.MAPPING_FILE]
+
+    def get_contents(self, path, ref=None):
+        assert ref == self.head
+        if path not in self.files:
+            raise GithubException(404, {"message": "Not Found"}, None)
+        content = self.files[path].encode("utf-8")
+        return SimpleNamespace(path=path, sha=mapping_commit.git_blob_sha(content), decoded_content=content)
+
+    def get_git_ref(self, name):
+        head = self.head
+        return SimpleNamespace(object=SimpleNamespace(sha=head), edit=lambda sha: self._update_ref(head, sha))
+
+    def get_git_commit(self, sha):
+        return SimpleNamespace(sha=sha, tree=f"tree-{sha}")
+
+    def create_git_tree(self, elements, base_tree):
+        return {element._identity["path"]: element._identity["content"] for element in elements}
+
+    def create_git_commit(self, message, tree, parents, author):
+        sha = f"c{len(self._created) + 1}"
+        self._created[sha] = (message, tree, parents[0].sha)
+        return SimpleNamespace(sha=sha)
+
+    def _update_ref(self, expected, sha):
+        if self.conflicts:
+            self.conflicts -= 1
+            # Someone else committed in between: a new series appears remotely
+            remote = json.loads(self.content)
+            remote["999"] = {"meeting_id": "999", "occurrences": []}
+            self.files[mapping_commit.MAPPING_FILE] = json.dumps(remote, indent=2)
+            self.head += "'"
+            raise GithubException(422, {"message": "Update is not a fast forward"}, None)
+        message, tree, parent = self._created[sha]
+        assert expected == parent == self.head
+        self.files.update(tree)
+        self.head = sha
+        self.commits.append(message)
+        self.committed_paths.append(sorted(tree))
+
+
+class TestMappingCommit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "meeting_topic_mapping.json")
+        self.initial = {"111": {"meeting_id": "111", "occurrences": [{"issue_number": 10}]}}
+        with open(self.path, "w") as f:
+            json.dump(self.initial, f, indent=2)
+
+        patches = [
+            mock.patch.object(meeting_store, "MAPPING_FILE", self.path),
+            mock.patch.object(mapping_commit, "MAPPING_FILE", self.path),
+            mock.patch.object(meeting_store, "_shared_store", None),
+            mock.patch.object(mapping_commit, "_pending_since", None),
+            mock.patch.object(mapping_commit, "_pending_reasons", []),
+            mock.patch.object(mapping_commit, "_mapping_pending", False),
+            mock.patch.object(mapping_commit, "_pending_files", {}),
+            mock.patch.object(mapping_commit, "_atexit_registered", True),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_requests_are_coalesced_into_one_commit(self):
+        repo = FakeRepo(json.dumps(self.initial, indent=2))
+        with mock.patch.object(mapping_commit, "_get_repo", return_value=repo):
+            occurrence = meeting_store.get_store().find_occurrence(10)[1]
+            occurrence["transcript_processed"] = True
+            mapping_commit.request_commit("transcript posted")
+            occurrence["Youtube_upload_processed"] = True
+            mapping_commit.request_commit("video uploaded")
+            self.assertEqual(repo.commits, [])
+
+            self.assertTrue(mapping_commit.flush_commits())
+            self.assertFalse(mapping_commit.flush_commits())
+
+        self.assertEqual(len(repo.commits), 1)
+        self.assertIn("- transcript posted\n- video uploaded", repo.commits[0])
+        self.assertTrue(json.loads(repo.content)["111"]["occurrences"][0]["Youtube_upload_processed"])
+
+    def test_conflict_merges_remote_and_retries(self):
+        repo = FakeRepo(json.dumps(self.initial, indent=2), conflicts=1)
+        with mock.patch.object(mapping_commit, "_get_repo", return_value=repo):
+            meeting_store.get_store().find_occurrence(10)[1]["transcript_processed"] = True
+            mapping_commit.request_commit()
+            self.assertTrue(mapping_commit.flush_commits())
+
+        committed = json.loads(repo.content)
+        self.assertIn("999", committed)
+        self.assertTrue(committed["111"]["occurrences"][0]["transcript_processed"])
+
+    def test_unchanged_content_is_not_committed(self):
+        repo = FakeRepo(json.dumps(self.initial, indent=2))
+        with mock.patch.object(mapping_commit, "_get_repo", return_value=repo):
+            mapping_commit.request_commit()
+            self.assertFalse(mapping_commit.flush_commits())
+        self.assertEqual(repo.commits, [])
+
+    def test_overdue_changes_are_only_committed_from_the_main_thread(self):
+        state_file = os.path.join(self.tmpdir.name, "youtube_quota.json")
+        with open(state_file, "w") as f:
+            f.write("{}")
+        with mock.patch.object(mapping_commit, "COMMIT_MAX_DELAY", 0), \
+             mock.patch.object(mapping_commit, "flush_commits") as flush:
+            worker = threading.Thread(target=mapping_commit.request_file_commit, args=(state_file, "quota"))
+            worker.start()
+            worker.join()
+            flush.assert_not_called()
+            self.assertTrue(mapping_commit.has_pending_commit())
+
+            mapping_commit.request_commit("recording processed")
+            flush.assert_called_once_with()
+
+    def test_state_files_share_the_mapping_commit(self):
+        state_file = os.path.join(self.tmpdir.name, "youtube_quota.json")
+        with open(state_file, "w") as f:
+            json.dump({"date": "2025-07-01", "used": 100}, f)
+        repo = FakeRepo(json.dumps(self.initial, indent=2))
+        repo.files[state_file] = json.dumps({"date": "2025-07-01", "used": 50, "remote": True})
+        merge = lambda remote, local: dict(remote, **local)
+        with mock.patch.object(mapping_commit, "_get_repo", return_value=repo):
+            meeting_store.get_store().find_occurrence(10)[1]["transcript_processed"] = True
+            mapping_commit.request_commit("transcript posted")
+            mapping_commit.request_file_commit(state_file, "quota ledger", merge=merge)
+            self.assertTrue(mapping_commit.flush_commits())
+
+        self.assertEqual(repo.committed_paths, [sorted([self.path, state_file])])
+        self.assertIn("- transcript posted\n- quota ledger", repo.commits[0])
+        self.assertEqual(json.loads(repo.files[state_file]), {"date": "2025-07-01", "used": 100, "remote": True})
+
+    def test_unchanged_state_file_is_left_out(self):
+        state_file = os.path.join(self.tmpdir.name, "zoom_poll_state.json")
+        with open(state_file, "w") as f:
+            f.write("{}")
+        repo = FakeRepo(json.dumps(self.initial, indent=2))
+        repo.files[state_file] = "{}"
+        with mock.patch.object(mapping_commit, "_get_repo", return_value=repo):
+            mapping_commit.request_file_commit(state_file, "poll cursor")
+            self.assertFalse(mapping_commit.flush_commits())
+        self.assertEqual(repo.commits, [])
+
+    def test_concurrent_field_edits_are_both_kept(self):
+        remote = json.loads(json.dumps(self.initial))
+        remote["111"]["occurrences"][0]["youtube_video_id"] = "vid1"
+        repo = FakeRepo(json.dumps(remote, indent=2))
+        with mock.patch.object(mapping_commit, "_get_repo", return_value=repo):
+            meeting_store.get_store().find_occurrence(10)[1]["transcript_processed"] = True
+            mapping_commit.request_commit()
+            self.assertTrue(mapping_commit.flush_commits())
+
+        occurrence = json.loads(repo.content)["111"]["occurrences"][0]
+        self.assertEqual(occurrence["youtube_video_id"], "vid1")
+        self.assertTrue(occurrence["transcript_processed"])
+
+
+class TestMappingMerge(unittest.TestCase):
+
+    def test_merge_by_meeting_and_issue(self):
+        base = {"1": {"meeting_id": "1", "occurrences": [
+            {"issue_number": 5, "upload_attempt_count": 1, "transcript_processed": False, "notifications": []},
+        ]}}
+        local = json.loads(json.dumps(base))
+        remote = json.loads(json.dumps(base))
+
+        local["1"]["occurrences"][0].update(upload_attempt_count=2, notifications=[{"type": "youtube_upload"}])
+        local["1"]["occurrences"].append({"issue_number": 6})
+        remote["1"]["occurrences"][0].update(upload_attempt_count=3, transcript_processed=True,
+                                             notifications=[{"type": "transcript_posted"}])
+        remote["2"] = {"meeting_id": "2", "occurrences": [{"issue_number": 7}]}
+
+        merged, conflicts = mapping_merge.merge(base, local, remote)
+        occurrences = merged["1"]["occurrences"]
+        self.assertEqual([o["issue_number"] for o in occurrences], [5, 6])
+        self.assertEqual(occurrences[0]["upload_attempt_count"], 3)
+        self.assertTrue(occurrences[0]["transcript_processed"])
+        self.assertEqual([n["type"] for n in occurrences[0]["notifications"]], ["transcript_posted", "youtube_upload"])
+        self.assertIn("2", merged)
+        self.assertEqual(conflicts, [])
+
+    def test_conflicting_scalars_keep_ours(self):
+        base = {"1": {"meeting_id": "1", "calendar_event_id": "a"}}
+        merged, conflicts = mapping_merge.merge(
+            base,
+            {"1": {"meeting_id": "1", "calendar_event_id": "b"}},
+            {"1": {"meeting_id": "1", "calendar_event_id": "c"}},
+        )
+        self.assertEqual(merged["1"]["calendar_event_id"], "b")
+        self.assertEqual(len(conflicts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import sys
+import json
+import pathlib
+import threading
+import time
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from googleapiclient.http import HttpMockSequence, HttpRequest
+from googleapiclient.model import JsonModel
+
+from modules import media_stream
+
+CHUNK = media_stream.CHUNK_GRANULARITY
+
+
+def make_chunks(total, piece=100_000):
+    data = bytes(i % 251 for i in range(total))
+    return data, [data[i:i + piece] for i in range(0, total, piece)]
+
+
+def upload_request(media, responses):
+    http = HttpMockSequence(responses)
+    request = HttpRequest(
+        http, JsonModel().response, "https://www.googleapis.com/upload/youtube/v3/videos",
+        method="POST", body="{}", headers={"content-type": "application/json"},
+        resumable=media,
+    )
+    return http, request
+
+
+class TestChunkBuffer(unittest.TestCase):
+
+    def test_reads_across_piece_boundaries(self):
+        buffer = media_stream.ChunkBuffer(max_size=1000)
+        for piece in (b"abc", b"def", b"ghij"):
+            buffer.put(piece)
+        buffer.finish()
+        self.assertEqual(buffer.read(0, 4), b"abcd")
+        self.assertEqual(buffer.read(2, 5), b"cdefg")
+        self.assertEqual(buffer.read(7, 10), b"hij")  # short read at the end
+
+    def test_earlier_offsets_are_discarded(self):
+        buffer = media_stream.ChunkBuffer(max_size=1000)
+        buffer.put(b"abcdef")
+        buffer.finish()
+        self.assertEqual(buffer.read(4, 2), b"ef")
+        with self.assertRaises(media_stream.StreamClosedError):
+            buffer.read(0, 2)
+
+    def test_read_ahead_of_window_skips_forward(self):
+        # Resuming at an offset beyond what fits in the window
+        buffer = media_stream.ChunkBuffer(max_size=4, start=10)
+
+        def produce():
+            for piece in (b"abc", b"def", b"ghi"):
+                buffer.put(piece)
+            buffer.finish()
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        self.assertEqual(buffer.read(16, 3), b"ghi")
+        producer.join(1)
+
+    def test_producer_blocks_when_full(self):
+        buffer = media_stream.ChunkBuffer(max_size=10)
+        buffer.put(b"x" * 10)
+        done = threading.Event()
+
+        def produce():
+            buffer.put(b"y" * 5)
+            done.set()
+
+        threading.Thread(target=produce, daemon=True).start()
+        self.assertFalse(done.wait(0.1))
+        buffer.read(10, 5)  # consumer moved past the first piece
+        self.assertTrue(done.wait(1))
+
+    def test_close_unblocks_producer(self):
+        buffer = media_stream.ChunkBuffer(max_size=1)
+        buffer.put(b"x")
+        result = []
+        producer = threading.Thread(target=lambda: result.append(buffer.put(b"y")), daemon=True)
+        producer.start()
+        buffer.close()
+        producer.join(1)
+        self.assertEqual(result, [False])
+
+
+class TestStreamingMediaUpload(unittest.TestCase):
+
+    def test_uploads_in_chunks_with_known_size(self):
+        data, chunks = make_chunks(2 * CHUNK + 1234)
+        media = media_stream.StreamingMediaUpload(iter(chunks), size=len(data), chunksize=CHUNK, buffer_size=CHUNK)
+        http, request = upload_request(media, [
+            ({"status": "200", "location": "https://upload.example/session"}, ""),
+            ({"status": "308", "range": f"0-{CHUNK - 1}"}, ""),
+            ({"status": "308", "range": f"0-{2 * CHUNK - 1}"}, ""),
+            ({"status": "200"}, json.dumps({"id": "video123"})),
+        ])
+        response = None
+        while response is None:
+            _, response = request.next_chunk()
+        media.close()
+
+        self.assertEqual(response, {"id": "video123"})
+        bodies = [body for _, method, body, _ in http.request_sequence if method == "PUT"]
+        self.assertEqual(b"".join(bodies), data)
+        headers = [headers for _, method, _, headers in http.request_sequence if method == "PUT"]
+        self.assertEqual(headers[-1]["Content-Range"], f"bytes {2 * CHUNK}-{len(data) - 1}/{len(data)}")
+
+    def test_resends_unacknowledged_bytes(self):
+        data, chunks = make_chunks(CHUNK + 10)
+        media = media_stream.StreamingMediaUpload(iter(chunks), chunksize=CHUNK, buffer_size=CHUNK)
+        half = CHUNK // 2
+        http, request = upload_request(media, [
+            ({"status": "200", "location": "https://upload.example/session"}, ""),
+            # Server only persisted half of the first chunk
+            ({"status": "308", "range": f"0-{half - 1}"}, ""),
+            ({"status": "200"}, json.dumps({"id": "video123"})),
+        ])
+        response = None
+        while response is None:
+            _, response = request.next_chunk()
+        media.close()
+
+        puts = [(body, headers) for _, method, body, headers in http.request_sequence if method == "PUT"]
+        self.assertEqual(puts[1][0], data[half:])
+        # Unknown size: the last chunk is short, so it carries the final length
+        self.assertEqual(puts[1][1]["Content-Range"], f"bytes {half}-{len(data) - 1}/{len(data)}")
+
+    def test_download_error_surfaces_in_upload(self):
+        def failing():
+            yield b"x" * 10
+            raise ConnectionError("Zoom download dropped")
+
+        media = media_stream.StreamingMediaUpload(failing(), chunksize=CHUNK, buffer_size=CHUNK)
+        with self.assertRaises(ConnectionError):
+            media.getbytes(0, CHUNK)
+        media.close()
+
+    def test_reader_thread_stops_on_close(self):
+        def endless():
+            while True:
+                yield b"x" * 1024
+
+        media = media_stream.StreamingMediaUpload(endless(), chunksize=CHUNK, buffer_size=CHUNK)
+        time.sleep(0.05)
+        media.close()
+        self.assertFalse(media._reader.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
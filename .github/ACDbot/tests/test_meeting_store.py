@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules.meeting_store import MeetingStore
+
+
+def make_mapping():
+    return {
+        "111": {
+            "meeting_id": "111",
+            "is_recurring": True,
+            "call_series": "acde",
+            "occurrences": [
+                {"issue_number": 10, "discourse_topic_id": 500, "start_time": "2025-01-02T14:00:00Z"},
+                {"issue_number": 12, "discourse_topic_id": "placeholder-duplicate-12", "start_time": "2025-01-16T14:00:00Z"},
+            ],
+        },
+        # Legacy entry: occurrence fields live on the series entry itself
+        "222": {
+            "meeting_id": "222",
+            "call_series": "acde",
+            "issue_number": 7,
+            "discourse_topic_id": 400,
+            "start_time": "2024-12-19T14:00:00Z",
+        },
+    }
+
+
+class TestMeetingStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = MeetingStore(make_mapping())
+
+    def test_find_occurrence(self):
+        meeting_id, occurrence = self.store.find_occurrence(12)
+        self.assertEqual(meeting_id, "111")
+        self.assertIs(occurrence, self.store.mapping["111"]["occurrences"][1])
+        self.assertEqual(self.store.find_occurrence("7")[0], "222")
+        self.assertEqual(self.store.find_occurrence(99), (None, None))
+
+    def test_latest_in_series(self):
+        meeting_id, occurrence = self.store.latest_in_series("acde")
+        self.assertEqual(occurrence["issue_number"], 12)
+        # Skips placeholder topic IDs when asked for a valid one
+        _, occurrence = self.store.latest_in_series(
+            "acde", lambda m_id, entry, occ: isinstance(occ.get("discourse_topic_id"), int)
+        )
+        self.assertEqual(occurrence["issue_number"], 10)
+        self.assertEqual([m_id for m_id, _ in self.store.series_entries("acde")], ["111", "222"])
+
+    def test_find_by_topic_and_start_time(self):
+        self.assertEqual(self.store.find_by_topic(400)[0][0], "222")
+        self.assertEqual(self.store.find_by_topic("placeholder-duplicate-12"), [])
+
+        _, occurrence = self.store.find_by_start_time("2025-01-16T14:20:00Z")
+        self.assertEqual(occurrence["issue_number"], 12)
+        self.assertEqual(self.store.find_by_start_time("2025-01-16T15:00:00Z"), (None, None))
+        self.assertEqual(self.store.find_by_start_time("2025-01-02T14:05:00Z", meeting_id="222"), (None, None))
+
+    def test_upsert_occurrence_updates_indexes(self):
+        self.store.upsert_occurrence("111", {"issue_number": 15, "discourse_topic_id": 600,
+                                             "start_time": "2025-01-30T14:00:00Z"})
+        self.assertEqual(self.store.latest_in_series("acde")[1]["issue_number"], 15)
+        self.assertEqual(self.store.find_occurrence(15)[1]["occurrence_number"], 3)
+
+        # Replacing an occurrence drops its old start time and topic from the indexes
+        self.store.upsert_occurrence("111", {"issue_number": 10, "discourse_topic_id": 501,
+                                             "start_time": "2025-01-03T14:00:00Z"})
+        self.assertEqual(self.store.find_by_topic(500), [])
+        self.assertEqual(self.store.find_by_start_time("2025-01-02T14:00:00Z"), (None, None))
+        self.assertEqual(len(self.store.mapping["111"]["occurrences"]), 3)
+
+        self.store.remove_series("222")
+        self.assertEqual(self.store.find_occurrence(7), (None, None))
+
+    def test_indexes_hold_the_occurrences_themselves(self):
+        replacement = {"issue_number": 10, "start_time": "2025-01-03T14:00:00Z"}
+        self.store.upsert_occurrence("111", replacement)
+        self.assertIs(self.store.find_by_start_time("2025-01-03T14:10:00Z")[1], replacement)
+        self.assertTrue(any(occ is replacement for _, occ in self.store.iter_series_occurrences("acde")))
+
+    def test_series_entries_include_series_without_occurrences(self):
+        self.store.upsert_series("333", {"meeting_id": "333", "call_series": "acde", "occurrences": []})
+        self.store.upsert_series("444", {"meeting_id": "444", "call_series": "acdc"})
+        self.assertEqual([m_id for m_id, _ in self.store.series_entries("acde")], ["111", "222", "333"])
+        self.assertEqual([m_id for m_id, _ in self.store.series_entries("acdc")], ["444"])
+
+        self.store.upsert_occurrence("333", {"issue_number": 20, "start_time": "2025-02-13T14:00:00Z"})
+        self.assertEqual([m_id for m_id, _ in self.store.series_entries("acde")], ["333", "111", "222"])
+
+        # Moving a series to another call series or removing it updates the index
+        self.store.upsert_series("333", dict(self.store.mapping["333"], call_series="acdc"))
+        self.store.remove_series("222")
+        self.assertEqual([m_id for m_id, _ in self.store.series_entries("acde")], ["111"])
+        self.assertEqual([m_id for m_id, _ in self.store.series_entries("acdc")], ["333", "444"])
+
+
+class TestMeetingStorePersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "meeting_topic_mapping.json")
+        with open(self.path, "w") as f:
+            json.dump(make_mapping(), f, indent=2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_flush_skips_clean_and_unchanged_content(self):
+        store = MeetingStore.load(self.path)
+        mtime = os.stat(self.path).st_mtime_ns
+        self.assertFalse(store.flush())
+
+        store.mark_dirty()  # Marked dirty, but the content hash is unchanged
+        self.assertFalse(store.flush())
+        self.assertFalse(store.dirty)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, mtime)
+
+    def test_flush_writes_changes_atomically(self):
+        store = MeetingStore.load(self.path)
+        store.find_occurrence(10)[1]["transcript_processed"] = True
+        store.mark_dirty()
+        self.assertTrue(store.flush())
+
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertTrue(saved["111"]["occurrences"][0]["transcript_processed"])
+        # No temp files left behind next to the mapping
+        self.assertEqual(os.listdir(self.tmpdir.name), ["meeting_topic_mapping.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
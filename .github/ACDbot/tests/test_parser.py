@@ -1,20 +1,4 @@
-from dotenv import load_dotenv
-from pathlib import Path
-import os  # Import os BEFORE assertions
-
-# Load .env from ACDbot directory
-env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(env_path)
-
-# Verify loading
-assert env_path.exists(), f"Missing .env at {env_path}"
-assert os.getenv("ZOOM_ACCOUNT_ID"), "ZOOM_ACCOUNT_ID not loaded"
-assert os.getenv("ZOOM_CLIENT_ID"), "ZOOM_CLIENT_ID not loaded"
-assert os.getenv("ZOOM_CLIENT_SECRET"), "ZOOM_CLIENT_SECRET not loaded"
-
-print(f"Loading env from: {env_path}")
-print(f"File exists: {env_path.exists()}")
-
+import os
 import sys
 import pathlib
 import unittest
@@ -24,6 +8,10 @@ current_dir = pathlib.Path(__file__).parent
 project_root = current_dir.parent
 sys.path.insert(0, str(project_root))
 
+# zoom reads its credentials at import time; nothing here talks to Zoom
+os.environ.setdefault("ZOOM_CLIENT_ID", "test")
+os.environ.setdefault("ZOOM_CLIENT_SECRET", "test")
+
 from scripts.handle_issue import parse_issue_for_time
 
 class TestParseIssueForTime(unittest.TestCase):
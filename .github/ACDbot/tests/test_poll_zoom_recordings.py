@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+# zoom reads its credentials at import time; nothing here talks to Zoom
+os.environ.setdefault("ZOOM_CLIENT_ID", "test")
+os.environ.setdefault("ZOOM_CLIENT_SECRET", "test")
+
+from modules import zoom
+from modules.meeting_store import MeetingStore
+from scripts import poll_zoom_recordings as poller
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.status_code = 200
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+def make_recording(uuid, start_time, end_time, meeting_id="111"):
+    return {
+        "id": meeting_id,
+        "uuid": uuid,
+        "topic": "ACDE",
+        "start_time": start_time,
+        "duration": 60,
+        "recording_files": [{"recording_end": end_time}],
+    }
+
+
+class TestIterRecordings(unittest.TestCase):
+
+    def test_follows_pages_and_windows(self):
+        pages = {
+            "": {"meetings": [{"uuid": "a"}], "next_page_token": "p2"},
+            "p2": {"meetings": [{"uuid": "b"}], "next_page_token": ""},
+        }
+        calls = []
+
+        def fake_request(method, url, headers=None, params=None):
+            calls.append(params)
+            if params["to"] == "2025-03-10":
+                return FakeResponse(pages[params.get("next_page_token", "")])
+            return FakeResponse({"meetings": [{"uuid": "older"}]})
+
+        with mock.patch.object(zoom, "get_access_token", return_value="token"), \
+                mock.patch.object(zoom.http_client, "request", side_effect=fake_request):
+            uuids = [m["uuid"] for m in zoom.iter_recordings(date(2025, 1, 1), date(2025, 3, 10))]
+
+        self.assertEqual(uuids, ["a", "b", "older", "older"])
+        self.assertEqual([(c["from"], c["to"]) for c in calls], [
+            ("2025-02-08", "2025-03-10"),
+            ("2025-02-08", "2025-03-10"),
+            ("2025-01-08", "2025-02-07"),
+            ("2025-01-01", "2025-01-07"),
+        ])
+
+
+class TestPollCursor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.state_file = os.path.join(self.tmpdir.name, "zoom_poll_state.json")
+        with open(self.state_file, "w") as f:
+            json.dump({"last_end_time": "2025-01-16T15:00:00Z", "last_uuid": "old"}, f)
+
+        self.store = MeetingStore({"111": {"meeting_id": "111", "occurrences": [
+            {"issue_number": 10, "discourse_topic_id": 500, "start_time": "2025-01-02T14:00:00Z",
+             "transcript_processed": True},
+            {"issue_number": 12, "discourse_topic_id": 501, "start_time": "2025-01-16T14:00:00Z"},
+            {"issue_number": 14, "discourse_topic_id": 502, "start_time": "2025-01-30T14:00:00Z"},
+        ]}})
+        patches = [
+            mock.patch.object(poller, "POLL_STATE_FILE", self.state_file),
+            mock.patch.object(poller.mapping_commit, "request_file_commit"),
+            mock.patch.object(poller.mapping_commit, "request_commit"),
+            mock.patch.object(poller.mapping_commit, "has_pending_commit", return_value=False),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_only_new_or_pending_recordings_are_processed(self):
+        recordings = [
+            make_recording("new", "2025-01-30T14:00:00Z", "2025-01-30T15:00:00Z"),
+            # Behind the cursor: #12 still needs its transcript, #10 is done
+            make_recording("pending", "2025-01-16T14:00:00Z", "2025-01-16T15:00:00Z"),
+            make_recording("done", "2025-01-02T14:00:00Z", "2025-01-02T15:00:00Z"),
+        ]
+        with mock.patch.object(poller.zoom, "iter_recordings", return_value=iter(recordings)), \
+                mock.patch.object(poller, "process_single_occurrence", return_value=False) as process:
+            poller.process_recordings(self.store)
+
+        processed = sorted(call.kwargs["recording"]["uuid"] for call in process.call_args_list)
+        self.assertEqual(processed, ["new", "pending"])
+        self.assertEqual(poller.load_poll_state(),
+                         {"last_end_time": "2025-01-30T15:00:00Z", "last_uuid": "new"})
+
+    def test_worker_changes_are_applied_to_the_shared_mapping(self):
+        recordings = [make_recording("new", "2025-01-30T14:00:00Z", "2025-01-30T15:00:00Z")]
+
+        def fake_process(recording, occurrence, series_entry, force_process=False, notifications=None):
+            occurrence["transcript_processed"] = True
+            notifications.append(("transcript_posted", "posted", "https://example.org/t/502"))
+            return True
+
+        with mock.patch.object(poller.zoom, "iter_recordings", return_value=iter(recordings)), \
+                mock.patch.object(poller, "process_single_occurrence", side_effect=fake_process), \
+                mock.patch.object(poller.rss_utils, "add_notification_to_meeting") as notify:
+            poller.process_recordings(self.store)
+
+        self.assertTrue(self.store.find_occurrence(14)[1]["transcript_processed"])
+        notify.assert_called_once_with("111", 14, "transcript_posted", "posted", "https://example.org/t/502")
+        poller.mapping_commit.request_commit.assert_called_once()
+
+    def test_unpublished_artifacts_roll_back_the_occurrence(self):
+        recordings = [make_recording("new", "2025-01-30T14:00:00Z", "2025-01-30T15:00:00Z")]
+
+        def fake_process(recording, occurrence, series_entry, force_process=False, notifications=None):
+            # Queued inside the worker's batch; the write at its end fails
+            poller.discourse_artifacts.publish(502, "111-14", "transcript", "111-14", "summary", record=occurrence)
+            occurrence["transcript_processed"] = True
+            notifications.append(("transcript_posted", "posted", "https://example.org/t/502"))
+            return True
+
+        with mock.patch.object(poller.zoom, "iter_recordings", return_value=iter(recordings)), \
+                mock.patch.object(poller, "process_single_occurrence", side_effect=fake_process), \
+                mock.patch.object(poller.discourse_artifacts, "_write", side_effect=ConnectionError("down")), \
+                mock.patch.object(poller.rss_utils, "add_notification_to_meeting") as notify:
+            poller.process_recordings(self.store)
+
+        occurrence = self.store.find_occurrence(14)[1]
+        self.assertFalse(occurrence.get("transcript_processed"))
+        self.assertNotIn("discourse_posts", occurrence)
+        self.assertEqual(occurrence["transcript_attempt_count"], 1)
+        notify.assert_not_called()
+
+    def test_merge_keeps_later_cursor(self):
+        older = {"last_end_time": "2025-01-16T15:00:00Z", "last_uuid": "a"}
+        newer = {"last_end_time": "2025-01-30T15:00:00Z", "last_uuid": "b"}
+        self.assertEqual(poller.merge_poll_state(newer, older), newer)
+        self.assertEqual(poller.merge_poll_state(older, newer), newer)
+
+
+if __name__ == "__main__":
+    unittest.main()
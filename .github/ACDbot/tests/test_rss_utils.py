@@ -0,0 +1,239 @@
+import os
+import sys
+import copy
+import pathlib
+import tempfile
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import rss_utils
+
+ATOM = rss_utils.ATOM_NS
+
+
+def make_mapping(series=3, occurrences=4, notifications=2):
+    mapping = {}
+    for s in range(series):
+        meeting_id = str(1000 + s)
+        mapping[meeting_id] = {
+            "is_recurring": True,
+            "occurrence_rate": "weekly",
+            "occurrences": [
+                {
+                    "issue_number": s * 100 + o,
+                    "issue_title": f"Call {s} #{o} <draft> & notes",
+                    "discourse_topic_id": 5000 + s * 100 + o,
+                    "start_time": f"2025-02-{o + 1:02d}T14:00:00Z",
+                    "duration": 90,
+                    "notifications": [
+                        {"type": "youtube_upload", "content": f"upload {n}",
+                         "timestamp": f"2025-02-{o + 1:02d}T1{n}:00:00+00:00", "url": "https://youtu.be/x"}
+                        for n in range(notifications)
+                    ],
+                }
+                for o in range(occurrences)
+            ],
+        }
+    return mapping
+
+
+class TestRssFeed(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "rss", "meetings.xml")
+        patches = [
+            mock.patch.object(rss_utils, "RSS_FILE_PATH", self.path),
+            mock.patch.object(rss_utils, "_item_cache", {}),
+            mock.patch.object(rss_utils, "_written", {}),
+            mock.patch.object(rss_utils, "MAX_ITEMS", 50),
+            mock.patch.object(rss_utils, "MAX_AGE_DAYS", 0),
+            mock.patch.object(rss_utils, "FEED_BASE_URL", "https://example.org/rss"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def parse(self, path=None):
+        return ET.parse(path or self.path).getroot().find("channel")
+
+    def feed_path(self, *parts):
+        return os.path.join(os.path.dirname(self.path), *parts)
+
+    def links(self, channel):
+        return {link.get("rel"): link.get("href") for link in channel.findall(f"{{{ATOM}}}link")}
+
+    def test_feed_is_valid_rss(self):
+        rss_utils.create_or_update_rss_feed(make_mapping())
+        channel = self.parse()
+        items = channel.findall("item")
+        self.assertEqual(len(items), 12)
+        # Newest first
+        self.assertEqual(items[0].find("title").text, "Call 0 #3 <draft> & notes")
+        self.assertEqual(items[-1].find("guid").text, "meeting-1002-occurrence-200")
+        self.assertIn("Series Meeting ID:</strong> 1000", items[0].find("description").text)
+        self.assertEqual(items[0].find("pubDate").text, "Tue, 04 Feb 2025 14:00:00 +0000")
+
+    def test_notifications_newest_first_without_reordering_mapping(self):
+        mapping = make_mapping(series=1, occurrences=1)
+        original = copy.deepcopy(mapping)
+        rss_utils.create_or_update_rss_feed(mapping)
+        description = self.parse().find("item").find("description").text
+        self.assertLess(description.index("upload 1"), description.index("upload 0"))
+        self.assertEqual(mapping, original)
+
+    def test_only_changed_items_are_rendered(self):
+        mapping = make_mapping()
+        rss_utils.create_or_update_rss_feed(mapping)
+        mapping["1001"]["occurrences"][2]["youtube_video_id"] = "abc123"
+
+        with mock.patch.object(rss_utils, "render_occurrence_item", wraps=rss_utils.render_occurrence_item) as render:
+            rss_utils.create_or_update_rss_feed(mapping)
+        self.assertEqual(render.call_count, 1)
+        self.assertIn("youtu.be/abc123", ET.tostring(self.parse(), encoding="unicode"))
+
+    def test_unchanged_feed_is_not_rewritten(self):
+        mapping = make_mapping()
+        rss_utils.create_or_update_rss_feed(mapping)
+        with mock.patch.object(rss_utils, "write_rss_feed") as write:
+            rss_utils.create_or_update_rss_feed(mapping)
+        write.assert_not_called()
+
+    def test_unchanged_feeds_are_not_rewritten_by_a_new_process(self):
+        mapping = make_mapping(series=2)
+        mapping["1000"]["call_series"] = "acde"
+        mapping["1001"]["call_series"] = "acdc"
+        mapping["1000"]["occurrences"][0]["start_time"] = "2024-05-01T14:00:00Z"
+        rss_utils.create_or_update_rss_feed(mapping)
+        files = sorted(os.path.join(root, name) for root, _, names in os.walk(os.path.dirname(self.path))
+                       for name in names)
+        self.assertEqual(len(files), 5)  # main feed, two series feeds and two archive pages
+
+        def read_all():
+            contents = {}
+            for path in files:
+                with open(path) as f:
+                    contents[path] = f.read()
+            return contents
+
+        # As built by an earlier run
+        for path, content in read_all().items():
+            with open(path, "w") as f:
+                f.write(rss_utils.BUILD_DATE_PATTERN.sub(
+                    "<lastBuildDate>Mon, 01 Jan 2024 00:00:00 +0000</lastBuildDate>", content))
+        before = read_all()
+        # Each CI run is a new process, with nothing in _written or _item_cache
+        with mock.patch.object(rss_utils, "_written", {}), mock.patch.object(rss_utils, "_item_cache", {}):
+            rss_utils.create_or_update_rss_feed(mapping)
+        self.assertEqual(read_all(), before)
+
+        mapping["1001"]["occurrences"][0]["issue_title"] = "Renamed"
+        with mock.patch.object(rss_utils, "_written", {}), mock.patch.object(rss_utils, "_item_cache", {}):
+            rss_utils.create_or_update_rss_feed(mapping)
+        after = read_all()
+        self.assertEqual({path for path in files if after[path] != before[path]},
+                         {self.path, self.feed_path("archive", "2025.xml"), self.feed_path("series", "acdc.xml")})
+
+    def test_channel_pub_date_is_kept(self):
+        rss_utils.create_new_rss_feed()
+        with open(self.path) as f:
+            content = f.read().replace(self.parse().find("pubDate").text, "Mon, 01 Jan 2024 00:00:00 +0000", 1)
+        with open(self.path, "w") as f:
+            f.write(content)
+        rss_utils.create_or_update_rss_feed(make_mapping(series=1, occurrences=1))
+        self.assertEqual(self.parse().find("pubDate").text, "Mon, 01 Jan 2024 00:00:00 +0000")
+
+    def test_removed_occurrence_leaves_the_feed(self):
+        mapping = make_mapping(series=1, occurrences=2)
+        rss_utils.create_or_update_rss_feed(mapping)
+        del mapping["1000"]["occurrences"][1]
+        rss_utils.create_or_update_rss_feed(mapping)
+        self.assertEqual(len(self.parse().findall("item")), 1)
+        self.assertEqual(len(rss_utils._item_cache), 1)
+
+    def test_main_feed_keeps_the_latest_items(self):
+        with mock.patch.object(rss_utils, "MAX_ITEMS", 5):
+            rss_utils.create_or_update_rss_feed(make_mapping())
+        items = self.parse().findall("item")
+        self.assertEqual(len(items), 5)
+        self.assertEqual(items[0].find("pubDate").text, "Tue, 04 Feb 2025 14:00:00 +0000")
+
+    def test_age_window(self):
+        mapping = make_mapping(series=1, occurrences=2)
+        mapping["1000"]["occurrences"][1]["start_time"] = rss_utils.datetime.datetime.now(
+            rss_utils.pytz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with mock.patch.object(rss_utils, "MAX_AGE_DAYS", 30):
+            rss_utils.create_or_update_rss_feed(mapping)
+        self.assertEqual([item.find("guid").text for item in self.parse().findall("item")],
+                         ["meeting-1000-occurrence-1"])
+
+    def test_series_feeds(self):
+        mapping = make_mapping(series=2, occurrences=2)
+        mapping["1000"]["call_series"] = "acde"
+        mapping["1001"]["call_series"] = "FOCIL Breakout"
+        rss_utils.create_or_update_rss_feed(mapping)
+
+        acde = self.parse(self.feed_path("series", "acde.xml"))
+        self.assertEqual({item.find("guid").text for item in acde.findall("item")},
+                         {"meeting-1000-occurrence-0", "meeting-1000-occurrence-1"})
+        self.assertEqual(self.links(acde)["self"], "https://example.org/rss/series/acde.xml")
+        self.assertTrue(os.path.exists(self.feed_path("series", "focil-breakout.xml")))
+
+        # A series that loses its last item loses its feed
+        del mapping["1001"]
+        rss_utils.create_or_update_rss_feed(mapping)
+        self.assertFalse(os.path.exists(self.feed_path("series", "focil-breakout.xml")))
+
+    def test_yearly_archive_pages_are_linked(self):
+        mapping = make_mapping(series=1, occurrences=3)
+        mapping["1000"]["occurrences"][0]["start_time"] = "2023-05-01T14:00:00Z"
+        mapping["1000"]["occurrences"][1]["start_time"] = "2024-05-01T14:00:00Z"
+        with mock.patch.object(rss_utils, "MAX_ITEMS", 1):
+            rss_utils.create_or_update_rss_feed(mapping)
+
+        base = "https://example.org/rss"
+        main = self.parse()
+        self.assertEqual(len(main.findall("item")), 1)
+        self.assertEqual(self.links(main), {
+            "self": f"{base}/meetings.xml", "first": f"{base}/meetings.xml",
+            "next": f"{base}/archive/2025.xml", "last": f"{base}/archive/2023.xml",
+        })
+        page_2024 = self.parse(self.feed_path("archive", "2024.xml"))
+        self.assertEqual([item.find("guid").text for item in page_2024.findall("item")],
+                         ["meeting-1000-occurrence-1"])
+        self.assertEqual(self.links(page_2024), {
+            "self": f"{base}/archive/2024.xml", "first": f"{base}/meetings.xml",
+            "previous": f"{base}/archive/2025.xml", "next": f"{base}/archive/2023.xml",
+            "last": f"{base}/archive/2023.xml",
+        })
+        self.assertNotIn("next", self.links(self.parse(self.feed_path("archive", "2023.xml"))))
+
+    def test_feed_paths(self):
+        rss_dir = os.path.dirname(self.path)
+        self.assertEqual(rss_utils.feed_file_for("/rss"), self.path)
+        self.assertEqual(rss_utils.feed_file_for("/rss/acde"), os.path.join(rss_dir, "series", "acde.xml"))
+        self.assertEqual(rss_utils.feed_file_for("/rss/archive/2024"), os.path.join(rss_dir, "archive", "2024.xml"))
+        self.assertIsNone(rss_utils.feed_file_for("/rss/../../secrets"))
+        self.assertIsNone(rss_utils.feed_file_for("/index.html"))
+
+    def test_incremental_build_of_large_archive_is_fast(self):
+        mapping = make_mapping(series=20, occurrences=25, notifications=24)
+        rss_utils.create_or_update_rss_feed(mapping)
+        mapping["1005"]["occurrences"][3]["notifications"].append(
+            {"type": "transcript_posted", "content": "posted", "timestamp": "2025-03-01T00:00:00+00:00"})
+        start = time.perf_counter()
+        rss_utils.create_or_update_rss_feed(mapping)
+        # Hashing 500 items and one render; generous bound for slow CI machines
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import sys
+import gzip
+import pathlib
+import tempfile
+import threading
+import http.client
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import rss_utils
+from scripts import serve_rss
+
+
+class TestServeRss(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "rss", "meetings.xml")
+        self.mapping_path = os.path.join(tmp.name, "meeting_topic_mapping.json")
+        patch = mock.patch.object(rss_utils, "RSS_FILE_PATH", self.path)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.write_feed(b"<rss><channel><title>v1</title></channel></rss>" * 20)
+
+        self.rebuilder = serve_rss.FeedRebuilder(mapping_path=self.mapping_path, interval=0.05)
+        self.server = serve_rss.RSSServer(("127.0.0.1", 0), self.rebuilder)
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def write_feed(self, content, mtime=None):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def get(self, path="/rss", method="GET", **headers):
+        conn = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        self.addCleanup(conn.close)
+        conn.request(method, path, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+    def test_serves_feed_with_validators(self):
+        response, body = self.get()
+        self.assertEqual(response.status, 200)
+        self.assertTrue(body.startswith(b"<rss>"))
+        self.assertEqual(response.getheader("Content-Type"), "application/rss+xml; charset=utf-8")
+        self.assertIsNotNone(response.getheader("ETag"))
+        self.assertIsNotNone(response.getheader("Last-Modified"))
+        self.assertIn("max-age=", response.getheader("Cache-Control"))
+
+    def test_conditional_get_returns_304(self):
+        response, _ = self.get()
+        response, body = self.get(**{"If-None-Match": response.getheader("ETag")})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+        response, _ = self.get(**{"If-Modified-Since": response.getheader("Last-Modified")})
+        self.assertEqual(response.status, 304)
+
+    def test_changed_feed_gets_new_etag(self):
+        response, _ = self.get()
+        etag = response.getheader("ETag")
+        self.write_feed(b"<rss><channel><title>v2</title></channel></rss>", mtime=os.stat(self.path).st_mtime + 10)
+        response, body = self.get(**{"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"v2", body)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_gzip_negotiation(self):
+        response, body = self.get(**{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertTrue(gzip.decompress(body).startswith(b"<rss>"))
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+
+        # A gzip ETag revalidates the gzip representation only
+        gzip_etag = response.getheader("ETag")
+        response, _ = self.get(**{"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        self.assertEqual(response.status, 304)
+        response, body = self.get(**{"If-None-Match": gzip_etag})
+        self.assertEqual(response.status, 200)
+        self.assertTrue(body.startswith(b"<rss>"))
+
+        response, _ = self.get(**{"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+
+    def test_head_sends_no_body(self):
+        response, body = self.get(method="HEAD")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"")
+        self.assertGreater(int(response.getheader("Content-Length")), 0)
+
+    def test_unknown_path_is_404(self):
+        response, _ = self.get("/rss/../../secrets")
+        self.assertEqual(response.status, 404)
+        response, _ = self.get("/rss/archive/1999")
+        self.assertEqual(response.status, 404)
+
+    def test_update_rebuilds_in_background(self):
+        built = threading.Event()
+        with mock.patch.object(self.rebuilder, "rebuild", side_effect=built.set):
+            self.rebuilder.start()
+            self.addCleanup(self.rebuilder.stop)
+            response, _ = self.get("/update")
+            self.assertEqual(response.status, 202)
+            self.assertTrue(built.wait(2))
+
+    def test_mapping_change_triggers_rebuild(self):
+        built = threading.Event()
+        with mock.patch.object(self.rebuilder, "rebuild", side_effect=built.set):
+            self.rebuilder.start()
+            self.addCleanup(self.rebuilder.stop)
+            self.assertFalse(built.wait(0.2))
+            with open(self.mapping_path, "w") as f:
+                f.write("{}")
+            self.assertTrue(built.wait(2))
+
+    def test_slow_client_does_not_block_others(self):
+        # Open a connection that never sends its request
+        slow = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        slow.connect()
+        self.addCleanup(slow.close)
+        response, _ = self.get()
+        self.assertEqual(response.status, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
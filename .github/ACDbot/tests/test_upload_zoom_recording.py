@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+# zoom reads its credentials at import time; nothing here talks to Zoom
+os.environ.setdefault("ZOOM_CLIENT_ID", "test")
+os.environ.setdefault("ZOOM_CLIENT_SECRET", "test")
+
+from googleapiclient.http import HttpMockSequence, HttpRequest
+from googleapiclient.model import JsonModel
+
+from modules import media_stream, youtube_quota
+from modules.meeting_store import MeetingStore
+from scripts import upload_zoom_recording as uploader
+
+CHUNK = media_stream.CHUNK_GRANULARITY
+SESSION_URI = "https://upload.example/session"
+
+
+class FakeYouTube:
+    """videos().insert() backed by a scripted HttpMockSequence."""
+
+    def __init__(self, responses):
+        self.http = HttpMockSequence(responses)
+
+    def videos(self):
+        return self
+
+    def insert(self, part, body, media_body):
+        return HttpRequest(
+            self.http, JsonModel().response, "https://www.googleapis.com/upload/youtube/v3/videos",
+            method="POST", body=json.dumps(body), headers={"content-type": "application/json"},
+            resumable=media_body,
+        )
+
+    def puts(self):
+        return [(body, headers) for _, method, body, headers in self.http.request_sequence if method == "PUT"]
+
+
+def isolate_quota_ledger(test):
+    """Points the YouTube quota ledger at a temp file that is never committed."""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    for patcher in (
+        mock.patch.object(youtube_quota, "LEDGER_FILE", os.path.join(tmp.name, "youtube_quota.json")),
+        mock.patch.object(youtube_quota.mapping_commit, "request_file_commit"),
+    ):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+def make_media(data, start=0):
+    return media_stream.StreamingMediaUpload(iter([data[start:]]), size=len(data), chunksize=CHUNK, start=start)
+
+
+class TestUploadMedia(unittest.TestCase):
+
+    def setUp(self):
+        self.data = bytes(i % 251 for i in range(2 * CHUNK + 100))
+        self.checkpoints = []
+        isolate_quota_ledger(self)
+        sleep = mock.patch.object(uploader.time, "sleep")
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def checkpoint(self, uri, offset):
+        self.checkpoints.append((uri, offset))
+
+    def test_checkpoints_every_confirmed_chunk(self):
+        youtube = FakeYouTube([
+            ({"status": "200", "location": SESSION_URI}, ""),
+            ({"status": "308", "range": f"0-{CHUNK - 1}"}, ""),
+            ({"status": "308", "range": f"0-{2 * CHUNK - 1}"}, ""),
+            ({"status": "200"}, json.dumps({"id": "video123"})),
+        ])
+        media = make_media(self.data)
+        response = uploader.upload_media(youtube, {}, media, checkpoint=self.checkpoint)
+        media.close()
+
+        self.assertEqual(response["id"], "video123")
+        self.assertEqual(self.checkpoints[:2], [(SESSION_URI, CHUNK), (SESSION_URI, 2 * CHUNK)])
+        self.assertEqual(youtube_quota.usage()["calls"], {"videos.insert": 1})
+
+    def query_session(self, status, headers=None, json_data=None):
+        response = mock.Mock(status_code=status, headers=headers or {})
+        response.json.return_value = json_data
+        patcher = mock.patch.object(uploader.http_client, "put", return_value=response)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_resumes_saved_session_from_server_offset(self):
+        # Status query: the server has more than the saved checkpoint
+        put = self.query_session(308, {"Range": f"bytes=0-{CHUNK + 99}"})
+        youtube = FakeYouTube([({"status": "200"}, json.dumps({"id": "video123"}))])
+        media = make_media(self.data, start=CHUNK)
+        session = {"uri": SESSION_URI, "offset": CHUNK}
+        response = uploader.upload_media(youtube, {}, media, session=session, checkpoint=self.checkpoint)
+        media.close()
+
+        self.assertEqual(response["id"], "video123")
+        self.assertEqual(put.call_args.args[0], SESSION_URI)
+        self.assertEqual(put.call_args.kwargs["headers"]["Content-Range"], f"bytes */{len(self.data)}")
+        # No new session was created
+        self.assertNotIn("POST", [method for _, method, _, _ in youtube.http.request_sequence])
+        puts = youtube.puts()
+        self.assertEqual(puts[0][0], self.data[CHUNK + 100:2 * CHUNK + 100])
+        # Resuming does not insert a new video
+        self.assertEqual(youtube_quota.usage()["used"], 0)
+
+    def test_resumed_session_that_already_finished(self):
+        self.query_session(200, json_data={"id": "video123"})
+        youtube = FakeYouTube([])
+        media = make_media(self.data, start=CHUNK)
+        response = uploader.upload_media(youtube, {}, media, session={"uri": SESSION_URI, "offset": CHUNK})
+        media.close()
+        self.assertEqual(response["id"], "video123")
+        self.assertEqual(youtube.http.request_sequence, [])
+
+    def test_failed_chunk_is_retried_after_status_query(self):
+        youtube = FakeYouTube([
+            ({"status": "200", "location": SESSION_URI}, ""),
+            ({"status": "503"}, "unavailable"),
+            ({"status": "308", "range": f"0-{CHUNK - 1}"}, ""),  # status query
+            ({"status": "308", "range": f"0-{2 * CHUNK - 1}"}, ""),
+            ({"status": "200"}, json.dumps({"id": "video123"})),
+        ])
+        media = make_media(self.data)
+        with mock.patch.object(uploader, "UPLOAD_NUM_RETRIES", 0):
+            response = uploader.upload_media(youtube, {}, media, checkpoint=self.checkpoint)
+        media.close()
+        self.assertEqual(response["id"], "video123")
+
+    def test_expired_session(self):
+        self.query_session(404)
+        youtube = FakeYouTube([])
+        media = make_media(self.data, start=CHUNK)
+        with self.assertRaises(uploader.UploadSessionExpired):
+            uploader.upload_media(youtube, {}, media, session={"uri": SESSION_URI, "offset": CHUNK})
+        media.close()
+
+
+NOW = datetime(2025, 6, 20, 12, 0, tzinfo=timezone.utc)
+
+
+def make_occurrence(issue_number, hours_ago, **fields):
+    start = NOW - timedelta(hours=hours_ago)
+    occurrence = {
+        "issue_number": issue_number,
+        "issue_title": f"Call #{issue_number}",
+        "start_time": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "duration": 60,
+    }
+    occurrence.update(fields)
+    return occurrence
+
+
+class TestUploadQueue(unittest.TestCase):
+
+    def setUp(self):
+        isolate_quota_ledger(self)
+
+    def make_store(self):
+        return MeetingStore({
+            "111": {"occurrences": [
+                make_occurrence(1, 72),
+                make_occurrence(2, 48, Youtube_upload_processed=True),
+                make_occurrence(3, 24, skip_youtube_upload=True),
+                make_occurrence(4, 0.5),  # still running
+            ]},
+            "222": {"occurrences": [
+                make_occurrence(5, 96),
+                make_occurrence(6, 30, upload_attempt_count=10),
+                make_occurrence(7, 10, upload_attempt_count=10,
+                                youtube_upload_session={"uri": SESSION_URI, "offset": 100, "resumed_from": 0}),
+                make_occurrence(8, 24 * 60),  # too old
+            ]},
+            "placeholder-skipped-9": {"occurrences": [make_occurrence(9, 24)]},
+        })
+
+    def test_pending_uploads_order(self):
+        pending = uploader.pending_uploads(self.make_store(), now=NOW)
+        self.assertEqual([occurrence["issue_number"] for _, occurrence in pending], [7, 5, 1])
+
+    def test_queue_applies_worker_changes_on_main_thread(self):
+        store = self.make_store()
+        main_thread = threading.current_thread()
+        applied_on = []
+        apply = uploader.apply_occurrence_changes
+
+        def record_apply(occurrence, changes, reason=None):
+            if reason:
+                applied_on.append(threading.current_thread())
+            apply(occurrence, changes, reason)
+
+        def fake_upload(meeting_id, issue_number, updates):
+            shared = store.find_occurrence_in_series(meeting_id, issue_number)
+            updates.put(lambda: uploader.apply_occurrence_changes(
+                shared, {"youtube_video_id": f"video{issue_number}"}, "uploaded"))
+            return True
+
+        with mock.patch.object(uploader, "upload_recording", side_effect=fake_upload), \
+             mock.patch.object(uploader, "apply_occurrence_changes", side_effect=record_apply), \
+             mock.patch.object(uploader, "pending_uploads", return_value=uploader.pending_uploads(store, now=NOW)), \
+             mock.patch.object(uploader.mapping_commit, "request_commit"):
+            uploader.run_upload_queue(store)
+
+        self.assertEqual(store.find_occurrence_in_series("222", 5)["youtube_video_id"], "video5")
+        self.assertEqual(applied_on, [main_thread] * 3)
+
+    def test_quota_defers_fresh_uploads_but_not_resumes(self):
+        store = self.make_store()
+        uploaded = []
+        # Room for a single new upload today
+        youtube_quota.charge("search.list", youtube_quota.UPLOAD,
+                             units=youtube_quota.DAILY_QUOTA - youtube_quota.cost("videos.insert"))
+        with mock.patch.object(uploader, "upload_recording",
+                               side_effect=lambda meeting_id, issue_number, updates: uploaded.append(issue_number)), \
+             mock.patch.object(uploader, "pending_uploads", return_value=uploader.pending_uploads(store, now=NOW)):
+            uploader.run_upload_queue(store)
+        self.assertEqual(sorted(uploaded), [5, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import pathlib
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from googleapiclient.errors import HttpError
+
+from modules import youtube_catalog, youtube_quota
+
+
+def make_item(video_id, meeting_id=None, issue_number=None, published_at="2025-06-01T00:00:00Z"):
+    description = "Recording"
+    if meeting_id:
+        description += f"\n\nOriginal Zoom Meeting ID: {meeting_id}"
+    if issue_number:
+        description += f"\nGitHub Issue: https://github.com/ethereum/pm/issues/{issue_number}"
+    return {
+        "snippet": {"title": f"Video {video_id}", "description": description, "publishedAt": published_at},
+        "contentDetails": {"videoId": video_id, "videoPublishedAt": published_at},
+    }
+
+
+class FakeRequest:
+
+    def __init__(self, handler, params):
+        self.handler = handler
+        self.params = params
+        self.headers = {}
+
+    def execute(self):
+        return self.handler(self)
+
+
+class FakeYouTube:
+    """A channel whose uploads playlist is `items` (newest first), served in pages of two."""
+
+    def __init__(self, items, etag="etag-1"):
+        self.items = items
+        self.etag = etag
+        self.playlist_calls = []
+
+    def channels(self):
+        return SimpleNamespace(list=lambda **params: FakeRequest(
+            lambda request: {"items": [{"id": "UC1", "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}]},
+            params,
+        ))
+
+    def playlistItems(self):
+        return SimpleNamespace(list=lambda **params: FakeRequest(self._page, params))
+
+    def _page(self, request):
+        self.playlist_calls.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            raise HttpError(SimpleNamespace(status=304, reason="Not Modified"), b"")
+        start = int(request.params["pageToken"] or 0)
+        response = {"etag": self.etag, "items": self.items[start:start + 2]}
+        if start + 2 < len(self.items):
+            response["nextPageToken"] = str(start + 2)
+        return response
+
+
+class TestYouTubeCatalog(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patches = [
+            mock.patch.object(youtube_catalog, "CATALOG_FILE", os.path.join(tmp.name, "youtube_catalog.json")),
+            mock.patch.object(youtube_catalog, "CATALOG_MAX_AGE", 0),
+            mock.patch.object(youtube_catalog, "_refreshed_at", {}),
+            mock.patch.object(youtube_catalog.mapping_commit, "request_file_commit"),
+            mock.patch.object(youtube_quota, "charge"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_refresh_stops_at_known_video(self):
+        youtube = FakeYouTube([make_item("c"), make_item("b"), make_item("a")])
+        self.assertEqual([v["video_id"] for v in youtube_catalog.list_videos(youtube)], ["c", "b", "a"])
+
+        youtube.items = [make_item("e"), make_item("d")] + youtube.items
+        youtube.etag = "etag-2"
+        youtube.playlist_calls.clear()
+        videos = youtube_catalog.list_videos(youtube)
+
+        self.assertEqual([v["video_id"] for v in videos], ["e", "d", "c", "b", "a"])
+        # Page one held both new videos, page two started with a known one
+        self.assertEqual(len(youtube.playlist_calls), 2)
+
+    def test_unchanged_channel_costs_one_conditional_request(self):
+        youtube = FakeYouTube([make_item("b"), make_item("a")])
+        youtube_catalog.list_videos(youtube)
+        youtube.playlist_calls.clear()
+
+        self.assertEqual([v["video_id"] for v in youtube_catalog.list_videos(youtube)], ["b", "a"])
+        self.assertEqual(len(youtube.playlist_calls), 1)
+        self.assertEqual(youtube.playlist_calls[0].headers["If-None-Match"], "etag-1")
+
+    def test_find_meeting_video(self):
+        youtube = FakeYouTube([
+            make_item("v2", meeting_id="111", issue_number=12),
+            make_item("v1", meeting_id="111", issue_number=10),
+            make_item("v0"),
+        ])
+        self.assertEqual(youtube_catalog.find_meeting_video(youtube, 111, 10)["video_id"], "v1")
+        self.assertEqual(youtube_catalog.find_meeting_video(youtube, "111")["video_id"], "v2")
+        self.assertIsNone(youtube_catalog.find_meeting_video(youtube, "111", 11))
+
+    def test_merge_unions_videos_newest_first(self):
+        remote = {"channels": {"mine": {"etag": "r", "videos": [
+            {"video_id": "b", "published_at": "2025-06-02T00:00:00Z"},
+            {"video_id": "a", "published_at": "2025-06-01T00:00:00Z"},
+        ]}}}
+        local = {"channels": {"mine": {"etag": "l", "videos": [
+            {"video_id": "c", "published_at": "2025-06-03T00:00:00Z"},
+            {"video_id": "a", "published_at": "2025-06-01T00:00:00Z"},
+        ]}}}
+        merged = youtube_catalog.merge_catalogs(remote, local)["channels"]["mine"]
+        self.assertEqual(merged["etag"], "l")
+        self.assertEqual([v["video_id"] for v in merged["videos"]], ["c", "b", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
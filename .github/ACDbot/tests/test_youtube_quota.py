@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import pathlib
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from googleapiclient.errors import HttpError
+
+from modules import youtube_quota
+
+
+class TestYouTubeQuota(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ledger_file = os.path.join(tmp.name, "youtube_quota.json")
+        patches = [
+            mock.patch.object(youtube_quota, "LEDGER_FILE", self.ledger_file),
+            mock.patch.object(youtube_quota, "DAILY_QUOTA", 10000),
+            mock.patch.object(youtube_quota, "UPLOAD_RESERVE", 3200),
+            mock.patch.object(youtube_quota, "DISCOVERY_RESERVE", 5000),
+            mock.patch.object(youtube_quota, "_run_id", "run-1"),
+            mock.patch.object(youtube_quota.mapping_commit, "request_file_commit"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_charges_are_persisted(self):
+        youtube_quota.charge("videos.insert", youtube_quota.UPLOAD)
+        youtube_quota.charge("search.list", youtube_quota.DISCOVERY)
+        youtube_quota.charge("videos.list", youtube_quota.DISCOVERY)
+
+        usage = youtube_quota.usage()
+        self.assertEqual(usage["used"], 1701)
+        self.assertEqual(usage["remaining"], 8299)
+        self.assertEqual(usage["calls"], {"videos.insert": 1, "search.list": 1, "videos.list": 1})
+        with open(self.ledger_file) as f:
+            self.assertEqual(json.load(f)["runs"]["run-1"]["units"], 1701)
+
+    def test_lower_priorities_leave_their_reserve(self):
+        youtube_quota.charge("videos.insert", youtube_quota.UPLOAD, units=4900)
+        # 5100 left: one more search would cut into the discovery reserve
+        youtube_quota.charge("search.list", youtube_quota.DISCOVERY)
+        with self.assertRaises(youtube_quota.QuotaDeferred):
+            youtube_quota.charge("search.list", youtube_quota.DISCOVERY)
+        # Streams may go down to the upload reserve, uploads to zero
+        youtube_quota.charge("liveBroadcasts.insert", youtube_quota.STREAM, units=1800)
+        with self.assertRaises(youtube_quota.QuotaDeferred):
+            youtube_quota.charge("liveBroadcasts.insert", youtube_quota.STREAM)
+        youtube_quota.charge("videos.insert", youtube_quota.UPLOAD)
+        youtube_quota.charge("videos.insert", youtube_quota.UPLOAD)
+        self.assertEqual(youtube_quota.usage()["remaining"], 0)
+        self.assertEqual(youtube_quota.available(youtube_quota.UPLOAD), 0)
+
+    def test_new_day_starts_a_new_ledger(self):
+        with open(self.ledger_file, "w") as f:
+            json.dump({"date": "2000-01-01", "runs": {"old": {"units": 10000, "calls": {}}}}, f)
+        self.assertEqual(youtube_quota.available(youtube_quota.UPLOAD), 10000)
+
+    def test_quota_exceeded_error_exhausts_budget(self):
+        request = mock.Mock()
+        request.execute.side_effect = HttpError(
+            SimpleNamespace(status=403, reason="Forbidden"),
+            b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}',
+        )
+        with self.assertRaises(HttpError):
+            youtube_quota.execute(request, "videos.list", youtube_quota.DISCOVERY)
+        self.assertEqual(youtube_quota.usage()["remaining"], 0)
+
+    def test_merge_keeps_every_run_of_the_day(self):
+        remote = {"date": "2025-06-20", "runs": {"a": {"units": 100}, "b": {"units": 50}}}
+        local = {"date": "2025-06-20", "runs": {"b": {"units": 1650}, "c": {"units": 1}}}
+        merged = youtube_quota.merge_ledgers(remote, local)
+        self.assertEqual(merged["runs"], {"a": {"units": 100}, "b": {"units": 1650}, "c": {"units": 1}})
+        self.assertEqual(youtube_quota.merge_ledgers(remote, {"date": "2025-06-19", "runs": {}}), remote)
+
+
+if __name__ == "__main__":
+    unittest.main()
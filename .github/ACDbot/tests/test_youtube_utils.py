@@ -0,0 +1,172 @@
+import sys
+import pathlib
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from modules import youtube_quota, youtube_utils
+
+
+class FakeRequest:
+
+    def __init__(self, kind, params, youtube):
+        self.kind = kind
+        self.params = params
+        self.youtube = youtube
+
+    def execute(self):
+        self.youtube.round_trips += 1
+        return self.youtube.respond(self)
+
+
+class FakeBatch:
+
+    def __init__(self, youtube, callback):
+        self.youtube = youtube
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.youtube.round_trips += 1
+        self.youtube.batch_sizes.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, self.youtube.respond(request), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class FakeYouTube:
+
+    def __init__(self, failing_titles=(), failing_binds=(), stream_fails=False):
+        self.round_trips = 0
+        self.batch_sizes = []
+        self.thumbnails_set = []
+        self.failing_titles = set(failing_titles)
+        self.failing_binds = set(failing_binds)
+        self.stream_fails = stream_fails
+        self.broadcasts = 0
+        self.deleted = []
+
+    def _resource(self, kind, *methods):
+        return SimpleNamespace(**{
+            method: (lambda method=method: lambda **params: FakeRequest(f"{kind}.{method}", params, self))()
+            for method in methods
+        })
+
+    def liveStreams(self):
+        return self._resource("liveStreams", "insert")
+
+    def liveBroadcasts(self):
+        return self._resource("liveBroadcasts", "insert", "bind", "delete")
+
+    def thumbnails(self):
+        return self._resource("thumbnails", "set")
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def respond(self, request):
+        if request.kind == "liveStreams.insert":
+            if self.stream_fails:
+                raise RuntimeError("cannot create stream")
+            return {"id": "stream1", "cdn": {"ingestionInfo": {"ingestionAddress": "rtmp://a", "streamName": "key"}}}
+        if request.kind == "liveBroadcasts.insert":
+            title = request.params["body"]["snippet"]["title"]
+            if title in self.failing_titles:
+                raise RuntimeError(f"cannot create {title}")
+            self.broadcasts += 1
+            return {"id": f"b{self.broadcasts}"}
+        if request.kind == "liveBroadcasts.bind":
+            if request.params["id"] in self.failing_binds:
+                raise RuntimeError(f"cannot bind {request.params['id']}")
+            return {"id": request.params["id"]}
+        if request.kind == "liveBroadcasts.delete":
+            self.deleted.append(request.params["id"])
+            return ""
+        if request.kind == "thumbnails.set":
+            self.thumbnails_set.append((request.params["videoId"], request.params["media_body"]))
+            return {"items": [{"default": {"url": "https://i.ytimg.com/x.jpg"}}]}
+        raise AssertionError(request.kind)
+
+
+class TestCreateStreamsBatch(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(youtube_quota, "charge"),
+            mock.patch.object(youtube_utils, "read_thumbnail", return_value=b"jpeg"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.events = [(f"ACDE {i}", f"2025-07-0{i}T14:00:00.000Z") for i in range(1, 5)]
+
+    def test_two_batches_and_one_shared_stream(self):
+        youtube = FakeYouTube()
+        with mock.patch.object(youtube_utils, "get_youtube_service", return_value=youtube):
+            streams = youtube_utils.create_streams_batch(self.events, "desc", stream_title="ACDE")
+
+        self.assertEqual(youtube.batch_sizes, [5, 4])
+        self.assertEqual([s["broadcast_id"] for s in streams], ["b1", "b2", "b3", "b4"])
+        self.assertEqual({s["stream_id"] for s in streams}, {"stream1"})
+        self.assertEqual(streams[0]["rtmp_url"], "rtmp://a/key")
+        self.assertEqual(streams[2]["scheduled_time"], "2025-07-03T14:00:00.000Z")
+        # Thumbnails are still one call each, all from the same bytes
+        self.assertEqual(len(youtube.thumbnails_set), 4)
+        self.assertEqual({media.getbytes(0, 10) for _, media in youtube.thumbnails_set}, {b"jpeg"})
+
+    def test_failed_broadcast_is_left_out(self):
+        youtube = FakeYouTube(failing_titles={"ACDE 2"})
+        with mock.patch.object(youtube_utils, "get_youtube_service", return_value=youtube):
+            streams = youtube_utils.create_streams_batch(self.events, "desc")
+
+        self.assertEqual([s["scheduled_time"][:10] for s in streams], ["2025-07-01", "2025-07-03", "2025-07-04"])
+        self.assertEqual(youtube.batch_sizes, [5, 3])
+
+    def test_unbound_broadcast_is_left_out_and_deleted(self):
+        youtube = FakeYouTube(failing_binds={"b3"})
+        with mock.patch.object(youtube_utils, "get_youtube_service", return_value=youtube):
+            streams = youtube_utils.create_streams_batch(self.events, "desc")
+
+        self.assertEqual([s["broadcast_id"] for s in streams], ["b1", "b2", "b4"])
+        self.assertEqual(youtube.deleted, ["b3"])
+        self.assertEqual(len(youtube.thumbnails_set), 3)
+
+        youtube = FakeYouTube(failing_binds={"b1", "b2", "b3", "b4"})
+        with mock.patch.object(youtube_utils, "get_youtube_service", return_value=youtube):
+            with self.assertRaises(RuntimeError):
+                youtube_utils.create_streams_batch(self.events, "desc")
+        self.assertEqual(youtube.deleted, ["b1", "b2", "b3", "b4"])
+
+    def test_failed_stream_deletes_the_broadcasts(self):
+        youtube = FakeYouTube(stream_fails=True)
+        with mock.patch.object(youtube_utils, "get_youtube_service", return_value=youtube):
+            with self.assertRaisesRegex(RuntimeError, "cannot create stream"):
+                youtube_utils.create_streams_batch(self.events, "desc")
+
+        self.assertEqual(youtube.deleted, ["b1", "b2", "b3", "b4"])
+        self.assertEqual(youtube.thumbnails_set, [])
+
+    def test_recurring_streams_use_one_batch(self):
+        youtube = FakeYouTube()
+        with mock.patch.object(youtube_utils, "get_youtube_service", return_value=youtube), \
+             mock.patch.object(youtube_quota, "available", return_value=10000):
+            streams = youtube_utils.create_recurring_streams(
+                "ACDE", "desc", "2025-07-03T14:00:00Z", "weekly", num_events=3)
+
+        self.assertEqual([s["scheduled_time"] for s in streams], [
+            "2025-07-03T14:00:00.000Z", "2025-07-10T14:00:00.000Z", "2025-07-17T14:00:00.000Z"])
+        self.assertEqual(youtube.batch_sizes, [4, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
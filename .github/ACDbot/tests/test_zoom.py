@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import time
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the project root to sys.path
+current_dir = pathlib.Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+# zoom reads its credentials at import time; nothing here talks to Zoom
+os.environ.setdefault("ZOOM_CLIENT_ID", "test")
+os.environ.setdefault("ZOOM_CLIENT_SECRET", "test")
+
+from modules import zoom
+
+
+class FakeResponse:
+
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self.data = data or {}
+        self.closed = False
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise zoom.requests.HTTPError(str(self.status_code))
+
+    def close(self):
+        self.closed = True
+
+
+class TestAccessTokenRetry(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_file = os.path.join(tmp.name, "zoom_access_token.json")
+        # A cached token that looks fresh but that Zoom has revoked
+        with open(self.cache_file, "w") as f:
+            json.dump({"access_token": "revoked", "expires_at": time.time() + 3000}, f)
+        self.refreshes = []
+        patches = [
+            mock.patch.object(zoom, "TOKEN_DIR", tmp.name),
+            mock.patch.object(zoom, "ACCESS_TOKEN_CACHE_FILE", self.cache_file),
+            mock.patch.object(zoom, "TOKEN_LOCK_FILE", os.path.join(tmp.name, "zoom_token.lock")),
+            mock.patch.object(zoom, "_access_token", None),
+            mock.patch.object(zoom, "_access_token_expires_at", 0.0),
+            mock.patch.object(zoom, "_refresh_access_token", side_effect=self._refresh),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _refresh(self):
+        self.refreshes.append(True)
+        zoom._access_token = "fresh"
+        zoom._access_token_expires_at = time.time() + 3600
+        return zoom._access_token
+
+    def test_401_refreshes_the_token_and_retries_once(self):
+        sent = []
+
+        def fake_request(method, url, headers=None, **kwargs):
+            sent.append(headers["Authorization"])
+            if headers["Authorization"] == "Bearer revoked":
+                return FakeResponse(401)
+            return FakeResponse(200, {"join_url": "https://zoom.us/j/1"})
+
+        with mock.patch.object(zoom.http_client, "request", side_effect=fake_request):
+            self.assertEqual(zoom.get_meeting(1)["join_url"], "https://zoom.us/j/1")
+            # Later calls reuse the fresh token
+            zoom.get_meeting(1)
+        self.assertEqual(sent, ["Bearer revoked", "Bearer fresh", "Bearer fresh"])
+        self.assertEqual(len(self.refreshes), 1)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_second_401_is_returned(self):
+        with mock.patch.object(zoom.http_client, "request", return_value=FakeResponse(401)) as request:
+            response = zoom.api_request("GET", f"{zoom.api_base_url}/meetings/1")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(request.call_count, 2)
+
+    def test_newer_token_is_not_invalidated(self):
+        zoom._access_token, zoom._access_token_expires_at = "newer", time.time() + 3600
+        zoom.invalidate_access_token("revoked")
+        self.assertEqual(zoom.get_access_token(), "newer")
+        self.assertEqual(self.refreshes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()